@@ -0,0 +1,161 @@
+"""
+OCR Admission Control Middleware
+================================
+Sheds OCR load before it reaches the worker pool.
+
+When a ward uploads many photos at once, every OCR request holds an upload
+body, a decoded image and a slot in the OCR queue. Without a limit they pile
+up until the API process is too busy to answer its liveness probe and the
+pod is restarted, losing all in-flight work.
+
+This middleware admits at most OCR_MAX_IN_FLIGHT requests to the OCR and
+blood gas image routes at once. Beyond that - or when the OCR worker pool
+itself is at capacity - requests are rejected immediately with 503 and a
+Retry-After estimated from recent job durations, before their body is read.
+All other routes (/health, auth, content) are never affected.
+
+The slot is held until the response has been sent in full (a pure ASGI
+middleware - a BaseHTTPMiddleware would release it when a streaming
+response such as /api/ocr/batch starts). POST /api/ocr/jobs only enqueues
+and is not counted: its jobs wait in the job store (bounded by OCR_JOBS_MAX)
+until the OCR worker pool has a free slot.
+
+Configuration:
+- OCR_MAX_IN_FLIGHT: Concurrent OCR requests per API process
+  (default: OCR worker pool capacity, i.e. OCR_WORKERS + OCR_MAX_QUEUE_DEPTH)
+
+The in-flight / queue-depth gauges are exposed at GET /api/admin/ocr/metrics.
+"""
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Routes that run OCR while the request waits (POST only), matched exactly
+OCR_ADMISSION_PATHS = frozenset({
+    "/api/ocr",
+    "/api/ocr/upload",
+    "/api/ocr/batch",
+    "/api/blood-gas/analyze-image",
+    "/api/blood-gas/analyze-image/upload",
+    "/api/blood-gas/analyze-image-offline",
+    "/api/blood-gas/analyze-image-offline/upload",
+})
+
+
+def is_ocr_route(scope: Scope) -> bool:
+    """True for POST requests to an OCR / blood gas image route."""
+    if scope["type"] != "http" or scope["method"] != "POST":
+        return False
+    return scope["path"].rstrip("/") in OCR_ADMISSION_PATHS
+
+
+class OCRAdmissionController:
+    """
+    Counts in-flight OCR requests and decides whether to admit new ones.
+
+    A request is rejected when the in-flight limit is reached or when the
+    OCR executor has no free capacity (its queue counts jobs, so batch
+    requests running several images are accounted for there).
+    """
+
+    def __init__(self, executor, max_in_flight: Optional[int] = None):
+        """
+        Args:
+            executor: The OCRExecutor whose capacity / job durations are used
+            max_in_flight: Concurrent OCR requests (default: executor capacity)
+        """
+        self.executor = executor
+        self.max_in_flight = max(1, max_in_flight or executor.capacity)
+        self.in_flight = 0
+        self.rejected_total = 0
+
+    def try_acquire(self) -> Optional[int]:
+        """
+        Admit a request.
+
+        Returns:
+            None if admitted (caller must release()), otherwise the
+            Retry-After estimate in seconds
+        """
+        if self.in_flight >= self.max_in_flight or self.executor.pending_jobs >= self.executor.capacity:
+            self.rejected_total += 1
+            return self.executor.estimate_wait_seconds(max(self.in_flight, self.executor.pending_jobs))
+        self.in_flight += 1
+        return None
+
+    def release(self):
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight_requests": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "rejected_total": self.rejected_total
+        }
+
+
+# Global admission controller (initialized in server.py lifespan)
+ocr_admission: Optional[OCRAdmissionController] = None
+
+
+def get_ocr_admission() -> Optional[OCRAdmissionController]:
+    """Get the global OCR admission controller (None if not initialized)."""
+    return ocr_admission
+
+
+def init_ocr_admission(executor) -> OCRAdmissionController:
+    """
+    Initialize the global OCR admission controller from environment config.
+
+    Args:
+        executor: The global OCRExecutor
+
+    Returns:
+        Initialized OCRAdmissionController
+    """
+    global ocr_admission
+    max_in_flight = os.environ.get('OCR_MAX_IN_FLIGHT')
+    ocr_admission = OCRAdmissionController(executor, int(max_in_flight) if max_in_flight else None)
+    logger.info(f"[OCR] Admission control: max_in_flight={ocr_admission.max_in_flight}")
+    return ocr_admission
+
+
+class OCRAdmissionMiddleware:
+    """Reject OCR requests with 503 + Retry-After when OCR is saturated"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        controller = get_ocr_admission()
+        if controller is None or not is_ocr_route(scope):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = controller.try_acquire()
+        if retry_after is not None:
+            logger.warning(
+                f"OCR request shed: {scope['path']} "
+                f"(in_flight={controller.in_flight}, pending_jobs={controller.executor.pending_jobs})"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "detail": "OCR service is busy. Please try again shortly.",
+                    "retry_after": retry_after
+                },
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        # Returns once the last body chunk was sent - streamed batches included
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
@@ -37,6 +37,14 @@ logger = logging.getLogger(__name__)
 # Maximum request body size (10MB)
 MAX_BODY_SIZE = 10 * 1024 * 1024
 
+# Binary uploads (OCR image upload endpoints) - never read or scanned here
+BINARY_CONTENT_TYPES = ("image/", "application/octet-stream")
+
+
+def is_binary_content_type(content_type: str) -> bool:
+    """True for raw image / octet-stream bodies."""
+    return content_type.lower().startswith(BINARY_CONTENT_TYPES)
+
 # =============================================================================
 # STRICT INPUT VALIDATION CONFIGURATION
 # =============================================================================
@@ -165,9 +173,9 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
         if request.method in ["POST", "PUT", "PATCH"]:
             content_type = request.headers.get("content-type", "")
             
-            # Allow JSON and form data
+            # Allow JSON, form data and binary image uploads
             allowed_types = ["application/json", "multipart/form-data", "application/x-www-form-urlencoded"]
-            if not any(ct in content_type for ct in allowed_types):
+            if not any(ct in content_type for ct in allowed_types) and not is_binary_content_type(content_type):
                 # Allow if no body expected
                 content_length = request.headers.get("content-length", "0")
                 if content_length != "0":
@@ -182,8 +190,12 @@ class InputValidationMiddleware(BaseHTTPMiddleware):
                 content={"detail": "Request body too large"}
             )
         
-        # For JSON requests, validate the body
+        # Binary and multipart bodies are streamed by the endpoint, not buffered here
         content_type = request.headers.get("content-type", "")
+        if is_binary_content_type(content_type) or "multipart/form-data" in content_type:
+            return await call_next(request)
+        
+        # For JSON requests, validate the body
         if "application/json" in content_type:
             try:
                 # Read and cache the body
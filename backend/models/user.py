@@ -31,6 +31,8 @@ class User(BaseModel):
     is_active: bool = True
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Revocation epoch: tokens issued before this are rejected (revoke_all_user_tokens)
+    tokens_valid_after: Optional[datetime] = None
 
 
 class UserResponse(BaseModel):
@@ -35,6 +35,8 @@ from models.user import UserResponse, User
 from models.subscription import Subscription, SubscriptionStatus, PlanType
 from services.subscription_service import SubscriptionService
 from services.auth_service import AuthService
+from services.token_epochs import bump_token_epoch
+from services.user_cache import invalidate_cached_user
 from motor.motor_asyncio import AsyncIOMotorClient
 
 
@@ -72,6 +74,16 @@ class AdminEditUser(BaseModel):
     subscription_days: Optional[int] = None  # Days to add/set
 
 
+class AdminBloodGasRules(BaseModel):
+    """
+    Request model for replacing the blood gas rules table.
+    
+    Attributes:
+        rules: Full rules table (shape of DEFAULT_RULES in services/blood_gas_rules.py)
+    """
+    rules: dict
+
+
 # =============================================================================
 # ROUTER SETUP & DATABASE CONNECTION
 # =============================================================================
@@ -243,6 +255,7 @@ async def delete_user(
     
     # Delete the user
     result = await db.users.delete_one({'id': user_id})
+    await bump_token_epoch(user_id)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to delete user")
@@ -380,6 +393,8 @@ async def edit_user(
             {'id': user_id},
             {'$set': {'hashed_password': hashed, 'updated_at': datetime.now(timezone.utc).isoformat()}}
         )
+        # Sessions signed in with the old password are logged out
+        await auth_service.revoke_all_user_tokens(user_id, reason="password_changed_by_admin")
         updates_made.append("password")
     
     # Update subscription if type or days provided
@@ -430,6 +445,7 @@ async def edit_user(
         
         updates_made.append("subscription")
     
+    await bump_token_epoch(user_id)
     if not updates_made:
         raise HTTPException(status_code=400, detail="No updates provided")
     
@@ -562,7 +578,7 @@ async def run_scheduled_job(
     Manually trigger a scheduled job to run immediately (Admin only)
     
     Args:
-        job_id: ID of the job to run (e.g., 'renewal_reminders')
+        job_id: ID of the job to run ('renewal_reminders' or 'expire_subscriptions')
     """
     from services.scheduler_service import get_scheduler
     
@@ -603,6 +619,120 @@ async def get_scheduler_logs(
     }
 
 
+@router.get("/ocr/cache-stats")
+async def get_ocr_cache_stats(
+    admin: UserResponse = Depends(require_admin)
+):
+    """
+    Get OCR result cache hit/miss counters for this API process (Admin only)
+    """
+    from services.ocr_cache import get_ocr_cache
+
+    cache = get_ocr_cache()
+    if not cache:
+        return {"enabled": False}
+
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/auth/user-cache-stats")
+async def get_user_cache_stats(
+    admin: UserResponse = Depends(require_admin)
+):
+    """
+    Get resolved-user cache hit/miss counters, the token epoch store
+    (subscription claims) and revoked token filter state for this API
+    process (Admin only)
+    """
+    from services.user_cache import get_user_cache
+    from services.token_epochs import get_token_epoch_store
+    from services.revoked_tokens import get_revoked_token_filter
+
+    cache = get_user_cache()
+    store = get_token_epoch_store()
+    revoked_filter = get_revoked_token_filter()
+    related = {
+        "token_epochs": store.stats() if store else None,
+        "revoked_token_filter": revoked_filter.stats() if revoked_filter else None
+    }
+    if not cache:
+        return {"enabled": False, **related}
+
+    return {"enabled": True, **cache.stats(), **related}
+
+
+@router.get("/ocr/metrics")
+async def get_ocr_metrics(
+    admin: UserResponse = Depends(require_admin)
+):
+    """
+    Get OCR stage timing histograms, worker pool gauges (queue depth,
+    running jobs, rejections), admission control, async job and variant
+    selector state for this API process (Admin only). Use to size OCR_WORKERS / OCR_PASS_THREADS.
+    """
+    from services.ocr_timing import get_ocr_timing_stats
+    from services.ocr_executor import get_ocr_executor
+    from services.ocr_jobs import get_ocr_job_store
+    from services.ocr_variant_selector import get_variant_selector
+    from middleware.admission import get_ocr_admission
+
+    executor = get_ocr_executor()
+    admission = get_ocr_admission()
+    job_store = get_ocr_job_store()
+    selector = get_variant_selector()
+
+    return {
+        "stages": get_ocr_timing_stats().snapshot(),
+        "pool": executor.stats() if executor else None,
+        "admission": admission.stats() if admission else None,
+        "jobs": job_store.stats() if job_store else None,
+        "variant_selector": selector.stats() if selector else None
+    }
+
+
+@router.get("/blood-gas-rules")
+async def get_blood_gas_rules_table(
+    admin: UserResponse = Depends(require_admin)
+):
+    """
+    Get the active blood gas rules table, its version and the names of the
+    thresholds age groups can override (Admin only)
+    """
+    from services.blood_gas_rules import get_blood_gas_rules, get_blood_gas_rules_store, threshold_names
+
+    rules = await get_blood_gas_rules()
+    store = get_blood_gas_rules_store()
+    return {
+        "version": rules.version,
+        "rules": rules.rules,
+        "threshold_names": threshold_names(rules.rules),
+        "store": store.stats() if store else None
+    }
+
+
+@router.put("/blood-gas-rules")
+async def update_blood_gas_rules_table(
+    request: AdminBloodGasRules,
+    admin: UserResponse = Depends(require_admin)
+):
+    """
+    Replace the blood gas rules table (Admin only).
+    
+    The table is validated and compiled before it is stored; it is active in
+    this API process at once and in the others within
+    BLOOD_GAS_RULES_REFRESH_SECONDS.
+    """
+    from services.blood_gas_rules import get_blood_gas_rules_store, init_blood_gas_rules
+
+    store = get_blood_gas_rules_store() or init_blood_gas_rules(db)
+    try:
+        compiled = await store.save(request.rules, updated_by=admin.email)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid blood gas rules: {e}")
+
+    return {"success": True, "version": compiled.version, "age_groups": list(compiled.groups)}
+
+
 
 # =============================================================================
 # DEVICE MANAGEMENT ENDPOINTS
@@ -712,6 +842,7 @@ async def revoke_user_device(
         'user_id': user_id,
         'device_id': device_id
     })
+    invalidate_cached_user(user_id)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=500, detail="Failed to revoke device")
@@ -733,7 +864,8 @@ async def revoke_all_user_devices(
     Revoke all devices for a user (Admin only)
     
     This logs out the user from all devices by:
-    1. Revoking all associated refresh tokens
+    1. Revoking every token issued so far (one revocation epoch write, one
+       bulk insert of the devices' refresh tokens)
     2. Deleting all device registrations
     """
     import logging
@@ -744,25 +876,9 @@ async def revoke_all_user_devices(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # SECURITY: Revoke all refresh tokens before deleting devices
-    tokens_revoked = 0
-    devices = await db.user_devices.find({'user_id': user_id}).to_list(100)
-    
+    # SECURITY: Revoke all tokens before deleting devices
     auth_service = AuthService(db)
-    for device in devices:
-        refresh_token = device.get('refresh_token')
-        if refresh_token:
-            try:
-                payload = auth_service.decode_token(refresh_token)
-                if payload and payload.get('jti'):
-                    await auth_service.revoke_token(
-                        jti=payload['jti'],
-                        user_id=user_id,
-                        reason="all_devices_revoked_by_admin"
-                    )
-                    tokens_revoked += 1
-            except Exception as e:
-                logger.warning(f"Could not revoke token for device: {e}")
+    tokens_revoked = await auth_service.revoke_all_user_tokens(user_id, reason="all_devices_revoked_by_admin")
     
     # Delete all devices for this user
     result = await db.user_devices.delete_many({'user_id': user_id})
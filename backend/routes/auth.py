@@ -10,6 +10,8 @@ sys.path.insert(0, '/app/backend')
 
 from models.user import UserCreate, UserLogin, UserResponse, TokenResponse
 from services.auth_service import AuthService
+from services.token_epochs import get_token_epoch_store
+from services.user_cache import get_user_cache, invalidate_cached_user
 from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
@@ -163,9 +165,10 @@ def get_device_info(request: Request) -> dict:
     }
 
 
-async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[UserResponse]:
+def get_access_payload(request: Request, credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[dict]:
     """
-    Get current user from JWT token (supports both header and cookie)
+    Decoded access token from the Authorization header or the access_token cookie
+    (None if missing, invalid, expired or not an access token)
     """
     token = None
     
@@ -187,11 +190,59 @@ async def get_current_user(request: Request, credentials: HTTPAuthorizationCrede
     if payload.get('type') != 'access':
         return None
     
-    user_id = payload.get('sub')
-    if not user_id:
+    if not payload.get('sub'):
         return None
     
-    return await auth_service.get_user_with_subscription(user_id)
+    return payload
+
+
+async def resolve_user(payload: dict) -> Optional[UserResponse]:
+    """
+    The user and subscription status of a decoded access token, from the database
+    """
+    user_id = payload['sub']
+    
+    # Resolved users are cached briefly per (user, token) - see services/user_cache.py
+    iat = payload.get('iat')
+    cache = get_user_cache()
+    if cache is None:
+        return await auth_service.get_user_with_subscription(user_id, iat)
+    
+    user = cache.get(user_id, iat)
+    if user is not None:
+        return user
+    generation = cache.begin()
+    user = await auth_service.get_user_with_subscription(user_id, iat)
+    if user is not None:
+        cache.put(user_id, iat, user, generation)
+    return user
+
+
+async def user_from_current_claims(payload: dict) -> Optional[UserResponse]:
+    """
+    The user vouched for by the token's subscription claims, if they are still
+    current - no write to the user since they were read (services/token_epochs.py)
+    """
+    store = get_token_epoch_store()
+    if store is None:
+        return None
+    user = auth_service.user_from_claims(payload)
+    if user is None:
+        return None
+    await store.sync()
+    if not store.is_current(user.id, payload['subscription'].get('at') or 0.0):
+        return None
+    return user
+
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Optional[UserResponse]:
+    """
+    Get current user from JWT token (supports both header and cookie)
+    """
+    payload = get_access_payload(request, credentials)
+    if not payload:
+        return None
+    return await resolve_user(payload)
 
 
 async def require_auth(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
@@ -207,8 +258,21 @@ async def require_auth(request: Request, credentials: HTTPAuthorizationCredentia
 async def require_subscription(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
     """
     Require authentication AND active subscription (or admin status)
+    
+    Tokens with current subscription claims are authorised without a database
+    read; anything else (no claims, inactive, stale) is checked against the database.
     """
-    user = await require_auth(request, credentials)
+    payload = get_access_payload(request, credentials)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    user = await user_from_current_claims(payload)
+    if user is not None:
+        return user
+    
+    user = await resolve_user(payload)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
     
     # Admin always has access
     if user.is_admin:
@@ -274,16 +338,13 @@ async def signup(user_data: UserCreate, response: Response):
         import logging
         logging.getLogger(__name__).error(f"Failed to send welcome/admin notification email: {e}", exc_info=True)
     
-    # Generate tokens
-    access_token = auth_service.create_access_token(user.id, user.is_admin)
+    # Generate tokens (the access token carries the subscription status)
+    access_token, user_response = await auth_service.issue_access_token(user.id, user.is_admin)
     refresh_token = auth_service.create_refresh_token(user.id)
     
     # Set HTTP-only cookies with secure flags using centralized helper
     set_auth_cookies(response, access_token, refresh_token, remember_me=False)
     
-    # Get user with subscription info
-    user_response = await auth_service.get_user_with_subscription(user.id)
-    
     return TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -327,8 +388,8 @@ async def login(credentials: UserLogin, request: Request, response: Response):
                 detail=f"Device limit reached. You can only be logged in on {MAX_DEVICES_PER_USER} devices. Please log out from another device or contact admin."
             )
     
-    # Generate tokens
-    access_token = auth_service.create_access_token(user.id, user.is_admin)
+    # Generate tokens (the access token carries the subscription status)
+    access_token, user_response = await auth_service.issue_access_token(user.id, user.is_admin)
     refresh_token = auth_service.create_refresh_token(user.id)
     
     # Register/update device
@@ -365,9 +426,6 @@ async def login(credentials: UserLogin, request: Request, response: Response):
         max_age=604800
     )
     
-    # Get user with subscription info
-    user_response = await auth_service.get_user_with_subscription(user.id)
-    
     return TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
@@ -418,6 +476,7 @@ async def logout(request: Request, response: Response):
             'user_id': user_id,
             'device_id': device_id
         })
+        invalidate_cached_user(user_id)
     
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
@@ -465,19 +524,23 @@ async def refresh_token(request: Request, response: Response):
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     
-    # Revoke the old refresh token (token rotation for security)
-    if jti:
-        await auth_service.revoke_token(jti, user_id, reason="token_refresh")
+    # Issued before the user's tokens were all revoked (password change, log out everywhere)
+    if auth_service.issued_before_revocation(user, payload.get('iat')):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    
+    # Revoke the old refresh token (token rotation for security). Fails if another
+    # request revoked it meanwhile, e.g. the same token replayed on another API process
+    if jti and not await auth_service.consume_refresh_token(jti, user_id):
+        logger.warning(f"Refresh token reused during rotation: jti={jti}")
+        raise HTTPException(status_code=401, detail="Token has been revoked")
     
     # Generate new tokens
-    access_token = auth_service.create_access_token(user.id, user.is_admin)
+    access_token, user_response = await auth_service.issue_access_token(user.id, user.is_admin)
     new_refresh_token = auth_service.create_refresh_token(user.id)
     
     # Update cookies using centralized helper with secure settings
     set_auth_cookies(response, access_token, new_refresh_token, remember_me=True)
     
-    user_response = await auth_service.get_user_with_subscription(user.id)
-    
     return TokenResponse(
         access_token=access_token,
         refresh_token=new_refresh_token,
@@ -620,6 +683,8 @@ async def reset_password(request_data: ResetPasswordRequest):
     
     if result.modified_count == 0:
         raise HTTPException(status_code=500, detail="Failed to update password")
+    # Log out every session (also bumps the token epoch)
+    await auth_service.revoke_all_user_tokens(reset_record['user_id'], reason="password_reset")
     
     # Delete used token
     await db.password_resets.delete_one({'token': request_data.token})
@@ -42,6 +42,7 @@ from services.paypal_service import PayPalService, PayPalError, PayPalErrorCode
 from services.subscription_service import SubscriptionService
 from routes.auth import require_auth, require_subscription
 from services.auth_service import AuthService
+from services.token_epochs import bump_token_epoch
 from models.user import UserResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel
@@ -743,7 +744,7 @@ async def capture_paypal_order_with_state(request_data: CaptureWithStateRequest)
             logger.error(f"Failed to send subscription email: {e}")
         
         # Generate new authentication tokens for the user
-        access_token = auth_service.create_access_token(user_id, user_doc.get('is_admin', False))
+        access_token, _ = await auth_service.issue_access_token(user_id, user_doc.get('is_admin', False))
         refresh_token = auth_service.create_refresh_token(user_id)
         
         return {
@@ -942,6 +943,7 @@ async def handle_paypal_webhook(request: Request):
                         'cancelled_at': datetime.now(timezone.utc).isoformat()
                     }}
                 )
+                await bump_token_epoch(custom_id)
         
         else:
             logger.debug(f"Unhandled webhook event type: {event_type}")
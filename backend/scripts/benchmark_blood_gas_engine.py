@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Blood Gas Engine Benchmark - scalar rules vs vectorised batch
+=============================================================
+
+Times the original one-sample-at-a-time analysis
+(tests/blood_gas_reference.py) against services/blood_gas_engine.py, both
+per sample and as one batch, on random samples, and checks all three
+return identical analyses.
+
+Usage:
+    python scripts/benchmark_blood_gas_engine.py [--samples N] [--repeat N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.blood_gas_engine import analyze, analyze_batch  # noqa: E402
+from tests.blood_gas_reference import analyze_blood_gas_reference  # noqa: E402
+
+VALUE_RANGES = {
+    "pH": (6.8, 7.8), "pCO2": (15, 90), "HCO3": (5, 45), "Na": (115, 160),
+    "K": (2.0, 7.5), "Cl": (80, 125), "lactate": (0.3, 12), "Hb": (4, 22),
+}
+
+
+def random_samples(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {name: (round(rng.uniform(low, high), 2) if rng.random() > 0.05 else None)
+         for name, (low, high) in VALUE_RANGES.items()}
+        for _ in range(count)
+    ]
+
+
+def time_per_sample(run, samples, repeat):
+    """Median over repeats of the mean microseconds per sample."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(samples)
+        runs.append(1e6 * (time.perf_counter() - start) / len(samples))
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    samples = random_samples(args.samples)
+    reference = [analyze_blood_gas_reference(s) for s in samples]
+    mismatches = sum(1 for r, b in zip(reference, analyze_batch(samples)) if r != b)
+    print(f"{len(samples)} samples, {mismatches} mismatches\n")
+
+    scalar = time_per_sample(lambda batch: [analyze_blood_gas_reference(s) for s in batch], samples, args.repeat)
+    single = time_per_sample(lambda batch: [analyze(s) for s in batch], samples, args.repeat)
+    batched = time_per_sample(analyze_batch, samples, args.repeat)
+    print(f"{'engine':<16} {'us/sample':>10}")
+    print(f"{'scalar rules':<16} {scalar:>10.1f}")
+    print(f"{'engine, single':<16} {single:>10.1f}")
+    print(f"{'engine, batch':<16} {batched:>10.1f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
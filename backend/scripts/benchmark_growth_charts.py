@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Growth Chart Benchmark - full redraw vs cached static layers
+============================================================
+
+Times POST /api/growth/chart rendering (services/growth_charts.py) per
+chart: drawing everything on every request (axes, grid, percentile curves,
+measurements) against copying the cached static layer and drawing only the
+measurements, for PNG and PDF and one or two charts.
+
+Usage:
+    python scripts/benchmark_growth_charts.py [--points N] [--repeat N]
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from PIL import ImageDraw  # noqa: E402
+
+from services import growth_charts  # noqa: E402
+from services.growth_charts import _draw_overlay, _draw_static, render_growth_charts, static_layer  # noqa: E402
+
+
+def measurements(count):
+    ages = [24 + i * (216 / max(1, count - 1)) for i in range(count)]
+    return [{"age_months": age, "stature": 82 + age * 0.45, "weight": 11 + age * 0.2} for age in ages]
+
+
+def render_uncached(sex, charts, points, image_format):
+    """Everything drawn per request (what the browser does today)."""
+    pages = []
+    for chart in charts:
+        image = _draw_static(chart, sex)
+        _draw_overlay(ImageDraw.Draw(image), chart, sex, points)
+        pages.append(image)
+    buffer = io.BytesIO()
+    if image_format == "pdf":
+        pages[0].save(buffer, format="PDF", resolution=growth_charts.PDF_RESOLUTION, save_all=True,
+                      append_images=pages[1:])
+    else:
+        for page in pages:
+            page.save(buffer, format="PNG", compress_level=growth_charts.PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+def time_ms(run, repeat):
+    """Median milliseconds over repeats."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        runs.append(1000 * (time.perf_counter() - start))
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=12, help="Measurements per chart")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    points = measurements(args.points)
+
+    start = time.perf_counter()
+    static_layer(("stature",), "male")
+    print(f"static layer, first render: {1000 * (time.perf_counter() - start):.0f} ms\n")
+
+    print(f"{'charts':<16} {'format':<7} {'uncached ms/chart':>18} {'cached ms/chart':>16} {'bytes':>9}")
+    for charts in (["stature"], ["stature", "weight"]):
+        for image_format in ("png", "pdf"):
+            render_growth_charts("male", charts, points, image_format)  # warm this layer combination
+            uncached = time_ms(lambda: render_uncached("male", charts, points, image_format), args.repeat)
+            cached = time_ms(lambda: render_growth_charts("male", charts, points, image_format), args.repeat)
+            size = len(render_growth_charts("male", charts, points, image_format))
+            print(f"{'+'.join(charts):<16} {image_format:<7} {uncached / len(charts):>18.1f} "
+                  f"{cached / len(charts):>16.1f} {size:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Metric Extraction Benchmark - original vs compiled rule table
+=============================================================
+
+Times extract_metrics_improved (compiled METRIC_RULES with anchor
+prefilter) against the original pattern-by-pattern extractor
+(tests/ocr_metrics_reference.py) on the recorded OCR corpus, and checks
+both return identical metrics.
+
+Usage:
+    python scripts/benchmark_metric_extraction.py [corpus_dir] [--repeat N]
+
+Default corpus_dir: tests/fixtures/ocr_corpus
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.ocr_service import extract_metrics_improved  # noqa: E402
+from tests.ocr_metrics_reference import extract_metrics_reference  # noqa: E402
+
+
+def time_per_text(extract, texts, repeat):
+    """Median over repeats of the mean microseconds per text."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            extract(text)
+        runs.append(1e6 * (time.perf_counter() - start) / len(texts))
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", nargs="?", default=BACKEND_DIR / "tests" / "fixtures" / "ocr_corpus")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    texts = [p.read_text() for p in sorted(Path(args.corpus_dir).glob("*.txt"))]
+    if not texts:
+        print(f"No .txt samples in {args.corpus_dir}")
+        return 1
+
+    mismatches = sum(1 for t in texts if extract_metrics_improved(t) != extract_metrics_reference(t))
+    print(f"{len(texts)} texts, {mismatches} mismatches\n")
+
+    original = time_per_text(extract_metrics_reference, texts, args.repeat)
+    compiled = time_per_text(extract_metrics_improved, texts, args.repeat)
+    print(f"{'extractor':<10} {'us/text':>9}")
+    print(f"{'original':<10} {original:>9.1f}")
+    print(f"{'compiled':<10} {compiled:>9.1f}")
+    print(f"\nspeedup: {original / compiled:.2f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
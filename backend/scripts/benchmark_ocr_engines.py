@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+OCR Engine Benchmark - pytesseract vs tesserocr
+===============================================
+
+Measures per-pass Tesseract latency for both OCR_ENGINE backends on the
+same preprocessed images (the clahe/simple/denoised variants used by
+perform_ocr):
+- pytesseract: forks the tesseract CLI, writes a temp image per call
+- tesserocr: warm in-process handle, numpy buffer passed directly
+
+Backends that are not installed are reported and skipped.
+
+Usage:
+    python scripts/benchmark_ocr_engines.py [image_dir] [--repeat N]
+
+Without image_dir a synthetic ABL800-style printout is rendered.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytesseract
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.ocr_service import (  # noqa: E402
+    OCR_VARIANTS,
+    OCR_TESSDATA_PATH,
+    TesseractHandlePool,
+    tesserocr,
+    tesserocr_image_to_data,
+)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff'}
+
+SYNTHETIC_LINES = [
+    "pH          7.312", "pCO2        38.4  mmHg", "pO2         96    mmHg",
+    "ctHb        12.1  g/dL", "cK+         4.2   mmol/L", "cNa+        137   mmol/L",
+    "cCl-        103   mmol/L", "cLac        1.4   mmol/L", "cBase(Ecf)  -2.6  mmol/L",
+    "cHCO3(P,st) 22.8  mmol/L",
+]
+
+
+def synthetic_image() -> np.ndarray:
+    """Render a clean printout-like BGR image."""
+    img = np.full((60 + 45 * len(SYNTHETIC_LINES), 900, 3), 255, np.uint8)
+    for i, line in enumerate(SYNTHETIC_LINES):
+        cv2.putText(img, line, (30, 60 + 45 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+    return img
+
+
+def load_images(image_dir):
+    if image_dir is None:
+        return [("synthetic", synthetic_image())]
+    images = []
+    for path in sorted(Path(image_dir).iterdir()):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if img is not None:
+                images.append((path.name, img))
+    return images
+
+
+def build_backends():
+    backends = {}
+    try:
+        pytesseract.get_tesseract_version()
+        backends["pytesseract"] = lambda img: pytesseract.image_to_data(
+            img, lang="eng", config="--psm 4 --oem 3", output_type=pytesseract.Output.DICT
+        )
+    except Exception as e:
+        print(f"pytesseract: unavailable ({e})")
+
+    if tesserocr is None:
+        print("tesserocr: unavailable (not installed)")
+    else:
+        try:
+            pool = TesseractHandlePool(1, OCR_TESSDATA_PATH)
+            start = time.perf_counter()
+            pool.warm("eng")
+            print(f"tesserocr: handle warm-up {1000 * (time.perf_counter() - start):.0f} ms (once per worker)")
+            backends["tesserocr"] = lambda img: tesserocr_image_to_data(img, pool=pool)
+        except Exception as e:
+            print(f"tesserocr: unavailable ({e})")
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image_dir", nargs="?", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    images = load_images(args.image_dir)
+    passes = [(f"{name}/{variant}", preprocess(img)) for name, img in images for variant, preprocess in OCR_VARIANTS]
+    backends = build_backends()
+    if not backends:
+        print("No OCR backend available")
+        return 1
+
+    print(f"\n{len(passes)} passes x {args.repeat} repeats\n")
+    print(f"{'backend':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, run in backends.items():
+        run(passes[0][1])  # exclude first-call effects
+        timings = []
+        for _ in range(args.repeat):
+            for _, processed in passes:
+                start = time.perf_counter()
+                run(processed)
+                timings.append(1000 * (time.perf_counter() - start))
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+        print(f"{name:<12} {statistics.mean(timings):>9.1f} {statistics.median(timings):>9.1f} {p95:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Variant Selector Evaluation - passes saved vs metrics lost
+==========================================================
+
+Replays a directory of sample images through the learned variant selector
+(services/ocr_variant_selector.py) and compares it with running every
+preprocessing variant:
+
+1. Every variant in OCR_VARIANTS is run once per image (decode and
+   normalisation as in perform_ocr_bytes_sync)
+2. Images are replayed in order (--rounds times) as if they were traffic:
+   the selector picks a variant to run alone first from the wins recorded
+   so far, falls back to all variants when that pass is not good enough,
+   and then records the winner
+3. Reports Tesseract passes saved and metrics lost against the best pass
+   over all variants
+
+Usage:
+    python scripts/evaluate_variant_selector.py image_dir [--rounds N]
+        [--min-samples N] [--min-share F]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.ocr_service import (  # noqa: E402
+    OCR_VARIANTS,
+    decode_image_bytes,
+    is_good_enough,
+    normalize_image,
+    run_ocr_pass,
+)
+from services.ocr_variant_selector import (  # noqa: E402
+    OCR_SELECTOR_MIN_SAMPLES,
+    OCR_SELECTOR_MIN_SHARE,
+    choose_first,
+    feature_key,
+    image_features,
+)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff'}
+
+
+def run_all_variants(image_path: Path):
+    """(feature key, {variant: OCRPass}) for one image."""
+    img = normalize_image(decode_image_bytes(image_path.read_bytes(), grayscale=True))
+    passes = {
+        name: run_ocr_pass(name, priority, preprocess, img)
+        for priority, (name, preprocess) in enumerate(OCR_VARIANTS)
+    }
+    return feature_key(image_features(img)), passes
+
+
+def best_of(passes):
+    best = None
+    for ocr_pass in passes:
+        if ocr_pass.beats(best):
+            best = ocr_pass
+    return best
+
+
+def metrics_lost(chosen, reference) -> int:
+    """Metrics of the reference pass missing or different in the chosen one."""
+    return sum(1 for k, v in reference.metrics.items() if chosen.metrics.get(k) != v)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("image_dir")
+    parser.add_argument("--rounds", type=int, default=3, help="times the images are replayed")
+    parser.add_argument("--min-samples", type=int, default=OCR_SELECTOR_MIN_SAMPLES)
+    parser.add_argument("--min-share", type=float, default=OCR_SELECTOR_MIN_SHARE)
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.image_dir).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if not paths:
+        print(f"No images in {args.image_dir}")
+        return 1
+
+    print(f"Running {len(OCR_VARIANTS)} variants on {len(paths)} images...")
+    samples = []
+    for path in paths:
+        key, passes = run_all_variants(path)
+        full = best_of(passes.values())
+        samples.append((path.name, key, passes, full))
+        print(f"  {path.name:<30} bucket={key} winner={full.name} metrics={len(full.metrics)}")
+
+    stats = {}
+    requests = passes_full = passes_selector = selected = fallbacks = lost = images_with_loss = 0
+    for _ in range(args.rounds):
+        for name, key, passes, full in samples:
+            requests += 1
+            passes_full += len(passes)
+            first = choose_first(stats, key, args.min_samples, args.min_share, explore_rate=0.0)
+            if first is not None and is_good_enough(passes[first]):
+                selected += 1
+                passes_selector += 1
+                winner = passes[first]
+            else:
+                fallbacks += first is not None
+                passes_selector += len(passes)
+                winner = full
+            missing = metrics_lost(winner, full)
+            lost += missing
+            images_with_loss += missing > 0
+            # Only a comparison of every variant is a win (see plan_passes)
+            if first is None:
+                stats.setdefault(key, {})
+                stats[key][winner.name] = stats[key].get(winner.name, 0) + 1
+
+    saved = passes_full - passes_selector
+    print(f"\nrequests:             {requests} ({args.rounds} rounds)")
+    print(f"selected variant only: {selected}  (fell back to all variants: {fallbacks})")
+    print(f"passes (all variants): {passes_full}")
+    print(f"passes (selector):     {passes_selector}")
+    print(f"passes saved:          {saved} ({100.0 * saved / passes_full:.1f}%)")
+    print(f"metrics lost:          {lost} in {images_with_loss} requests")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+OCR Regression Corpus Recorder
+==============================
+
+Records raw Tesseract output for a directory of blood gas images so the
+OCR text reconstruction can be regression-tested without the binary.
+
+For every image it writes, next to each other in the output directory:
+- <name>.tsv: pytesseract.image_to_data output (TSV, as parsed by run_tesseract)
+- <name>.txt: pytesseract.image_to_string output on the same image/config
+
+tests/test_ocr_engine.py asserts that reconstruct_text_from_data(<name>.tsv)
+equals <name>.txt and yields identical key_metrics. No images are stored.
+
+Usage:
+    python scripts/record_ocr_corpus.py <image_dir> [output_dir]
+
+Default output_dir: tests/fixtures/ocr_corpus
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import pytesseract
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.ocr_service import preprocess_simple  # noqa: E402
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff'}
+CONFIG = '--psm 4 --oem 3'
+
+
+def record(image_dir: Path, output_dir: Path) -> int:
+    """Record TSV + text output for every image; returns number recorded."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for image_path in sorted(image_dir.iterdir()):
+        if image_path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        img = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if img is None:
+            print(f"skip (unreadable): {image_path.name}")
+            continue
+        processed = preprocess_simple(img)
+        tsv = pytesseract.image_to_data(processed, lang='eng', config=CONFIG)
+        text = pytesseract.image_to_string(processed, lang='eng', config=CONFIG)
+        (output_dir / f"{image_path.stem}.tsv").write_text(tsv)
+        (output_dir / f"{image_path.stem}.txt").write_text(text)
+        print(f"recorded: {image_path.name}")
+        count += 1
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    out = Path(sys.argv[2]) if len(sys.argv) > 2 else BACKEND_DIR / 'tests' / 'fixtures' / 'ocr_corpus'
+    n = record(Path(sys.argv[1]), out)
+    print(f"Recorded {n} images into {out}")
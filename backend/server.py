@@ -1,16 +1,20 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Request
-from fastapi.responses import Response
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartException, MultiPartParser
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import List, Literal, Optional
 import uuid
 from datetime import datetime, timezone
+import asyncio
 import base64
+import json
 from contextlib import asynccontextmanager
 
 # Import security middleware
@@ -22,8 +26,11 @@ from middleware.security import (
 )
 from middleware.validation import (
     InputValidationMiddleware,
-    RequestLoggingMiddleware
+    RequestLoggingMiddleware,
+    is_binary_content_type,
+    MAX_BODY_SIZE
 )
+from middleware.admission import OCRAdmissionMiddleware, init_ocr_admission
 
 # =============================================================================
 # PRODUCTION ENVIRONMENT VALIDATION
@@ -115,14 +122,54 @@ def validate_production_environment():
 # Import optimized Tesseract OCR service (100% local, medical-grade preprocessing)
 from services.ocr_service import (
     perform_ocr as perform_paddle_ocr,
+    perform_ocr_bytes,
+    perform_ocr_batch,
+    merge_key_metrics,
+    init_ocr_worker,
     parse_blood_gas_from_ocr_text,
     check_ocr_quality,
     OCRResult,
     LOW_CONFIDENCE_THRESHOLD
 )
+from services.ocr_executor import (
+    init_ocr_executor,
+    get_ocr_executor,
+    OCRQueueFullError,
+    OCRJobTimeoutError
+)
+from services.ocr_cache import init_ocr_cache
+from services.ocr_jobs import init_ocr_job_store, get_ocr_job_store
+from services.ocr_variant_selector import init_variant_selector
+from services import blood_gas_engine
+from services.blood_gas_rules import init_blood_gas_rules, get_blood_gas_rules
+from services.blood_gas_trends import (
+    init_blood_gas_trend_store,
+    get_blood_gas_trend_store,
+    is_valid_label,
+    TrendOrderError,
+    TrendConflictError
+)
+from services.growth_percentiles import (
+    get_growth_reference,
+    assess as assess_growth,
+    MEASURES as GROWTH_MEASURES,
+    SEXES as GROWTH_SEXES,
+    GROWTH_BATCH_MAX
+)
+from services.growth_charts import (
+    render_growth_charts,
+    warm_static_layers as warm_growth_chart_layers,
+    chart_filename as growth_chart_filename,
+    MEDIA_TYPES as GROWTH_CHART_MEDIA_TYPES,
+    GROWTH_CHART_MAX_POINTS
+)
 
 # Import scheduler service
 from services.scheduler_service import init_scheduler, get_scheduler
+from services.subscription_service import SubscriptionService
+from services.user_cache import init_user_cache
+from services.token_epochs import init_token_epoch_store
+from services.revoked_tokens import ensure_revoked_token_indexes, init_revoked_token_filter
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -143,8 +190,8 @@ async def lifespan(app: FastAPI):
     Lifespan context manager to handle startup and shutdown events.
     - Validates production configuration
     - Creates database indexes
-    - Starts the scheduler on startup
-    - Stops the scheduler on shutdown
+    - Starts the OCR worker pool and the scheduler on startup
+    - Stops both on shutdown
     """
     # Startup
     logger.info("Starting application...")
@@ -152,17 +199,57 @@ async def lifespan(app: FastAPI):
     # Validate environment configuration (will raise in production if invalid)
     validate_production_environment()
     
-    # Create TTL index for revoked_tokens collection (auto-cleanup after 30 days)
-    try:
-        await db.revoked_tokens.create_index(
-            "expires_at",
-            expireAfterSeconds=0,  # MongoDB uses the date in expires_at field
-            name="revoked_tokens_ttl"
-        )
-        logger.info("Created TTL index for revoked_tokens collection")
-    except Exception as e:
-        # Index might already exist
-        logger.debug(f"TTL index creation: {e}")
+    # revoked_tokens: TTL index (auto-cleanup after 30 days) and unique jti index
+    await ensure_revoked_token_indexes(db.revoked_tokens)
+    
+    # Revoked refresh token JTIs as an in-process Bloom filter (refresh skips Mongo for unrevoked tokens)
+    revoked_token_filter = init_revoked_token_filter(db)
+    if revoked_token_filter:
+        await revoked_token_filter.load()
+    
+    # Resolved users for require_auth / require_subscription, cached briefly per token
+    init_user_cache()
+    
+    # Per-user epochs that retire the subscription claims carried by access tokens
+    token_epoch_store = init_token_epoch_store(db)
+    if token_epoch_store:
+        await token_epoch_store.ensure_indexes()
+        await token_epoch_store.load()
+    
+    # OCR runs in a dedicated process pool so uploads never block the event loop
+    ocr_executor = init_ocr_executor(initializer=init_ocr_worker)
+    ocr_executor.start()
+    init_ocr_admission(ocr_executor)
+    
+    # Identical re-uploads are answered from the OCR result cache
+    ocr_cache = init_ocr_cache(db)
+    if ocr_cache:
+        await ocr_cache.ensure_indexes()
+    
+    # Learned preprocessing variant order (win counts accumulated in Mongo)
+    variant_selector = init_variant_selector(db)
+    if variant_selector:
+        await variant_selector.load()
+    
+    # Blood gas rules table (content_metadata), recompiled when its version changes
+    blood_gas_rules = init_blood_gas_rules(db)
+    await blood_gas_rules.load()
+    
+    # CDC growth LMS tables, read once into NumPy arrays, and the cached chart layers
+    get_growth_reference()
+    await asyncio.to_thread(warm_growth_chart_layers)
+    
+    # Opt-in serial blood gas store (BLOOD_GAS_TRENDS_ENABLED)
+    blood_gas_trend_store = init_blood_gas_trend_store(db)
+    if blood_gas_trend_store:
+        await blood_gas_trend_store.ensure_indexes()
+    
+    # Background OCR jobs for clients that poll instead of holding the request open
+    ocr_job_store = init_ocr_job_store(db, ocr_executor)
+    await ocr_job_store.ensure_indexes()
+    
+    # Status + expiry date indexes for the scheduler's subscription expiry sweep
+    await SubscriptionService(db).ensure_indexes()
     
     scheduler = init_scheduler(db)
     scheduler.start()
@@ -172,6 +259,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    ocr_job_store = get_ocr_job_store()
+    if ocr_job_store:
+        ocr_job_store.cancel_all()
+    ocr_executor = get_ocr_executor()
+    if ocr_executor:
+        ocr_executor.stop()
     scheduler = get_scheduler()
     if scheduler:
         scheduler.stop()
@@ -201,6 +294,7 @@ class StatusCheckCreate(BaseModel):
 class BloodGasInput(BaseModel):
     image_base64: Optional[str] = None
     manual_values: Optional[dict] = None
+    debug: bool = False  # Include per-stage OCR timings in the response
 
 class BloodGasValues(BaseModel):
     pH: Optional[float] = None
@@ -213,10 +307,39 @@ class BloodGasValues(BaseModel):
     Cl: Optional[float] = None
     lactate: Optional[float] = None
     Hb: Optional[float] = None
+    age_days: Optional[float] = Field(None, ge=0)  # Selects age-specific reference ranges (e.g. neonates)
 
 class BloodGasAnalysisRequest(BaseModel):
     values: BloodGasValues
 
+class BloodGasBatchRequest(BaseModel):
+    samples: List[BloodGasValues] = Field(..., min_length=1, max_length=blood_gas_engine.BLOOD_GAS_BATCH_MAX)
+
+class GrowthMeasurement(BaseModel):
+    sex: Literal["male", "female"]
+    age_months: float = Field(..., ge=24, le=240)  # CDC 2000 tables cover 2-20 years
+    weight: Optional[float] = Field(None, gt=0)  # kg
+    stature: Optional[float] = Field(None, gt=0)  # cm
+
+class GrowthPercentileRequest(BaseModel):
+    measurements: List[GrowthMeasurement] = Field(..., min_length=1, max_length=GROWTH_BATCH_MAX)
+
+class GrowthChartPoint(BaseModel):
+    age_months: float = Field(..., ge=24, le=240)
+    weight: Optional[float] = Field(None, gt=0)  # kg
+    stature: Optional[float] = Field(None, gt=0)  # cm
+
+class GrowthChartRequest(BaseModel):
+    sex: Literal["male", "female"]
+    charts: List[Literal["stature", "weight"]] = Field(default_factory=lambda: ["stature", "weight"], min_length=1,
+                                                       max_length=2)
+    format: Literal["png", "pdf"] = "png"
+    measurements: List[GrowthChartPoint] = Field(default_factory=list, max_length=GROWTH_CHART_MAX_POINTS)
+
+class BloodGasTrendReading(BaseModel):
+    values: BloodGasValues
+    taken_at: Optional[datetime] = None  # Sample time (default: now); readings must be in time order
+
 # Add routes
 @api_router.get("/")
 async def root():
@@ -269,11 +392,138 @@ async def get_status_checks():
 # See /app/backend/services/ocr_service.py for documentation
 # ============================================================================
 
+async def run_ocr_job(**kwargs) -> OCRResult:
+    """
+    Run OCR in the worker pool, mapping pool pressure to HTTP errors.
+    
+    Accepts either image_base64 (JSON endpoints) or image_bytes (upload
+    endpoints) plus the OCR options.
+    
+    Raises:
+        HTTPException 503: OCR queue is full (client should retry shortly)
+        HTTPException 504: OCR job exceeded OCR_JOB_TIMEOUT_SECONDS
+    """
+    try:
+        if "image_bytes" in kwargs:
+            return await perform_ocr_bytes(**kwargs)
+        return await perform_paddle_ocr(**kwargs)
+    except OCRQueueFullError as e:
+        logger.warning(f"OCR request rejected: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="OCR service is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except OCRJobTimeoutError as e:
+        logger.warning(f"OCR request timed out: {e}")
+        raise HTTPException(status_code=504, detail="OCR processing timed out. Please try a clearer or smaller photo.")
+
+
 class OCRRequest(BaseModel):
     """Request model for generic OCR endpoint"""
     image_base64: str
     language: str = "eng"  # Supports 'en', 'arabic', 'multilingual'
     return_bboxes: bool = False
+    debug: bool = False  # Include per-stage OCR timings in the response
+
+
+# Multipart field names accepted by the /upload endpoints
+UPLOAD_FIELD_NAMES = ("image", "file")
+
+
+class UploadTooLargeError(MultiPartException):
+    """
+    Upload body exceeded MAX_BODY_SIZE while streaming.
+    
+    A MultiPartException, so the multipart parser closes the files it has
+    spooled before re-raising it.
+    """
+
+
+async def stream_upload_body(request: Request):
+    """
+    The request body, chunk by chunk, cut off at MAX_BODY_SIZE.
+    
+    The middleware only checks Content-Length, which chunked uploads don't
+    send.
+    """
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BODY_SIZE:
+            raise UploadTooLargeError("Request body too large")
+        yield chunk
+
+
+async def read_upload_body(request: Request) -> bytes:
+    """
+    Read the whole body from the size-limited stream.
+    
+    Raises:
+        HTTPException 413: Body larger than MAX_BODY_SIZE
+    """
+    try:
+        return b"".join([chunk async for chunk in stream_upload_body(request)])
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="Request body too large")
+
+
+async def parse_upload_form(request: Request, max_files: int, max_fields: int) -> FormData:
+    """
+    Parse a multipart upload from the size-limited body stream.
+    
+    request.form() would spool the whole body first. The caller closes the
+    returned form.
+    
+    Raises:
+        HTTPException 400: Malformed form, or too many files / fields
+        HTTPException 413: Upload larger than MAX_BODY_SIZE
+    """
+    parser = MultiPartParser(request.headers, stream_upload_body(request), max_files=max_files,
+                             max_fields=max_fields)
+    try:
+        return await parser.parse()
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="Request body too large")
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+
+async def read_image_upload(request: Request) -> bytes:
+    """
+    Read a binary image upload without base64 or JSON parsing.
+    
+    Accepts either a raw body (Content-Type: image/* or
+    application/octet-stream), streamed chunk by chunk, or a multipart form
+    with an "image" (or "file") field.
+    
+    Raises:
+        HTTPException 400: No image in the request
+        HTTPException 413: Upload larger than MAX_BODY_SIZE
+        HTTPException 415: Unsupported Content-Type
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if is_binary_content_type(content_type):
+        image_bytes = await read_upload_body(request)
+    elif "multipart/form-data" in content_type:
+        form = await parse_upload_form(request, max_files=1, max_fields=10)
+        try:
+            upload = next((form[name] for name in UPLOAD_FIELD_NAMES if name in form), None)
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=400, detail="Image is required")
+            image_bytes = await upload.read()
+        finally:
+            await form.close()
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload the image as multipart/form-data or a raw image/* body"
+        )
+    
+    if not image_bytes:
+        raise HTTPException(status_code=400, detail="Image is required")
+    return image_bytes
 
 
 @api_router.post("/ocr")
@@ -293,17 +543,114 @@ async def perform_ocr_endpoint(request: OCRRequest):
     if not request.image_base64:
         raise HTTPException(status_code=400, detail="Image is required")
     
-    result = await perform_paddle_ocr(
+    result = await run_ocr_job(
         image_base64=request.image_base64,
         language=request.language,
         return_bboxes=request.return_bboxes
     )
+    return build_ocr_response(result, request.debug)
+
+
+@api_router.post("/ocr/upload")
+async def perform_ocr_upload_endpoint(request: Request, language: str = "eng", return_bboxes: bool = False,
+                                      debug: bool = False):
+    """
+    Binary variant of /api/ocr - same response, no base64/JSON body.
+    
+    Send the image as multipart/form-data (field "image") or as a raw
+    image/* body. Options are query parameters.
+    """
+    image_bytes = await read_image_upload(request)
+    result = await run_ocr_job(image_bytes=image_bytes, language=language, return_bboxes=return_bboxes)
+    return build_ocr_response(result, debug)
+
+
+# Max images accepted by /api/ocr/batch in one request
+OCR_BATCH_MAX_IMAGES = int(os.environ.get('OCR_BATCH_MAX_IMAGES', 10))
+
+
+@api_router.post("/ocr/batch")
+async def perform_ocr_batch_endpoint(request: Request, language: str = "eng", same_report: bool = False,
+                                     debug: bool = False):
+    """
+    Batch OCR for multi-page printouts and serial gases.
+    
+    Send a multipart form with one "images" field per image. Images are
+    spread across the OCR worker pool and results are streamed back as
+    NDJSON, one line per image in completion order:
+    
+        {"type": "result", "index": 0, "filename": "p1.jpg", ...same as /api/ocr...}
+        {"type": "error", "index": 1, "filename": "p2.jpg", "status_code": 503, "detail": "..."}
+    
+    The last line is a summary. With same_report=true (pages of one
+    report) it includes merged_key_metrics: each metric from the most
+    confident page that has it.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "multipart/form-data" not in content_type:
+        raise HTTPException(status_code=415, detail="Upload the images as multipart/form-data")
+    
+    form = await parse_upload_form(request, max_files=OCR_BATCH_MAX_IMAGES, max_fields=OCR_BATCH_MAX_IMAGES + 10)
+    try:
+        uploads = [u for u in form.getlist("images") + form.getlist("image") if not isinstance(u, str)]
+        if not uploads:
+            raise HTTPException(status_code=400, detail="At least one image is required")
+        if len(uploads) > OCR_BATCH_MAX_IMAGES:
+            raise HTTPException(status_code=400, detail=f"At most {OCR_BATCH_MAX_IMAGES} images per batch")
+        
+        filenames = [u.filename for u in uploads]
+        images = [await u.read() for u in uploads]
+    finally:
+        await form.close()
+    
+    async def stream():
+        results: List[Optional[OCRResult]] = [None] * len(images)
+        async for index, outcome in perform_ocr_batch(images, language=language):
+            line = {"type": "result", "index": index, "filename": filenames[index]}
+            if isinstance(outcome, OCRQueueFullError):
+                line.update(type="error", status_code=503, detail="OCR service is busy. Please try again shortly.",
+                            retry_after=outcome.retry_after)
+            elif isinstance(outcome, OCRJobTimeoutError):
+                line.update(type="error", status_code=504, detail="OCR processing timed out for this image.")
+            elif isinstance(outcome, Exception):
+                logger.error(f"Batch OCR error: {outcome}")
+                line.update(type="error", status_code=500, detail="OCR processing failed for this image.")
+            else:
+                results[index] = outcome
+                line.update(build_ocr_response(outcome, debug))
+            yield json.dumps(line) + "\n"
+        
+        summary = {
+            "type": "summary",
+            "images": len(images),
+            "succeeded": sum(1 for r in results if r is not None and r.success)
+        }
+        if same_report:
+            summary["merged_key_metrics"] = merge_key_metrics(results)
+        yield json.dumps(summary) + "\n"
     
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def add_ocr_debug(response: dict, result: OCRResult, debug: bool) -> dict:
+    """Attach per-stage OCR timings (ms), the winning variant and analyzer profile when debug is requested."""
+    if debug:
+        response["debug"] = {
+            "timings_ms": result.timings,
+            "variant": result.variant,
+            "image_features": result.image_features,
+            "analyzer_profile": result.analyzer_profile
+        }
+    return response
+
+
+def build_ocr_response(result: OCRResult, debug: bool = False) -> dict:
+    """Response body shared by /api/ocr and /api/ocr/upload."""
     # Check quality
     quality = check_ocr_quality(result)
     
     if not result.success:
-        return {
+        return add_ocr_debug({
             "success": False,
             "ocr_text": "",
             "ocr_blocks": [],
@@ -312,7 +659,7 @@ async def perform_ocr_endpoint(request: OCRRequest):
             "error_message": result.error_message,
             "quality": quality,
             "engine": "tesseract_medical"
-        }
+        }, result, debug)
     
     # Add low confidence warning
     response = {
@@ -330,7 +677,7 @@ async def perform_ocr_endpoint(request: OCRRequest):
     if result.avg_confidence < LOW_CONFIDENCE_THRESHOLD:
         response["low_confidence_warning"] = f"OCR confidence is low ({result.avg_confidence:.0%}). Consider taking a clearer photo."
     
-    return response
+    return add_ocr_debug(response, result, debug)
 
 
 @api_router.post("/blood-gas/analyze-image-offline")
@@ -349,10 +696,33 @@ async def analyze_blood_gas_image_offline(request: BloodGasInput):
     if not request.image_base64:
         raise HTTPException(status_code=400, detail="Image is required")
     
+    return await analyze_blood_gas_image_offline_ocr(request.debug, image_base64=request.image_base64)
+
+
+@api_router.post("/blood-gas/analyze-image-offline/upload")
+async def analyze_blood_gas_image_offline_upload(request: Request, debug: bool = False):
+    """
+    Binary variant of /api/blood-gas/analyze-image-offline.
+    
+    Send the image as multipart/form-data (field "image") or as a raw
+    image/* body.
+    """
+    image_bytes = await read_image_upload(request)
+    return await analyze_blood_gas_image_offline_ocr(debug, image_bytes=image_bytes)
+
+
+async def analyze_blood_gas_image_offline_ocr(debug: bool = False, **image) -> dict:
+    """
+    Local OCR + metric extraction for the offline blood gas endpoints.
+    
+    Args:
+        debug: Include per-stage OCR timings in the response
+        image: image_base64=... or image_bytes=...
+    """
     try:
         # Perform OCR using 100% local medical-grade Tesseract
-        ocr_result = await perform_paddle_ocr(
-            image_base64=request.image_base64,
+        ocr_result = await run_ocr_job(
+            **image,
             language="eng",
             return_bboxes=False
         )
@@ -360,14 +730,14 @@ async def analyze_blood_gas_image_offline(request: BloodGasInput):
         quality = check_ocr_quality(ocr_result)
         
         if not ocr_result.success:
-            return {
+            return add_ocr_debug({
                 "success": False,
                 "values": {},
                 "raw_text": "",
                 "error_message": ocr_result.error_message,
                 "quality": quality,
                 "engine": "tesseract_medical"
-            }
+            }, ocr_result, debug)
         
         # Use pre-extracted key_metrics if available, else parse from text
         extracted_values = getattr(ocr_result, 'key_metrics', None) or parse_blood_gas_from_ocr_text(ocr_result.ocr_text)
@@ -387,8 +757,10 @@ async def analyze_blood_gas_image_offline(request: BloodGasInput):
         if ocr_result.avg_confidence < LOW_CONFIDENCE_THRESHOLD:
             response["low_confidence_warning"] = f"OCR confidence: {ocr_result.avg_confidence:.0%}. Consider taking a clearer photo."
         
-        return response
+        return add_ocr_debug(response, ocr_result, debug)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Medical OCR error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"OCR processing failed: {str(e)}")
@@ -417,13 +789,36 @@ async def analyze_blood_gas_image(request: BloodGasInput):
     if not request.image_base64:
         raise HTTPException(status_code=400, detail="Image is required")
     
+    return await analyze_blood_gas_image_ocr(request.debug, image_base64=request.image_base64)
+
+
+@api_router.post("/blood-gas/analyze-image/upload")
+async def analyze_blood_gas_image_upload(request: Request, debug: bool = False):
+    """
+    Binary variant of /api/blood-gas/analyze-image (same LLM fallback rules).
+    
+    Send the image as multipart/form-data (field "image") or as a raw
+    image/* body.
+    """
+    image_bytes = await read_image_upload(request)
+    return await analyze_blood_gas_image_ocr(debug, image_bytes=image_bytes)
+
+
+async def analyze_blood_gas_image_ocr(debug: bool = False, **image) -> dict:
+    """
+    Local OCR + metric extraction with optional LLM text parsing.
+    
+    Args:
+        debug: Include per-stage OCR timings in the response
+        image: image_base64=... or image_bytes=...
+    """
     # Check if LLM fallback is allowed
     allow_remote_llm = os.getenv("ALLOW_REMOTE_LLM", "false").lower() == "true"
     
     try:
         # Step 1: Perform OCR using 100% local medical-grade Tesseract
-        ocr_result = await perform_paddle_ocr(
-            image_base64=request.image_base64,
+        ocr_result = await run_ocr_job(
+            **image,
             language="eng",
             return_bboxes=True
         )
@@ -431,13 +826,13 @@ async def analyze_blood_gas_image(request: BloodGasInput):
         quality = check_ocr_quality(ocr_result)
         
         if not ocr_result.success:
-            return {
+            return add_ocr_debug({
                 "success": False,
                 "values": {},
                 "error_message": ocr_result.error_message,
                 "quality": quality,
                 "engine": "tesseract_medical"
-            }
+            }, ocr_result, debug)
         
         # Step 2: Use pre-extracted key_metrics if available, else parse from text
         extracted_values = getattr(ocr_result, 'key_metrics', None) or parse_blood_gas_from_ocr_text(ocr_result.ocr_text)
@@ -456,7 +851,7 @@ async def analyze_blood_gas_image(request: BloodGasInput):
             }
             if ocr_result.avg_confidence < LOW_CONFIDENCE_THRESHOLD:
                 response["low_confidence_warning"] = f"OCR confidence: {ocr_result.avg_confidence:.0%}. Consider taking a clearer photo."
-            return response
+            return add_ocr_debug(response, ocr_result, debug)
         
         # Step 3: If basic parsing failed and LLM is allowed, try LLM-assisted TEXT parsing
         # PRIVACY: Only OCR text is sent to LLM, NEVER the original image
@@ -517,7 +912,7 @@ Do not include any text outside the JSON."""
                     }
                     if ocr_result.avg_confidence < LOW_CONFIDENCE_THRESHOLD:
                         result_response["low_confidence_warning"] = f"OCR confidence: {ocr_result.avg_confidence:.0%}. Consider taking a clearer photo."
-                    return result_response
+                    return add_ocr_debug(result_response, ocr_result, debug)
             except Exception as llm_error:
                 logging.warning(f"LLM parsing fallback failed: {llm_error}")
         
@@ -533,175 +928,172 @@ Do not include any text outside the JSON."""
         }
         if ocr_result.avg_confidence < LOW_CONFIDENCE_THRESHOLD:
             response["low_confidence_warning"] = f"OCR confidence: {ocr_result.avg_confidence:.0%}. Consider taking a clearer photo."
-        return response
-            
+        return add_ocr_debug(response, ocr_result, debug)
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error analyzing image: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Job kinds accepted by /api/ocr/jobs -> synchronous endpoint they mirror
+OCR_JOB_KINDS = ("ocr", "blood_gas", "blood_gas_offline")
+
+
+@api_router.post("/ocr/jobs", status_code=202)
+async def submit_ocr_job(request: Request, kind: str = "blood_gas", language: str = "eng",
+                         return_bboxes: bool = False, debug: bool = False):
+    """
+    Submit an OCR job and return its id immediately (202).
+    
+    For clients on unreliable networks: the OCR runs in the worker pool in
+    the background and the result is fetched from GET /api/ocr/jobs/{job_id}.
+    Accepted jobs wait for a free worker pool slot instead of failing when
+    the pool is busy; only a full job store answers 503.
+    
+    Jobs are found from any API process through the ocr_jobs collection;
+    with OCR_JOBS_MONGO=false they only live in the accepting process
+    (single uvicorn worker or sticky sessions).
+    
+    kind selects the synchronous endpoint whose response becomes the result:
+    - ocr: /api/ocr (language and return_bboxes apply)
+    - blood_gas: /api/blood-gas/analyze-image
+    - blood_gas_offline: /api/blood-gas/analyze-image-offline
+    
+    The image is sent like the /upload endpoints (multipart field "image" or
+    a raw image/* body) or as JSON {"image_base64": "..."}.
+    """
+    if kind not in OCR_JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(OCR_JOB_KINDS)}")
+    
+    if request.headers.get("content-type", "").startswith("application/json"):
+        # Read through the size limit; request.json() buffers chunked bodies
+        # of any size
+        try:
+            body = json.loads(await read_upload_body(request))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        image_base64 = body.get("image_base64") if isinstance(body, dict) else None
+        if not image_base64:
+            raise HTTPException(status_code=400, detail="Image is required")
+        image = {"image_base64": image_base64}
+    else:
+        image = {"image_bytes": await read_image_upload(request)}
+    
+    if kind == "ocr":
+        async def work():
+            result = await run_ocr_job(**image, language=language, return_bboxes=return_bboxes)
+            return build_ocr_response(result, debug)
+        coro = work()
+    elif kind == "blood_gas":
+        coro = analyze_blood_gas_image_ocr(debug, **image)
+    else:
+        coro = analyze_blood_gas_image_offline_ocr(debug, **image)
+    
+    try:
+        job = await get_ocr_job_store().submit(kind, coro)
+    except OCRQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="OCR service is busy. Please try again shortly.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    poll_url = f"/api/ocr/jobs/{job.job_id}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.job_id, "status": job.status, "poll_url": poll_url},
+        headers={"Location": poll_url}
+    )
+
+
+@api_router.get("/ocr/jobs/{job_id}")
+async def get_ocr_job(job_id: str, wait: float = 0):
+    """
+    Poll an OCR job.
+    
+    With wait=N the request blocks up to N seconds (capped at
+    OCR_JOB_MAX_WAIT_SECONDS) until the job finishes (long polling).
+    
+    Returns {"status": "pending"} while running, {"status": "done", "result":
+    ...same body as the synchronous endpoint...} or {"status": "failed",
+    "error": {"status_code", "detail"}}. Finished jobs expire after
+    OCR_JOB_RESULT_TTL_SECONDS (404).
+    """
+    job = await get_ocr_job_store().get(job_id, wait=wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="OCR job not found or expired")
+    return job
+
+
 @api_router.post("/blood-gas/analyze")
 async def analyze_blood_gas(request: BloodGasAnalysisRequest):
     """Analyze blood gas values and provide diagnosis"""
-    values = request.values.model_dump()
-    
-    analysis = {
-        "primary_disorder": None,
-        "compensation": None,
-        "is_compensated": False,
-        "expected_value": None,
-        "expected_label": None,
-        "lactic_acidosis": False,
-        "anion_gap": None,
-        "anion_gap_status": None,
-        "cl_na_ratio": None,
-        "electrolyte_imbalances": [],
-        "recommendations": [],
-        "hb_analysis": None
-    }
+    return blood_gas_engine.analyze(request.values.model_dump(), await get_blood_gas_rules())
+
+
+@api_router.post("/blood-gas/analyze/batch")
+async def analyze_blood_gas_batch(request: BloodGasBatchRequest):
+    """
+    Analyze many blood gas samples at once (e.g. a unit's serial gases).
     
-    pH = values.get("pH")
-    pCO2 = values.get("pCO2")
-    HCO3 = values.get("HCO3")
-    _BE = values.get("BE")  # Extracted but not used in current analysis
-    Na = values.get("Na")
-    K = values.get("K")
-    Cl = values.get("Cl")
-    lactate = values.get("lactate")
-    Hb = values.get("Hb")
-    
-    # Calculate Anion Gap if electrolytes available (without albumin correction)
-    if Na and Cl and HCO3:
-        anion_gap = Na - (Cl + HCO3)
-        analysis["anion_gap"] = round(anion_gap, 1)
-        
-        if anion_gap > 12:
-            analysis["anion_gap_status"] = "Elevated (High Anion Gap)"
-        elif anion_gap < 8:
-            analysis["anion_gap_status"] = "Low Anion Gap"
-        else:
-            analysis["anion_gap_status"] = "Normal"
-    
-    # Cl:Na ratio for metabolic acidosis
-    if Na and Cl:
-        cl_na_ratio = Cl / Na
-        analysis["cl_na_ratio"] = round(cl_na_ratio, 3)
-    
-    # Primary disorder analysis
-    if pH and pCO2 and HCO3:
-        # Determine primary disorder
-        if pH < 7.35:
-            # Acidemia
-            if pCO2 > 45:
-                analysis["primary_disorder"] = "Respiratory Acidosis"
-                # Check compensation - expected HCO3
-                expected_hco3 = 24 + ((pCO2 - 40) * 0.1)  # Acute
-                analysis["expected_label"] = "HCO3"
-                analysis["expected_value"] = f"{expected_hco3:.1f} mEq/L (Acute)"
-                if HCO3 > expected_hco3 + 2:
-                    analysis["compensation"] = "Metabolic compensation present"
-                    analysis["is_compensated"] = True
-            elif HCO3 < 22:
-                analysis["primary_disorder"] = "Metabolic Acidosis"
-                # Check compensation (Winter's formula) - expected pCO2
-                expected_pco2 = (1.5 * HCO3) + 8
-                analysis["expected_label"] = "pCO2"
-                analysis["expected_value"] = f"{expected_pco2:.1f} ± 2 mmHg (Winter's formula: 1.5 × HCO3 + 8)"
-                if abs(pCO2 - expected_pco2) <= 2:
-                    analysis["compensation"] = "Appropriate respiratory compensation"
-                    analysis["is_compensated"] = True
-                elif pCO2 < expected_pco2 - 2:
-                    analysis["compensation"] = "Additional respiratory alkalosis"
-                elif pCO2 > expected_pco2 + 2:
-                    analysis["compensation"] = "Additional respiratory acidosis"
-        elif pH > 7.45:
-            # Alkalemia
-            if pCO2 < 35:
-                analysis["primary_disorder"] = "Respiratory Alkalosis"
-                expected_hco3 = 24 - ((40 - pCO2) * 0.2)  # Acute
-                analysis["expected_label"] = "HCO3"
-                analysis["expected_value"] = f"{expected_hco3:.1f} mEq/L (Acute)"
-                if HCO3 < expected_hco3 - 2:
-                    analysis["compensation"] = "Metabolic compensation present"
-                    analysis["is_compensated"] = True
-            elif HCO3 > 26:
-                analysis["primary_disorder"] = "Metabolic Alkalosis"
-                expected_pco2 = 40 + (0.7 * (HCO3 - 24))
-                analysis["expected_label"] = "pCO2"
-                analysis["expected_value"] = f"{expected_pco2:.1f} mmHg (40 + 0.7 × (HCO3 - 24))"
-                if abs(pCO2 - expected_pco2) <= 2:
-                    analysis["compensation"] = "Appropriate respiratory compensation"
-                    analysis["is_compensated"] = True
-        else:
-            # Normal pH - check for mixed disorder
-            if (pCO2 > 45 and HCO3 > 26) or (pCO2 < 35 and HCO3 < 22):
-                analysis["primary_disorder"] = "Mixed Disorder (compensated or concurrent)"
-            else:
-                analysis["primary_disorder"] = "Normal acid-base status"
-    
-    # Lactic acidosis check
-    if lactate and lactate > 2:
-        analysis["lactic_acidosis"] = True
-        if lactate > 4:
-            analysis["recommendations"].append("Severe lactic acidosis - investigate cause (sepsis, hypoperfusion, etc.)")
-    
-    # Electrolyte imbalances
-    if Na:
-        if Na < 135:
-            analysis["electrolyte_imbalances"].append("Hyponatremia")
-        elif Na > 145:
-            analysis["electrolyte_imbalances"].append("Hypernatremia")
-    
-    if K:
-        if K < 3.5:
-            analysis["electrolyte_imbalances"].append("Hypokalemia")
-        elif K > 5.0:
-            analysis["electrolyte_imbalances"].append("Hyperkalemia")
-    
-    if Cl:
-        if Cl < 98:
-            analysis["electrolyte_imbalances"].append("Hypochloremia")
-        elif Cl > 106:
-            analysis["electrolyte_imbalances"].append("Hyperchloremia")
-    
-    # Hemoglobin analysis
-    if Hb:
-        if Hb < 7:
-            analysis["hb_analysis"] = {
-                "level": "Severe Anemia",
-                "color": "red",
-                "message": "Blood transfusion indicated",
-                "value": Hb
-            }
-        elif Hb < 10:
-            analysis["hb_analysis"] = {
-                "level": "Moderate Anemia", 
-                "color": "amber",
-                "message": "Consider transfusion based on symptoms",
-                "value": Hb
-            }
-        elif Hb < 12:
-            analysis["hb_analysis"] = {
-                "level": "Mild Anemia",
-                "color": "yellow", 
-                "message": "Monitor closely",
-                "value": Hb
-            }
-        elif Hb <= 17:
-            analysis["hb_analysis"] = {
-                "level": "Normal",
-                "color": "green",
-                "message": "Normal hemoglobin level",
-                "value": Hb
-            }
-        else:
-            analysis["hb_analysis"] = {
-                "level": "Elevated",
-                "color": "orange",
-                "message": "Elevated hemoglobin - investigate cause",
-                "value": Hb
-            }
+    Results are in request order, each with the same structure as
+    /api/blood-gas/analyze.
+    """
+    results = blood_gas_engine.analyze_batch([values.model_dump() for values in request.samples],
+                                             await get_blood_gas_rules())
+    return {"count": len(results), "results": results}
+
+@api_router.post("/growth/percentiles")
+async def growth_percentiles(request: GrowthPercentileRequest):
+    """
+    CDC weight-for-age and stature-for-age z-scores and percentiles.
+    
+    Takes one child's or a whole list's measurements; results are in
+    request order, each {"sex", "age_months", "weight", "stature"} with
+    {"value", "z", "percentile"} (or null when not measured).
+    """
+    results = assess_growth([m.model_dump() for m in request.measurements])
+    return {"count": len(results), "results": results}
+
+
+@api_router.get("/growth/curves/{measure}")
+async def growth_curves(measure: str, sex: str = "male"):
+    """Percentile curves (P3-P97) at every CDC table age, for drawing a growth chart"""
+    if measure not in GROWTH_MEASURES:
+        raise HTTPException(status_code=404, detail=f"Unknown measure (use one of: {', '.join(GROWTH_MEASURES)})")
+    if sex not in GROWTH_SEXES:
+        raise HTTPException(status_code=400, detail="sex must be 'male' or 'female'")
+    reference = get_growth_reference()
+    return {
+        "measure": measure,
+        "sex": sex,
+        "unit": GROWTH_MEASURES[measure][1],
+        "ages": reference.ages.tolist(),
+        "percentiles": {
+            name: [round(value, 3) for value in curve.tolist()]
+            for name, curve in reference.curves(measure, sex).items()
+        }
+    }
+
+@api_router.post("/growth/chart")
+async def growth_chart(request: GrowthChartRequest):
+    """
+    Render CDC growth charts with the child's measurements as PNG or PDF.
     
-    return analysis
+    PNG stacks the requested charts top to bottom, PDF puts each on its own
+    page. The percentile curves come from cached layers, so only the
+    measurements are drawn per request.
+    """
+    charts = list(dict.fromkeys(request.charts))
+    content = await asyncio.to_thread(render_growth_charts, request.sex, charts,
+                                      [m.model_dump() for m in request.measurements], request.format)
+    filename = growth_chart_filename(request.sex, charts, request.format)
+    return Response(
+        content=content,
+        media_type=GROWTH_CHART_MEDIA_TYPES[request.format],
+        headers={"Content-Disposition": f'inline; filename="{filename}"'}
+    )
 
 # Import authentication and subscription routes
 from routes.auth import router as auth_router
@@ -709,6 +1101,73 @@ from routes.subscription import router as subscription_router
 from routes.layouts import router as layouts_router
 from routes.admin import router as admin_router
 from routes.content import router as content_router
+from routes.auth import require_auth
+from models.user import UserResponse
+
+
+def require_trend_store(label: Optional[str] = None):
+    """The trend store, or 404 while trends are disabled; 400 on a bad label."""
+    store = get_blood_gas_trend_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Blood gas trend storage is not enabled")
+    if label is not None and not is_valid_label(label):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid label: use 1-40 letters, digits, spaces, '_', '.' or '-' (a bed or study code, not a name)"
+        )
+    return store
+
+
+@api_router.get("/blood-gas/trends")
+async def list_blood_gas_trends(user: UserResponse = Depends(require_auth)):
+    """List the current user's trend labels, most recently updated first"""
+    return {"series": await require_trend_store().list_series(user.id)}
+
+
+@api_router.post("/blood-gas/trends/{label}/readings", status_code=201)
+async def add_blood_gas_trend_reading(label: str, request: BloodGasTrendReading,
+                                      user: UserResponse = Depends(require_auth)):
+    """
+    Analyze a reading and add it to the label's series.
+    
+    Returns the analysis (same as /api/blood-gas/analyze) and the updated
+    trend: per-value deltas, rates, running and rolling statistics and the
+    compensation trajectory. The work per reading is constant however many
+    readings the series holds.
+    """
+    store = require_trend_store(label)
+    try:
+        return await store.add_reading(user.id, label, request.values.model_dump(), request.taken_at,
+                                       await get_blood_gas_rules())
+    except (TrendOrderError, TrendConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@api_router.get("/blood-gas/trends/{label}")
+async def get_blood_gas_trend(label: str, user: UserResponse = Depends(require_auth)):
+    """Current trend summary of a label"""
+    trend = await require_trend_store(label).get_trend(user.id, label)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="Trend not found")
+    return trend
+
+
+@api_router.get("/blood-gas/trends/{label}/readings")
+async def get_blood_gas_trend_readings(label: str, limit: int = 50, before: Optional[int] = None,
+                                       user: UserResponse = Depends(require_auth)):
+    """Stored readings of a label, newest first (page back with before=<reading>)"""
+    limit = max(1, min(limit, 200))
+    readings = await require_trend_store(label).get_readings(user.id, label, limit=limit, before=before)
+    return {"label": label, "readings": readings}
+
+
+@api_router.delete("/blood-gas/trends/{label}")
+async def delete_blood_gas_trend(label: str, user: UserResponse = Depends(require_auth)):
+    """Delete a label's trend and all its readings"""
+    if not await require_trend_store(label).delete_series(user.id, label):
+        raise HTTPException(status_code=404, detail="Trend not found")
+    return {"message": "Trend deleted successfully"}
+
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -826,6 +1285,7 @@ app.add_middleware(AdminRouteProtectionMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(RateLimitMiddleware)
 app.add_middleware(InputValidationMiddleware)  # Validate input data
+app.add_middleware(OCRAdmissionMiddleware)     # Shed OCR load before bodies are read
 app.add_middleware(RequestLoggingMiddleware)   # Audit logging
 app.add_middleware(ErrorHandlerMiddleware)
 
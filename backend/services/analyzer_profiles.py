@@ -0,0 +1,202 @@
+"""
+=============================================================================
+ANALYZER PROFILES - Layout-Aware OCR of Known Analyzer Printouts
+=============================================================================
+Generic extraction (METRIC_RULES in ocr_service) treats every photo as free
+text. Printouts of a known analyzer have a fixed layout, one result per
+line:
+
+    pCO2        33.8  mmHg  [ 35.0 - 48.0 ]
+    <label>     <value> <unit> <reference range>
+
+A profile describes that layout: header text to recognise it, the fields in
+print order with the label spellings Tesseract produces for them, and the
+Tesseract settings (page segmentation mode, character whitelist) that suit
+it. Once a profile is recognised:
+- Tesseract runs with the profile's psm and whitelist
+- Extraction is a lookup of each line's first token in the label table,
+  taking the value from the next token
+- Values are printed with a fixed number of decimals, so a decimal point
+  Tesseract dropped ("7300", "19") is put back ("7.300", "1.9")
+- A data line with an unreadable label between two recognised fields whose
+  print positions differ by two is taken to be the field in between
+- Metrics the lookup did not find still go through the generic rules
+
+ADDING A PROFILE: append an AnalyzerProfile to ANALYZER_PROFILES. Labels are
+written folded (see label_key): lowercase, "0" read as "o", only [a-z0-9].
+
+CONFIGURATION (environment variables):
+- OCR_ANALYZER_PROFILES: Detect profiles and use them (default: true)
+=============================================================================
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+OCR_ANALYZER_PROFILES = os.environ.get('OCR_ANALYZER_PROFILES', 'true').lower() == 'true'
+
+# Lines of OCR text searched for a profile's header
+PROFILE_DETECT_LINES = 5
+
+# Top part of the normalised image OCR'd to detect the profile before the
+# full passes (the header line plus some slack)
+HEADER_STRIP_FRACTION = 0.12
+HEADER_STRIP_MIN_HEIGHT = 60
+
+_LABEL_FOLD = str.maketrans({'0': 'o'})
+_NON_LABEL = re.compile(r'[^a-z0-9]')
+_VALUE = re.compile(r'^[\-\+"]?\d+(?:[\.\,]\d+)?')
+
+
+def label_key(token: str) -> str:
+    """Fold a label token the way profile labels are written."""
+    return _NON_LABEL.sub('', token.lower().translate(_LABEL_FOLD))
+
+
+@dataclass(frozen=True)
+class ProfileField:
+    """One printed result line."""
+    metric: str  # key_metrics name (see METRIC_RULES)
+    labels: Tuple[str, ...]  # Folded label spellings, including OCR misreads
+    unit: str = ""
+    decimals: int = 0  # Digits printed after the decimal point
+
+
+@dataclass(frozen=True)
+class AnalyzerProfile:
+    """Printout layout and Tesseract settings of one analyzer model."""
+    name: str
+    detect: re.Pattern  # Searched in the first PROFILE_DETECT_LINES lines
+    fields: Tuple[ProfileField, ...]  # In print order
+    psm: int = 4
+    header_words: str = ""  # Other printed text, for the whitelist
+    whitelist: str = field(init=False)
+    _labels: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        printed = self.header_words + "".join(f.unit for f in self.fields)
+        chars = set(printed) | set("0123456789.,-+()[]%/#:")
+        for f in self.fields:
+            chars |= set(f.metric)
+        object.__setattr__(self, 'whitelist', "".join(sorted(c for c in chars if not c.isspace())))
+        labels = {}
+        for position, f in enumerate(self.fields):
+            for label in f.labels:
+                labels[label] = position
+        object.__setattr__(self, '_labels', labels)
+
+    def field_at(self, token: str) -> Optional[int]:
+        """Print position of the field a label token names, or None."""
+        return self._labels.get(label_key(token))
+
+
+ABL800_FLEX = AnalyzerProfile(
+    name="abl800_flex",
+    detect=re.compile(r'ABL\s*[8B][0O]{2}', re.IGNORECASE),
+    psm=6,
+    header_words="ABL800 FLEX PATIENT REPORT Syringe Sample Blood Gas Values Oximetry "
+                 "Electrolyte Metabolite Acid Base Status pH pCO2 pO2 ctHb sO2 FO2Hb FCOHb FMetHb "
+                 "cK+ cNa+ cCa2+ cCl- cGlu cLac cBase(Ecf) cHCO3(P,st) uL",
+    fields=(
+        ProfileField("pH", ("ph", "pht", "py"), decimals=3),
+        ProfileField("pCO2", ("pco2", "pco", "pcoz", "poo", "pco2t", "pcot"), "mmHg", 1),
+        ProfileField("pO2", ("po2", "po", "poz", "po2t", "pot", "poi"), "mmHg"),
+        ProfileField("Hb", ("cthb", "sthb", "hb"), "g/dL", 1),
+        ProfileField("SO2", ("so2", "so", "5o2", "3o", "3o2", "soz"), "%", 1),
+        ProfileField("FO2Hb", ("fo2hb", "fohb", "fo2", "fozhb"), "%", 1),
+        ProfileField("FCOHb", ("fcohb", "cohb"), "%", 1),
+        ProfileField("FMetHb", ("fmethb", "methb", "fmathb", "fmetib"), "%", 1),
+        ProfileField("K", ("ck", "ckk", "3k", "k", "ok"), "mmol/L", 1),
+        ProfileField("Na", ("cna", "cnat", "onat", "na"), "mmol/L"),
+        ProfileField("Ca", ("cca2", "cca", "cia", "ccaz", "ca2"), "mmol/L", 2),
+        ProfileField("Cl", ("ccl", "cl", "scl", "oc", "occl"), "mmol/L"),
+        ProfileField("glucose", ("cglu", "egiu", "glu", "cgiu"), "mmol/L", 1),
+        ProfileField("lactate", ("clac", "cllac", "clec", "pitac", "lac"), "mmol/L", 1),
+        ProfileField("BE", ("cbaseecf", "cbaseef", "cbaseecfo", "obaseecf", "obase", "cbase"), "mmol/L", 1),
+        ProfileField("HCO3", ("chco3pst", "chcopst", "chco3", "ch2opsto", "ch2opst", "chcopsto"), "mmol/L", 1),
+    ),
+)
+
+ANALYZER_PROFILES: Tuple[AnalyzerProfile, ...] = (ABL800_FLEX,)
+
+
+def detect_profile(ocr_text: str) -> Optional[AnalyzerProfile]:
+    """Profile whose header appears in the first OCR lines, or None."""
+    lines = [line for line in ocr_text.splitlines() if line.strip()][:PROFILE_DETECT_LINES]
+    head = "\n".join(lines)
+    for profile in ANALYZER_PROFILES:
+        if profile.detect.search(head):
+            return profile
+    return None
+
+
+def header_strip(gray: np.ndarray) -> np.ndarray:
+    """Top part of a normalised image, where analyzers print their name."""
+    h = gray.shape[0]
+    return gray[:max(HEADER_STRIP_MIN_HEIGHT, int(h * HEADER_STRIP_FRACTION))]
+
+
+def extract_with_profile(profile: AnalyzerProfile, ocr_text: str,
+                         converters: Dict[str, Callable[[str], Optional[float]]]) -> Dict[str, Any]:
+    """
+    Metrics by direct lookup of each line's label in the profile.
+
+    Args:
+        profile: Recognised analyzer profile
+        ocr_text: OCR text of the printout
+        converters: metric -> value conversion / range check (METRIC_RULES)
+
+    Returns:
+        Metrics found, in the profile's print order
+    """
+    found: Dict[int, float] = {}
+    # (line number, field position or None, value token) of every data line
+    data_lines: List[Tuple[int, Optional[int], str]] = []
+
+    for line_no, line in enumerate(ocr_text.splitlines()):
+        tokens = line.split()
+        if len(tokens) < 2:
+            continue
+        match = _VALUE.match(tokens[1])
+        if match is None:
+            continue
+        position = profile.field_at(tokens[0])
+        data_lines.append((line_no, position, match.group(0)))
+        if position is not None and position not in found:
+            value = _convert(converters, profile.fields[position], match.group(0))
+            if value is not None:
+                found[position] = value
+
+    # Unreadable label between two recognised neighbours one field apart
+    for (_, before, _), (_, position, value_token), (_, after, _) in zip(data_lines, data_lines[1:], data_lines[2:]):
+        if position is None and before is not None and after is not None and after - before == 2:
+            missing = before + 1
+            if missing not in found:
+                value = _convert(converters, profile.fields[missing], value_token)
+                if value is not None:
+                    found[missing] = value
+
+    return {profile.fields[position].metric: found[position] for position in sorted(found)}
+
+
+def with_decimals(value: str, decimals: int) -> str:
+    """Put back a decimal point missing from a fixed-decimals value."""
+    sign, digits = (value[0], value[1:]) if value[:1] in '-+"' else ('', value)
+    if not decimals or '.' in digits or ',' in digits or len(digits) <= decimals:
+        return value
+    return f"{sign}{digits[:-decimals]}.{digits[-decimals:]}"
+
+
+def _convert(converters, profile_field: ProfileField, value: str) -> Optional[float]:
+    convert = converters.get(profile_field.metric)
+    if convert is None:
+        return None
+    value = with_decimals(value, profile_field.decimals)
+    try:
+        return convert(value)
+    except ValueError:
+        return None
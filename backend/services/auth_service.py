@@ -18,14 +18,25 @@ CONFIGURATION: All settings loaded from environment variables in .env file
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import os
 import re
+import time
 import bcrypt
 import jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from models.user import User, UserCreate, UserResponse
 from models.subscription import Subscription, SubscriptionStatus, PlanType
+from services.revoked_tokens import get_revoked_token_filter
+from services.token_epochs import SUBSCRIPTION_CLAIMS_ENABLED, bump_token_epoch
+
+
+def _remember_revoked(jti: str) -> None:
+    """Add a JTI this process just revoked to the revoked token filter."""
+    revoked_filter = get_revoked_token_filter()
+    if revoked_filter is not None:
+        revoked_filter.add(jti)
 
 
 class AuthService:
@@ -94,6 +105,7 @@ class AuthService:
         
         self.jwt_algorithm = os.environ.get('JWT_ALGORITHM', 'HS256')
         self.access_token_expire = int(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
+        self.subscription_claims = SUBSCRIPTION_CLAIMS_ENABLED
         self.refresh_token_expire = int(os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS', 7))
         
         # =================================================================
@@ -280,18 +292,100 @@ class AuthService:
         """Verify a password against its hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
     
-    def create_access_token(self, user_id: str, is_admin: bool = False) -> str:
-        """Create a JWT access token"""
-        expire = datetime.now(timezone.utc) + timedelta(minutes=self.access_token_expire)
+    def create_access_token(self, user_id: str, is_admin: bool = False,
+                            user: Optional[UserResponse] = None, claims_at: Optional[float] = None) -> str:
+        """
+        Create a JWT access token.
+        
+        With ``user`` (and ACCESS_TOKEN_SUBSCRIPTION_CLAIMS on), the token also
+        carries the user's profile and subscription status so require_subscription
+        can authorise without a database read. The token then expires no later
+        than the trial / subscription it vouches for.
+        
+        Args:
+            user_id: User's unique identifier
+            is_admin: Admin flag
+            user: Resolved user to embed as claims
+            claims_at: Unix time ``user`` was read (before the read; default now)
+        """
+        now = datetime.now(timezone.utc)
+        expire = now + timedelta(minutes=self.access_token_expire)
         payload = {
             'sub': user_id,
             'is_admin': is_admin,
             'type': 'access',
-            'exp': expire,
-            'iat': datetime.now(timezone.utc)
+            # Fractional (RFC 7519 NumericDate) so it orders exactly against
+            # users.tokens_valid_after - see issued_before_revocation
+            'iat': now.timestamp()
         }
+        if user is not None and self.subscription_claims:
+            until = user.trial_ends_at if user.subscription_status == 'trial' else user.subscription_renews_at
+            active = user.has_active_subscription
+            # Admin and tester access is not time-limited
+            if not active or user.is_admin or user.email == self.tester_email:
+                until = None
+            if until is not None:
+                expire = min(expire, until)
+            payload['profile'] = {
+                'email': user.email,
+                'name': user.name,
+                'is_active': user.is_active,
+                'created_at': user.created_at.isoformat()
+            }
+            payload['subscription'] = {
+                'active': active,
+                'status': user.subscription_status,
+                'plan': user.subscription_plan,
+                'until': until.timestamp() if until is not None else None,
+                'at': claims_at if claims_at is not None else now.timestamp()
+            }
+        payload['exp'] = expire
         return jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
     
+    async def issue_access_token(self, user_id: str, is_admin: bool = False) -> Tuple[str, Optional[UserResponse]]:
+        """
+        Resolve the user and create an access token carrying their subscription claims.
+        
+        Returns:
+            (access token, UserResponse or None if the user does not exist)
+        """
+        # Taken before the read: a write landing during it makes the claims stale
+        claims_at = time.time()
+        user = await self.get_user_with_subscription(user_id)
+        return self.create_access_token(user_id, is_admin, user, claims_at), user
+    
+    def user_from_claims(self, payload: dict) -> Optional[UserResponse]:
+        """
+        The user an access token vouches for, if it carries active subscription claims.
+        
+        Returns None for tokens without claims and for inactive subscriptions
+        (the user may have subscribed since - callers read the database then).
+        """
+        claims = payload.get('subscription')
+        profile = payload.get('profile')
+        if not isinstance(claims, dict) or not isinstance(profile, dict) or not claims.get('active'):
+            return None
+        until = claims.get('until')
+        if until is not None and until <= time.time():
+            return None
+        until_at = datetime.fromtimestamp(until, timezone.utc) if until is not None else None
+        try:
+            return UserResponse(
+                id=payload['sub'],
+                email=profile['email'],
+                name=profile['name'],
+                is_admin=bool(payload.get('is_admin')),
+                is_active=profile['is_active'],
+                created_at=datetime.fromisoformat(profile['created_at']),
+                has_active_subscription=True,
+                subscription_plan=claims.get('plan'),
+                subscription_status=claims.get('status'),
+                trial_ends_at=until_at if claims.get('status') == 'trial' else None,
+                subscription_renews_at=until_at if claims.get('status') != 'trial' else None
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+    
     def create_refresh_token(self, user_id: str, remember_me: bool = False) -> str:
         """
         Create a JWT refresh token.
@@ -317,7 +411,7 @@ class AuthService:
             'sub': user_id,
             'type': 'refresh',
             'exp': expire,
-            'iat': datetime.now(timezone.utc),
+            'iat': time.time(),
             'jti': jti  # Unique token ID for future revocation support
         }
         return jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
@@ -332,6 +426,19 @@ class AuthService:
         except jwt.InvalidTokenError:
             return None
     
+    def _revocation(self, jti: str, user_id: str, reason: str) -> dict:
+        """revoked_tokens document for a JTI"""
+        now = datetime.now(timezone.utc)
+        return {
+            'jti': jti,
+            'user_id': user_id,
+            'revoked_at': now.isoformat(),
+            'reason': reason,
+            # Auto-expire after 30 days (tokens expire in 7 days max, so this is safe).
+            # BSON date - the TTL index ignores string dates
+            'expires_at': now + timedelta(days=30)
+        }
+    
     async def revoke_token(self, jti: str, user_id: str, reason: str = "logout") -> bool:
         """
         Revoke a refresh token by its JTI (JWT ID).
@@ -344,27 +451,49 @@ class AuthService:
             reason: Reason for revocation (e.g., 'logout', 'device_revoked', 'password_changed')
         
         Returns:
-            True if successfully revoked, False otherwise
+            True if successfully revoked (or already revoked), False otherwise
         """
         try:
-            await self.db.revoked_tokens.insert_one({
-                'jti': jti,
-                'user_id': user_id,
-                'revoked_at': datetime.now(timezone.utc).isoformat(),
-                'reason': reason,
-                # Auto-expire after 30 days (tokens expire in 7 days max, so this is safe)
-                'expires_at': (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
-            })
-            return True
+            await self.db.revoked_tokens.insert_one(self._revocation(jti, user_id, reason))
+        except DuplicateKeyError:
+            pass  # Already revoked
         except Exception as e:
             import logging
             logging.error(f"Failed to revoke token: {e}")
             return False
+        _remember_revoked(jti)
+        return True
+    
+    async def consume_refresh_token(self, jti: str, user_id: str) -> bool:
+        """
+        Revoke a refresh token that is being exchanged for new tokens (rotation).
+        
+        The insert on the unique jti index is the atomic check: it fails if the
+        token was revoked meanwhile - a replay, possibly racing this exchange in
+        another API process before the revoked token filter synced.
+        
+        Returns:
+            False if the token was already revoked, True otherwise
+        """
+        try:
+            await self.db.revoked_tokens.insert_one(self._revocation(jti, user_id, "token_refresh"))
+        except DuplicateKeyError:
+            return False
+        except Exception as e:
+            # is_token_revoked() already passed; do not fail the refresh on a write error
+            import logging
+            logging.error(f"Failed to revoke refreshed token: {e}")
+            return True
+        _remember_revoked(jti)
+        return True
     
     async def is_token_revoked(self, jti: str) -> bool:
         """
         Check if a token has been revoked.
         
+        The revoked token filter answers "not revoked" without a database
+        read; only possible hits are confirmed in revoked_tokens.
+        
         Args:
             jti: The JWT ID to check
         
@@ -374,14 +503,26 @@ class AuthService:
         if not jti:
             return False
         
-        revoked = await self.db.revoked_tokens.find_one({'jti': jti})
+        revoked_filter = get_revoked_token_filter()
+        if revoked_filter is not None:
+            await revoked_filter.sync()
+            if not revoked_filter.might_be_revoked(jti):
+                return False
+        
+        revoked = await self.db.revoked_tokens.find_one({'jti': jti}, {'_id': 1})
         return revoked is not None
     
     async def revoke_all_user_tokens(self, user_id: str, reason: str = "password_changed") -> int:
         """
-        Revoke all active refresh tokens for a user.
+        Revoke every token of a user (password change, log out everywhere).
         
-        Used when password is changed or user requests logout from all devices.
+        A constant number of round trips, however many devices the user has:
+        1. One atomic update moves the user's revocation epoch
+           (users.tokens_valid_after) to now - every access and refresh token
+           issued before it is rejected, listed or not
+        2. The refresh tokens of the registered devices are recorded in
+           revoked_tokens with one insert_many (audit, revoked token filter)
+        3. The user's cached resolution and subscription claims are dropped
         
         Args:
             user_id: The user ID whose tokens should be revoked
@@ -391,20 +532,74 @@ class AuthService:
             Number of device sessions revoked
         """
         try:
-            # Get all active device sessions for the user
-            sessions = await self.db.user_devices.find({'user_id': user_id}).to_list(length=100)
+            # Full precision, as in the tokens' iat: a token issued earlier in
+            # this second is rejected, the login right after stays valid
+            valid_after = datetime.now(timezone.utc)
+            await self.db.users.update_one(
+                {'id': user_id},
+                {'$max': {'tokens_valid_after': valid_after.isoformat()}}
+            )
             
-            # Mark all sessions as revoked
+            sessions = await self.db.user_devices.find(
+                {'user_id': user_id}, {'_id': 0, 'refresh_token': 1}
+            ).to_list(length=100)
+            jtis = []
             for session in sessions:
-                if session.get('refresh_token_jti'):
-                    await self.revoke_token(session['refresh_token_jti'], user_id, reason)
+                payload = self._decode_unverified_expiry(session.get('refresh_token'))
+                if payload and payload.get('jti'):
+                    jtis.append(payload['jti'])
+            await self.revoke_tokens(jtis, user_id, reason)
             
+            await bump_token_epoch(user_id)
             return len(sessions)
         except Exception as e:
             import logging
             logging.error(f"Failed to revoke all user tokens: {e}")
             return 0
     
+    async def revoke_tokens(self, jtis: List[str], user_id: str, reason: str) -> int:
+        """
+        Revoke several refresh tokens with one insert_many.
+        
+        Returns:
+            Number of JTIs revoked (already revoked ones included)
+        """
+        if not jtis:
+            return 0
+        try:
+            await self.db.revoked_tokens.insert_many(
+                [self._revocation(jti, user_id, reason) for jti in jtis], ordered=False
+            )
+        except BulkWriteError as e:
+            # Duplicate keys are JTIs revoked before - anything else is a failure
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                import logging
+                logging.error(f"Failed to revoke tokens: {e}")
+                return 0
+        for jti in jtis:
+            _remember_revoked(jti)
+        return len(jtis)
+    
+    def _decode_unverified_expiry(self, token: Optional[str]) -> Optional[dict]:
+        """Decode a token of ours whether or not it has expired (None if invalid)."""
+        if not token:
+            return None
+        try:
+            return jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm],
+                              options={'verify_exp': False})
+        except jwt.InvalidTokenError:
+            return None
+    
+    @staticmethod
+    def issued_before_revocation(user: User, issued_at) -> bool:
+        """True if a token issued at issued_at (Unix time) predates the user's revocation epoch."""
+        if user.tokens_valid_after is None or issued_at is None:
+            return False
+        valid_after = user.tokens_valid_after
+        if valid_after.tzinfo is None:
+            valid_after = valid_after.replace(tzinfo=timezone.utc)
+        return issued_at < valid_after.timestamp()
+    
     async def create_user(self, user_data: UserCreate) -> Tuple[User, Optional[str]]:
         """Create a new user with optional trial subscription"""
         email_lower = user_data.email.lower()
@@ -559,13 +754,20 @@ class AuthService:
         
         user_doc['created_at'] = datetime.fromisoformat(user_doc['created_at']) if isinstance(user_doc['created_at'], str) else user_doc['created_at']
         user_doc['updated_at'] = datetime.fromisoformat(user_doc['updated_at']) if isinstance(user_doc['updated_at'], str) else user_doc['updated_at']
+        if isinstance(user_doc.get('tokens_valid_after'), str):
+            user_doc['tokens_valid_after'] = datetime.fromisoformat(user_doc['tokens_valid_after'])
         
         return User(**user_doc)
     
-    async def get_user_with_subscription(self, user_id: str) -> Optional[UserResponse]:
-        """Get user with their subscription status"""
+    async def get_user_with_subscription(self, user_id: str, issued_at: Optional[float] = None) -> Optional[UserResponse]:
+        """
+        Get user with their subscription status
+        
+        With issued_at (a token's iat), None is also returned if the token
+        predates the user's revocation epoch.
+        """
         user = await self.get_user_by_id(user_id)
-        if not user:
+        if not user or self.issued_before_revocation(user, issued_at):
             return None
         
         # Admin always has full access
@@ -626,25 +828,17 @@ class AuthService:
             
             now = datetime.now(timezone.utc)
             
+            # Lapsed subscriptions read as expired; the stored status is
+            # updated by the scheduler's expiry sweep, never by this read
             if status == 'trial':
                 if trial_ends and trial_ends > now:
                     has_active = True
                 else:
-                    # Trial expired
-                    await self.db.subscriptions.update_one(
-                        {'id': sub_doc['id']},
-                        {'$set': {'status': 'expired', 'updated_at': now.isoformat()}}
-                    )
                     status = 'expired'
             elif status == 'active':
                 if renews_at and renews_at > now:
                     has_active = True
                 else:
-                    # Subscription expired
-                    await self.db.subscriptions.update_one(
-                        {'id': sub_doc['id']},
-                        {'$set': {'status': 'expired', 'updated_at': now.isoformat()}}
-                    )
                     status = 'expired'
         
         return UserResponse(
@@ -0,0 +1,302 @@
+"""
+=============================================================================
+BLOOD GAS ENGINE - Vectorised Acid-Base / Electrolyte Interpretation
+=============================================================================
+The interpretation rules behind POST /api/blood-gas/analyze, evaluated over
+NumPy arrays so a whole unit's serial gases (POST /api/blood-gas/analyze/batch)
+are classified in one pass instead of one sample per request.
+
+FLOW:
+1. to_columns(): samples -> one float64 array per value (NaN = missing)
+2. interpret(): anion gap, primary disorder, expected compensation
+   (Winter's formula etc.), electrolyte and Hb classes as array codes
+3. analyze_batch(): codes -> the per-sample analysis dict of the endpoint
+
+Thresholds come from the compiled rules table (services/blood_gas_rules.py),
+per sample from its age group (``age_days``; no age -> the base table).
+
+A value of 0 counts as missing, like an absent one (the rules have always
+treated values by truthiness).
+
+RULES (default thresholds):
+- Anion gap = Na - (Cl + HCO3): > 12 elevated, < 8 low (no albumin correction)
+- pH < 7.35: pCO2 > 45 respiratory acidosis (expected HCO3, acute),
+  else HCO3 < 22 metabolic acidosis (Winter's formula 1.5 x HCO3 + 8 +/- 2)
+- pH > 7.45: pCO2 < 35 respiratory alkalosis (expected HCO3, acute),
+  else HCO3 > 26 metabolic alkalosis (expected pCO2 40 + 0.7 x (HCO3 - 24))
+- Normal pH with pCO2 and HCO3 both high or both low: mixed disorder
+- Lactate > 2 lactic acidosis, > 4 severe; Na, K, Cl ranges and Hb bands
+=============================================================================
+"""
+
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.blood_gas_rules import DEFAULT_COMPILED_RULES, CompiledRules
+
+# Most samples accepted by one batch request
+BLOOD_GAS_BATCH_MAX = int(os.environ.get('BLOOD_GAS_BATCH_MAX', 1000))
+
+# Values the rules read (BloodGasValues in server.py; BE is not used yet)
+ENGINE_FIELDS = ("pH", "pCO2", "HCO3", "Na", "K", "Cl", "lactate", "Hb")
+
+# Patient age selecting the rules' age group (0 is a valid age)
+AGE_FIELD = "age_days"
+
+ANION_GAP_STATUS = ("Normal", "Elevated (High Anion Gap)", "Low Anion Gap")
+
+# Primary disorder codes (-1 = not assessed)
+RESPIRATORY_ACIDOSIS = 0
+METABOLIC_ACIDOSIS = 1
+RESPIRATORY_ALKALOSIS = 2
+METABOLIC_ALKALOSIS = 3
+MIXED_DISORDER = 4
+NORMAL_ACID_BASE = 5
+
+PRIMARY_DISORDERS = (
+    "Respiratory Acidosis",
+    "Metabolic Acidosis",
+    "Respiratory Alkalosis",
+    "Metabolic Alkalosis",
+    "Mixed Disorder (compensated or concurrent)",
+    "Normal acid-base status",
+)
+
+# expected_label per primary disorder code (value formats: CompiledRules.expected_formats)
+EXPECTED_LABELS = ("HCO3", "pCO2", "HCO3", "pCO2")
+
+# Compensation codes (-1 = none stated); the first two are compensated
+COMPENSATION = (
+    "Metabolic compensation present",
+    "Appropriate respiratory compensation",
+    "Additional respiratory alkalosis",
+    "Additional respiratory acidosis",
+)
+
+SEVERE_LACTIC_ACIDOSIS = "Severe lactic acidosis - investigate cause (sepsis, hypoperfusion, etc.)"
+
+
+def to_columns(samples: Sequence[Mapping[str, Optional[float]]]) -> Dict[str, np.ndarray]:
+    """One float64 array per ENGINE_FIELDS value and age, NaN where a sample lacks it."""
+    return {
+        name: np.array([np.nan if s.get(name) is None else s[name] for s in samples], dtype=np.float64)
+        for name in ENGINE_FIELDS + (AGE_FIELD,)
+    }
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    return ~np.isnan(values) & (values != 0)
+
+
+def _group_params(rules: CompiledRules, group: np.ndarray) -> Dict[str, Any]:
+    """Thresholds per sample: plain floats when the batch is one age group."""
+    if len(group) and (group == group[0]).all():
+        g = int(group[0])
+        return {name: float(values[g]) for name, values in rules.params.items()}
+    return {name: values[group] for name, values in rules.params.items()}
+
+
+def interpret(columns: Mapping[str, np.ndarray], rules: CompiledRules = DEFAULT_COMPILED_RULES) -> Dict[str, np.ndarray]:
+    """
+    Evaluate every rule over whole columns.
+
+    Args:
+        columns: to_columns() output
+        rules: Compiled rules table
+
+    Returns:
+        Arrays per sample: group (age group index), anion_gap / cl_na_ratio /
+        expected (NaN if not computed), anion_gap_status / disorder /
+        compensation / hb_level codes (-1 if none), lactic / severe_lactic
+        flags and one below / above flag array per electrolyte rule
+    """
+    pH, pCO2, HCO3 = columns["pH"], columns["pCO2"], columns["HCO3"]
+    Na, Cl = columns["Na"], columns["Cl"]
+    lactate, Hb = columns["lactate"], columns["Hb"]
+    present = {name: _present(columns[name]) for name in ENGINE_FIELDS}
+    group = rules.group_index(columns[AGE_FIELD])
+    p = _group_params(rules, group)
+    tolerance = p["compensation.tolerance"]
+    normal_pco2, normal_hco3 = p["compensation.normal_pCO2"], p["compensation.normal_HCO3"]
+
+    with np.errstate(all='ignore'):
+        has_ag = present["Na"] & present["Cl"] & present["HCO3"]
+        anion_gap = np.where(has_ag, Na - (Cl + HCO3), np.nan)
+        ag_status = np.where(
+            has_ag,
+            np.where(anion_gap > p["anion_gap.high"], 1, np.where(anion_gap < p["anion_gap.low"], 2, 0)),
+            -1
+        )
+
+        cl_na_ratio = np.where(present["Na"] & present["Cl"], Cl / Na, np.nan)
+
+        # np.where chains rather than np.select: as fast for large batches
+        # and far cheaper for the single-sample endpoint
+        has_abg = present["pH"] & present["pCO2"] & present["HCO3"]
+        acidemia = pH < p["acid_base.pH.low"]
+        alkalemia = pH > p["acid_base.pH.high"]
+        pco2_high, pco2_low = pCO2 > p["acid_base.pCO2.high"], pCO2 < p["acid_base.pCO2.low"]
+        hco3_high, hco3_low = HCO3 > p["acid_base.HCO3.high"], HCO3 < p["acid_base.HCO3.low"]
+        mixed = (pco2_high & hco3_high) | (pco2_low & hco3_low)
+        disorder = np.where(
+            acidemia,
+            np.where(pco2_high, RESPIRATORY_ACIDOSIS, np.where(hco3_low, METABOLIC_ACIDOSIS, -1)),
+            np.where(
+                alkalemia,
+                np.where(pco2_low, RESPIRATORY_ALKALOSIS, np.where(hco3_high, METABOLIC_ALKALOSIS, -1)),
+                np.where(mixed, MIXED_DISORDER, NORMAL_ACID_BASE)
+            )
+        )
+        disorder = np.where(has_abg, disorder, -1)
+
+        # Expected HCO3 (respiratory) / pCO2 (metabolic) for compensation
+        respiratory = (disorder == RESPIRATORY_ACIDOSIS) | (disorder == RESPIRATORY_ALKALOSIS)
+        metabolic = (disorder == METABOLIC_ACIDOSIS) | (disorder == METABOLIC_ALKALOSIS)
+        expected = np.where(
+            acidemia,
+            np.where(respiratory,
+                     normal_hco3 + ((pCO2 - normal_pco2) * p["compensation.respiratory_acidosis"]),
+                     (p["compensation.winters_slope"] * HCO3) + p["compensation.winters_intercept"]),
+            np.where(respiratory,
+                     normal_hco3 - ((normal_pco2 - pCO2) * p["compensation.respiratory_alkalosis"]),
+                     normal_pco2 + (p["compensation.metabolic_alkalosis_slope"] * (HCO3 - normal_hco3)))
+        )
+        expected = np.where(respiratory | metabolic, expected, np.nan)
+
+        metabolic_compensation = np.where(acidemia, HCO3 > expected + tolerance, HCO3 < expected - tolerance)
+        respiratory_compensation = np.where(
+            np.abs(pCO2 - expected) <= tolerance, 1,
+            np.where(disorder == METABOLIC_ALKALOSIS, -1,
+                     np.where(pCO2 < expected - tolerance, 2, np.where(pCO2 > expected + tolerance, 3, -1)))
+        )
+        compensation = np.where(
+            respiratory, np.where(metabolic_compensation, 0, -1),
+            np.where(metabolic, respiratory_compensation, -1)
+        )
+
+        lactic = present["lactate"] & (lactate > p["lactate.elevated"])
+
+        # Hb band = number of band maxima the value is past
+        edges = rules.hb_edges[group]
+        past = np.where(rules.hb_inclusive, Hb[:, None] > edges, Hb[:, None] >= edges)
+        hb_level = np.where(present["Hb"], past.sum(axis=1), -1)
+
+        result = {
+            "group": group,
+            "anion_gap": anion_gap,
+            "anion_gap_status": ag_status,
+            "cl_na_ratio": cl_na_ratio,
+            "disorder": disorder,
+            "expected": expected,
+            "compensation": compensation,
+            "lactic": lactic,
+            "severe_lactic": lactic & (lactate > p["lactate.severe"]),
+            "hb_level": hb_level,
+        }
+        for name, _, _ in rules.electrolytes:
+            result[f"{name}_below"] = present[name] & (columns[name] < p[f"electrolytes.{name}.low"])
+            result[f"{name}_above"] = present[name] & (columns[name] > p[f"electrolytes.{name}.high"])
+    return result
+
+
+def _analyses(codes: Mapping[str, np.ndarray], hb: np.ndarray, rules: CompiledRules) -> List[Dict[str, Any]]:
+    """The endpoint's analysis dict per sample, from interpret() codes."""
+    # Plain Python lists: indexing numpy scalars per sample costs more than the rules
+    rows = zip(
+        codes["group"].tolist(),
+        codes["anion_gap_status"].tolist(), codes["anion_gap"].tolist(), codes["cl_na_ratio"].tolist(),
+        codes["disorder"].tolist(), codes["expected"].tolist(), codes["compensation"].tolist(),
+        codes["lactic"].tolist(), codes["severe_lactic"].tolist(), codes["hb_level"].tolist(), hb.tolist(),
+        *(codes[f"{name}_{side}"].tolist() for name, _, _ in rules.electrolytes for side in ("below", "above"))
+    )
+    results = []
+    for group, status, anion_gap, ratio, disorder, expected, compensation, lactic, severe, level, hb_value, *flags \
+            in rows:
+        analysis = {
+            "primary_disorder": None,
+            "compensation": None,
+            "is_compensated": False,
+            "expected_value": None,
+            "expected_label": None,
+            "lactic_acidosis": False,
+            "anion_gap": None,
+            "anion_gap_status": None,
+            "cl_na_ratio": None,
+            "electrolyte_imbalances": [],
+            "recommendations": [],
+            "hb_analysis": None
+        }
+
+        if status >= 0:
+            analysis["anion_gap"] = round(anion_gap, 1)
+            analysis["anion_gap_status"] = ANION_GAP_STATUS[status]
+
+        if ratio == ratio:  # not NaN
+            analysis["cl_na_ratio"] = round(ratio, 3)
+
+        if disorder >= 0:
+            analysis["primary_disorder"] = PRIMARY_DISORDERS[disorder]
+        if 0 <= disorder < len(EXPECTED_LABELS):
+            analysis["expected_label"] = EXPECTED_LABELS[disorder]
+            analysis["expected_value"] = rules.expected_formats[group][disorder].format(expected)
+        if compensation >= 0:
+            analysis["compensation"] = COMPENSATION[compensation]
+            analysis["is_compensated"] = compensation <= 1
+
+        if lactic:
+            analysis["lactic_acidosis"] = True
+            if severe:
+                analysis["recommendations"].append(SEVERE_LACTIC_ACIDOSIS)
+
+        for (_, below, above), is_below, is_above in zip(rules.electrolytes, flags[::2], flags[1::2]):
+            if is_below:
+                analysis["electrolyte_imbalances"].append(below)
+            elif is_above:
+                analysis["electrolyte_imbalances"].append(above)
+
+        if level >= 0:
+            label, color, message = rules.hb_bands[level]
+            analysis["hb_analysis"] = {
+                "level": label,
+                "color": color,
+                "message": message,
+                "value": hb_value
+            }
+
+        results.append(analysis)
+    return results
+
+
+def analyze_batch(samples: Sequence[Mapping[str, Optional[float]]],
+                  rules: CompiledRules = DEFAULT_COMPILED_RULES) -> List[Dict[str, Any]]:
+    """
+    Interpret many blood gas samples at once.
+
+    Args:
+        samples: Value dicts (BloodGasValues fields incl. age_days; missing or None allowed)
+        rules: Compiled rules table (services/blood_gas_rules.get_blood_gas_rules())
+
+    Returns:
+        One analysis dict per sample, in order (same structure as
+        POST /api/blood-gas/analyze)
+    """
+    return analyze_with_codes(samples, rules)[0]
+
+
+def analyze_with_codes(samples: Sequence[Mapping[str, Optional[float]]],
+                       rules: CompiledRules = DEFAULT_COMPILED_RULES
+                       ) -> Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """analyze_batch() plus the interpret() arrays (e.g. the numeric expected compensation)."""
+    if not samples:
+        return [], {}
+    columns = to_columns(samples)
+    codes = interpret(columns, rules)
+    return _analyses(codes, columns["Hb"], rules), codes
+
+
+def analyze(values: Mapping[str, Optional[float]],
+            rules: CompiledRules = DEFAULT_COMPILED_RULES) -> Dict[str, Any]:
+    """Interpret one blood gas sample (see analyze_batch)."""
+    return analyze_batch([values], rules)[0]
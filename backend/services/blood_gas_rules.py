@@ -0,0 +1,414 @@
+"""
+=============================================================================
+BLOOD GAS RULES - Declarative Thresholds for the Blood Gas Engine
+=============================================================================
+Every threshold services/blood_gas_engine.py applies (pH / pCO2 / HCO3
+limits, compensation formulas, anion gap, lactate, electrolyte ranges, Hb
+bands) comes from a rules table instead of code:
+
+    DEFAULT_RULES (below)   - built-in table, used until one is stored
+    content_metadata        - {"type": "blood_gas_rules", "version": N, "rules": {...}}
+
+The table is validated and compiled once into CompiledRules: one NumPy
+array per threshold with a slot per age group, plus precomputed labels and
+report strings. Requests only gather the slot of each sample's age group;
+nothing is parsed per request.
+
+AGE GROUPS:
+"age_groups" lists groups by "max_age_days" (a sample younger than that
+belongs to the group). "overrides" replace thresholds by their flat name,
+e.g. {"electrolytes.K.high": 6.0, "hb_bands.0.max": 10}; see
+threshold_names() for all names. Samples without an age, or older than
+every group, use the base table.
+
+HOT RELOAD:
+- PUT /api/admin/blood-gas-rules validates, stores and swaps the table in
+  the API process that serves it
+- Every other API process compares the stored version at most every
+  BLOOD_GAS_RULES_REFRESH_SECONDS and recompiles when it changed
+
+CONFIGURATION (environment variables):
+- BLOOD_GAS_RULES_REFRESH_SECONDS: Stored version check interval (default: 30)
+=============================================================================
+"""
+
+import copy
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BLOOD_GAS_RULES_REFRESH_SECONDS = float(os.environ.get('BLOOD_GAS_RULES_REFRESH_SECONDS', 30))
+
+RULES_DOC_TYPE = "blood_gas_rules"
+
+# Values the electrolyte ranges may refer to
+ELECTROLYTE_FIELDS = ("Na", "K", "Cl")
+
+DEFAULT_RULES: Dict[str, Any] = {
+    "anion_gap": {"low": 8, "high": 12},
+    "acid_base": {
+        "pH": {"low": 7.35, "high": 7.45},
+        "pCO2": {"low": 35, "high": 45},
+        "HCO3": {"low": 22, "high": 26},
+    },
+    "compensation": {
+        "normal_pCO2": 40,
+        "normal_HCO3": 24,
+        "tolerance": 2,
+        # Expected HCO3 change per mmHg pCO2 (acute)
+        "respiratory_acidosis": 0.1,
+        "respiratory_alkalosis": 0.2,
+        # Winter's formula: expected pCO2 = slope x HCO3 + intercept
+        "winters_slope": 1.5,
+        "winters_intercept": 8,
+        # Expected pCO2 = normal_pCO2 + slope x (HCO3 - normal_HCO3)
+        "metabolic_alkalosis_slope": 0.7,
+    },
+    "lactate": {"elevated": 2, "severe": 4},
+    "electrolytes": [
+        {"field": "Na", "low": 135, "high": 145, "below": "Hyponatremia", "above": "Hypernatremia"},
+        {"field": "K", "low": 3.5, "high": 5.0, "below": "Hypokalemia", "above": "Hyperkalemia"},
+        {"field": "Cl", "low": 98, "high": 106, "below": "Hypochloremia", "above": "Hyperchloremia"},
+    ],
+    # Ascending; Hb below "max" (at or below it if "inclusive") is in the band,
+    # the last band (no "max") takes everything above
+    "hb_bands": [
+        {"max": 7, "level": "Severe Anemia", "color": "red", "message": "Blood transfusion indicated"},
+        {"max": 10, "level": "Moderate Anemia", "color": "amber", "message": "Consider transfusion based on symptoms"},
+        {"max": 12, "level": "Mild Anemia", "color": "yellow", "message": "Monitor closely"},
+        {"max": 17, "inclusive": True, "level": "Normal", "color": "green", "message": "Normal hemoglobin level"},
+        {"level": "Elevated", "color": "orange", "message": "Elevated hemoglobin - investigate cause"},
+    ],
+    "age_groups": [
+        {
+            "name": "neonate",
+            "max_age_days": 28,
+            "overrides": {
+                "electrolytes.K.high": 6.0,
+                "hb_bands.0.max": 10,
+                "hb_bands.1.max": 12,
+                "hb_bands.2.max": 14,
+                "hb_bands.3.max": 22,
+            },
+        },
+    ],
+}
+
+BASE_GROUP = "default"
+
+
+def threshold_names(rules: Mapping[str, Any]) -> List[str]:
+    """Flat names of every numeric threshold of a rules table."""
+    return list(_flatten(rules))
+
+
+def _flatten(rules: Mapping[str, Any]) -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    for section in ("anion_gap", "compensation", "lactate"):
+        for key, value in rules[section].items():
+            flat[f"{section}.{key}"] = value
+    for field, limits in rules["acid_base"].items():
+        for key in ("low", "high"):
+            flat[f"acid_base.{field}.{key}"] = limits[key]
+    for electrolyte in rules["electrolytes"]:
+        for key in ("low", "high"):
+            flat[f"electrolytes.{electrolyte['field']}.{key}"] = electrolyte[key]
+    for i, band in enumerate(rules["hb_bands"][:-1]):
+        flat[f"hb_bands.{i}.max"] = band["max"]
+    return flat
+
+
+def _number(name: str, value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        raise ValueError(f"{name} must be a number")
+    return float(value)
+
+
+def _check_limits(flat: Mapping[str, float], where: str):
+    for name, value in flat.items():
+        if name.endswith(".low") and value >= flat[name[:-len("low")] + "high"]:
+            raise ValueError(f"{where}: {name} must be below the matching high limit")
+    edges = [flat[name] for name in flat if name.startswith("hb_bands.")]
+    if edges != sorted(edges) or len(set(edges)) != len(edges):
+        raise ValueError(f"{where}: hb_bands maxima must be strictly ascending")
+
+
+def validate_rules(rules: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Check a rules table (see DEFAULT_RULES for the shape).
+
+    Returns:
+        A deep copy of the table
+
+    Raises:
+        ValueError: With a message naming the first problem found
+    """
+    if not isinstance(rules, Mapping):
+        raise ValueError("rules must be an object")
+    rules = copy.deepcopy(dict(rules))
+    for section in DEFAULT_RULES:
+        if section not in rules:
+            raise ValueError(f"missing section: {section}")
+    unknown = set(rules) - set(DEFAULT_RULES)
+    if unknown:
+        raise ValueError(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    for section in ("anion_gap", "compensation", "lactate"):
+        if not isinstance(rules[section], Mapping) or set(rules[section]) != set(DEFAULT_RULES[section]):
+            raise ValueError(f"{section} must have exactly: {', '.join(DEFAULT_RULES[section])}")
+    if not isinstance(rules["acid_base"], Mapping) or set(rules["acid_base"]) != set(DEFAULT_RULES["acid_base"]):
+        raise ValueError("acid_base must have exactly: pH, pCO2, HCO3")
+    for field, limits in rules["acid_base"].items():
+        if not isinstance(limits, Mapping) or set(limits) != {"low", "high"}:
+            raise ValueError(f"acid_base.{field} must have low and high")
+
+    electrolytes = rules["electrolytes"]
+    if not isinstance(electrolytes, list):
+        raise ValueError("electrolytes must be a list")
+    fields = [e.get("field") if isinstance(e, Mapping) else None for e in electrolytes]
+    if any(f not in ELECTROLYTE_FIELDS for f in fields) or len(set(fields)) != len(fields):
+        raise ValueError(f"electrolytes: each field must be one of {', '.join(ELECTROLYTE_FIELDS)}, once")
+    for e in electrolytes:
+        for key in ("below", "above"):
+            if not isinstance(e.get(key), str):
+                raise ValueError(f"electrolytes.{e['field']}.{key} must be a label")
+
+    bands = rules["hb_bands"]
+    if not isinstance(bands, list) or len(bands) < 2:
+        raise ValueError("hb_bands must list at least two bands")
+    for i, band in enumerate(bands):
+        if not isinstance(band, Mapping) or not all(isinstance(band.get(k), str) for k in ("level", "color", "message")):
+            raise ValueError(f"hb_bands.{i} needs level, color and message")
+        if ("max" in band) == (i == len(bands) - 1):
+            raise ValueError("hb_bands: every band but the last needs a max")
+
+    flat = _flatten(rules)
+    for name, value in flat.items():
+        flat[name] = _number(name, value)
+    _check_limits(flat, "rules")
+
+    groups = rules["age_groups"]
+    if not isinstance(groups, list):
+        raise ValueError("age_groups must be a list")
+    names = set()
+    for group in groups:
+        if not isinstance(group, Mapping) or not isinstance(group.get("name"), str):
+            raise ValueError("age_groups: every group needs a name")
+        name = group["name"]
+        if name in names or name == BASE_GROUP:
+            raise ValueError(f"age_groups: duplicate or reserved name {name}")
+        names.add(name)
+        if _number(f"age_groups.{name}.max_age_days", group.get("max_age_days")) <= 0:
+            raise ValueError(f"age_groups.{name}.max_age_days must be positive")
+        overrides = group.get("overrides", {})
+        if not isinstance(overrides, Mapping):
+            raise ValueError(f"age_groups.{name}.overrides must be an object")
+        group_flat = dict(flat)
+        for key, value in overrides.items():
+            if key not in flat:
+                raise ValueError(f"age_groups.{name}: unknown threshold {key}")
+            group_flat[key] = _number(f"age_groups.{name}.{key}", value)
+        _check_limits(group_flat, f"age_groups.{name}")
+    return rules
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """A validated rules table in the form the engine evaluates."""
+    version: int
+    groups: Tuple[str, ...]  # Age groups by max age, then BASE_GROUP
+    max_age_days: np.ndarray  # Upper age bound per age group (BASE_GROUP excluded)
+    params: Dict[str, np.ndarray]  # Flat threshold name -> value per group
+    electrolytes: Tuple[Tuple[str, str, str], ...]  # (field, below label, above label)
+    hb_bands: Tuple[Tuple[str, str, str], ...]  # (level, color, message)
+    hb_edges: np.ndarray  # Band maxima per group, shape (groups, bands - 1)
+    hb_inclusive: np.ndarray  # Per band edge: Hb equal to the max stays in the band
+    expected_formats: Tuple[Tuple[str, str, str, str], ...]  # Per group: see _expected_formats
+    rules: Dict[str, Any]  # The source table
+
+    def group_index(self, age_days: np.ndarray) -> np.ndarray:
+        """Index into ``groups`` per sample (NaN age -> BASE_GROUP)."""
+        return np.searchsorted(self.max_age_days, age_days, side='right')
+
+
+def _expected_formats(p: Mapping[str, float]) -> Tuple[str, str, str, str]:
+    """expected_value formats per primary disorder, with the group's numbers."""
+    return (
+        "{:.1f} mEq/L (Acute)",
+        f"{{:.1f}} ± {p['compensation.tolerance']:g} mmHg (Winter's formula: "
+        f"{p['compensation.winters_slope']:g} × HCO3 + {p['compensation.winters_intercept']:g})",
+        "{:.1f} mEq/L (Acute)",
+        f"{{:.1f}} mmHg ({p['compensation.normal_pCO2']:g} + {p['compensation.metabolic_alkalosis_slope']:g} "
+        f"× (HCO3 - {p['compensation.normal_HCO3']:g}))",
+    )
+
+
+def compile_rules(rules: Mapping[str, Any], version: int = 0) -> CompiledRules:
+    """
+    Validate and compile a rules table.
+
+    Raises:
+        ValueError: If the table is invalid (see validate_rules)
+    """
+    rules = validate_rules(rules)
+    base = {name: float(value) for name, value in _flatten(rules).items()}
+    groups = sorted(rules["age_groups"], key=lambda g: g["max_age_days"])
+    group_params = [{**base, **{k: float(v) for k, v in g.get("overrides", {}).items()}} for g in groups] + [base]
+
+    return CompiledRules(
+        version=version,
+        groups=tuple(g["name"] for g in groups) + (BASE_GROUP,),
+        max_age_days=np.array([float(g["max_age_days"]) for g in groups]),
+        params={name: np.array([p[name] for p in group_params]) for name in base},
+        electrolytes=tuple((e["field"], e["below"], e["above"]) for e in rules["electrolytes"]),
+        hb_bands=tuple((b["level"], b["color"], b["message"]) for b in rules["hb_bands"]),
+        hb_edges=np.array([[p[f"hb_bands.{i}.max"] for i in range(len(rules["hb_bands"]) - 1)] for p in group_params]),
+        hb_inclusive=np.array([bool(b.get("inclusive", False)) for b in rules["hb_bands"][:-1]]),
+        expected_formats=tuple(_expected_formats(p) for p in group_params),
+        rules=rules
+    )
+
+
+DEFAULT_COMPILED_RULES = compile_rules(DEFAULT_RULES)
+
+
+class BloodGasRulesStore:
+    """The compiled rules of this API process, kept in step with Mongo."""
+
+    def __init__(self, collection=None, refresh_seconds: float = BLOOD_GAS_RULES_REFRESH_SECONDS):
+        """
+        Args:
+            collection: Motor collection holding the rules document (content_metadata)
+            refresh_seconds: Interval between stored version checks
+        """
+        self.collection = collection
+        self.refresh_seconds = refresh_seconds
+        self.compiled = DEFAULT_COMPILED_RULES
+        self.source = "default"
+        self.reloads = 0
+        self.errors = 0
+        self._checked_at = time.monotonic()
+        self._refreshing = False
+
+    async def load(self) -> CompiledRules:
+        """Compile the stored table (startup / version change); keeps the current rules on error."""
+        self._checked_at = time.monotonic()
+        if self.collection is None:
+            return self.compiled
+        try:
+            doc = await self.collection.find_one({"type": RULES_DOC_TYPE}, {"_id": 0})
+            if doc is None:
+                if self.source != "default":
+                    self.compiled, self.source = DEFAULT_COMPILED_RULES, "default"
+                return self.compiled
+            compiled = compile_rules(doc["rules"], int(doc.get("version", 0)))
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Blood gas rules not loaded, keeping version {self.compiled.version}: {e}")
+            return self.compiled
+        self.compiled, self.source = compiled, "database"
+        self.reloads += 1
+        logger.info(f"Blood gas rules version {compiled.version} loaded")
+        return compiled
+
+    async def current(self) -> CompiledRules:
+        """
+        The compiled rules, reloaded first if the stored version changed.
+
+        The stored version is read at most every refresh_seconds; other
+        requests use the compiled rules without waiting.
+        """
+        if (self.collection is None or self._refreshing
+                or time.monotonic() - self._checked_at < self.refresh_seconds):
+            return self.compiled
+        self._refreshing = True
+        try:
+            self._checked_at = time.monotonic()
+            doc = await self.collection.find_one({"type": RULES_DOC_TYPE}, {"_id": 0, "version": 1})
+            stored = int(doc.get("version", 0)) if doc else None
+            if (stored is None and self.source != "default") or (stored is not None and stored != self.compiled.version):
+                await self.load()
+        except Exception as e:
+            logger.warning(f"Blood gas rules version check failed: {e}")
+        finally:
+            self._refreshing = False
+        return self.compiled
+
+    async def save(self, rules: Mapping[str, Any], updated_by: Optional[str] = None) -> CompiledRules:
+        """
+        Validate, store and activate a rules table.
+
+        Raises:
+            ValueError: If the table is invalid
+        """
+        compiled = compile_rules(rules)
+        if self.collection is not None:
+            doc = await self.collection.find_one_and_update(
+                {"type": RULES_DOC_TYPE},
+                {
+                    "$set": {
+                        "rules": compiled.rules,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "updated_by": updated_by
+                    },
+                    "$inc": {"version": 1}
+                },
+                upsert=True,
+                return_document=True,
+                projection={"_id": 0, "version": 1}
+            )
+            compiled = compile_rules(compiled.rules, int(doc["version"]))
+        else:
+            compiled = compile_rules(compiled.rules, self.compiled.version + 1)
+        self.compiled, self.source = compiled, "database" if self.collection is not None else "memory"
+        self._checked_at = time.monotonic()
+        logger.info(f"Blood gas rules version {compiled.version} saved by {updated_by}")
+        return compiled
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.compiled.version,
+            "source": self.source,
+            "age_groups": list(self.compiled.groups),
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "refresh_seconds": self.refresh_seconds
+        }
+
+
+# Global rules store (initialized in server.py)
+blood_gas_rules_store: Optional[BloodGasRulesStore] = None
+
+
+def get_blood_gas_rules_store() -> Optional[BloodGasRulesStore]:
+    """Get the global blood gas rules store (None if not initialized)."""
+    return blood_gas_rules_store
+
+
+async def get_blood_gas_rules() -> CompiledRules:
+    """Current compiled rules (the defaults if the store is not initialized)."""
+    if blood_gas_rules_store is None:
+        return DEFAULT_COMPILED_RULES
+    return await blood_gas_rules_store.current()
+
+
+def init_blood_gas_rules(db=None) -> BloodGasRulesStore:
+    """
+    Initialize the global blood gas rules store.
+
+    Args:
+        db: MongoDB database instance (rules live in content_metadata)
+
+    Returns:
+        BloodGasRulesStore instance (call load() to read the stored table)
+    """
+    global blood_gas_rules_store
+    blood_gas_rules_store = BloodGasRulesStore(collection=db.content_metadata if db is not None else None)
+    return blood_gas_rules_store
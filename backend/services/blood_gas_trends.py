@@ -0,0 +1,446 @@
+"""
+=============================================================================
+BLOOD GAS TRENDS - Opt-in Serial Gas Store with Incremental Trend Statistics
+=============================================================================
+POST /api/blood-gas/analyze is stateless: serial gases for one patient only
+meet in the frontend's saved results. With trends enabled, a signed-in user
+can file de-identified readings under their own patient label (a bed or
+study code - never a name) and get deltas, rolling trends and the
+compensation trajectory back with every new reading.
+
+FLOW:
+1. POST /api/blood-gas/trends/{label}/readings -> the reading is analysed,
+   the series' running state is advanced by that one reading and stored
+   back, the reading itself is appended to the history
+2. GET /api/blood-gas/trends/{label} -> the trend summary from that state
+3. GET /api/blood-gas/trends/{label}/readings -> the stored history (paged)
+
+KEY FEATURES:
+- Constant work per reading however long the series: the series document
+  holds running statistics (Welford mean / variance, min / max, first and
+  previous value) and a fixed-size window of recent values per metric, so a
+  new reading never reads the history back
+- Delta and rate per hour against the metric's previous value, rolling mean
+  and least-squares slope over the window, change since the first reading
+- Compensation trajectory: for a primary disorder with an expected
+  compensation (Winter's formula etc.), the gap between actual and expected
+  pCO2 / HCO3 and whether it is closing from reading to reading
+- Compare-and-set on the reading count, so concurrent readings for the same
+  label are serialised instead of lost
+- Readings must arrive in time order (late entries are rejected, as
+  they would invalidate the running state)
+
+CONFIGURATION (environment variables):
+- BLOOD_GAS_TRENDS_ENABLED: Store serial readings (default: false)
+- BLOOD_GAS_TREND_WINDOW: Readings in the rolling window (default: 6)
+- BLOOD_GAS_TREND_RETENTION_DAYS: Days a series / reading is kept after
+  its last update (default: 30)
+=============================================================================
+"""
+
+import copy
+import logging
+import math
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from services import blood_gas_engine
+from services.blood_gas_rules import DEFAULT_COMPILED_RULES, CompiledRules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOOD_GAS_TREND_WINDOW = 6
+DEFAULT_BLOOD_GAS_TREND_RETENTION_DAYS = 30
+
+# Values followed over time (BloodGasValues) plus the derived anion gap
+TREND_FIELDS = ("pH", "pCO2", "pO2", "HCO3", "BE", "Na", "K", "Cl", "lactate", "Hb")
+DERIVED_FIELDS = ("anion_gap",)
+
+# User-chosen patient labels: bed / study codes, no free text
+TREND_LABEL_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 _.-]{0,39}$")
+
+# Base excess may legitimately be 0; for every other value 0 means not measured
+ZERO_VALID_FIELDS = ("BE",)
+
+# Change in |actual - expected| (mmHg / mEq/L) below which compensation is "stable"
+COMPENSATION_TREND_TOLERANCE = 0.5
+
+# Attempts at the compare-and-set update before giving up on a busy series
+MAX_UPDATE_ATTEMPTS = 5
+
+
+class TrendOrderError(ValueError):
+    """A reading older than the series' latest one."""
+
+
+class TrendConflictError(RuntimeError):
+    """The series kept changing under concurrent readings."""
+
+
+def is_valid_label(label: str) -> bool:
+    """Whether a patient label is acceptable (1-40 letters, digits, space, _ . -)."""
+    return bool(TREND_LABEL_PATTERN.match(label))
+
+
+def _utc(value: datetime) -> datetime:
+    """Mongo returns naive UTC datetimes."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _round(value: Optional[float], digits: int = 3) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+def _trend_values(values: Mapping[str, Optional[float]], analysis: Mapping[str, Any]) -> Dict[str, float]:
+    """The measured values of one reading, plus the derived ones."""
+    present = {}
+    for name in TREND_FIELDS:
+        value = values.get(name)
+        if value is not None and (value != 0 or name in ZERO_VALID_FIELDS):
+            present[name] = float(value)
+    if analysis.get("anion_gap") is not None:
+        present["anion_gap"] = float(analysis["anion_gap"])
+    return present
+
+
+def new_series(user_id: str, label: str, taken_at: datetime) -> Dict[str, Any]:
+    """Running state of a series before its first reading."""
+    return {
+        "user_id": user_id,
+        "label": label,
+        "count": 0,
+        "first_taken_at": taken_at,
+        "last_taken_at": taken_at,
+        "metrics": {},
+        "compensation": None,
+    }
+
+
+def _advance_metric(metric: Optional[Dict[str, Any]], t: float, value: float, window: int) -> Dict[str, Any]:
+    """One more value in a metric's running statistics."""
+    if metric is None:
+        return {"n": 1, "mean": value, "m2": 0.0, "min": value, "max": value, "first": value,
+                "last": value, "last_t": t, "prev": None, "prev_t": None, "window": [[t, value]]}
+    n = metric["n"] + 1
+    delta = value - metric["mean"]
+    mean = metric["mean"] + delta / n
+    return {
+        "n": n,
+        "mean": mean,
+        "m2": metric["m2"] + delta * (value - mean),
+        "min": min(metric["min"], value),
+        "max": max(metric["max"], value),
+        "first": metric["first"],
+        "last": value,
+        "last_t": t,
+        "prev": metric["last"],
+        "prev_t": metric["last_t"],
+        "window": (metric["window"] + [[t, value]])[-window:],
+    }
+
+
+def _advance_compensation(previous: Optional[Dict[str, Any]], reading: int,
+                          values: Mapping[str, Optional[float]], analysis: Mapping[str, Any],
+                          expected: Optional[float]) -> Optional[Dict[str, Any]]:
+    """Compensation trajectory after one more reading (unchanged if acid-base was not assessed)."""
+    disorder = analysis.get("primary_disorder")
+    if disorder is None:
+        return previous
+
+    label = analysis.get("expected_label")
+    gap = None
+    if label is not None and expected is not None and values.get(label) is not None:
+        gap = float(values[label]) - expected
+
+    same = previous is not None and previous["disorder"] == disorder
+    previous_gap = previous["gap"] if same else None
+    if previous is None:
+        direction = "new"
+    elif not same:
+        direction = "changed"
+    elif gap is None or previous_gap is None:
+        direction = "stable"
+    else:
+        change = abs(gap) - abs(previous_gap)
+        if change < -COMPENSATION_TREND_TOLERANCE:
+            direction = "converging"
+        elif change > COMPENSATION_TREND_TOLERANCE:
+            direction = "diverging"
+        else:
+            direction = "stable"
+
+    return {
+        "disorder": disorder,
+        "previous_disorder": previous["disorder"] if previous is not None else None,
+        "since_reading": previous["since_reading"] if same else reading,
+        "readings": previous["readings"] + 1 if same else 1,
+        "compensation": analysis.get("compensation"),
+        "is_compensated": analysis.get("is_compensated", False),
+        "expected_label": label,
+        "expected": expected,
+        "actual": float(values[label]) if gap is not None else None,
+        "gap": gap,
+        "previous_gap": previous_gap,
+        "direction": direction,
+    }
+
+
+def advance(state: Mapping[str, Any], taken_at: datetime, values: Mapping[str, Optional[float]],
+            analysis: Mapping[str, Any], expected: Optional[float],
+            window: int = DEFAULT_BLOOD_GAS_TREND_WINDOW) -> Dict[str, Any]:
+    """
+    Series state after one more reading. Touches only the reading's own
+    metrics, so the cost does not grow with the series.
+
+    Args:
+        state: Current state (new_series() for an empty series); not modified
+        taken_at: Time of the reading, not before state["last_taken_at"]
+        values: The reading's BloodGasValues
+        analysis: blood_gas_engine analysis of the reading
+        expected: Numeric expected compensation (interpret()["expected"]), or None
+        window: Readings kept per metric for the rolling trend
+
+    Returns:
+        The new state (a copy)
+    """
+    if state["count"] and taken_at < _utc(state["last_taken_at"]):
+        raise TrendOrderError("Readings must be added in time order")
+
+    new = copy.deepcopy(dict(state))
+    new["count"] = state["count"] + 1
+    new["last_taken_at"] = taken_at
+    t = (taken_at - _utc(state["first_taken_at"])).total_seconds() / 3600
+    for name, value in _trend_values(values, analysis).items():
+        new["metrics"][name] = _advance_metric(state["metrics"].get(name), t, value, window)
+    new["compensation"] = _advance_compensation(state["compensation"], new["count"], values, analysis, expected)
+    return new
+
+
+def _window_trend(points: List[List[float]]) -> Dict[str, Optional[float]]:
+    """Mean and least-squares slope (per hour) over the rolling window."""
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    sxx = sum((t - mean_t) ** 2 for t, _ in points)
+    slope = None
+    if sxx > 0:
+        slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / sxx
+    return {"n": n, "mean": _round(mean_v), "slope_per_hour": _round(slope)}
+
+
+def _metric_summary(metric: Mapping[str, Any]) -> Dict[str, Any]:
+    delta = hours = rate = None
+    if metric["prev"] is not None:
+        delta = metric["last"] - metric["prev"]
+        hours = metric["last_t"] - metric["prev_t"]
+        if hours > 0:
+            rate = delta / hours
+    return {
+        "value": metric["last"],
+        "previous": metric["prev"],
+        "delta": _round(delta),
+        "hours_since_previous": _round(hours, 2),
+        "rate_per_hour": _round(rate),
+        "change_from_first": _round(metric["last"] - metric["first"]),
+        "n": metric["n"],
+        "mean": _round(metric["mean"]),
+        "sd": _round(math.sqrt(metric["m2"] / (metric["n"] - 1))) if metric["n"] > 1 else None,
+        "min": metric["min"],
+        "max": metric["max"],
+        "rolling": _window_trend(metric["window"]),
+    }
+
+
+def summarize(state: Mapping[str, Any]) -> Dict[str, Any]:
+    """Trend response body, computed from the running state alone."""
+    compensation = state["compensation"]
+    if compensation is not None:
+        compensation = {
+            **compensation,
+            "expected": _round(compensation["expected"], 1),
+            "gap": _round(compensation["gap"], 1),
+            "previous_gap": _round(compensation["previous_gap"], 1),
+        }
+    return {
+        "label": state["label"],
+        "count": state["count"],
+        "first_taken_at": _utc(state["first_taken_at"]).isoformat(),
+        "last_taken_at": _utc(state["last_taken_at"]).isoformat(),
+        "metrics": {
+            name: _metric_summary(state["metrics"][name])
+            for name in TREND_FIELDS + DERIVED_FIELDS if name in state["metrics"]
+        },
+        "compensation": compensation,
+    }
+
+
+class BloodGasTrendStore:
+    """
+    Per-user, per-label serial blood gases in Mongo.
+
+    ``blood_gas_trend_series`` holds one running-state document per label,
+    ``blood_gas_trend_readings`` the readings themselves for the history.
+    """
+
+    def __init__(self, series_collection, readings_collection,
+                 window: int = DEFAULT_BLOOD_GAS_TREND_WINDOW,
+                 retention_days: int = DEFAULT_BLOOD_GAS_TREND_RETENTION_DAYS):
+        """
+        Args:
+            series_collection: Motor collection of series states
+            readings_collection: Motor collection of readings
+            window: Readings in the rolling window per metric
+            retention_days: Days kept after the last update (TTL index)
+        """
+        self.series = series_collection
+        self.readings = readings_collection
+        self.window = max(2, window)
+        self.retention_days = retention_days
+
+    async def ensure_indexes(self):
+        """Create the lookup and TTL indexes."""
+        try:
+            await self.series.create_index([("user_id", 1), ("label", 1)], unique=True,
+                                           name="blood_gas_trend_series_key")
+            await self.series.create_index("expires_at", expireAfterSeconds=0,
+                                           name="blood_gas_trend_series_ttl")
+            await self.readings.create_index([("user_id", 1), ("label", 1), ("reading", -1)], unique=True,
+                                             name="blood_gas_trend_readings_key")
+            await self.readings.create_index("expires_at", expireAfterSeconds=0,
+                                             name="blood_gas_trend_readings_ttl")
+        except Exception as e:
+            logger.debug(f"Blood gas trend index creation: {e}")
+
+    async def add_reading(self, user_id: str, label: str, values: Mapping[str, Optional[float]],
+                          taken_at: Optional[datetime] = None,
+                          rules: CompiledRules = DEFAULT_COMPILED_RULES) -> Dict[str, Any]:
+        """
+        Analyse a reading, advance its series and store both.
+
+        Returns:
+            {"reading": number in the series, "taken_at", "analysis", "trend": summarize()}
+
+        Raises:
+            TrendOrderError: taken_at is before the series' latest reading
+            TrendConflictError: concurrent readings kept winning the update
+        """
+        taken_at = _utc(taken_at) if taken_at is not None else datetime.now(timezone.utc)
+        analyses, codes = blood_gas_engine.analyze_with_codes([values], rules)
+        analysis = analyses[0]
+        expected = codes["expected"][0].item()
+        expected = None if math.isnan(expected) else expected
+        key = {"user_id": user_id, "label": label}
+
+        for _ in range(MAX_UPDATE_ATTEMPTS):
+            state = await self.series.find_one(key, {"_id": 0})
+            now = datetime.now(timezone.utc)
+            new = advance(state or new_series(user_id, label, taken_at), taken_at, values, analysis,
+                          expected, self.window)
+            new["updated_at"] = now
+            new["expires_at"] = now + timedelta(days=self.retention_days)
+            if state is None:
+                try:
+                    await self.series.insert_one({**new, "created_at": now})
+                except DuplicateKeyError:
+                    continue
+            else:
+                # Compare-and-set: only if no other reading was added meanwhile
+                result = await self.series.update_one({**key, "count": state["count"]}, {"$set": new})
+                if result.matched_count == 0:
+                    continue
+
+            await self.readings.insert_one({
+                **key,
+                "reading": new["count"],
+                "taken_at": taken_at,
+                "values": dict(values),
+                "analysis": analysis,
+                "created_at": now,
+                "expires_at": new["expires_at"],
+            })
+            return {
+                "reading": new["count"],
+                "taken_at": taken_at.isoformat(),
+                "analysis": analysis,
+                "trend": summarize(new),
+            }
+        raise TrendConflictError("Too many concurrent readings for this label, please retry")
+
+    async def get_trend(self, user_id: str, label: str) -> Optional[Dict[str, Any]]:
+        """Current trend summary, or None for an unknown label."""
+        state = await self.series.find_one({"user_id": user_id, "label": label}, {"_id": 0})
+        return summarize(state) if state else None
+
+    async def list_series(self, user_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """The user's labels, most recently updated first."""
+        cursor = self.series.find(
+            {"user_id": user_id},
+            {"_id": 0, "label": 1, "count": 1, "first_taken_at": 1, "last_taken_at": 1}
+        ).sort("last_taken_at", -1).limit(limit)
+        series = await cursor.to_list(limit)
+        for entry in series:
+            entry["first_taken_at"] = _utc(entry["first_taken_at"]).isoformat()
+            entry["last_taken_at"] = _utc(entry["last_taken_at"]).isoformat()
+        return series
+
+    async def get_readings(self, user_id: str, label: str, limit: int = 50,
+                           before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Stored readings, newest first; ``before`` pages back from a reading number."""
+        query: Dict[str, Any] = {"user_id": user_id, "label": label}
+        if before is not None:
+            query["reading"] = {"$lt": before}
+        cursor = self.readings.find(
+            query, {"_id": 0, "reading": 1, "taken_at": 1, "values": 1, "analysis": 1}
+        ).sort("reading", -1).limit(limit)
+        readings = await cursor.to_list(limit)
+        for reading in readings:
+            reading["taken_at"] = _utc(reading["taken_at"]).isoformat()
+        return readings
+
+    async def delete_series(self, user_id: str, label: str) -> bool:
+        """Delete a label's state and readings. Returns False if it did not exist."""
+        key = {"user_id": user_id, "label": label}
+        result = await self.series.delete_one(key)
+        await self.readings.delete_many(key)
+        return result.deleted_count > 0
+
+
+# Global trend store instance (None unless BLOOD_GAS_TRENDS_ENABLED=true)
+blood_gas_trend_store: Optional[BloodGasTrendStore] = None
+
+
+def get_blood_gas_trend_store() -> Optional[BloodGasTrendStore]:
+    """Get the global trend store (None if trends are disabled)."""
+    return blood_gas_trend_store
+
+
+def init_blood_gas_trend_store(db=None) -> Optional[BloodGasTrendStore]:
+    """
+    Initialize the global trend store from environment configuration.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        BloodGasTrendStore instance, or None if BLOOD_GAS_TRENDS_ENABLED is
+        not true (or there is no database)
+    """
+    global blood_gas_trend_store
+    if os.environ.get('BLOOD_GAS_TRENDS_ENABLED', 'false').lower() != 'true' or db is None:
+        blood_gas_trend_store = None
+        logger.info("Blood gas trend storage disabled (BLOOD_GAS_TRENDS_ENABLED=false)")
+        return None
+
+    blood_gas_trend_store = BloodGasTrendStore(
+        db.blood_gas_trend_series,
+        db.blood_gas_trend_readings,
+        window=int(os.environ.get('BLOOD_GAS_TREND_WINDOW', DEFAULT_BLOOD_GAS_TREND_WINDOW)),
+        retention_days=int(os.environ.get('BLOOD_GAS_TREND_RETENTION_DAYS', DEFAULT_BLOOD_GAS_TREND_RETENTION_DAYS))
+    )
+    return blood_gas_trend_store
@@ -0,0 +1,253 @@
+"""
+=============================================================================
+GROWTH CHARTS - Server-side CDC Growth Chart Rendering (PNG / PDF)
+=============================================================================
+Draws CDC weight- and stature-for-age charts with a child's measurements so
+older ward phones no longer plot and export the chart in the browser.
+
+FLOW:
+1. static_layer(charts, sex): axes, grid and the P3-P97 curves from the LMS
+   tables (services/growth_percentiles.py), drawn once per chart / sex at
+   2x, downsampled for smooth curves, stacked and reduced to a palette
+   image, then cached for the process
+2. render_charts(): a copy of the cached layer plus the patient overlay
+   (points, connecting line, latest percentile) - the only per-request drawing
+3. render_growth_charts(): one or more charts as a PNG (stacked) or a PDF
+   (one page per chart)
+
+The palette layer keeps per-request PNG encoding to a few milliseconds (one
+byte per pixel instead of three); PDF pages are converted back to RGB so
+they are embedded as JPEG.
+
+Benchmark: python scripts/benchmark_growth_charts.py
+=============================================================================
+"""
+
+import io
+import math
+import os
+from functools import lru_cache
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from services.growth_percentiles import MEASURES, PERCENTILE_Z_SCORES, SEXES, get_growth_reference
+
+# Most measurements drawn on one chart
+GROWTH_CHART_MAX_POINTS = int(os.environ.get('GROWTH_CHART_MAX_POINTS', 100))
+
+CHART_WIDTH = 1000
+CHART_HEIGHT = 700
+# Static layers are drawn at this multiple of the chart size, then downsampled
+SUPERSAMPLE = 2
+# Plot area margins: left, top, right, bottom
+MARGINS = (70, 60, 50, 60)
+
+PNG_COMPRESS_LEVEL = 1  # Fast; the charts are flat colours and compress well anyway
+# Palette size of the cached layers (the overlay's few colours are added per request)
+STATIC_LAYER_COLORS = 128
+PDF_RESOLUTION = 100.0
+
+CHART_TITLES = {"weight": "Weight-for-age", "stature": "Stature-for-age"}
+SEX_TITLES = {"male": "Boys", "female": "Girls"}
+
+BACKGROUND = {"male": (239, 246, 255), "female": (253, 242, 248)}
+POINT_COLOR = {"male": (37, 99, 235), "female": (219, 39, 119)}
+LINE_COLOR = {"male": (220, 38, 38), "female": (37, 99, 235)}
+GRID_COLOR = (214, 219, 226)
+AXIS_COLOR = (71, 85, 105)
+CURVE_COLOR = (100, 116, 139)
+MEDIAN_COLOR = (30, 41, 59)
+TEXT_COLOR = (15, 23, 42)
+
+# Candidate y gridline steps; the smallest giving at most this many lines is used
+Y_STEPS = (1, 2, 5, 10, 20, 25, 50)
+MAX_Y_LINES = 20
+
+
+@lru_cache(maxsize=None)
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1: fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+# Smallest vertical gap between percentile labels at the right edge (px)
+LABEL_SPACING = 12
+
+
+class ChartGeometry:
+    """Data -> pixel mapping of one chart type (shared by both sexes)."""
+
+    def __init__(self, chart: str, scale: int = 1):
+        reference = get_growth_reference()
+        low = min(float(reference.curves(chart, sex)["P3"].min()) for sex in SEXES)
+        high = max(float(reference.curves(chart, sex)["P97"].max()) for sex in SEXES)
+        self.y_step = next(s for s in Y_STEPS if (high - low) / s <= MAX_Y_LINES)
+        self.y_min = math.floor(low / self.y_step) * self.y_step
+        self.y_max = math.ceil(high / self.y_step) * self.y_step
+        self.x_min, self.x_max = reference.age_range
+        self.scale = scale
+        left, top, right, bottom = (m * scale for m in MARGINS)
+        self.box = (left, top, CHART_WIDTH * scale - right, CHART_HEIGHT * scale - bottom)
+
+    def x(self, age_months):
+        left, _, right, _ = self.box
+        return left + (np.asarray(age_months) - self.x_min) / (self.x_max - self.x_min) * (right - left)
+
+    def y(self, value):
+        _, top, _, bottom = self.box
+        value = np.clip(np.asarray(value, dtype=np.float64), self.y_min, self.y_max)
+        return bottom - (value - self.y_min) / (self.y_max - self.y_min) * (bottom - top)
+
+
+@lru_cache(maxsize=None)
+def chart_geometry(chart: str, scale: int = 1) -> ChartGeometry:
+    return ChartGeometry(chart, scale)
+
+
+def _spread_labels(ys: Sequence[float], spacing: float) -> List[float]:
+    """Label positions at least ``spacing`` apart, keeping their order (top to bottom)."""
+    order = sorted(range(len(ys)), key=lambda i: ys[i])
+    placed = list(ys)
+    previous = -math.inf
+    for i in order:
+        placed[i] = max(ys[i], previous + spacing)
+        previous = placed[i]
+    return placed
+
+
+def _draw_static(chart: str, sex: str) -> Image.Image:
+    """Axes, grid and percentile curves of one chart, drawn at SUPERSAMPLE x and downsampled (RGB)."""
+    s = SUPERSAMPLE
+    geometry = chart_geometry(chart, s)
+    image = Image.new("RGB", (CHART_WIDTH * s, CHART_HEIGHT * s), BACKGROUND[sex])
+    draw = ImageDraw.Draw(image)
+    left, top, right, bottom = geometry.box
+    font, title_font = _font(12 * s), _font(18 * s)
+    draw.rectangle(geometry.box, fill=(255, 255, 255))
+
+    # Grid: every year / every y step, labels on the outside
+    for year in range(int(geometry.x_min // 12), int(geometry.x_max // 12) + 1):
+        x = float(geometry.x(year * 12))
+        draw.line([(x, top), (x, bottom)], fill=GRID_COLOR, width=s)
+        draw.text((x, bottom + 6 * s), str(year), fill=TEXT_COLOR, font=font, anchor="ma")
+    value = geometry.y_min
+    while value <= geometry.y_max:
+        y = float(geometry.y(value))
+        draw.line([(left, y), (right, y)], fill=GRID_COLOR, width=s)
+        draw.text((left - 6 * s, y), f"{value:g}", fill=TEXT_COLOR, font=font, anchor="rm")
+        value += geometry.y_step
+    draw.rectangle(geometry.box, outline=AXIS_COLOR, width=2 * s)
+
+    # Percentile curves, labelled at the right end
+    reference = get_growth_reference()
+    xs = geometry.x(reference.ages)
+    curves = reference.curves(chart, sex)
+    label_ys = _spread_labels([float(geometry.y(curve[-1])) for curve in curves.values()], LABEL_SPACING * s)
+    for (name, curve), label_y in zip(curves.items(), label_ys):
+        ys = geometry.y(curve)
+        median = PERCENTILE_Z_SCORES[name] == 0
+        draw.line(list(zip(xs.tolist(), ys.tolist())), fill=MEDIAN_COLOR if median else CURVE_COLOR,
+                  width=(3 if median else 2) * s, joint="curve")
+        draw.text((right + 6 * s, label_y), name[1:], fill=TEXT_COLOR, font=font, anchor="lm")
+
+    unit = MEASURES[chart][1]
+    draw.text((CHART_WIDTH * s / 2, 20 * s), f"CDC {CHART_TITLES[chart]} - {SEX_TITLES[sex]} (2-20 years)",
+              fill=TEXT_COLOR, font=title_font, anchor="mm")
+    draw.text(((left + right) / 2, CHART_HEIGHT * s - 18 * s), "Age (years)", fill=TEXT_COLOR, font=font,
+              anchor="mm")
+    draw.text((left, top - 10 * s), f"{chart.capitalize()} ({unit})", fill=TEXT_COLOR, font=font, anchor="ld")
+    return image.resize((CHART_WIDTH, CHART_HEIGHT), Image.LANCZOS)
+
+
+@lru_cache(maxsize=None)
+def static_layer(charts: Tuple[str, ...], sex: str) -> Image.Image:
+    """
+    The static layers of charts stacked top to bottom, as one palette image.
+
+    Cached per chart combination and sex; copy before drawing on it.
+    """
+    sheet = Image.new("RGB", (CHART_WIDTH, CHART_HEIGHT * len(charts)))
+    for i, chart in enumerate(charts):
+        sheet.paste(_draw_static(chart, sex), (0, CHART_HEIGHT * i))
+    return sheet.quantize(colors=STATIC_LAYER_COLORS, method=Image.Quantize.MEDIANCUT)
+
+
+def _draw_overlay(draw: ImageDraw.ImageDraw, chart: str, sex: str,
+                  measurements: Sequence[Mapping[str, Optional[float]]], y_offset: int = 0):
+    """The patient's points of one chart's measure, its connecting line and the latest percentile."""
+    points = sorted((m["age_months"], m[chart]) for m in measurements if m.get(chart) is not None)
+    if not points:
+        return
+
+    geometry = chart_geometry(chart)
+    ages = np.array([age for age, _ in points])
+    values = np.array([value for _, value in points])
+    coords = list(zip(geometry.x(ages).tolist(), (geometry.y(values) + y_offset).tolist()))
+    if len(coords) > 1:
+        draw.line(coords, fill=LINE_COLOR[sex], width=3, joint="curve")
+    radius = 6
+    for x, y in coords:
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=POINT_COLOR[sex],
+                     outline=(255, 255, 255), width=2)
+
+    # Latest measurement's percentile in the top-left corner of the plot
+    percentile = get_growth_reference().percentiles(chart, [SEXES.index(sex)], ages[-1:], values[-1:])[0]
+    left, top, _, _ = geometry.box
+    draw.text((left + 10, top + 10 + y_offset),
+              f"Latest: {values[-1]:g} {MEASURES[chart][1]} at {ages[-1] / 12:.1f} y - P{percentile:.0f}",
+              fill=POINT_COLOR[sex], font=_font(14), anchor="la")
+
+
+def render_charts(charts: Sequence[str], sex: str, measurements: Sequence[Mapping[str, Optional[float]]]) -> Image.Image:
+    """
+    Charts stacked top to bottom with the patient's measurements.
+
+    Args:
+        charts: Keys of MEASURES
+        sex: "male" or "female"
+        measurements: Dicts with age_months and any measure values (missing ones are skipped)
+
+    Returns:
+        Palette image of CHART_WIDTH x (CHART_HEIGHT per chart)
+    """
+    image = static_layer(tuple(charts), sex).copy()
+    draw = ImageDraw.Draw(image)
+    for i, chart in enumerate(charts):
+        _draw_overlay(draw, chart, sex, measurements, y_offset=CHART_HEIGHT * i)
+    return image
+
+
+def render_growth_charts(sex: str, charts: Sequence[str], measurements: Sequence[Mapping[str, Optional[float]]],
+                         image_format: str = "png") -> bytes:
+    """
+    Encode one or more charts: PNG stacks them vertically, PDF puts each on its own page.
+
+    Returns:
+        The encoded file
+    """
+    buffer = io.BytesIO()
+    if image_format == "pdf":
+        pages = [render_charts([chart], sex, measurements).convert("RGB") for chart in charts]
+        pages[0].save(buffer, format="PDF", resolution=PDF_RESOLUTION, save_all=True, append_images=pages[1:])
+    else:
+        render_charts(charts, sex, measurements).save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+def warm_static_layers():
+    """Draw the single-chart layers now (startup) instead of on the first request."""
+    for chart in MEASURES:
+        for sex in SEXES:
+            static_layer((chart,), sex)
+
+
+MEDIA_TYPES = {"png": "image/png", "pdf": "application/pdf"}
+
+
+def chart_filename(sex: str, charts: Sequence[str], image_format: str) -> str:
+    """Download name, e.g. cdc-stature-weight-girls.pdf"""
+    return f"cdc-{'-'.join(charts)}-{SEX_TITLES[sex].lower()}.{image_format}"
@@ -0,0 +1,221 @@
+"""
+=============================================================================
+GROWTH PERCENTILES - CDC 2000 LMS Z-Scores and Percentiles (2-20 years)
+=============================================================================
+Weight-for-age and stature-for-age z-scores and percentiles from the CDC
+LMS reference tables (data/cdc/cdc_wtage.csv, cdc_statage.csv), computed
+server-side so the browser no longer downloads the tables.
+
+FLOW:
+1. load_growth_reference(): each CSV is read once into one contiguous
+   float64 array per measure, shape (sex, age row, L/M/S)
+2. lms(): L, M, S for every (sex, age) by linear interpolation between the
+   table rows (24, 24.5, 25.5, ... 239.5, 240 months)
+3. z_scores() / percentiles() / values_at(): the LMS transform over whole
+   arrays, so one child and a whole clinic list cost the same few NumPy calls
+
+FORMULAS (Cole's LMS method):
+- Z = ((X / M) ** L - 1) / (L * S), or ln(X / M) / S when L ~ 0
+- X = M * (1 + L * S * Z) ** (1 / L), or M * exp(S * Z) when L ~ 0
+- Percentile = 100 * Phi(Z)
+
+Ages outside 24-240 months have no reference and give NaN (no
+extrapolation).
+=============================================================================
+"""
+
+import csv
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr
+except ImportError:  # scipy is optional: fall back to math.erf per element
+    _erf = np.frompyfunc(math.erf, 1, 1)
+
+    def ndtr(z):
+        z = np.asarray(z, dtype=np.float64)
+        return 0.5 * (1.0 + _erf(z / math.sqrt(2.0)).astype(np.float64))
+
+logger = logging.getLogger(__name__)
+
+# Most measurements accepted by one percentile request
+GROWTH_BATCH_MAX = int(os.environ.get('GROWTH_BATCH_MAX', 1000))
+
+GROWTH_DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "cdc"
+
+# measure -> (CSV file, unit)
+MEASURES = {
+    "weight": ("cdc_wtage.csv", "kg"),
+    "stature": ("cdc_statage.csv", "cm"),
+}
+
+# Index 0 / 1 of the tables' sex axis (CDC codes Sex=1 / Sex=2)
+SEXES = ("male", "female")
+
+# The CDC chart percentiles and their z-scores
+PERCENTILE_Z_SCORES = {
+    "P3": -1.880793608,
+    "P5": -1.644853627,
+    "P10": -1.281551566,
+    "P25": -0.674489750,
+    "P50": 0.0,
+    "P75": 0.674489750,
+    "P90": 1.281551566,
+    "P95": 1.644853627,
+    "P97": 1.880793608,
+}
+
+# |L| below which the log form of the LMS transform is used
+L_EPSILON = 1e-4
+
+
+class GrowthReference:
+    """
+    The LMS tables of all measures, on one shared age axis.
+
+    Attributes:
+        ages: Table ages in months, ascending (n,)
+        tables: measure -> C-contiguous array (len(SEXES), n, 3) of L, M, S
+    """
+
+    def __init__(self, ages: np.ndarray, tables: Dict[str, np.ndarray]):
+        self.ages = ages
+        self.tables = tables
+
+    @property
+    def age_range(self) -> Tuple[float, float]:
+        return float(self.ages[0]), float(self.ages[-1])
+
+    def lms(self, measure: str, sex: np.ndarray, age_months: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        L, M, S per sample, interpolated between the surrounding table rows.
+
+        Args:
+            measure: Key of MEASURES
+            sex: Sex index per sample (0 male, 1 female)
+            age_months: Age per sample
+
+        Returns:
+            L, M, S arrays (NaN where the age is outside the table)
+        """
+        table = self.tables[measure]
+        ages = self.ages
+        sex = np.asarray(sex, dtype=np.intp)
+        age = np.asarray(age_months, dtype=np.float64)
+        row = np.clip(np.searchsorted(ages, age, side="right") - 1, 0, len(ages) - 2)
+        frac = (age - ages[row]) / (ages[row + 1] - ages[row])
+        frac = np.where((age >= ages[0]) & (age <= ages[-1]), frac, np.nan)[:, None]
+        params = table[sex, row] * (1.0 - frac) + table[sex, row + 1] * frac
+        return params[:, 0], params[:, 1], params[:, 2]
+
+    def z_scores(self, measure: str, sex: np.ndarray, age_months: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Z-score per sample (NaN for a missing value or an age outside the table)."""
+        L, M, S = self.lms(measure, sex, age_months)
+        x = np.asarray(values, dtype=np.float64)
+        with np.errstate(all='ignore'):
+            log_form = np.log(x / M) / S
+            power_form = (np.power(x / M, L) - 1.0) / (L * S)
+            return np.where(np.abs(L) < L_EPSILON, log_form, power_form)
+
+    def percentiles(self, measure: str, sex: np.ndarray, age_months: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Percentile (0-100) per sample."""
+        return 100.0 * ndtr(self.z_scores(measure, sex, age_months, values))
+
+    def values_at(self, measure: str, sex: np.ndarray, age_months: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Measurement at z-score z per sample (the inverse of z_scores())."""
+        L, M, S = self.lms(measure, sex, age_months)
+        z = np.asarray(z, dtype=np.float64)
+        with np.errstate(all='ignore'):
+            log_form = M * np.exp(S * z)
+            power_form = M * np.power(1.0 + L * S * z, 1.0 / L)
+            return np.where(np.abs(L) < L_EPSILON, log_form, power_form)
+
+    def curves(self, measure: str, sex: str) -> Dict[str, np.ndarray]:
+        """PERCENTILE_Z_SCORES curves at every table age, for drawing a chart."""
+        index = np.full(len(self.ages), SEXES.index(sex))
+        return {
+            name: self.values_at(measure, index, self.ages, np.full(len(self.ages), z))
+            for name, z in PERCENTILE_Z_SCORES.items()
+        }
+
+
+def _read_table(path: Path) -> Tuple[np.ndarray, np.ndarray]:
+    """Ages and the (sex, age, L/M/S) array of one CDC LMS CSV."""
+    rows: Dict[int, list] = {code: [] for code in range(1, len(SEXES) + 1)}
+    with open(path, newline="") as f:
+        for record in csv.DictReader(f):
+            rows[int(record["Sex"])].append(
+                (float(record["Agemos"]), float(record["L"]), float(record["M"]), float(record["S"]))
+            )
+    per_sex = [np.array(sorted(rows[code]), dtype=np.float64) for code in sorted(rows)]
+    ages = per_sex[0][:, 0]
+    if any(not np.array_equal(table[:, 0], ages) for table in per_sex):
+        raise ValueError(f"{path.name}: sexes have different age rows")
+    return ages, np.ascontiguousarray(np.stack([table[:, 1:] for table in per_sex]))
+
+
+def load_growth_reference(data_dir: Path = GROWTH_DATA_DIR) -> GrowthReference:
+    """Read every MEASURES table from data_dir."""
+    ages = None
+    tables = {}
+    for measure, (filename, _) in MEASURES.items():
+        table_ages, tables[measure] = _read_table(Path(data_dir) / filename)
+        if ages is None:
+            ages = table_ages
+        elif not np.array_equal(ages, table_ages):
+            raise ValueError(f"{filename}: age rows differ from the other tables")
+    return GrowthReference(ages, tables)
+
+
+def _result(value: Optional[float], z: float, percentile: float) -> Optional[Dict[str, float]]:
+    if value is None or z != z:  # NaN
+        return None
+    return {"value": value, "z": round(z, 2), "percentile": round(percentile, 1)}
+
+
+def assess(measurements: Sequence[Dict], reference: Optional["GrowthReference"] = None) -> list:
+    """
+    Z-scores and percentiles for many children at once.
+
+    Args:
+        measurements: Dicts with sex ("male" / "female"), age_months and
+            any of the MEASURES values (missing or None allowed)
+        reference: Tables to use (default: get_growth_reference())
+
+    Returns:
+        Per measurement, in order: {"sex", "age_months", <measure>:
+        {"value", "z", "percentile"} or None per MEASURES key}
+    """
+    reference = reference or get_growth_reference()
+    if not measurements:
+        return []
+    sex = np.array([SEXES.index(m["sex"]) for m in measurements], dtype=np.intp)
+    age = np.array([m["age_months"] for m in measurements], dtype=np.float64)
+    results = [{"sex": m["sex"], "age_months": m["age_months"]} for m in measurements]
+    for measure in MEASURES:
+        values = [m.get(measure) for m in measurements]
+        x = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        z = reference.z_scores(measure, sex, age, x)
+        percentile = 100.0 * ndtr(z)
+        for result, value, zi, pi in zip(results, values, z.tolist(), percentile.tolist()):
+            result[measure] = _result(value, zi, pi)
+    return results
+
+
+# Global reference tables (loaded on first use)
+growth_reference: Optional[GrowthReference] = None
+
+
+def get_growth_reference() -> GrowthReference:
+    """Get the global growth reference, loading the tables on first use."""
+    global growth_reference
+    if growth_reference is None:
+        growth_reference = load_growth_reference()
+        logger.info(f"Loaded CDC growth tables: {', '.join(MEASURES)} ({len(growth_reference.ages)} ages)")
+    return growth_reference
@@ -0,0 +1,203 @@
+"""
+=============================================================================
+OCR RESULT CACHE - Content-Hash Cache for OCR / Blood Gas Image Analysis
+=============================================================================
+Clinicians often re-upload the same photo (retry after a network blip,
+switching between the offline and LLM blood gas endpoints). This cache
+returns the previous OCRResult instead of re-running decode, preprocessing
+and Tesseract.
+
+KEY FEATURES:
+- Key: SHA-256 of the decoded image bytes + language / psm / enhanced
+- In-process LRU with TTL (per API process)
+- Optional Mongo backing (``ocr_cache`` collection with a TTL index) so
+  all API processes share hits
+- Hit / miss counters for the admin OCR stats endpoint
+
+PRIVACY: Only the OCRResult is stored - never the image. Entries expire
+after OCR_CACHE_TTL_SECONDS in memory and via the Mongo TTL index.
+
+CONFIGURATION (environment variables):
+- OCR_CACHE_ENABLED: Enable the cache (default: true)
+- OCR_CACHE_MAX_ENTRIES: In-process LRU size (default: 256)
+- OCR_CACHE_TTL_SECONDS: Entry lifetime (default: 600)
+- OCR_CACHE_MONGO: Also store entries in Mongo (default: false)
+=============================================================================
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_CACHE_MAX_ENTRIES = 256
+DEFAULT_OCR_CACHE_TTL_SECONDS = 600
+
+
+class OCRResultCache:
+    """
+    Two-level cache of OCRResult objects keyed by image content hash.
+
+    Level 1 is an in-process LRU (OrderedDict, most recent at the end);
+    level 2, when a collection is given, is Mongo with a TTL index.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_OCR_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = DEFAULT_OCR_CACHE_TTL_SECONDS,
+                 collection=None):
+        """
+        Args:
+            max_entries: Max entries held in process memory
+            ttl_seconds: Lifetime of an entry in both levels
+            collection: Optional Motor collection for the shared level
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.collection = collection
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(image_bytes: bytes, language: str, psm_mode: int, enhanced: bool) -> str:
+        """Cache key from the decoded image bytes and the OCR options."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        return f"{digest}:{language}:{psm_mode}:{int(enhanced)}"
+
+    async def ensure_indexes(self):
+        """Create the TTL and key indexes on the Mongo collection."""
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0, name="ocr_cache_ttl")
+            await self.collection.create_index("key", unique=True, name="ocr_cache_key")
+            logger.info("Created indexes for ocr_cache collection")
+        except Exception as e:
+            # Index might already exist
+            logger.debug(f"OCR cache index creation: {e}")
+
+    async def get(self, key: str):
+        """Return a copy of the cached OCRResult, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+            del self._entries[key]
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one(
+                    {'key': key, 'expires_at': {'$gt': datetime.now(timezone.utc)}},
+                    {'_id': 0, 'result': 1}
+                )
+            except Exception as e:
+                logger.warning(f"OCR cache lookup failed: {e}")
+                doc = None
+            if doc:
+                result = _result_from_dict(doc['result'])
+                self._store_local(key, result)
+                self.hits += 1
+                self.mongo_hits += 1
+                return copy.deepcopy(result)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result) -> None:
+        """Cache a successful OCRResult under ``key``."""
+        self._store_local(key, copy.deepcopy(result))
+
+        if self.collection is not None:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.update_one(
+                    {'key': key},
+                    {'$set': {
+                        'key': key,
+                        'result': asdict(result),
+                        'created_at': now,
+                        # BSON date - the TTL index ignores string dates
+                        'expires_at': now + timedelta(seconds=self.ttl_seconds)
+                    }},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"OCR cache store failed: {e}")
+
+    def _store_local(self, key: str, result) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this API process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "mongo_backed": self.collection is not None
+        }
+
+
+def _result_from_dict(data: Dict[str, Any]):
+    """Rebuild an OCRResult stored with dataclasses.asdict()."""
+    # Import here to avoid circular imports (ocr_service uses this cache)
+    from services.ocr_service import OCRResult, OCRBlock
+
+    data = dict(data)
+    data['ocr_blocks'] = [OCRBlock(**b) for b in data.get('ocr_blocks', [])]
+    return OCRResult(**data)
+
+
+# Global OCR cache instance (initialized in server.py)
+ocr_cache: Optional[OCRResultCache] = None
+
+
+def get_ocr_cache() -> Optional[OCRResultCache]:
+    """Get the global OCR cache (None if disabled or not initialized)."""
+    return ocr_cache
+
+
+def init_ocr_cache(db=None) -> Optional[OCRResultCache]:
+    """
+    Initialize the global OCR cache from environment configuration.
+
+    Args:
+        db: MongoDB database instance (used only if OCR_CACHE_MONGO=true)
+
+    Returns:
+        OCRResultCache instance, or None if OCR_CACHE_ENABLED=false
+    """
+    global ocr_cache
+    if os.environ.get('OCR_CACHE_ENABLED', 'true').lower() != 'true':
+        ocr_cache = None
+        logger.info("OCR result cache disabled (OCR_CACHE_ENABLED=false)")
+        return None
+
+    use_mongo = os.environ.get('OCR_CACHE_MONGO', 'false').lower() == 'true'
+    ocr_cache = OCRResultCache(
+        max_entries=int(os.environ.get('OCR_CACHE_MAX_ENTRIES', DEFAULT_OCR_CACHE_MAX_ENTRIES)),
+        ttl_seconds=int(os.environ.get('OCR_CACHE_TTL_SECONDS', DEFAULT_OCR_CACHE_TTL_SECONDS)),
+        collection=db.ocr_cache if (use_mongo and db is not None) else None
+    )
+    return ocr_cache
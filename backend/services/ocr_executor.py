@@ -0,0 +1,303 @@
+"""
+=============================================================================
+OCR EXECUTOR - Bounded Process Pool for CPU-bound OCR Work
+=============================================================================
+Tesseract and OpenCV preprocessing are CPU-bound and can take several
+seconds per blood gas photo. Running them inline inside an ``async`` route
+freezes the uvicorn event loop, so unrelated requests (``/api/auth/me``,
+content browsing, ``/health``) stall behind every upload.
+
+This module owns a dedicated process pool for OCR jobs:
+- Configurable number of worker processes
+- Queue depth limit (jobs beyond it are rejected instead of piling up)
+- Per-job timeout (the caller stops waiting and the job is cancelled; a job
+  already running keeps its worker, and its slot, until it finishes)
+- Cancellation when the awaiting request is cancelled (client disconnect)
+- Recent job durations, used to estimate Retry-After for rejected requests
+
+CONFIGURATION (environment variables):
+- OCR_WORKERS: Number of worker processes (default: 2)
+- OCR_MAX_QUEUE_DEPTH: Jobs allowed to wait for a free worker (default: 8)
+- OCR_JOB_TIMEOUT_SECONDS: Max seconds a caller waits for a job (default: 30)
+
+NOTE: The global executor is initialized in server.py lifespan. When it is
+not initialized (scripts, unit tests) callers fall back to a thread so the
+event loop is still never blocked.
+=============================================================================
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_WORKERS = 2
+DEFAULT_OCR_MAX_QUEUE_DEPTH = 8
+DEFAULT_OCR_JOB_TIMEOUT_SECONDS = 30.0
+
+# Retry-After estimation: window of recent job durations, and the assumed
+# duration of a job before any have completed
+JOB_DURATION_WINDOW = 50
+DEFAULT_JOB_SECONDS_ESTIMATE = 5.0
+
+
+class OCRExecutorError(Exception):
+    """Base class for OCR executor failures."""
+
+
+class OCRQueueFullError(OCRExecutorError):
+    """Raised when the OCR queue is at capacity and the job is rejected."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OCRJobTimeoutError(OCRExecutorError):
+    """Raised when an OCR job does not finish within the configured timeout."""
+
+
+def _run_timed(fn: Callable[..., Any], args: tuple, kwargs: dict):
+    """Worker-side wrapper returning (seconds spent in fn, result)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+class OCRExecutor:
+    """
+    Bounded process pool for OCR jobs.
+
+    Capacity is ``max_workers`` running jobs plus ``max_queue_depth`` waiting
+    jobs. Submissions beyond that raise OCRQueueFullError immediately so the
+    route can answer 503 instead of holding the connection open.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_OCR_WORKERS,
+        max_queue_depth: int = DEFAULT_OCR_MAX_QUEUE_DEPTH,
+        job_timeout: float = DEFAULT_OCR_JOB_TIMEOUT_SECONDS,
+        initializer: Optional[Callable[..., None]] = None
+    ):
+        """
+        Initialize the executor (the pool itself is created by start()).
+
+        Args:
+            max_workers: Number of worker processes
+            max_queue_depth: Jobs allowed to wait for a free worker
+            job_timeout: Seconds a caller waits before the job is cancelled
+            initializer: Optional callable run once in each worker process
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self.job_timeout = job_timeout
+        self.initializer = initializer
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        # Jobs finish on the pool's management thread (done callbacks)
+        self._pending_lock = threading.Lock()
+        self._durations = deque(maxlen=JOB_DURATION_WINDOW)
+        self.rejected_total = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs (running + queued) accepted at once."""
+        return self.max_workers + self.max_queue_depth
+
+    @property
+    def pending_jobs(self) -> int:
+        """Jobs currently running or waiting for a worker."""
+        return self._pending
+
+    @property
+    def running_jobs(self) -> int:
+        """Jobs currently occupying a worker (approximate: pending capped at workers)."""
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queued_jobs(self) -> int:
+        """Jobs waiting for a free worker (queue-depth gauge)."""
+        return max(0, self._pending - self.max_workers)
+
+    @property
+    def recent_job_seconds(self) -> Optional[float]:
+        """Mean worker-side duration of recently completed jobs."""
+        if not self._durations:
+            return None
+        return sum(self._durations) / len(self._durations)
+
+    def estimate_wait_seconds(self, backlog: Optional[int] = None) -> int:
+        """
+        Estimate seconds until a new job could start, for Retry-After.
+
+        With ``backlog`` jobs ahead and ``max_workers`` running in parallel,
+        a slot frees after roughly (backlog - workers + 1) / workers mean job
+        durations. Clamped to [1, job_timeout].
+
+        Args:
+            backlog: Jobs ahead of the caller (default: pending jobs)
+        """
+        backlog = self._pending if backlog is None else backlog
+        job_seconds = self.recent_job_seconds or DEFAULT_JOB_SECONDS_ESTIMATE
+        waves = max(1, backlog - self.max_workers + 1) / self.max_workers
+        return int(min(max(1, math.ceil(job_seconds * waves)), max(1, math.ceil(self.job_timeout))))
+
+    def start(self):
+        """Create the worker process pool."""
+        if self._pool is not None:
+            return
+        # spawn: workers must not inherit the event loop, Mongo client or
+        # scheduler threads of the API process
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer
+        )
+        logger.info(
+            f"[OCR] Worker pool started: workers={self.max_workers}, "
+            f"max_queue_depth={self.max_queue_depth}, timeout={self.job_timeout}s"
+        )
+
+    def stats(self) -> dict:
+        """Pool gauges for the admin metrics endpoint."""
+        job_seconds = self.recent_job_seconds
+        return {
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "pending_jobs": self._pending,
+            "running_jobs": self.running_jobs,
+            "queued_jobs": self.queued_jobs,
+            "rejected_total": self.rejected_total,
+            "recent_job_seconds": round(job_seconds, 3) if job_seconds is not None else None
+        }
+
+    def stop(self):
+        """Shut the pool down, cancelling jobs that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("[OCR] Worker pool stopped")
+
+    def _restart_broken_pool(self, broken: Optional[ProcessPoolExecutor]):
+        """
+        Replace a pool whose worker died (e.g. OOM-killed on a huge image).
+
+        Every job on the broken pool fails with BrokenProcessPool; only the
+        first caller restarts it, later ones must not shut down the fresh
+        pool (and cancel the healthy jobs queued on it).
+        """
+        if broken is not None and self._pool is not broken:
+            return
+        logger.error("[OCR] Worker pool is broken - restarting")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.start()
+
+    def _job_done(self, future=None):
+        """A job left the pool (finished, failed or cancelled before it started)."""
+        with self._pending_lock:
+            self._pending -= 1
+
+    async def submit(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` in a worker process and await the result.
+
+        ``fn`` and its arguments must be picklable (module-level function,
+        plain data arguments).
+
+        Args:
+            fn: Module-level function to execute
+            timeout: Override for the configured per-job timeout
+
+        Returns:
+            The function's return value
+
+        Raises:
+            OCRQueueFullError: If running + queued jobs are at capacity
+            OCRJobTimeoutError: If the job does not finish in time
+        """
+        if self._pool is None:
+            self.start()
+
+        if self._pending >= self.capacity:
+            self.rejected_total += 1
+            raise OCRQueueFullError(
+                f"OCR queue is full ({self._pending} jobs pending, capacity {self.capacity})",
+                retry_after=self.estimate_wait_seconds()
+            )
+
+        timeout = self.job_timeout if timeout is None else timeout
+
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            pool = self._pool
+            try:
+                future = pool.submit(_run_timed, fn, args, kwargs)
+            except BrokenProcessPool:
+                self._restart_broken_pool(pool)
+                pool = self._pool
+                future = pool.submit(_run_timed, fn, args, kwargs)
+        except BaseException:
+            self._job_done()
+            raise
+        # The job counts as pending until it leaves the pool, not until the
+        # caller stops waiting: a timed-out job keeps running in its worker
+        future.add_done_callback(self._job_done)
+
+        try:
+            seconds, result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+            self._durations.append(seconds)
+            return result
+        except asyncio.TimeoutError:
+            # Drops the job if it is still queued; a job already running in
+            # a worker finishes there and its result is discarded
+            future.cancel()
+            raise OCRJobTimeoutError(f"OCR job exceeded {timeout:.0f}s timeout")
+        except asyncio.CancelledError:
+            # Client went away - don't spend a worker on an orphaned job
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            self._restart_broken_pool(pool)
+            raise
+
+
+# Global OCR executor instance (initialized in server.py)
+ocr_executor: Optional[OCRExecutor] = None
+
+
+def get_ocr_executor() -> Optional[OCRExecutor]:
+    """Get the global OCR executor instance (None if not initialized)."""
+    return ocr_executor
+
+
+def init_ocr_executor(initializer: Optional[Callable[..., None]] = None) -> OCRExecutor:
+    """
+    Initialize the global OCR executor from environment configuration.
+
+    Args:
+        initializer: Optional callable run once in each worker process
+
+    Returns:
+        Initialized (not yet started) OCRExecutor instance
+    """
+    global ocr_executor
+    ocr_executor = OCRExecutor(
+        max_workers=int(os.environ.get('OCR_WORKERS', DEFAULT_OCR_WORKERS)),
+        max_queue_depth=int(os.environ.get('OCR_MAX_QUEUE_DEPTH', DEFAULT_OCR_MAX_QUEUE_DEPTH)),
+        job_timeout=float(os.environ.get('OCR_JOB_TIMEOUT_SECONDS', DEFAULT_OCR_JOB_TIMEOUT_SECONDS)),
+        initializer=initializer
+    )
+    return ocr_executor
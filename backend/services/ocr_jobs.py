@@ -0,0 +1,329 @@
+"""
+=============================================================================
+OCR JOBS - Asynchronous OCR Jobs with Polling and Result Retention
+=============================================================================
+On poor hospital Wi-Fi a mobile client can lose the connection while it
+waits several seconds for a synchronous OCR response, and retrying starts
+over. With jobs, the upload returns a job id at once, the OCR runs in the
+worker pool in the background, and the client polls (or long-polls) for the
+finished response. Reconnecting never restarts the work.
+
+FLOW:
+1. POST /api/ocr/jobs        -> 202 {"job_id", "status": "pending", ...}
+2. GET  /api/ocr/jobs/{id}   -> {"status": "pending" | "done" | "failed", ...}
+   ?wait=N blocks up to N seconds (capped) until the job finishes
+3. Finished jobs are kept for OCR_JOB_RESULT_TTL_SECONDS, then return 404
+
+KEY FEATURES:
+- Job ids are random (secrets.token_urlsafe) - results contain PHI
+- The job result is exactly the response of the matching synchronous
+  endpoint (/api/ocr, /api/blood-gas/analyze-image[-offline])
+- Accepted jobs wait (pending) for room in the OCR worker pool instead of
+  failing when its queue is full; at most the pool's capacity of jobs are
+  in it at once
+- Mongo backing (``ocr_jobs`` collection with a TTL index) so a poll
+  reaching another API process still finds the job
+
+CONFIGURATION (environment variables):
+- OCR_JOB_RESULT_TTL_SECONDS: How long finished jobs are kept (default: 300)
+- OCR_JOBS_MAX: Jobs (running + retained) per API process (default: 200)
+- OCR_JOB_MAX_WAIT_SECONDS: Longest long-poll wait (default: 25)
+- OCR_JOBS_MONGO: Also store jobs in Mongo (default: true). With false,
+  jobs only live in the API process that accepted them - run a single
+  uvicorn worker or sticky sessions
+=============================================================================
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Dict, Optional
+
+from services.ocr_executor import OCRQueueFullError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_JOB_RESULT_TTL_SECONDS = 300
+DEFAULT_OCR_JOBS_MAX = 200
+DEFAULT_OCR_JOB_MAX_WAIT_SECONDS = 25.0
+
+# Interval between Mongo reads when long-polling a job owned by another process
+MONGO_POLL_INTERVAL_SECONDS = 0.5
+
+# Interval between checks for a free OCR worker pool slot
+CAPACITY_POLL_SECONDS = 0.1
+
+JOB_PENDING = "pending"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class OCRJob:
+    """A background OCR job and, once finished, its response or error."""
+    job_id: str
+    kind: str
+    status: str = JOB_PENDING
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: Optional[float] = None  # time.monotonic() deadline once finished
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Status response body for the polling endpoint."""
+        body = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at.isoformat()
+        }
+        if self.status == JOB_DONE:
+            body["result"] = self.result
+        elif self.status == JOB_FAILED:
+            body["error"] = self.error
+        if self.expires_at is not None:
+            body["expires_in_seconds"] = max(0, int(self.expires_at - time.monotonic()))
+        return body
+
+
+class OCRJobStore:
+    """
+    In-process registry of OCR jobs with TTL retention of finished jobs.
+
+    Jobs run as asyncio tasks in the API process; the OCR itself runs in the
+    OCR worker pool, so a job never blocks the event loop. A job only starts
+    its work once the pool has a free slot, so accepted jobs queue here
+    rather than being rejected by the pool.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_OCR_JOB_RESULT_TTL_SECONDS,
+                 max_jobs: int = DEFAULT_OCR_JOBS_MAX,
+                 max_wait_seconds: float = DEFAULT_OCR_JOB_MAX_WAIT_SECONDS,
+                 collection=None,
+                 executor=None):
+        """
+        Args:
+            ttl_seconds: Lifetime of a finished job
+            max_jobs: Max running + retained jobs held in process memory
+            max_wait_seconds: Cap on the long-poll wait
+            collection: Optional Motor collection shared by all API processes
+            executor: OCRExecutor the jobs run in (None: no capacity wait)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max(1, max_jobs)
+        self.max_wait_seconds = max_wait_seconds
+        self.collection = collection
+        self.executor = executor
+        # Jobs in the worker pool at once; the others wait pending
+        self._slots = asyncio.Semaphore(executor.capacity if executor is not None else self.max_jobs)
+        self._jobs: Dict[str, OCRJob] = {}
+        self.submitted = 0
+        self.rejected = 0
+
+    async def ensure_indexes(self):
+        """Create the TTL and job id indexes on the Mongo collection."""
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0, name="ocr_jobs_ttl")
+            await self.collection.create_index("job_id", unique=True, name="ocr_jobs_job_id")
+            logger.info("Created indexes for ocr_jobs collection")
+        except Exception as e:
+            # Index might already exist
+            logger.debug(f"OCR jobs index creation: {e}")
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        for job_id in [j.job_id for j in self._jobs.values() if j.expires_at is not None and j.expires_at <= now]:
+            del self._jobs[job_id]
+
+    async def submit(self, kind: str, work: Awaitable[Dict[str, Any]]) -> OCRJob:
+        """
+        Start ``work`` (a coroutine returning the response dict) as a job.
+
+        Raises:
+            OCRQueueFullError: If this process already holds max_jobs jobs
+        """
+        self._purge_expired()
+        if len(self._jobs) >= self.max_jobs:
+            self.rejected += 1
+            work.close()
+            raise OCRQueueFullError(f"OCR job store is full ({len(self._jobs)} jobs)", retry_after=5)
+
+        job = OCRJob(job_id=secrets.token_urlsafe(16), kind=kind)
+        self._jobs[job.job_id] = job
+        self.submitted += 1
+        await self._persist(job)
+        job.task = asyncio.create_task(self._run(job, work))
+        return job
+
+    async def _wait_for_capacity(self):
+        """Wait until the worker pool has a free slot (synchronous requests share it)."""
+        while self.executor is not None and self.executor.pending_jobs >= self.executor.capacity:
+            await asyncio.sleep(CAPACITY_POLL_SECONDS)
+
+    async def _run(self, job: OCRJob, work: Awaitable[Dict[str, Any]]):
+        try:
+            async with self._slots:
+                await self._wait_for_capacity()
+                job.result = await work
+            job.status = JOB_DONE
+        except asyncio.CancelledError:
+            work.close()  # Not started if cancelled while waiting for a slot
+            job.status = JOB_FAILED
+            job.error = {"status_code": 503, "detail": "OCR job was cancelled (server shutting down)."}
+            raise
+        except Exception as e:
+            # Routes raise HTTPException (503 busy, 504 timeout, ...) - keep
+            # its status and message for the client
+            if not hasattr(e, "status_code"):
+                logger.error(f"OCR job {job.job_id} failed: {e}")
+            job.status = JOB_FAILED
+            job.error = {
+                "status_code": getattr(e, "status_code", 500),
+                "detail": getattr(e, "detail", None) or "OCR processing failed."
+            }
+        finally:
+            job.expires_at = time.monotonic() + self.ttl_seconds
+            job.done.set()
+            await self._persist(job)
+
+    async def _persist(self, job: OCRJob):
+        if self.collection is None:
+            return
+        now = datetime.now(timezone.utc)
+        # A pending job whose API process died is dropped after an hour
+        lifetime = self.ttl_seconds if job.done.is_set() else 3600
+        try:
+            await self.collection.update_one(
+                {'job_id': job.job_id},
+                {'$set': {
+                    'job_id': job.job_id,
+                    'kind': job.kind,
+                    'status': job.status,
+                    'created_at': job.created_at,
+                    'result': job.result,
+                    'error': job.error,
+                    # BSON date - the TTL index ignores string dates
+                    'expires_at': now + timedelta(seconds=lifetime)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"OCR job store failed: {e}")
+
+    async def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status body of a job stored by any API process (Mongo level)."""
+        try:
+            doc = await self.collection.find_one(
+                {'job_id': job_id, 'expires_at': {'$gt': datetime.now(timezone.utc)}},
+                {'_id': 0}
+            )
+        except Exception as e:
+            logger.warning(f"OCR job lookup failed: {e}")
+            return None
+        if not doc:
+            return None
+        created_at = doc['created_at']
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        job = OCRJob(job_id=job_id, kind=doc['kind'], status=doc['status'], created_at=created_at,
+                     result=doc.get('result'), error=doc.get('error'))
+        body = job.to_dict()
+        if job.status != JOB_PENDING:
+            expires_at = doc['expires_at']
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            body["expires_in_seconds"] = max(0, int((expires_at - datetime.now(timezone.utc)).total_seconds()))
+        return body
+
+    async def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Status body of a job, optionally waiting for it to finish.
+
+        Args:
+            job_id: Id returned by submit()
+            wait: Seconds to wait for a pending job (capped at max_wait_seconds)
+
+        Returns:
+            Status body, or None if the job is unknown or has expired
+        """
+        wait = min(max(0.0, wait), self.max_wait_seconds)
+        self._purge_expired()
+
+        job = self._jobs.get(job_id)
+        if job is not None:
+            if wait and not job.done.is_set():
+                try:
+                    await asyncio.wait_for(job.done.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            return job.to_dict()
+
+        if self.collection is None:
+            return None
+
+        deadline = time.monotonic() + wait
+        body = await self._load(job_id)
+        while body is not None and body["status"] == JOB_PENDING and time.monotonic() < deadline:
+            await asyncio.sleep(min(MONGO_POLL_INTERVAL_SECONDS, max(0.0, deadline - time.monotonic())))
+            body = await self._load(job_id)
+        return body
+
+    def cancel_all(self):
+        """Cancel running jobs (shutdown)."""
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this API process."""
+        self._purge_expired()
+        pending = sum(1 for j in self._jobs.values() if j.status == JOB_PENDING)
+        return {
+            "pending": pending,
+            "retained": len(self._jobs) - pending,
+            "max_jobs": self.max_jobs,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "ttl_seconds": self.ttl_seconds,
+            "mongo_backed": self.collection is not None
+        }
+
+
+# Global OCR job store (initialized in server.py)
+ocr_job_store: Optional[OCRJobStore] = None
+
+
+def get_ocr_job_store() -> Optional[OCRJobStore]:
+    """Get the global OCR job store (None if not initialized)."""
+    return ocr_job_store
+
+
+def init_ocr_job_store(db=None, executor=None) -> OCRJobStore:
+    """
+    Initialize the global OCR job store from environment configuration.
+
+    Args:
+        db: MongoDB database instance (jobs are stored there unless OCR_JOBS_MONGO=false)
+        executor: The global OCRExecutor the jobs run in
+
+    Returns:
+        Initialized OCRJobStore instance
+    """
+    global ocr_job_store
+    use_mongo = os.environ.get('OCR_JOBS_MONGO', 'true').lower() == 'true'
+    ocr_job_store = OCRJobStore(
+        ttl_seconds=int(os.environ.get('OCR_JOB_RESULT_TTL_SECONDS', DEFAULT_OCR_JOB_RESULT_TTL_SECONDS)),
+        max_jobs=int(os.environ.get('OCR_JOBS_MAX', DEFAULT_OCR_JOBS_MAX)),
+        max_wait_seconds=float(os.environ.get('OCR_JOB_MAX_WAIT_SECONDS', DEFAULT_OCR_JOB_MAX_WAIT_SECONDS)),
+        collection=db.ocr_jobs if (use_mongo and db is not None) else None,
+        executor=executor
+    )
+    return ocr_job_store
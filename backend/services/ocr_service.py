@@ -9,25 +9,86 @@ This module provides OCR optimized for blood gas report photos with:
 - Multiple OCR passes with different settings
 - Highly robust regex parsing for blood gas values
 - Handles OCR errors and misreadings common in medical reports
+- Runs in the OCR worker pool (services/ocr_executor.py), off the event loop
 
 Supports Radiometer ABL800 FLEX and similar medical analyzer printouts.
 """
 
+import asyncio
 import base64
+import io
+import os
+import queue
 import re
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+import shlex
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple, Callable, AsyncIterator
 from dataclasses import dataclass, asdict, field
 
 import cv2
 import numpy as np
 import pytesseract
+from PIL import Image
+from pytesseract.pytesseract import file_to_dict
+
+from services.ocr_executor import get_ocr_executor
+from services.ocr_cache import get_ocr_cache
+from services.ocr_timing import get_ocr_timing_stats, stage_timer
+from services.ocr_variant_selector import image_features, feature_key, plan_passes, get_variant_selector
+from services.analyzer_profiles import (
+    AnalyzerProfile, OCR_ANALYZER_PROFILES, detect_profile, extract_with_profile, header_strip
+)
+
+# Variants run in parallel, so each Tesseract instance gets one OpenMP thread
+# to avoid oversubscribing the CPU. Must be set before libtesseract loads.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# Optional in-process Tesseract binding (OCR_ENGINE=tesserocr)
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
 
 logger = logging.getLogger(__name__)
 
 # Confidence threshold for warning about poor OCR quality
 LOW_CONFIDENCE_THRESHOLD = 0.6
 
+# The blood gas fields the analyzer UI works with (BloodGasValues in server.py)
+BLOOD_GAS_FIELDS = ("pH", "pCO2", "pO2", "HCO3", "BE", "Na", "K", "Cl", "lactate", "Hb")
+
+# Early exit: once a pass finds this many BLOOD_GAS_FIELDS at this confidence,
+# the remaining preprocessing variants are cancelled
+EARLY_EXIT_MIN_FIELDS = int(os.environ.get('OCR_EARLY_EXIT_MIN_FIELDS', len(BLOOD_GAS_FIELDS)))
+EARLY_EXIT_MIN_CONFIDENCE = float(os.environ.get('OCR_EARLY_EXIT_MIN_CONFIDENCE', 0.8))
+
+# Threads per OCR job used to run the preprocessing variants concurrently
+OCR_PASS_THREADS = int(os.environ.get('OCR_PASS_THREADS', 3))
+
+# Tesseract backend: "pytesseract" (subprocess per call) or "tesserocr"
+# (warm in-process handles, falls back to pytesseract if unavailable)
+OCR_ENGINE = os.environ.get('OCR_ENGINE', 'pytesseract').lower()
+OCR_TESSDATA_PATH = os.environ.get('OCR_TESSDATA_PATH', '')
+
+# Image normalisation before preprocessing: crop to the printout and cap the
+# working resolution so OCR cost doesn't grow with camera megapixels
+OCR_ROI_CROP = os.environ.get('OCR_ROI_CROP', 'true').lower() == 'true'
+OCR_TARGET_TEXT_HEIGHT = int(os.environ.get('OCR_TARGET_TEXT_HEIGHT', 32))
+OCR_MAX_IMAGE_SIDE = int(os.environ.get('OCR_MAX_IMAGE_SIDE', 2400))
+
+# Very large photos are decoded at 1/2, 1/4 or 1/8 size (libjpeg DCT scaling)
+# as long as the long side stays at least this large; the printout usually
+# spans at least half the frame, so the crop still reaches OCR_MAX_IMAGE_SIDE
+OCR_DECODE_MIN_SIDE = int(os.environ.get('OCR_DECODE_MIN_SIDE', 2 * OCR_MAX_IMAGE_SIDE))
+
+# Preprocessing output buffers kept for reuse per worker process (MB)
+OCR_BUFFER_POOL_MB = int(os.environ.get('OCR_BUFFER_POOL_MB', 64))
+
 
 # ============================================================================
 # DATA CLASSES
@@ -51,6 +112,11 @@ class OCRResult:
     lines: List[str] = field(default_factory=list)
     key_metrics: Dict[str, Any] = field(default_factory=dict)
     error_message: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # ms per stage, see services/ocr_timing.py
+    variant: Optional[str] = None  # Winning preprocessing variant
+    variant_compared: bool = False  # Every variant ran - the win counts for the variant selector
+    image_features: Dict[str, Any] = field(default_factory=dict)  # See services/ocr_variant_selector.py
+    analyzer_profile: Optional[str] = None  # See services/analyzer_profiles.py
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -70,46 +136,233 @@ class OCRResult:
 # IMAGE PREPROCESSING
 # ============================================================================
 
-def decode_base64_image(image_b64: str) -> np.ndarray:
-    """Decode base64 image to OpenCV format."""
+def decode_base64_bytes(image_b64: str) -> bytes:
+    """Decode a base64 image (optionally a data: URL) to raw file bytes."""
     if "," in image_b64:
         image_b64 = image_b64.split(",")[1]
-    img_bytes = base64.b64decode(image_b64)
-    img = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+    return base64.b64decode(image_b64)
+
+
+# IMREAD flags per decode reduction factor (grayscale, colour)
+_REDUCED_DECODE_FLAGS = {
+    1: (cv2.IMREAD_GRAYSCALE, cv2.IMREAD_COLOR),
+    2: (cv2.IMREAD_REDUCED_GRAYSCALE_2, cv2.IMREAD_REDUCED_COLOR_2),
+    4: (cv2.IMREAD_REDUCED_GRAYSCALE_4, cv2.IMREAD_REDUCED_COLOR_4),
+    8: (cv2.IMREAD_REDUCED_GRAYSCALE_8, cv2.IMREAD_REDUCED_COLOR_8),
+}
+
+
+def decode_reduction(img_bytes: bytes, min_side: int = OCR_DECODE_MIN_SIDE) -> int:
+    """
+    Largest decode reduction (1, 2, 4 or 8) keeping the long side >= min_side.
+    
+    Reads only the image header; unknown formats decode at full size.
+    """
+    try:
+        with Image.open(io.BytesIO(img_bytes)) as header:
+            long_side = max(header.size)
+    except Exception:
+        return 1
+    for factor in (8, 4, 2):
+        if long_side // factor >= min_side:
+            return factor
+    return 1
+
+
+def decode_image_bytes(img_bytes: bytes, grayscale: bool = False) -> np.ndarray:
+    """
+    Decode raw image file bytes to OpenCV format.
+    
+    Args:
+        img_bytes: Encoded image file (JPEG, PNG, ...)
+        grayscale: Decode straight to one channel, at reduced size for very
+            large photos (see decode_reduction). The OCR pipeline only ever
+            needs grayscale, so it never holds a full-size BGR copy.
+    """
+    buf = np.frombuffer(img_bytes, np.uint8)
+    if grayscale:
+        img = cv2.imdecode(buf, _REDUCED_DECODE_FLAGS[decode_reduction(img_bytes)][0])
+    else:
+        img = cv2.imdecode(buf, cv2.IMREAD_COLOR)
     if img is None:
         raise ValueError("Could not decode image")
     return img
 
 
+# Long side of the downsampled copy used to find the printout and text size
+ANALYSIS_SIDE = 1000
+
+
+def detect_printout_roi(gray: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find the analyzer paper strip in a (downsampled) grayscale photo.
+    
+    The printout is the largest bright region; returns its bounding box
+    (x, y, w, h) with a small margin, or None if it covers (almost) the
+    whole frame or nothing plausible is found.
+    """
+    h, w = gray.shape[:2]
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Close the dark text lines so the paper becomes one solid region
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 15)))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    x, y, cw, ch = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    area_fraction = (cw * ch) / float(w * h)
+    if area_fraction < 0.1 or area_fraction > 0.9:
+        return None
+    margin = int(0.02 * max(w, h))
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(w, x + cw + margin), min(h, y + ch + margin)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def estimate_text_height(gray: np.ndarray) -> Optional[float]:
+    """
+    Estimate the median character height (pixels) of a grayscale image.
+    
+    Uses connected components of the adaptive-thresholded ink; returns None
+    if too few character-like components are found to be reliable.
+    """
+    h = gray.shape[0]
+    ink = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 31, 15)
+    n, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    heights = stats[1:n, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:n, cv2.CC_STAT_WIDTH]
+    chars = heights[(heights >= 4) & (heights <= 0.2 * h) & (widths <= 3 * heights)]
+    if len(chars) < 20:
+        return None
+    return float(np.median(chars))
+
+
+def normalize_image(img: np.ndarray) -> np.ndarray:
+    """
+    Crop to the printout and downscale to a bounded working resolution.
+    
+    Runs once per image before the preprocessing variants:
+    Accepts grayscale (the OCR pipeline) or BGR images and keeps the input's
+    channels.
+    
+    1. Analysis on a copy with the long side at ANALYSIS_SIDE pixels
+    2. Crop to the paper strip (OCR_ROI_CROP)
+    3. Downscale so text is ~OCR_TARGET_TEXT_HEIGHT px and the long side is
+       at most OCR_MAX_IMAGE_SIDE. Images are never upscaled here.
+    """
+    h, w = img.shape[:2]
+    factor = min(1.0, ANALYSIS_SIDE / float(max(h, w)))
+    small = to_gray(img)
+    if factor < 1.0:
+        small = cv2.resize(small, (int(w * factor), int(h * factor)), interpolation=cv2.INTER_AREA)
+    
+    if OCR_ROI_CROP:
+        roi = detect_printout_roi(small)
+        if roi is not None:
+            x, y, rw, rh = roi
+            small = small[y:y + rh, x:x + rw]
+            x0, y0 = int(x / factor), int(y / factor)
+            img = img[y0:y0 + int(rh / factor), x0:x0 + int(rw / factor)]
+            h, w = img.shape[:2]
+    
+    scale = min(1.0, OCR_MAX_IMAGE_SIDE / float(max(h, w)))
+    text_height = estimate_text_height(small)
+    if text_height is not None:
+        scale = min(scale, OCR_TARGET_TEXT_HEIGHT / (text_height / factor))
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    return img
+
+
+class ImageBufferPool:
+    """
+    Reusable uint8 output buffers for the preprocessing variants.
+    
+    A worker process handles one upload at a time and every upload needs the
+    same few multi-megabyte arrays (CLAHE upscale, CLAHE output, denoised
+    output). Reusing them avoids allocating - and the allocator retaining -
+    fresh full-size arrays per variant per upload. Buffers are flat arrays
+    handed out as 2-D views, so images of different sizes share them.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._free: List[np.ndarray] = []
+        # Flat arrays handed out by this pool, by id (for release())
+        self._owned: "weakref.WeakValueDictionary[int, np.ndarray]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+    
+    def acquire(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Get a C-contiguous uint8 array of ``shape`` (contents undefined)."""
+        size = int(np.prod(shape))
+        with self._lock:
+            fits = [i for i, b in enumerate(self._free) if b.size >= size]
+            if fits:
+                flat = self._free.pop(min(fits, key=lambda i: self._free[i].size))
+            else:
+                flat = np.empty(size, np.uint8)
+                self._owned[id(flat)] = flat
+        return flat[:size].reshape(shape)
+    
+    def release(self, img: np.ndarray):
+        """Return a buffer from acquire(); anything else is ignored."""
+        flat = getattr(img, "base", None)
+        with self._lock:
+            if flat is None or self._owned.get(id(flat)) is not flat or any(b is flat for b in self._free):
+                return
+            self._free.append(flat)
+            # Keep the largest buffers within the byte budget
+            self._free.sort(key=lambda b: b.size, reverse=True)
+            while self._free and sum(b.size for b in self._free) > self.max_bytes:
+                self._free.pop()
+
+
+# Per-process preprocessing buffers (thread-safe; variants run in threads)
+image_buffer_pool = ImageBufferPool(OCR_BUFFER_POOL_MB * 1024 * 1024)
+
+
+def release_image_buffer(img: np.ndarray):
+    """Hand a preprocessed image back to the buffer pool once OCR is done."""
+    image_buffer_pool.release(img)
+
+
+def to_gray(img: np.ndarray) -> np.ndarray:
+    """Grayscale view of an image - the image itself if already one channel."""
+    if img.ndim == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+# The preprocessing variants below take the shared (normalised) grayscale
+# image - BGR still works - and never modify it. Outputs come from
+# image_buffer_pool; run_ocr_pass releases them after Tesseract.
+
 def preprocess_simple(img: np.ndarray) -> np.ndarray:
     """Simple preprocessing - just grayscale."""
-    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return to_gray(img)
 
 
 def preprocess_clahe(img: np.ndarray, scale: float = 1.5) -> np.ndarray:
     """Light upscale with CLAHE contrast enhancement."""
-    h, w = img.shape[:2]
-    if scale != 1.0:
-        img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_CUBIC)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = to_gray(img)
+    h, w = gray.shape
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    return clahe.apply(gray)
+    if scale == 1.0:
+        return clahe.apply(gray, image_buffer_pool.acquire((h, w)))
+    # Resize after the grayscale conversion: one channel instead of three
+    upscaled = cv2.resize(gray, (int(w * scale), int(h * scale)),
+                          image_buffer_pool.acquire((int(h * scale), int(w * scale))),
+                          interpolation=cv2.INTER_CUBIC)
+    try:
+        return clahe.apply(upscaled, image_buffer_pool.acquire(upscaled.shape))
+    finally:
+        image_buffer_pool.release(upscaled)
 
 
 def preprocess_denoise(img: np.ndarray) -> np.ndarray:
     """Denoise preprocessing for noisy images."""
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    return cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-
-
-def preprocess_bloodgas_image(image_b64: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Generate multiple preprocessed versions."""
-    img = decode_base64_image(image_b64)
-    return (
-        preprocess_simple(img),
-        preprocess_clahe(img, scale=1.5),
-        preprocess_denoise(img)
-    )
+    gray = to_gray(img)
+    return cv2.fastNlMeansDenoising(gray, image_buffer_pool.acquire(gray.shape), 10, 7, 21)
 
 
 # ============================================================================
@@ -142,418 +395,488 @@ def extract_value_near_label(text: str, label_pattern: str, value_pattern: str,
     return None
 
 
+# Compiled extraction engine used by extract_metrics_improved.
+#
+# Each metric is a MetricRule: its OCR-tolerant label/value patterns in
+# priority order (compiled once at import) and a converter that applies
+# the OCR digit fixes and range check.
+#
+# Most patterns carry anchors - lowercase literals, one of which every
+# match contains (e.g. "ca" for "[?sco]?\s*c?[Cc]a2?...") - and a lead: the
+# characters the pattern can match before the anchor. Using the case-folded
+# text (built once per text and shared by all rules):
+# - no anchor in the text: the pattern cannot match, the regex is skipped
+# - otherwise no match can start before the run of lead/whitespace
+#   characters that precedes the first anchor, so the search starts there
+#   instead of at 0 - most labels sit near the end of the printout
+#
+# Semantics are exactly those of the original pattern-by-pattern code:
+# per metric, the first match of each pattern in order (every match for
+# pO2) is converted; the first value passing its range check wins.
+
+# Characters that re.IGNORECASE matches to an ASCII letter but that
+# str.lower() does not map to it
+_ANCHOR_FOLD = str.maketrans({'ı': 'i', 'İ': 'i', 'ſ': 's', 'K': 'k'})
+
+
+@dataclass(frozen=True)
+class MetricRule:
+    """Compiled patterns + value conversion for one metric."""
+    metric: str
+    patterns: Tuple[Tuple[re.Pattern, Tuple[str, ...], frozenset], ...]
+    convert: Callable[[str], Optional[float]]
+    all_matches: bool = False
+
+
+def _rule(metric: str, patterns: List[Tuple[str, Tuple[str, ...], str]],
+          convert: Callable[[str], Optional[float]], all_matches: bool = False) -> MetricRule:
+    return MetricRule(
+        metric,
+        tuple((re.compile(pat, re.IGNORECASE), anchors, frozenset(lead)) for pat, anchors, lead in patterns),
+        convert,
+        all_matches
+    )
+
+
+def _decimal(value: str) -> float:
+    return float(value.replace(',', '.'))
+
+
+def _in_range(val: float, low: float, high: float, digits: int) -> Optional[float]:
+    return round(val, digits) if low <= val <= high else None
+
+
+def _convert_ph(value: str) -> Optional[float]:
+    val_str = value.replace(',', '.')
+    # Handle cases like "456" -> "7.456" or "7456" -> "7.456"
+    if '.' not in val_str:
+        if len(val_str) == 3:
+            val_str = '7.' + val_str
+        elif len(val_str) >= 4:
+            val_str = val_str[0] + '.' + val_str[1:]
+    return _in_range(float(val_str), 6.5, 8.0, 3)
+
+
+def _convert_pco2(value: str) -> Optional[float]:
+    val = _decimal(value)
+    # Skip if this looks like pH (7.xxx)
+    if 7.0 <= val <= 7.8:
+        return None
+    # Handle OCR adding extra digit: "341.6" -> "31.6"
+    if val > 150 and val < 1000:
+        val = val / 10
+    return _in_range(val, 10, 150, 1)
+
+
+def _convert_ca(value: str) -> Optional[float]:
+    val = _decimal(value)
+    # Handle 3-digit values: 137 -> 1.37, 431 -> 1.31
+    if val > 10:
+        val_str_clean = str(int(val))
+        val = float(val_str_clean[0] + '.' + val_str_clean[1:])
+    return _in_range(val, 0.5, 3.0, 2)
+
+
+def _convert_cl(value: str) -> Optional[float]:
+    val = float(value)
+    # Handle extra digits like 1412 -> 112
+    if val > 200:
+        val_str = str(int(val))
+        if len(val_str) == 4 and val_str[0] == '1':
+            val = float(val_str[1:])
+    return _in_range(val, 70, 130, 0)
+
+
+def _convert_lactate(value: str) -> Optional[float]:
+    val = _decimal(value)
+    # Handle OCR without decimal: 48 -> 4.8
+    if val >= 10 and '.' not in value:
+        val = val / 10.0
+    return _in_range(val, 0, 30, 1)
+
+
+def _convert_glucose(value: str) -> Optional[float]:
+    val = _decimal(value)
+    # Handle OCR errors adding extra digits: 41.3 -> 11.3
+    if val > 30 and val < 100:
+        val_str = str(val)
+        if val_str[0] == '4':
+            val = float('1' + val_str[1:])
+    return _in_range(val, 0.5, 50, 1)
+
+
+def _ranged(low: float, high: float, digits: int, parse: Callable[[str], float] = _decimal):
+    return lambda value: _in_range(parse(value), low, high, digits)
+
+
+METRIC_RULES: Tuple[MetricRule, ...] = (
+    # pH: "pH 7.456", "pH T 456)", "pH(T) 7.318", "py 7.3196", "? pH(T ) 7.196"
+    _rule('pH', [
+        (r'[?\s]*pH?\s*[\(\[]?\s*T?\s*[\)\]]?\s*[:\|]?\s*([67][\.\,]\d{2,4})', ('p',), '?'),  # pH(T) 7.196
+        (r'pH\s*T?\s*[\)\]]?\s*(\d{3,4})\s*[\)\]]', ('ph',), ''),  # pH T 456) -> 7.456
+        (r'([67][\.\,]\d{3,4})\s*[\|\]]', (), ''),
+    ], _convert_ph),
+    # pCO2: "pCO2 31.6", "poo, 341.6", "pCO,(T) 25.9", "pCO{T ) 25.9)", "PCO, 7.198", "pCO,{T ) 47.5"
+    _rule('pCO2', [
+        (r'pCO[2,\{]?\s*[\(\[\{]?\s*T?\s*[\)\]\}]?\s*[:\|]?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm|\))?', ('pco',), ''),
+        (r'p[cC][oO0][2,]?\s*\(?[T\)]?\s*[:\s]*(\d{1,3}[\.\,]?\d*)\s*(?:mmHg|mm|rorntig)?', ('pco', 'pc0'), ''),
+    ], _convert_pco2),
+    # pO2: "pO2 166", "? pO, 166", "pO2(T) 95.2", "OT) 95.2", "pO(T ) 110"
+    # Must distinguish from pCO2 - pO2 values are usually larger (60-500)
+    _rule('pO2', [
+        (r'pO[,]?\s*(\d{2,3})\s*[=]', ('po',), ''),  # "? pO, 166 ="
+        (r'[?\s]?pO[2,]?\s*[=:]\s*(\d{2,3})', ('po',), '?'),  # pO2 = 166
+        (r'pO\s*\(?T?\s*\)?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm)', ('po',), ''),  # pO(T ) 110 mmHg
+        (r'OT\)\s*(\d{2,3}[\.\,]\d*)', ('ot)',), ''),  # OCR error for pO2(T)
+        (r'Poi[,\s]*T?h?\s*(\d{2,3}[\.\,]?\d*)\s*mmHg', ('poi',), ''),  # "Poi, Th mmHg" OCR error
+    ], _ranged(50, 700, 1), all_matches=True),
+    # HCO3: "cHCO3-(P,st) 23.5", "cH20,(P,st)o 15.4", "cHOO, (7,80. 23.6", "cHCO,(P,st)¢ 15.8"
+    _rule('HCO3', [
+        (r'c?H[CO0]{1,3}[O032\-,]?\s*[\(\[]?P?,?\s*st\s*[\)\]][oc¢]?\s*[:\s]*(\d{1,2}[\.\,]\d)', ('st',), 'ch0o32-,([p'),
+        (r'cH[2O0]{1,2}[,O0]?\s*[\(\[]?P?,?\s*st\s*[\)\]]?[oc]?\s*(\d{1,2}[\.\,]\d)', ('ch',), ''),
+        (r'HCO3[\-]?\s*[:\s]*(\d{1,2}[\.\,]\d)', ('hco3',), ''),
+        (r'Bicarb[^\d]*(\d{1,2}[\.\,]\d)', ('bicarb',), ''),
+    ], _ranged(5, 45, 1)),
+    # BE: "cBase(Ef) -1.3", "cBase(Ecf)> -12.0", "cBase(Ecf)> "12.0" (quote = minus)
+    _rule('BE', [
+        (r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*[""]?(\-?\d{1,2}[\.\,]?\d*)', ('base',), 'c'),
+        (r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)', ('base',), 'c'),
+        (r'oBase[^\d]*([\-\+]?\d{1,2}[\.\,]?\d*)', ('obase',), ''),
+        (r'BE\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)', ('be',), ''),
+    ], _ranged(-30, 30, 1, lambda value: _decimal(value.replace('"', '-')))),
+    # Na: "cNa+ 134", "cNat 134", "oNat 135"
+    _rule('Na', [
+        (r'[co]?Na[t\+]?\s*[:\s]*(\d{3})[\.\,]?\s*(?:mmol)?', ('na',), 'co'),
+        (r'Sodium[^\d]*(\d{3})', ('sodium',), ''),
+    ], _ranged(100, 180, 0, float)),
+    # K: "cK+ 4.9", "? cK 4.9", "ckK* 3.7", "3k+ 3.9"
+    _rule('K', [
+        (r'[?3co]?\s*[ck]?K[\+\*]?\s*[:\s]*(\d[\.\,]\d)', ('k',), '?3cok'),
+        (r'[?co]?\s*[ck]K[\+\*]?\s*(\d[\.\,]\d)\s*mmol', ('ck', 'kk'), '?co'),
+        (r'Potassium[^\d]*(\d[\.\,]\d)', ('potassium',), ''),
+    ], _ranged(1.5, 10.0, 1)),
+    # Ca: "cCa2+ 1.37", "? cCa 1.37", "cia 1.36", "Ca?" 431" (431 -> 1.31), "cCa™ 137"
+    _rule('Ca', [
+        (r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*[:\s]*(\d[\.\,]\d{1,2})', ('ca',), '?sco'),  # Normal: 1.37
+        (r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*(\d{3})\s*(?:mmol)?', ('ca',), '?sco'),  # OCR error: 137 -> 1.37 or 431 -> 1.31
+        (r'cia\s*(\d[\.\,]\d{1,2})', ('cia',), ''),  # OCR error
+        (r'Calcium[^\d]*(\d[\.\,]\d{1,2})', ('calcium',), ''),
+    ], _convert_ca),
+    # Cl: "Cl- 107", "cCl- 107", "oc: 102", "scl 1412" (needs digit fix)
+    _rule('Cl', [
+        (r'[sco]?[Cc]l[\-]?\s*[:\s]*(\d{2,4})', ('cl',), 'sco'),
+        (r'oc:\s*(\d{2,3})', ('oc:',), ''),  # OCR error
+        (r'Chloride[^\d]*(\d{2,3})', ('chloride',), ''),
+    ], _convert_cl),
+    # Hb: "ctHb 7.41", "» ctHb 7.41", "Cthb 12.4", "StHb", "30, 1.0 y/dl"
+    _rule('Hb', [
+        (r'[»\sSs]?[cCsS]?t?[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:g/?[dD]?[lL]?|y/?[dD]?[lL]?)?', ('hb',), '»sct'),
+        (r'Hemoglobin[^\d]*(\d{1,2}[\.\,]\d)', ('hemoglobin',), ''),
+    ], _ranged(3, 25, 1)),
+    # SO2: "sO2 99.3%", "[ sO, 99.", "sO, O6.2", "30, 97.4"
+    _rule('SO2', [
+        (r'[s3][oO0][2,]?\s*[:\s]*[O0]?(\d{2}[\.\,]?\d*)\s*%?', ('so', 's0', '3o', '30'), ''),
+        (r'met\s*(\d{2}[\.\,]\d)\s*[%Yo]', ('met',), ''),  # OCR error "met 97.4 %"
+        (r'Saturation[^\d]*(\d{2,3}[\.\,]?\d*)', ('saturation',), ''),
+    ], _ranged(0, 100, 1, lambda value: _decimal(value.replace('O', '0')))),
+    # Lactate: "cLac 0.9", "? clec 0.", "clac", "Pitac 48" (48 -> 4.8)
+    _rule('lactate', [
+        (r'[?coPp]?\s*[ciI]?[tl]?[ae]c\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?', ('ac', 'ec'), '?copitl'),
+        (r'clec\s*(\d[\.\,]\d)', ('clec',), ''),  # OCR error
+        (r'Lactate[^\d]*(\d{1,2}[\.\,]\d)', ('lactate',), ''),
+    ], _convert_lactate),
+    # Glucose: "cGlu 6.7", "Glu 67", "eGiu . 4" (needs decimal reconstruction), "Glu 41.3" -> 11.3
+    _rule('glucose', [
+        (r'[ce]?[Gg][il]u\s*[\.\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?', ('giu', 'glu'), 'ce'),
+        (r'Glucose[^\d]*(\d{1,3}[\.\,]\d)', ('glucose',), ''),
+    ], _convert_glucose),
+    # Bilirubin: "ctBil 5", "ctB! &"
+    _rule('Bilirubin', [
+        (r'ct?[Bb]il?\s*[:\s]*(\d{1,3})\s*(?:umol|µmol)?', ('cb', 'ctb'), ''),
+    ], _ranged(0, 500, 0, float)),
+    _rule('FO2Hb', [
+        (r'F[oO0][2,]?[,\s]?[Hh][bB]\s*[:\s]*(\d{2,3}[\.\,]?\d*)\s*%?', ('hb',), 'fo02,'),
+        (r'nol\s*(\d{2}[\.\,]\d)\s*%', ('nol',), ''),  # OCR error for FO2Hb
+    ], _ranged(0, 100, 1)),
+    _rule('FCOHb', [
+        (r'F?C[oO0][Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?', ('cohb', 'c0hb'), 'f'),
+    ], _ranged(0, 100, 1)),
+    _rule('FMetHb', [
+        (r'F?M[ea]t[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?', ('methb', 'mathb'), 'f'),
+    ], _ranged(0, 100, 1)),
+    # ctO2 (Total Oxygen Content)
+    _rule('ctO2', [
+        (r'[lc]?[tl]?[oO0]2?[,c]?\s*[:\s]*(\d{1,2}[\.\,]\d)\s*(?:Vol%|vol)?', (), ''),
+    ], _ranged(5, 30, 1)),
+)
+
+
+class _AnchorIndex:
+    """Per-text index: first position of each anchor in the folded text."""
+    
+    def __init__(self, text: str):
+        # str.lower() keeps the length for every character except U+0130,
+        # which _ANCHOR_FOLD maps first, so positions match the text
+        self.folded = text.translate(_ANCHOR_FOLD).lower()
+        self._first: Dict[str, int] = {}
+    
+    def search_start(self, anchors: Tuple[str, ...], lead: frozenset) -> int:
+        """First index a match can start at, or -1 if no anchor occurs."""
+        start = -1
+        for anchor in anchors:
+            pos = self._first.get(anchor)
+            if pos is None:
+                pos = self._first[anchor] = self.folded.find(anchor)
+            if pos >= 0 and (start < 0 or pos < start):
+                start = pos
+        folded = self.folded
+        while start > 0 and (folded[start - 1] in lead or folded[start - 1].isspace()):
+            start -= 1
+        return start
+
+
+def _first_valid(rule: MetricRule, text: str, index: _AnchorIndex) -> Optional[float]:
+    for pattern, anchors, lead in rule.patterns:
+        start = index.search_start(anchors, lead) if anchors else 0
+        if start < 0:
+            continue
+        if rule.all_matches:
+            candidates = pattern.findall(text, start)
+        else:
+            match = pattern.search(text, start)
+            candidates = (match.group(1),) if match else ()
+        for value in candidates:
+            try:
+                val = rule.convert(value)
+            except ValueError:
+                continue
+            if val is not None:
+                return val
+    return None
+
+
 def extract_metrics_improved(ocr_text: str) -> Dict[str, Any]:
     """
     Improved extraction with multiple strategies for each metric.
     Handles common OCR errors in medical reports.
+    
+    Runs the compiled METRIC_RULES over the text in one pass.
     """
+    index = _AnchorIndex(ocr_text)
     metrics = {}
-    text = ocr_text
-    
-    # Normalize common OCR errors
-    text_normalized = text.replace(',', '.').replace('|', '1').replace('O', '0').replace('l', '1')
-    
-    # ================== pH ==================
-    # Common OCR patterns: "pH 7.456", "pH T 456)", "pH(T) 7.318", "py 7.3196", "? pH(T ) 7.196"
-    if 'pH' not in metrics:
-        patterns = [
-            r'[?\s]*pH?\s*[\(\[]?\s*T?\s*[\)\]]?\s*[:\|]?\s*([67][\.\,]\d{2,4})',  # pH(T) 7.196
-            r'pH\s*T?\s*[\)\]]?\s*(\d{3,4})\s*[\)\]]',  # pH T 456) -> 7.456
-            r'([67][\.\,]\d{3,4})\s*[\|\]]',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                # Handle cases like "456" -> "7.456" or "7456" -> "7.456"
-                if '.' not in val_str:
-                    if len(val_str) == 3:  # 456 -> 7.456
-                        val_str = '7.' + val_str
-                    elif len(val_str) >= 4:  # 7456 -> 7.456
-                        val_str = val_str[0] + '.' + val_str[1:]
-                try:
-                    val = float(val_str)
-                    if 6.5 <= val <= 8.0:
-                        metrics['pH'] = round(val, 3)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== pCO2 ==================
-    # Common OCR patterns: "pCO2 31.6", "poo, 341.6", "pCO,(T) 25.9", "pCO{T ) 25.9)", "PCO, 7.198", "pCO,{T ) 47.5"
-    if 'pCO2' not in metrics:
-        patterns = [
-            r'pCO[2,\{]?\s*[\(\[\{]?\s*T?\s*[\)\]\}]?\s*[:\|]?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm|\))?',
-            r'p[cC][oO0][2,]?\s*\(?[T\)]?\s*[:\s]*(\d{1,3}[\.\,]?\d*)\s*(?:mmHg|mm|rorntig)?',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    # Skip if this looks like pH (7.xxx)
-                    if 7.0 <= val <= 7.8:
-                        continue
-                    # Handle OCR adding extra digit: "341.6" -> "31.6"
-                    if val > 150 and val < 1000:
-                        val = val / 10
-                    if 10 <= val <= 150:
-                        metrics['pCO2'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== pO2 ==================
-    # Common OCR patterns: "pO2 166", "? pO, 166", "pO2(T) 95.2", "OT) 95.2", "pO(T ) 110"
-    # Must distinguish from pCO2 - pO2 values are usually larger (60-500)
-    if 'pO2' not in metrics:
-        patterns = [
-            r'pO[,]?\s*(\d{2,3})\s*[=]',  # "? pO, 166 ="
-            r'[?\s]?pO[2,]?\s*[=:]\s*(\d{2,3})',  # pO2 = 166
-            r'pO\s*\(?T?\s*\)?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm)',  # pO(T ) 110 mmHg
-            r'OT\)\s*(\d{2,3}[\.\,]\d*)',  # OCR error for pO2(T)
-            r'Poi[,\s]*T?h?\s*(\d{2,3}[\.\,]?\d*)\s*mmHg',  # "Poi, Th mmHg" OCR error
-        ]
-        for pat in patterns:
-            matches = re.findall(pat, text, re.IGNORECASE)
-            for val_str in matches:
-                val_str = val_str.replace(',', '.')
-                try:
-                    val = float(val_str)
-                    # pO2 typically > 50, unlike pCO2 which is 20-60
-                    if 50 <= val <= 700:
-                        metrics['pO2'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-            if 'pO2' in metrics:
-                break
+    for rule in METRIC_RULES:
+        val = _first_valid(rule, ocr_text, index)
+        if val is not None:
+            metrics[rule.metric] = val
+    return metrics
+
+
+_METRIC_CONVERTERS = {rule.metric: rule.convert for rule in METRIC_RULES}
+
+
+def extract_key_metrics(ocr_text: str, profile: Optional[AnalyzerProfile] = None) -> Dict[str, Any]:
+    """
+    Key metrics of a printout, using its analyzer profile when known.
     
-    # ================== HCO3 ==================
-    # Common patterns: "cHCO3-(P,st) 23.5", "cH20,(P,st)o 15.4", "cHOO, (7,80. 23.6", "cHCO,(P,st)¢ 15.8"
-    if 'HCO3' not in metrics:
-        patterns = [
-            r'c?H[CO0]{1,3}[O032\-,]?\s*[\(\[]?P?,?\s*st\s*[\)\]][oc¢]?\s*[:\s]*(\d{1,2}[\.\,]\d)',
-            r'cH[2O0]{1,2}[,O0]?\s*[\(\[]?P?,?\s*st\s*[\)\]]?[oc]?\s*(\d{1,2}[\.\,]\d)',
-            r'HCO3[\-]?\s*[:\s]*(\d{1,2}[\.\,]\d)',
-            r'Bicarb[^\d]*(\d{1,2}[\.\,]\d)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 5 <= val <= 45:
-                        metrics['HCO3'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Base Excess (BE) ==================
-    # Common patterns: "cBase(Ef) -1.3", "cBase(Ecf)> -12.0", "cBase(Ecf)> "12.0" (quote = minus)
-    if 'BE' not in metrics:
-        patterns = [
-            r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*[""]?(\-?\d{1,2}[\.\,]?\d*)',
-            r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)',
-            r'oBase[^\d]*([\-\+]?\d{1,2}[\.\,]?\d*)',
-            r'BE\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.').replace('"', '-').replace('"', '-')
-                try:
-                    val = float(val_str)
-                    if -30 <= val <= 30:
-                        metrics['BE'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Sodium (Na) ==================
-    # Common patterns: "cNa+ 134", "cNat 134", "oNat 135"
-    if 'Na' not in metrics:
-        patterns = [
-            r'[co]?Na[t\+]?\s*[:\s]*(\d{3})[\.\,]?\s*(?:mmol)?',
-            r'Sodium[^\d]*(\d{3})',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                try:
-                    val = float(match.group(1))
-                    if 100 <= val <= 180:
-                        metrics['Na'] = round(val, 0)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Potassium (K) ==================
-    # Common patterns: "cK+ 4.9", "? cK 4.9", "ckK* 3.7", "3k+ 3.9"
-    if 'K' not in metrics:
-        patterns = [
-            r'[?3co]?\s*[ck]?K[\+\*]?\s*[:\s]*(\d[\.\,]\d)',
-            r'[?co]?\s*[ck]K[\+\*]?\s*(\d[\.\,]\d)\s*mmol',
-            r'Potassium[^\d]*(\d[\.\,]\d)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 1.5 <= val <= 10.0:
-                        metrics['K'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Calcium (Ca) ==================
-    # Common patterns: "cCa2+ 1.37", "? cCa 1.37", "cia 1.36", "Ca?" 431" (431 -> 1.31), "cCa™ 137"
-    if 'Ca' not in metrics:
-        patterns = [
-            r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*[:\s]*(\d[\.\,]\d{1,2})',  # Normal: 1.37
-            r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*(\d{3})\s*(?:mmol)?',  # OCR error: 137 -> 1.37 or 431 -> 1.31
-            r'cia\s*(\d[\.\,]\d{1,2})',  # OCR error
-            r'Calcium[^\d]*(\d[\.\,]\d{1,2})',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    # Handle 3-digit values: 137 -> 1.37, 431 -> 1.31
-                    if val > 10:
-                        # Insert decimal after first digit
-                        val_str_clean = str(int(val))
-                        val = float(val_str_clean[0] + '.' + val_str_clean[1:])
-                    if 0.5 <= val <= 3.0:
-                        metrics['Ca'] = round(val, 2)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Chloride (Cl) ==================
-    # Common patterns: "Cl- 107", "cCl- 107", "oc: 102", "scl 1412" (needs digit fix)
-    if 'Cl' not in metrics:
-        patterns = [
-            r'[sco]?[Cc]l[\-]?\s*[:\s]*(\d{2,4})',
-            r'oc:\s*(\d{2,3})',  # OCR error
-            r'Chloride[^\d]*(\d{2,3})',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                try:
-                    val = float(match.group(1))
-                    # Handle extra digits like 1412 -> 112
-                    if val > 200:
-                        val_str = str(int(val))
-                        if len(val_str) == 4 and val_str[0] == '1':
-                            val = float(val_str[1:])  # Remove leading 1
-                    if 70 <= val <= 130:
-                        metrics['Cl'] = round(val, 0)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Hemoglobin (Hb) ==================
-    # Common patterns: "ctHb 7.41", "» ctHb 7.41", "Cthb 12.4", "StHb", "30, 1.0 y/dl"
-    if 'Hb' not in metrics:
-        patterns = [
-            r'[»\sSs]?[cCsS]?t?[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:g/?[dD]?[lL]?|y/?[dD]?[lL]?)?',
-            r'Hemoglobin[^\d]*(\d{1,2}[\.\,]\d)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 3 <= val <= 25:
-                        metrics['Hb'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Oxygen Saturation (SO2/sO2) ==================
-    # Common patterns: "sO2 99.3%", "[ sO, 99.", "sO, O6.2", "30, 97.4"
-    if 'SO2' not in metrics:
-        patterns = [
-            r'[s3][oO0][2,]?\s*[:\s]*[O0]?(\d{2}[\.\,]?\d*)\s*%?',
-            r'met\s*(\d{2}[\.\,]\d)\s*[%Yo]',  # OCR error "met 97.4 %"
-            r'Saturation[^\d]*(\d{2,3}[\.\,]?\d*)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.').replace('O', '0')
-                try:
-                    val = float(val_str)
-                    if 0 <= val <= 100:
-                        metrics['SO2'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Lactate ==================
-    # Common patterns: "cLac 0.9", "? clec 0.", "clac", "Pitac 48" (48 -> 4.8)
-    if 'lactate' not in metrics:
-        patterns = [
-            r'[?coPp]?\s*[ciI]?[tl]?[ae]c\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?',
-            r'clec\s*(\d[\.\,]\d)',  # OCR error
-            r'Lactate[^\d]*(\d{1,2}[\.\,]\d)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    # Handle OCR without decimal: 48 -> 4.8
-                    if val >= 10 and '.' not in match.group(1):
-                        val = val / 10.0
-                    if 0 <= val <= 30:
-                        metrics['lactate'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Glucose ==================
-    # Common patterns: "cGlu 6.7", "Glu 67", "eGiu . 4" (needs decimal reconstruction), "Glu 41.3" -> 11.3
-    if 'glucose' not in metrics:
-        patterns = [
-            r'[ce]?[Gg][il]u\s*[\.\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?',
-            r'Glucose[^\d]*(\d{1,3}[\.\,]\d)',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    # Handle OCR errors adding extra digits: 41.3 -> 11.3
-                    if val > 30 and val < 100:
-                        val_str = str(val)
-                        if val_str[0] == '4':
-                            val = float('1' + val_str[1:])
-                    if 0.5 <= val <= 50:
-                        metrics['glucose'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== Bilirubin ==================
-    # Common patterns: "ctBil 5", "ctB! &"
-    if 'Bilirubin' not in metrics:
-        patterns = [
-            r'ct?[Bb]il?\s*[:\s]*(\d{1,3})\s*(?:umol|µmol)?',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                try:
-                    val = float(match.group(1))
-                    if 0 <= val <= 500:
-                        metrics['Bilirubin'] = round(val, 0)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== FO2Hb ==================
-    if 'FO2Hb' not in metrics:
-        patterns = [
-            r'F[oO0][2,]?[,\s]?[Hh][bB]\s*[:\s]*(\d{2,3}[\.\,]?\d*)\s*%?',
-            r'nol\s*(\d{2}[\.\,]\d)\s*%',  # OCR error for FO2Hb
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 0 <= val <= 100:
-                        metrics['FO2Hb'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== FCOHb ==================
-    if 'FCOHb' not in metrics:
-        patterns = [
-            r'F?C[oO0][Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 0 <= val <= 100:
-                        metrics['FCOHb'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== FMetHb ==================
-    if 'FMetHb' not in metrics:
-        patterns = [
-            r'F?M[ea]t[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 0 <= val <= 100:
-                        metrics['FMetHb'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
-    
-    # ================== ctO2 (Total Oxygen Content) ==================
-    if 'ctO2' not in metrics:
-        patterns = [
-            r'[lc]?[tl]?[oO0]2?[,c]?\s*[:\s]*(\d{1,2}[\.\,]\d)\s*(?:Vol%|vol)?',
-        ]
-        for pat in patterns:
-            match = re.search(pat, text, re.IGNORECASE)
-            if match:
-                val_str = match.group(1).replace(',', '.')
-                try:
-                    val = float(val_str)
-                    if 5 <= val <= 30:
-                        metrics['ctO2'] = round(val, 1)
-                        break
-                except ValueError:
-                    continue
+    Without ``profile`` one is detected from the first lines of the text.
+    Values found by profile lookup take precedence; METRIC_RULES fill in
+    the metrics the lookup missed.
+    """
+    if profile is None and OCR_ANALYZER_PROFILES:
+        profile = detect_profile(ocr_text)
+    if profile is None:
+        return extract_metrics_improved(ocr_text)
     
+    found = extract_with_profile(profile, ocr_text, _METRIC_CONVERTERS)
+    index = _AnchorIndex(ocr_text)
+    metrics = {}
+    for rule in METRIC_RULES:
+        val = found.get(rule.metric)
+        if val is None:
+            val = _first_valid(rule, ocr_text, index)
+        if val is not None:
+            metrics[rule.metric] = val
     return metrics
 
 
 def parse_blood_gas_from_ocr_text(ocr_text: str) -> Dict[str, Any]:
     """Parse blood gas values from raw OCR text."""
-    return extract_metrics_improved(ocr_text)
+    return extract_key_metrics(ocr_text)
 
 
 # ============================================================================
-# MAIN OCR FUNCTION
+# TESSERACT
 # ============================================================================
 
-def run_tesseract(processed_img: np.ndarray, psm_mode: int = 4, language: str = "eng") -> Tuple[str, float, List[OCRBlock]]:
-    """Run Tesseract OCR on a processed image."""
-    config = f'--psm {psm_mode} --oem 3'
+# Tesseract's text renderer ends every page with a form feed
+PAGE_SEPARATOR = "\f"
+
+
+def reconstruct_text_from_data(data: Dict[str, List[Any]]) -> str:
+    """
+    Rebuild Tesseract's plain-text output from an image_to_data result.
     
-    data = pytesseract.image_to_data(
-        processed_img, 
-        lang=language, 
+    Mirrors the text renderer: words joined by a space, every line ending
+    in a newline, a blank line between paragraphs and a form feed at the
+    end of the page. Produces the same string as image_to_string on the
+    same image without a second recognition run.
+    """
+    paragraphs: List[List[List[str]]] = []
+    current_par = None
+    current_line = None
+    
+    for i, level in enumerate(data['level']):
+        if level != 5:  # word rows only; 1-4 are page/block/par/line boxes
+            continue
+        par_key = (data['page_num'][i], data['block_num'][i], data['par_num'][i])
+        line_key = par_key + (data['line_num'][i],)
+        if par_key != current_par:
+            paragraphs.append([])
+            current_par, current_line = par_key, None
+        if line_key != current_line:
+            paragraphs[-1].append([])
+            current_line = line_key
+        paragraphs[-1][-1].append(str(data['text'][i]))
+    
+    text = "\n".join(
+        "".join(" ".join(words) + "\n" for words in lines)
+        for lines in paragraphs
+    )
+    return text + PAGE_SEPARATOR
+
+
+# Header row the tesseract CLI writes before TSV word rows
+TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+
+class TesseractHandlePool:
+    """
+    Warm tesserocr API handles shared by the OCR passes of one worker.
+    
+    Loading traineddata is the expensive part of starting Tesseract, so each
+    worker process keeps one initialised handle per concurrent pass
+    (OCR_PASS_THREADS) and per language, checked out for the duration of a
+    pass. Handles are not thread-safe and are never shared concurrently.
+    """
+    
+    def __init__(self, size: int, path: str = ""):
+        self.size = max(1, size)
+        self.path = path
+        self._handles: Dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+    
+    def _create(self, language: str):
+        kwargs = {'lang': language, 'oem': tesserocr.OEM.DEFAULT}
+        if self.path:
+            kwargs['path'] = self.path
+        return tesserocr.PyTessBaseAPI(**kwargs)
+    
+    def _queue_for(self, language: str) -> queue.Queue:
+        with self._lock:
+            handles = self._handles.get(language)
+            if handles is None:
+                handles = queue.Queue()
+                for _ in range(self.size):
+                    handles.put(self._create(language))
+                self._handles[language] = handles
+            return handles
+    
+    def warm(self, language: str = "eng"):
+        """Load traineddata for a language ahead of the first request."""
+        self._queue_for(language)
+    
+    @contextmanager
+    def acquire(self, language: str = "eng"):
+        handles = self._queue_for(language)
+        api = handles.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            handles.put(api)
+
+
+# Per-process handle pool (created by init_ocr_worker or on first use)
+_handle_pool: Optional[TesseractHandlePool] = None
+_handle_pool_disabled = False
+_handle_pool_lock = threading.Lock()
+
+
+def get_tesseract_handle_pool() -> Optional[TesseractHandlePool]:
+    """
+    Warm handle pool for OCR_ENGINE=tesserocr.
+    
+    Returns None - meaning "use pytesseract" - when another engine is
+    configured, tesserocr is not installed or its handles fail to load.
+    """
+    global _handle_pool, _handle_pool_disabled
+    if OCR_ENGINE != 'tesserocr' or _handle_pool_disabled:
+        return None
+    with _handle_pool_lock:
+        if _handle_pool is None:
+            if tesserocr is None:
+                logger.warning("OCR_ENGINE=tesserocr but tesserocr is not installed - using pytesseract")
+                _handle_pool_disabled = True
+                return None
+            try:
+                pool = TesseractHandlePool(OCR_PASS_THREADS, OCR_TESSDATA_PATH)
+                pool.warm("eng")
+            except Exception as e:
+                logger.warning(f"Could not initialise tesserocr handles ({e}) - using pytesseract")
+                _handle_pool_disabled = True
+                return None
+            _handle_pool = pool
+        return _handle_pool
+
+
+def tesserocr_image_to_data(processed_img: np.ndarray, psm_mode: int = 4, language: str = "eng",
+                            pool: Optional[TesseractHandlePool] = None,
+                            whitelist: Optional[str] = None) -> Dict[str, List[Any]]:
+    """
+    In-process equivalent of pytesseract.image_to_data(output_type=DICT).
+    
+    The numpy buffer is handed to Tesseract directly (no temp files, no
+    subprocess) and the TSV renderer output is parsed the same way
+    pytesseract parses the CLI's TSV file. Handles are shared between
+    calls, so the character whitelist is set (or cleared) every time.
+    """
+    pool = pool or get_tesseract_handle_pool()
+    img = np.ascontiguousarray(processed_img)
+    height, width = img.shape[:2]
+    bytes_per_pixel = 1 if img.ndim == 2 else img.shape[2]
+    
+    with pool.acquire(language) as api:
+        api.SetPageSegMode(psm_mode)
+        api.SetVariable("tessedit_char_whitelist", whitelist or "")
+        api.SetImageBytes(img.tobytes(), width, height, bytes_per_pixel, img.strides[0])
+        tsv = api.GetTSVText(0)
+    
+    return file_to_dict(TSV_HEADER + tsv, '\t', -1)
+
+
+def image_to_data(processed_img: np.ndarray, psm_mode: int = 4, language: str = "eng",
+                  whitelist: Optional[str] = None) -> Dict[str, List[Any]]:
+    """Word-level OCR data from the configured Tesseract backend."""
+    pool = get_tesseract_handle_pool()
+    if pool is not None:
+        return tesserocr_image_to_data(processed_img, psm_mode=psm_mode, language=language, pool=pool,
+                                       whitelist=whitelist)
+    
+    config = f'--psm {psm_mode} --oem 3'
+    if whitelist:
+        config += f' -c tessedit_char_whitelist={shlex.quote(whitelist)}'
+    return pytesseract.image_to_data(
+        processed_img,
+        lang=language,
         config=config,
         output_type=pytesseract.Output.DICT
     )
+
+
+def run_tesseract(processed_img: np.ndarray, psm_mode: int = 4, language: str = "eng",
+                  whitelist: Optional[str] = None) -> Tuple[str, float, List[OCRBlock]]:
+    """Run Tesseract OCR on a processed image (single recognition pass)."""
+    data = image_to_data(processed_img, psm_mode=psm_mode, language=language, whitelist=whitelist)
     
     blocks = []
     confidences = []
@@ -574,54 +897,233 @@ def run_tesseract(processed_img: np.ndarray, psm_mode: int = 4, language: str =
                 ))
                 confidences.append(float(conf))
     
-    full_text = pytesseract.image_to_string(processed_img, lang=language, config=config)
+    full_text = reconstruct_text_from_data(data)
     avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
     
     return full_text, avg_confidence, blocks
 
 
-async def perform_ocr(
-    image_base64: str,
+# ============================================================================
+# MULTI-PASS ENGINE
+# ============================================================================
+
+# Preprocessing variants in priority order - ties in score go to the earlier one
+OCR_VARIANTS: List[Tuple[str, Callable[[np.ndarray], np.ndarray]]] = [
+    ("clahe", lambda img: preprocess_clahe(img, scale=1.5)),
+    ("simple", preprocess_simple),
+    ("denoised", preprocess_denoise),
+]
+
+
+@dataclass
+class OCRPass:
+    """Result of one preprocessing variant + Tesseract + extraction pass"""
+    name: str
+    priority: int
+    full_text: str
+    avg_conf: float
+    blocks: List[OCRBlock]
+    metrics: Dict[str, Any]
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def score(self) -> float:
+        # Metric count dominates; Tesseract confidence (0-100) breaks ties
+        return len(self.metrics) * 10 + self.avg_conf
+
+    def beats(self, other: Optional["OCRPass"]) -> bool:
+        if other is None:
+            return True
+        return (self.score, -self.priority) > (other.score, -other.priority)
+
+
+def is_good_enough(ocr_pass: OCRPass,
+                   min_fields: int = EARLY_EXIT_MIN_FIELDS,
+                   min_confidence: float = EARLY_EXIT_MIN_CONFIDENCE) -> bool:
+    """Whether a pass is good enough to skip the remaining variants."""
+    found = sum(1 for f in BLOOD_GAS_FIELDS if f in ocr_pass.metrics)
+    return found >= min_fields and ocr_pass.avg_conf / 100.0 >= min_confidence
+
+
+def run_ocr_pass(name: str, priority: int, preprocess: Callable[[np.ndarray], np.ndarray],
+                 img: np.ndarray, psm_mode: int = 4, language: str = "eng",
+                 profile: Optional[AnalyzerProfile] = None,
+                 stop: Optional[threading.Event] = None) -> Optional[OCRPass]:
+    """
+    Preprocess, OCR and extract metrics for one variant.
+    
+    With an analyzer ``profile``, Tesseract runs with the profile's psm and
+    character whitelist instead of ``psm_mode``. Returns None without
+    running Tesseract if ``stop`` was set while preprocessing (another pass
+    was good enough).
+    """
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, f"preprocess_{name}"):
+        processed = preprocess(img)
+    if stop is not None and stop.is_set():
+        release_image_buffer(processed)
+        return None
+    try:
+        with stage_timer(timings, f"tesseract_{name}"):
+            if profile is not None:
+                full_text, avg_conf, blocks = run_tesseract(processed, psm_mode=profile.psm, language=language,
+                                                            whitelist=profile.whitelist)
+            else:
+                full_text, avg_conf, blocks = run_tesseract(processed, psm_mode=psm_mode, language=language)
+    finally:
+        release_image_buffer(processed)
+    with stage_timer(timings, f"extract_{name}"):
+        metrics = extract_key_metrics(full_text, profile)
+    return OCRPass(name, priority, full_text, avg_conf, blocks, metrics, timings)
+
+
+def run_ocr_passes(img: np.ndarray, psm_mode: int = 4, language: str = "eng",
+                   early_exit: bool = True, timings: Optional[Dict[str, float]] = None,
+                   first: Optional[str] = None,
+                   profile: Optional[AnalyzerProfile] = None) -> Optional[OCRPass]:
+    """
+    Fan the preprocessing variants out concurrently and keep the best pass.
+    
+    FLOW:
+    1. With ``first`` (the variant selector's likely winner), run that variant
+       alone; if it is_good_enough(), return it without running the others
+    2. Submit every (remaining) variant in OCR_VARIANTS to a small thread pool
+       (OpenCV and the Tesseract subprocess both release the GIL)
+    3. Score passes as they complete with len(metrics) * 10 + avg_conf
+    4. As soon as a pass is_good_enough(), cancel the variants not yet started
+       and return without waiting for the ones still running; those skip
+       Tesseract once their preprocessing is done, so they don't compete
+       for the cores with this worker's next job
+    
+    Stage timings of every completed pass are merged into ``timings``.
+    ``profile`` (services/analyzer_profiles.py) is passed to every pass.
+    
+    Returns:
+        Best OCRPass, or None if every pass failed
+    """
+    best = None
+    variants = list(enumerate(OCR_VARIANTS))
+    lead = next(((priority, variant) for priority, variant in variants if variant[0] == first), None)
+    if lead is not None:
+        variants.remove(lead)
+        priority, (name, preprocess) = lead
+        try:
+            best = run_ocr_pass(name, priority, preprocess, img, psm_mode, language, profile)
+        except Exception as e:
+            logger.warning(f"OCR pass {name} failed: {e}")
+        else:
+            if timings is not None:
+                timings.update(best.timings)
+            if is_good_enough(best):
+                return best
+            logger.debug(f"OCR selected variant {name} not good enough - running the others")
+    
+    # With OCR_PASS_THREADS >= variants every pass starts at once, so
+    # cancelling futures alone would not stop any of them
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=max(1, OCR_PASS_THREADS), thread_name_prefix="ocr-pass")
+    try:
+        futures = {
+            pool.submit(run_ocr_pass, name, priority, preprocess, img, psm_mode, language, profile, stop): name
+            for priority, (name, preprocess) in variants
+        }
+        for future in as_completed(futures):
+            try:
+                ocr_pass = future.result()
+            except Exception as e:
+                logger.warning(f"OCR pass {futures[future]} failed: {e}")
+                continue
+            if ocr_pass is None:
+                continue
+            
+            if timings is not None:
+                timings.update(ocr_pass.timings)
+            
+            if ocr_pass.beats(best):
+                best = ocr_pass
+            
+            if early_exit and is_good_enough(ocr_pass):
+                logger.debug(f"OCR early exit after pass {ocr_pass.name}")
+                break
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    return best
+
+
+def detect_profile_from_image(img: np.ndarray, language: str = "eng") -> Optional[AnalyzerProfile]:
+    """
+    Analyzer profile of a normalised printout, from its header alone.
+    
+    OCRs only the top strip of the image (header_strip), so the full passes
+    can run with the profile's Tesseract settings.
+    """
+    text, _, _ = run_tesseract(header_strip(img), psm_mode=6, language=language)
+    return detect_profile(text)
+
+
+# ============================================================================
+# MAIN OCR FUNCTION
+# ============================================================================
+
+def perform_ocr_bytes_sync(
+    image_bytes: bytes,
     language: str = "eng",
     enhanced: bool = True,
     psm_mode: int = 4,
-    **kwargs
+    variant_stats: Optional[Dict[str, Dict[str, int]]] = None
 ) -> OCRResult:
     """
-    Perform OCR on a base64-encoded image using Tesseract.
-    Uses multiple preprocessing approaches and selects the best result.
+    Perform OCR on raw image file bytes using Tesseract (blocking).
+    Runs the preprocessing variants in parallel and selects the best result.
+    
+    CPU-bound - runs inside an OCR worker process, never on the event loop.
+    
+    ``variant_stats`` are the variant selector's win counts
+    (services/ocr_variant_selector.py); with them, a variant that has
+    dominated similar images runs alone first. ``variant_compared`` on the
+    result says whether every variant ran, i.e. whether its win counts.
+    
+    In enhanced mode the analyzer profile (services/analyzer_profiles.py)
+    is detected from the printout header first, and every pass then runs
+    with that profile's Tesseract settings and field lookup.
     """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    features: Dict[str, Any] = {}
+    profile = None
+    compared = False
     try:
-        if enhanced:
-            simple, clahe, denoised = preprocess_bloodgas_image(image_base64)
-            
-            best_result = None
-            best_metric_count = -1
-            
-            for name, processed in [("clahe", clahe), ("simple", simple), ("denoised", denoised)]:
-                try:
-                    full_text, avg_conf, blocks = run_tesseract(processed, psm_mode=4, language=language)
-                    metrics = extract_metrics_improved(full_text)
-                    
-                    score = len(metrics) * 10 + avg_conf
-                    
-                    if score > best_metric_count:
-                        best_metric_count = score
-                        best_result = (full_text, avg_conf, blocks, metrics)
-                except Exception as e:
-                    logger.warning(f"OCR pass {name} failed: {e}")
-                    continue
-            
-            if best_result:
-                full_text, avg_conf, blocks, metrics = best_result
+        # One grayscale decode shared by every preprocessing variant
+        with stage_timer(timings, "imdecode"):
+            img = decode_image_bytes(image_bytes, grayscale=True)
+        with stage_timer(timings, "normalize"):
+            img = normalize_image(img)
+        
+        with stage_timer(timings, "features"):
+            features = image_features(img)
+            features["key"] = feature_key(features)
+        
+        if enhanced and OCR_ANALYZER_PROFILES:
+            with stage_timer(timings, "profile_detect"):
+                profile = detect_profile_from_image(img, language)
+        
+        with stage_timer(timings, "ocr_passes"):
+            if enhanced:
+                first, compared = plan_passes(variant_stats, features["key"])
+                best = run_ocr_passes(img, psm_mode=4, language=language, early_exit=not compared,
+                                      timings=timings, first=first, profile=profile)
+                if best is None:
+                    compared = False
+                    best = run_ocr_pass("simple", 0, preprocess_simple, img, psm_mode=4, language=language,
+                                        profile=profile)
+                    timings.update(best.timings)
             else:
-                full_text, avg_conf, blocks = run_tesseract(simple, psm_mode=4, language=language)
-                metrics = extract_metrics_improved(full_text)
-        else:
-            img = decode_base64_image(image_base64)
-            processed = preprocess_simple(img)
-            full_text, avg_conf, blocks = run_tesseract(processed, psm_mode=psm_mode, language=language)
-            metrics = extract_metrics_improved(full_text)
+                best = run_ocr_pass("simple", 0, preprocess_simple, img, psm_mode=psm_mode, language=language)
+                timings.update(best.timings)
+        
+        full_text, avg_conf, blocks, metrics = best.full_text, best.avg_conf, best.blocks, best.metrics
         
         lines = [line.strip() for line in full_text.split('\n') if line.strip()]
         
@@ -631,7 +1133,12 @@ async def perform_ocr(
             ocr_blocks=blocks,
             avg_confidence=avg_conf / 100.0,
             lines=lines,
-            key_metrics=metrics
+            key_metrics=metrics,
+            timings={**timings, "worker_total": round(1000 * (time.perf_counter() - started), 3)},
+            variant=best.name,
+            variant_compared=compared,
+            image_features=features,
+            analyzer_profile=profile.name if profile is not None else None
         )
         
     except Exception as e:
@@ -641,16 +1148,171 @@ async def perform_ocr(
             ocr_text="",
             ocr_blocks=[],
             avg_confidence=0.0,
-            error_message=str(e)
+            error_message=str(e),
+            timings={**timings, "worker_total": round(1000 * (time.perf_counter() - started), 3)}
         )
 
 
+def init_ocr_worker():
+    """
+    Initializer for OCR worker processes.
+    
+    With OCR_ENGINE=tesserocr, loads the eng traineddata into warm handles
+    once so the first request doesn't pay for it.
+    """
+    get_tesseract_handle_pool()
+
+
+async def perform_ocr(
+    image_base64: str,
+    language: str = "eng",
+    enhanced: bool = True,
+    psm_mode: int = 4,
+    **kwargs
+) -> OCRResult:
+    """
+    Perform OCR on a base64-encoded image without blocking the event loop.
+    
+    The job runs in the OCR worker pool (services/ocr_executor.py). If the
+    pool has not been initialized (scripts, tests) it runs in a thread.
+    
+    Raises:
+        OCRQueueFullError: If the OCR worker pool is at capacity
+        OCRJobTimeoutError: If the job exceeds OCR_JOB_TIMEOUT_SECONDS
+    """
+    timings: Dict[str, float] = {}
+    try:
+        with stage_timer(timings, "decode_base64"):
+            image_bytes = decode_base64_bytes(image_base64)
+    except Exception as e:
+        logger.error(f"OCR failed: {str(e)}")
+        return OCRResult(success=False, ocr_text="", ocr_blocks=[], avg_confidence=0.0, error_message=str(e))
+    return await perform_ocr_bytes(image_bytes, language, enhanced, psm_mode, timings=timings)
+
+
+async def perform_ocr_bytes(
+    image_bytes: bytes,
+    language: str = "eng",
+    enhanced: bool = True,
+    psm_mode: int = 4,
+    timings: Optional[Dict[str, float]] = None,
+    **kwargs
+) -> OCRResult:
+    """
+    Perform OCR on raw image file bytes without blocking the event loop.
+    
+    Identical images (same bytes and options) are served from the OCR
+    result cache (services/ocr_cache.py); only successful results are cached.
+    
+    The result's timings cover this request (earlier stages measured by the
+    caller can be passed in ``timings``) and are recorded in the stage
+    histograms (services/ocr_timing.py).
+    """
+    started = time.perf_counter()
+    timings = dict(timings or {})
+    
+    cache = get_ocr_cache()
+    cache_key = None
+    result = None
+    if cache is not None:
+        with stage_timer(timings, "cache_lookup"):
+            cache_key = cache.make_key(image_bytes, language, psm_mode, enhanced)
+            result = await cache.get(cache_key)
+    
+    if result is None:
+        selector = get_variant_selector()
+        # Win counts go to the worker only when the selector is enabled
+        selector_args = (selector.snapshot(),) if selector is not None and enhanced else ()
+        executor = get_ocr_executor()
+        job_started = time.perf_counter()
+        if executor is None:
+            result = await asyncio.to_thread(perform_ocr_bytes_sync, image_bytes, language, enhanced, psm_mode,
+                                             *selector_args)
+        else:
+            result = await executor.submit(perform_ocr_bytes_sync, image_bytes, language, enhanced, psm_mode,
+                                           *selector_args)
+        job_ms = 1000 * (time.perf_counter() - job_started)
+        timings.update(result.timings)
+        timings["pool_wait"] = round(max(0.0, job_ms - result.timings.get("worker_total", job_ms)), 3)
+        
+        if selector is not None and enhanced and result.success and result.variant_compared:
+            await selector.record(result.image_features["key"], result.variant)
+        
+        if cache is not None and result.success:
+            await cache.set(cache_key, result)
+    
+    timings["total"] = round(1000 * (time.perf_counter() - started) + timings.get("decode_base64", 0.0), 3)
+    result.timings = timings
+    get_ocr_timing_stats().record(timings)
+    logger.debug(f"OCR timings (ms): {timings}")
+    return result
+
+
+# ============================================================================
+# BATCH OCR (multi-page reports, serial gases)
+# ============================================================================
+
+async def perform_ocr_batch(
+    images: List[bytes],
+    language: str = "eng",
+    enhanced: bool = True,
+    psm_mode: int = 4
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    OCR several images concurrently, yielding results as each completes.
+    
+    At most one job per OCR worker process is in flight for a batch, so a
+    batch keeps every worker busy without filling the shared queue that
+    single-image requests rely on.
+    
+    Yields:
+        (index, OCRResult) or (index, exception) in completion order
+    """
+    executor = get_ocr_executor()
+    slots = asyncio.Semaphore(executor.max_workers if executor else OCR_PASS_THREADS)
+    
+    async def run(index: int, image_bytes: bytes):
+        async with slots:
+            try:
+                return index, await perform_ocr_bytes(image_bytes, language, enhanced, psm_mode)
+            except Exception as e:
+                return index, e
+    
+    tasks = [asyncio.create_task(run(i, img)) for i, img in enumerate(images)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away - don't keep OCR'ing pages nobody will read
+        for task in tasks:
+            task.cancel()
+
+
+def merge_key_metrics(results: List[OCRResult]) -> Dict[str, Any]:
+    """
+    Merge key_metrics of pages belonging to one report.
+    
+    Each metric is taken from the most confident successful page that has
+    it (earlier pages win ties).
+    """
+    merged: Dict[str, Any] = {}
+    ranked = sorted(
+        (r for r in results if r is not None and r.success),
+        key=lambda r: -r.avg_confidence
+    )
+    for result in ranked:
+        for key, value in result.key_metrics.items():
+            merged.setdefault(key, value)
+    return merged
+
+
 # ============================================================================
 # QUALITY CHECK
 # ============================================================================
 
 def check_ocr_quality(result: OCRResult) -> Dict[str, Any]:
     """Evaluate the quality of OCR results."""
+    started = time.perf_counter()
     issues = []
     scores = []
     
@@ -673,6 +1335,10 @@ def check_ocr_quality(result: OCRResult) -> Dict[str, Any]:
     
     quality_score = sum(scores) / len(scores) if scores else 0.0
     
+    elapsed_ms = round(1000 * (time.perf_counter() - started), 3)
+    result.timings["quality_check"] = elapsed_ms
+    get_ocr_timing_stats().record({"quality_check": elapsed_ms})
+    
     return {
         "quality_score": quality_score,
         "is_acceptable": quality_score >= 0.5,
@@ -0,0 +1,120 @@
+"""
+=============================================================================
+OCR TIMING - Per-Stage Timing Histograms for the OCR Pipeline
+=============================================================================
+Every OCRResult carries ``timings``: milliseconds spent per pipeline stage.
+This module aggregates them into fixed-bucket histograms per API process so
+slow uploads can be attributed to a stage and the worker pool can be sized.
+
+STAGES (keys of OCRResult.timings):
+- decode_base64: base64 -> bytes (API process, JSON endpoints only)
+- cache_lookup: OCR result cache lookup (API process)
+- pool_wait: time a job spent queued for / shipped to a worker process
+- imdecode, normalize: cv2.imdecode and ROI crop / downscale (worker)
+- features: image features for the variant selector (worker)
+- profile_detect: header strip OCR that picks the analyzer profile (worker)
+- preprocess_<variant>, tesseract_<variant>, extract_<variant>: per pass
+- ocr_passes: wall time of all passes (they run concurrently)
+- worker_total: total time inside the worker process
+- quality_check: check_ocr_quality (API process)
+- total: whole request from bytes to OCRResult
+
+Exposed at GET /api/admin/ocr/metrics; single responses include their own
+timings when the endpoint is called with debug=true.
+=============================================================================
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+STAGE_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], stage: str):
+    """Record the duration of the with-block as timings[stage] (ms)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(1000 * (time.perf_counter() - start), 3)
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram for one stage."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(STAGE_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        index = len(STAGE_BUCKETS_MS)
+        for i, bound in enumerate(STAGE_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing quantile q (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(STAGE_BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in STAGE_BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.buckets))
+        }
+
+
+class OCRTimingStats:
+    """Per-stage histograms for this API process."""
+
+    def __init__(self):
+        self._stages: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, float]):
+        with self._lock:
+            for stage, ms in timings.items():
+                histogram = self._stages.get(stage)
+                if histogram is None:
+                    histogram = self._stages[stage] = StageHistogram()
+                histogram.observe(ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {stage: h.snapshot() for stage, h in sorted(self._stages.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+# Global timing stats (per API process)
+ocr_timing_stats = OCRTimingStats()
+
+
+def get_ocr_timing_stats() -> OCRTimingStats:
+    """Get the global OCR stage timing histograms."""
+    return ocr_timing_stats
@@ -0,0 +1,274 @@
+"""
+=============================================================================
+OCR VARIANT SELECTOR - Learn Which Preprocessing Variant Wins
+=============================================================================
+Every OCR job runs up to three preprocessing variants (clahe, simple,
+denoised). For a given analyzer / camera combination one of them almost
+always wins, so running all three mostly wastes worker time.
+
+The selector records which variant won each request, keyed by a coarse
+bucket of cheap image features (brightness, contrast, blur, resolution).
+When one variant has clearly dominated a bucket, the worker runs it alone
+first and only falls back to the other variants if that pass is not
+good enough (is_good_enough in ocr_service).
+
+FLOW:
+1. Worker: image_features() on the normalised grayscale image -> feature_key()
+2. Worker: plan_passes(stats, key) -> the variant to run alone (choose_first),
+   or a fan-out; a fan-out compares every variant (no early exit) while the
+   bucket has fewer than OCR_SELECTOR_MIN_SAMPLES wins and for the
+   OCR_SELECTOR_EXPLORE_RATE share of jobs
+3. API process: VariantSelector.record(key, winner) after jobs that compared
+   every variant - a variant run alone, or the first good enough pass of an
+   early-exit fan-out, won nothing
+4. API process passes VariantSelector.snapshot() to the next job
+
+Win counts are per API process in memory and, with a database, are also
+accumulated in the ``ocr_variant_stats`` collection (no PHI - counts only)
+and loaded at startup. Counts per bucket are halved once they reach
+MAX_BUCKET_WINS, in memory and in the collection, so the selector follows
+changes in devices.
+
+CONFIGURATION (environment variables):
+- OCR_VARIANT_SELECTOR: Enable the selector (default: true)
+- OCR_SELECTOR_MIN_SAMPLES: Wins recorded in a bucket before it is trusted (default: 20)
+- OCR_SELECTOR_MIN_SHARE: Share of wins the leading variant needs (default: 0.7)
+- OCR_SELECTOR_EXPLORE_RATE: Jobs that still run every variant, so the
+  counts keep reflecting all variants (default: 0.05)
+
+Evaluate offline with scripts/evaluate_variant_selector.py.
+=============================================================================
+"""
+
+import logging
+import os
+import random
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Read in both the API process and the OCR workers (spawned with the same env)
+OCR_SELECTOR_MIN_SAMPLES = int(os.environ.get('OCR_SELECTOR_MIN_SAMPLES', 20))
+OCR_SELECTOR_MIN_SHARE = float(os.environ.get('OCR_SELECTOR_MIN_SHARE', 0.7))
+OCR_SELECTOR_EXPLORE_RATE = float(os.environ.get('OCR_SELECTOR_EXPLORE_RATE', 0.05))
+
+# Win counts of a bucket are halved when its total reaches this
+MAX_BUCKET_WINS = 1000
+
+# Long side of the copy the features are computed on
+FEATURE_SIDE = 500
+
+# Bucket edges per feature (values below the first edge -> bucket 0, ...)
+FEATURE_BUCKETS = {
+    "brightness": (100, 170),      # mean gray level
+    "contrast": (40, 70),          # gray level standard deviation
+    "blur": (100, 500),            # variance of the Laplacian (low = blurry)
+    "megapixels": (1.0, 3.0),      # normalised image size
+}
+
+
+def image_features(gray: np.ndarray) -> Dict[str, float]:
+    """
+    Cheap global features of a grayscale image (a few ms at any size).
+
+    Returns:
+        brightness, contrast, blur (Laplacian variance) and megapixels
+    """
+    h, w = gray.shape[:2]
+    factor = min(1.0, FEATURE_SIDE / float(max(h, w)))
+    small = gray
+    if factor < 1.0:
+        small = cv2.resize(gray, (max(1, int(w * factor)), max(1, int(h * factor))), interpolation=cv2.INTER_AREA)
+    mean, std = cv2.meanStdDev(small)
+    blur = cv2.Laplacian(small, cv2.CV_64F).var()
+    return {
+        "brightness": round(float(mean[0][0]), 1),
+        "contrast": round(float(std[0][0]), 1),
+        "blur": round(float(blur), 1),
+        "megapixels": round(h * w / 1e6, 2),
+    }
+
+
+def feature_key(features: Dict[str, float]) -> str:
+    """Coarse bucket of image features, e.g. "b1c2s0r1"."""
+    key = ""
+    for prefix, name in (("b", "brightness"), ("c", "contrast"), ("s", "blur"), ("r", "megapixels")):
+        key += f"{prefix}{sum(1 for edge in FEATURE_BUCKETS[name] if features[name] >= edge)}"
+    return key
+
+
+def choose_first(stats: Optional[Dict[str, Dict[str, int]]], key: str,
+                 min_samples: int = OCR_SELECTOR_MIN_SAMPLES,
+                 min_share: float = OCR_SELECTOR_MIN_SHARE,
+                 explore_rate: float = OCR_SELECTOR_EXPLORE_RATE) -> Optional[str]:
+    """
+    The variant to run alone first for a bucket, or None to run them all.
+
+    Args:
+        stats: Win counts per bucket ({key: {variant: wins}})
+        key: feature_key() of the image
+        min_samples: Wins recorded in the bucket before it is trusted
+        min_share: Share of the bucket's wins the leading variant needs
+        explore_rate: Probability of returning None anyway
+    """
+    wins = (stats or {}).get(key)
+    if not wins:
+        return None
+    total = sum(wins.values())
+    variant, count = max(wins.items(), key=lambda item: item[1])
+    if total < min_samples or count < min_share * total:
+        return None
+    if explore_rate and random.random() < explore_rate:
+        return None
+    return variant
+
+
+def plan_passes(stats: Optional[Dict[str, Dict[str, int]]], key: str,
+                min_samples: int = OCR_SELECTOR_MIN_SAMPLES,
+                min_share: float = OCR_SELECTOR_MIN_SHARE,
+                explore_rate: float = OCR_SELECTOR_EXPLORE_RATE) -> Tuple[Optional[str], bool]:
+    """
+    How a worker runs the variants for a bucket: (first, compare).
+
+    - Selector disabled (no stats): (None, False) - fan out with early exit
+    - Exploration, or a bucket with fewer than min_samples wins: (None, True) -
+      every variant runs and the winner is recorded
+    - A trusted leading variant: (variant, False) - it runs alone first
+    - Otherwise (None, False) - fan out with early exit, nothing recorded
+
+    Args:
+        stats: Win counts per bucket ({key: {variant: wins}}), None if disabled
+        key: feature_key() of the image
+    """
+    if stats is None:
+        return None, False
+    if explore_rate and random.random() < explore_rate:
+        return None, True
+    if sum(stats.get(key, {}).values()) < min_samples:
+        return None, True
+    return choose_first(stats, key, min_samples, min_share, explore_rate=0.0), False
+
+
+class VariantSelector:
+    """Win counts per feature bucket for this API process."""
+
+    def __init__(self, collection=None):
+        """
+        Args:
+            collection: Optional Motor collection accumulating win counts
+        """
+        self.collection = collection
+        self._wins: Dict[str, Dict[str, int]] = {}
+        self.recorded = 0
+
+    async def load(self):
+        """Load accumulated win counts from Mongo (startup)."""
+        if self.collection is None:
+            return
+        try:
+            async for doc in self.collection.find({}, {'_id': 0, 'key': 1, 'variant': 1, 'wins': 1}):
+                self._wins.setdefault(doc['key'], {})[doc['variant']] = int(doc['wins'])
+        except Exception as e:
+            logger.warning(f"OCR variant stats load failed: {e}")
+            return
+        for wins in self._wins.values():
+            self._decay(wins)
+        logger.info(f"Loaded OCR variant stats for {len(self._wins)} feature buckets")
+
+    @staticmethod
+    def _decay(wins: Dict[str, int]):
+        while sum(wins.values()) >= MAX_BUCKET_WINS:
+            for variant in wins:
+                wins[variant] //= 2
+
+    async def record(self, key: str, variant: str):
+        """
+        Record that ``variant`` won an OCR job for feature bucket ``key``.
+
+        Only for jobs that compared every variant (OCRResult.variant_compared).
+        """
+        wins = self._wins.setdefault(key, {})
+        wins[variant] = wins.get(variant, 0) + 1
+        decayed = sum(wins.values()) >= MAX_BUCKET_WINS
+        self._decay(wins)
+        self.recorded += 1
+
+        if self.collection is not None:
+            try:
+                await self.collection.update_one(
+                    {'key': key, 'variant': variant},
+                    {'$inc': {'wins': 1}},
+                    upsert=True
+                )
+                if decayed:
+                    await self._decay_stored(key)
+            except Exception as e:
+                logger.warning(f"OCR variant stats store failed: {e}")
+
+    async def _decay_stored(self, key: str):
+        """
+        Halve the accumulated counts of a bucket the way _decay() halves them
+        in memory, so a restart doesn't reload the undecayed history.
+
+        The collection sums the wins of every API process; they are halved
+        until their total is below MAX_BUCKET_WINS.
+        """
+        docs = await self.collection.find({'key': key}, {'_id': 0, 'wins': 1}).to_list(None)
+        total = sum(int(doc['wins']) for doc in docs)
+        divisor = 1
+        while total // divisor >= MAX_BUCKET_WINS:
+            divisor *= 2
+        if divisor > 1:
+            await self.collection.update_many(
+                {'key': key},
+                [{'$set': {'wins': {'$floor': {'$divide': ['$wins', divisor]}}}}]
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the win counts, passed to OCR worker processes."""
+        return {key: dict(wins) for key, wins in self._wins.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Win counts and settings for the admin OCR metrics endpoint."""
+        return {
+            "recorded": self.recorded,
+            "min_samples": OCR_SELECTOR_MIN_SAMPLES,
+            "min_share": OCR_SELECTOR_MIN_SHARE,
+            "explore_rate": OCR_SELECTOR_EXPLORE_RATE,
+            "buckets": {
+                key: {"wins": dict(wins), "first": choose_first(self._wins, key, explore_rate=0.0)}
+                for key, wins in sorted(self._wins.items())
+            }
+        }
+
+
+# Global variant selector (initialized in server.py)
+variant_selector: Optional[VariantSelector] = None
+
+
+def get_variant_selector() -> Optional[VariantSelector]:
+    """Get the global variant selector (None if disabled or not initialized)."""
+    return variant_selector
+
+
+def init_variant_selector(db=None) -> Optional[VariantSelector]:
+    """
+    Initialize the global variant selector from environment configuration.
+
+    Args:
+        db: MongoDB database instance (win counts are accumulated there)
+
+    Returns:
+        VariantSelector instance, or None if OCR_VARIANT_SELECTOR=false
+    """
+    global variant_selector
+    if os.environ.get('OCR_VARIANT_SELECTOR', 'true').lower() != 'true':
+        variant_selector = None
+        logger.info("OCR variant selector disabled (OCR_VARIANT_SELECTOR=false)")
+        return None
+
+    variant_selector = VariantSelector(collection=db.ocr_variant_stats if db is not None else None)
+    return variant_selector
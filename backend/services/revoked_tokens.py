@@ -0,0 +1,274 @@
+"""
+=============================================================================
+REVOKED TOKENS - In-Process Bloom Filter of Revoked Refresh Token JTIs
+=============================================================================
+POST /api/auth/refresh checks the refresh token's JTI against
+``revoked_tokens``. Almost every check is for a token that was never
+revoked, so this filter answers those without a database round trip; only
+"maybe revoked" answers are confirmed with a find_one on the ``jti`` index.
+
+FLOW:
+1. load() (startup): every revoked JTI is streamed into a Bloom filter
+   sized for max(REVOKED_TOKEN_FILTER_CAPACITY, 2 x current count)
+2. revoke_token() adds its JTI to this process's filter at once
+3. Every REVOKED_TOKEN_SYNC_SECONDS a check first pulls the JTIs other API
+   processes revoked since the last sync (delta by revoked_at)
+4. Once more JTIs were added than the filter was sized for, the next sync
+   rebuilds it from the collection (dropping JTIs the TTL index removed)
+
+MULTI-WORKER CONSISTENCY: another process's revocation reaches this
+filter within REVOKED_TOKEN_SYNC_SECONDS. The refresh endpoint does not
+depend on that window: it rotates (revokes) the presented token with an
+insert on the unique ``jti`` index, so a replay of a token another process
+just revoked fails on the duplicate key.
+
+Bloom filters have no false negatives; false positives (about
+REVOKED_TOKEN_FILTER_ERROR_RATE) only cost the find_one they replace.
+
+CONFIGURATION (environment variables):
+- REVOKED_TOKEN_FILTER_ENABLED: Use the filter (default: true)
+- REVOKED_TOKEN_FILTER_CAPACITY: Minimum JTIs the filter is sized for (default: 100000)
+- REVOKED_TOKEN_FILTER_ERROR_RATE: Target false positive rate (default: 0.001)
+- REVOKED_TOKEN_SYNC_SECONDS: Delta sync interval (default: 5)
+=============================================================================
+"""
+
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILTER_CAPACITY = int(os.environ.get('REVOKED_TOKEN_FILTER_CAPACITY', 100000))
+DEFAULT_FILTER_ERROR_RATE = float(os.environ.get('REVOKED_TOKEN_FILTER_ERROR_RATE', 0.001))
+REVOKED_TOKEN_SYNC_SECONDS = float(os.environ.get('REVOKED_TOKEN_SYNC_SECONDS', 5))
+# Re-read revocations this close to the last sync (their revoked_at may lag slightly)
+SYNC_OVERLAP = timedelta(seconds=2)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings (double hashing over one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Args:
+            capacity: Items the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevokedTokenFilter:
+    """The revoked JTIs of all API processes, as a Bloom filter in this one."""
+
+    def __init__(self, collection=None, capacity: int = DEFAULT_FILTER_CAPACITY,
+                 error_rate: float = DEFAULT_FILTER_ERROR_RATE,
+                 sync_seconds: float = REVOKED_TOKEN_SYNC_SECONDS):
+        """
+        Args:
+            collection: Motor collection (revoked_tokens)
+            capacity: Minimum JTIs the filter is sized for
+            error_rate: Target false positive rate
+            sync_seconds: Interval between delta syncs
+        """
+        self.collection = collection
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.bloom = BloomFilter(capacity, error_rate)
+        # Until load() succeeds every JTI is "maybe revoked" (checked in Mongo)
+        self.ready = collection is None
+        self._watermark: Optional[str] = None
+        self._synced_at = time.monotonic()
+        self._syncing = False
+        self.negatives = 0
+        self.positives = 0
+        self.syncs = 0
+        self.rebuilds = 0
+        self.errors = 0
+
+    async def load(self):
+        """Build the filter from every revoked JTI (startup, rebuilds)."""
+        self._synced_at = time.monotonic()
+        if self.collection is None:
+            return
+        try:
+            total = await self.collection.count_documents({})
+            bloom = BloomFilter(max(self.capacity, 2 * total), self.error_rate)
+            watermark = None
+            cursor = self.collection.find({}, {'_id': 0, 'jti': 1, 'revoked_at': 1})
+            async for doc in cursor:
+                bloom.add(doc['jti'])
+                revoked_at = doc.get('revoked_at')
+                if revoked_at and (watermark is None or revoked_at > watermark):
+                    watermark = revoked_at
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Revoked token filter not loaded: {e}")
+            return
+        # JTIs revoked here while streaming are re-read by the next sync (overlap)
+        self.bloom, self._watermark, self.ready = bloom, watermark or self._watermark, True
+        self.rebuilds += 1
+        logger.info(f"Revoked token filter loaded: {bloom.count} JTIs, {len(bloom.bits) // 1024} KiB")
+
+    def add(self, jti: str) -> None:
+        """Record a revoked JTI (not counted again if already present)."""
+        if jti not in self.bloom:
+            self.bloom.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """False only if the JTI is certainly not revoked."""
+        if not self.ready or jti in self.bloom:
+            self.positives += 1
+            return True
+        self.negatives += 1
+        return False
+
+    async def sync(self):
+        """
+        Pull the JTIs revoked since the last sync; rebuild when over capacity.
+
+        Runs at most every sync_seconds; other checks use the filter
+        without waiting.
+        """
+        if (self.collection is None or self._syncing
+                or time.monotonic() - self._synced_at < self.sync_seconds):
+            return
+        self._syncing = True
+        try:
+            if not self.ready or self.bloom.count > self.bloom.capacity:
+                await self.load()
+                return
+            self._synced_at = time.monotonic()
+            query = {}
+            if self._watermark is not None:
+                since = datetime.fromisoformat(self._watermark) - SYNC_OVERLAP
+                query = {'revoked_at': {'$gte': since.isoformat()}}
+            async for doc in self.collection.find(query, {'_id': 0, 'jti': 1, 'revoked_at': 1}):
+                self.add(doc['jti'])
+                revoked_at = doc.get('revoked_at')
+                if revoked_at and (self._watermark is None or revoked_at > self._watermark):
+                    self._watermark = revoked_at
+            self.syncs += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Revoked token filter sync failed: {e}")
+        finally:
+            self._syncing = False
+
+    def stats(self) -> Dict[str, Any]:
+        checks = self.negatives + self.positives
+        return {
+            "ready": self.ready,
+            "jtis": self.bloom.count,
+            "capacity": self.bloom.capacity,
+            "bytes": len(self.bloom.bits),
+            "hashes": self.bloom.hashes,
+            "negatives": self.negatives,
+            "positives": self.positives,
+            "db_lookups_avoided": round(self.negatives / checks, 3) if checks else 0.0,
+            "syncs": self.syncs,
+            "rebuilds": self.rebuilds,
+            "errors": self.errors
+        }
+
+
+async def remove_duplicate_jtis(collection) -> int:
+    """
+    Keep one revoked_tokens document per JTI (the latest to expire).
+
+    Returns:
+        Number of documents removed
+    """
+    pipeline = [
+        {"$sort": {"expires_at": -1}},
+        {"$group": {"_id": "$jti", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    extra = []
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        extra.extend(group["ids"][1:])
+    if not extra:
+        return 0
+    result = await collection.delete_many({"_id": {"$in": extra}})
+    return result.deleted_count
+
+
+async def ensure_revoked_token_indexes(collection):
+    """
+    TTL index on expires_at and a unique index on jti.
+
+    Refresh rotation relies on the unique index to reject replays, so it is
+    not optional: if existing documents repeat a JTI the extra copies are
+    removed and the index created again; any other failure is raised.
+    """
+    try:
+        await collection.create_index("expires_at", expireAfterSeconds=0, name="revoked_tokens_ttl")
+    except Exception as e:
+        # Index might already exist
+        logger.debug(f"TTL index creation: {e}")
+    # A non-unique jti index from earlier releases blocks the unique one
+    try:
+        await collection.drop_index("revoked_tokens_jti_lookup")
+    except OperationFailure:
+        pass
+    try:
+        await collection.create_index("jti", unique=True, name="revoked_tokens_jti")
+    except DuplicateKeyError:
+        removed = await remove_duplicate_jtis(collection)
+        logger.warning(f"Removed {removed} duplicate revoked_tokens documents to create the unique jti index")
+        await collection.create_index("jti", unique=True, name="revoked_tokens_jti")
+    logger.info("Created indexes for revoked_tokens collection")
+
+
+# Global revoked token filter (initialized in server.py)
+revoked_token_filter: Optional[RevokedTokenFilter] = None
+
+
+def get_revoked_token_filter() -> Optional[RevokedTokenFilter]:
+    """Get the global revoked token filter (None if disabled or not initialized)."""
+    return revoked_token_filter
+
+
+def init_revoked_token_filter(db) -> Optional[RevokedTokenFilter]:
+    """
+    Initialize the global revoked token filter from environment configuration.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        RevokedTokenFilter instance, or None if REVOKED_TOKEN_FILTER_ENABLED=false
+    """
+    global revoked_token_filter
+    if os.environ.get('REVOKED_TOKEN_FILTER_ENABLED', 'true').lower() != 'true':
+        revoked_token_filter = None
+        logger.info("Revoked token filter disabled (REVOKED_TOKEN_FILTER_ENABLED=false)")
+        return None
+    revoked_token_filter = RevokedTokenFilter(db.revoked_tokens)
+    return revoked_token_filter
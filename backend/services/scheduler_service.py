@@ -4,6 +4,9 @@ SCHEDULER SERVICE - Automated Task Scheduling
 =============================================================================
 This service handles scheduled background tasks including:
 - Subscription renewal reminders (daily at 9 AM UTC)
+- Subscription expiry sweep (every SUBSCRIPTION_EXPIRY_SWEEP_MINUTES, and
+  at startup): lapsed trial / active subscriptions are stored as expired
+  here instead of by the requests that notice them
 - Future: Automated cleanup, reports, etc.
 
 Uses APScheduler for reliable job scheduling with persistence.
@@ -15,10 +18,14 @@ import logging
 from datetime import datetime, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from motor.motor_asyncio import AsyncIOMotorClient
 
 logger = logging.getLogger(__name__)
 
+# Minutes between subscription expiry sweeps
+SUBSCRIPTION_EXPIRY_SWEEP_MINUTES = float(os.environ.get('SUBSCRIPTION_EXPIRY_SWEEP_MINUTES', 15))
+
 
 class SchedulerService:
     """
@@ -84,6 +91,44 @@ class SchedulerService:
             
             return {'error': str(e)}
     
+    async def expire_subscriptions_job(self):
+        """
+        Scheduled job to store lapsed trials and subscriptions as expired.
+        Requests already treat them as expired; this keeps the stored status
+        (admin views, stats, reminders) current without writes on the read path.
+        """
+        try:
+            # Import here to avoid circular imports
+            from services.subscription_service import SubscriptionService
+            
+            results = await SubscriptionService(self.db).expire_lapsed_subscriptions()
+            
+            # Most sweeps find nothing - only log the ones that changed something
+            if results['trials_expired'] or results['subscriptions_expired']:
+                logger.info(f"[SCHEDULER] Expiry sweep: "
+                           f"trials_expired={results['trials_expired']}, "
+                           f"subscriptions_expired={results['subscriptions_expired']}")
+                await self.db.scheduler_logs.insert_one({
+                    'job_name': 'expire_subscriptions',
+                    'executed_at': datetime.now(timezone.utc).isoformat(),
+                    'results': results,
+                    'status': 'success'
+                })
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Error in expiry sweep job: {e}")
+            
+            await self.db.scheduler_logs.insert_one({
+                'job_name': 'expire_subscriptions',
+                'executed_at': datetime.now(timezone.utc).isoformat(),
+                'error': str(e),
+                'status': 'error'
+            })
+            
+            return {'error': str(e)}
+    
     def start(self):
         """
         Start the scheduler and register all jobs.
@@ -102,6 +147,16 @@ class SchedulerService:
                 replace_existing=True
             )
             
+            # Expiry sweep - every SUBSCRIPTION_EXPIRY_SWEEP_MINUTES, first run now
+            self.scheduler.add_job(
+                self.expire_subscriptions_job,
+                trigger=IntervalTrigger(minutes=SUBSCRIPTION_EXPIRY_SWEEP_MINUTES, timezone='UTC'),
+                id='expire_subscriptions',
+                name='Expire Lapsed Subscriptions',
+                next_run_time=datetime.now(timezone.utc),
+                replace_existing=True
+            )
+            
             # Start the scheduler
             self.scheduler.start()
             self._is_running = True
@@ -153,6 +208,8 @@ class SchedulerService:
         """
         if job_id == 'renewal_reminders':
             return await self.send_renewal_reminders_job()
+        elif job_id == 'expire_subscriptions':
+            return await self.expire_subscriptions_job()
         else:
             raise ValueError(f"Unknown job ID: {job_id}")
 
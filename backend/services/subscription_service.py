@@ -3,6 +3,7 @@ from typing import Optional, Tuple, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.subscription import Subscription, SubscriptionStatus, PlanType, SubscriptionResponse
 from services.email_service import email_service
+from services.token_epochs import bump_token_epoch
 import os
 import logging
 
@@ -50,27 +51,16 @@ class SubscriptionService:
         
         now = datetime.now(timezone.utc)
         
+        # Lapsed dates are judged here; expire_lapsed_subscriptions() stores the status
         if sub.status == SubscriptionStatus.TRIAL:
             if sub.trial_ends_at and sub.trial_ends_at > now:
                 return True, 'trial'
-            else:
-                # Trial expired - update status
-                await self.db.subscriptions.update_one(
-                    {'id': sub.id},
-                    {'$set': {'status': 'expired', 'updated_at': now.isoformat()}}
-                )
-                return False, 'trial_expired'
+            return False, 'trial_expired'
         
         elif sub.status == SubscriptionStatus.ACTIVE:
             if sub.renews_at and sub.renews_at > now:
                 return True, 'active'
-            else:
-                # Subscription expired
-                await self.db.subscriptions.update_one(
-                    {'id': sub.id},
-                    {'$set': {'status': 'expired', 'updated_at': now.isoformat()}}
-                )
-                return False, 'expired'
+            return False, 'expired'
         
         elif sub.status == SubscriptionStatus.CANCELED:
             # Check if still within paid period
@@ -80,6 +70,54 @@ class SubscriptionService:
         
         return False, 'expired'
     
+    async def ensure_indexes(self):
+        """Create the status + expiry date indexes used by the expiry sweep."""
+        try:
+            await self.db.subscriptions.create_index(
+                [('status', 1), ('trial_ends_at', 1)], name='subscriptions_trial_expiry'
+            )
+            await self.db.subscriptions.create_index(
+                [('status', 1), ('renews_at', 1)], name='subscriptions_renewal_expiry'
+            )
+            logger.info("Created expiry indexes for subscriptions collection")
+        except Exception as e:
+            # Index might already exist
+            logger.debug(f"Subscription index creation: {e}")
+    
+    async def expire_lapsed_subscriptions(self, now: Optional[datetime] = None) -> dict:
+        """
+        Mark trials and paid subscriptions whose date has passed as expired.
+        
+        One update_many per status over the status + date indexes. Dates are
+        stored as UTC ISO strings, which sort chronologically. Readers already
+        treat lapsed subscriptions as expired, so this only brings the stored
+        status (admin lists, stats, reminders) in line.
+        
+        Returns:
+            Counts of expired trials and paid subscriptions
+        """
+        now = now or datetime.now(timezone.utc)
+        update = {'$set': {'status': 'expired', 'updated_at': now.isoformat()}}
+        
+        trials = await self.db.subscriptions.update_many(
+            {'status': 'trial', '$or': [
+                {'trial_ends_at': {'$lte': now.isoformat()}},
+                {'trial_ends_at': None}
+            ]},
+            update
+        )
+        paid = await self.db.subscriptions.update_many(
+            {'status': 'active', '$or': [
+                {'renews_at': {'$lte': now.isoformat()}},
+                {'renews_at': None}
+            ]},
+            update
+        )
+        return {
+            'trials_expired': trials.modified_count,
+            'subscriptions_expired': paid.modified_count
+        }
+    
     async def create_paid_subscription(
         self,
         user_id: str,
@@ -122,6 +160,7 @@ class SubscriptionService:
                 {'id': existing.id},
                 {'$set': update_data}
             )
+            await bump_token_epoch(user_id)
             
             existing.plan_name = plan_name
             existing.status = SubscriptionStatus.ACTIVE
@@ -154,6 +193,7 @@ class SubscriptionService:
                     sub_dict[key] = sub_dict[key].isoformat()
             
             await self.db.subscriptions.insert_one(sub_dict)
+            await bump_token_epoch(user_id)
             
             # Send subscription confirmation email
             await self._send_subscription_email(user_id, plan_name, renews_at)
@@ -227,6 +267,7 @@ class SubscriptionService:
                 'updated_at': now.isoformat()
             }}
         )
+        await bump_token_epoch(user_id)
         
         # Send cancellation email
         try:
@@ -297,6 +338,7 @@ class SubscriptionService:
                 'updated_at': now.isoformat()
             }}
         )
+        await bump_token_epoch(sub_doc['user_id'])
         
         return True
     
@@ -308,6 +350,11 @@ class SubscriptionService:
         """
         now = datetime.now(timezone.utc)
         
+        sub_doc = await self.db.subscriptions.find_one(
+            {'gateway_order_id': gateway_order_id},
+            {'_id': 0, 'user_id': 1}
+        )
+        
         result = await self.db.subscriptions.update_one(
             {'gateway_order_id': gateway_order_id},
             {'$set': {
@@ -315,6 +362,8 @@ class SubscriptionService:
                 'updated_at': now.isoformat()
             }}
         )
+        if sub_doc:
+            await bump_token_epoch(sub_doc['user_id'])
         
         return result.modified_count > 0
     
@@ -0,0 +1,217 @@
+"""
+=============================================================================
+TOKEN EPOCHS - Per-User Epochs for Subscription Claims in Access Tokens
+=============================================================================
+Access tokens carry the user's subscription status (see
+AuthService.issue_access_token), so require_subscription can authorise
+content requests without reading Mongo. A claim is only trusted while no
+user or subscription write happened after it was read: every such write
+bumps the user's epoch, and claims read before the epoch fall back to the
+database.
+
+FLOW:
+1. A write (payment, cancel, webhook, admin edit, password reset, device
+   revocation) calls bump_token_epoch(user_id): the resolved-user cache
+   entry is dropped and the epoch (a Unix timestamp) is stored in
+   ``token_epochs`` and in this process's map at once
+2. require_subscription compares the token's claims time with the
+   in-process map - no database read
+3. Every TOKEN_EPOCH_SYNC_SECONDS a request pulls the epochs other API
+   processes wrote since the last sync (delta by updated_at)
+
+Epochs only need to outlive the access tokens they invalidate, so they
+expire (TTL index, and pruned in memory) after ACCESS_TOKEN_EXPIRE_MINUTES.
+Claims times and epochs come from different hosts' clocks; keep them
+NTP-synced (as for JWT expiry).
+
+CONFIGURATION (environment variables):
+- ACCESS_TOKEN_SUBSCRIPTION_CLAIMS: Issue and trust claims (default: true)
+- TOKEN_EPOCH_SYNC_SECONDS: Delta sync interval (default: 5)
+=============================================================================
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from services.user_cache import invalidate_cached_user
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_CLAIMS_ENABLED = os.environ.get('ACCESS_TOKEN_SUBSCRIPTION_CLAIMS', 'true').lower() == 'true'
+TOKEN_EPOCH_SYNC_SECONDS = float(os.environ.get('TOKEN_EPOCH_SYNC_SECONDS', 5))
+# Epochs are kept as long as an access token lives
+TOKEN_EPOCH_RETENTION_SECONDS = 60 * int(os.environ.get('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
+# Re-read writes this close to the last sync (their updated_at may lag slightly)
+SYNC_OVERLAP = timedelta(seconds=2)
+
+
+class TokenEpochStore:
+    """The per-user epochs of this API process, kept in step with Mongo."""
+
+    def __init__(self, collection=None, sync_seconds: float = TOKEN_EPOCH_SYNC_SECONDS,
+                 retention_seconds: float = TOKEN_EPOCH_RETENTION_SECONDS):
+        """
+        Args:
+            collection: Motor collection (token_epochs), or None for this process only
+            sync_seconds: Interval between delta syncs
+            retention_seconds: Lifetime of an epoch (the access token lifetime)
+        """
+        self.collection = collection
+        self.sync_seconds = sync_seconds
+        self.retention_seconds = retention_seconds
+        self._epochs: Dict[str, float] = {}
+        self._watermark: Optional[datetime] = None
+        self._synced_at = time.monotonic()
+        self._syncing = False
+        self.bumps = 0
+        self.syncs = 0
+        self.errors = 0
+
+    async def ensure_indexes(self):
+        """Create the user, sync and TTL indexes."""
+        if self.collection is None:
+            return
+        try:
+            await self.collection.create_index("user_id", unique=True, name="token_epochs_user")
+            await self.collection.create_index("updated_at", name="token_epochs_updated")
+            await self.collection.create_index("expires_at", expireAfterSeconds=0, name="token_epochs_ttl")
+            logger.info("Created indexes for token_epochs collection")
+        except Exception as e:
+            # Index might already exist
+            logger.debug(f"Token epoch index creation: {e}")
+
+    def is_current(self, user_id: str, claims_at: float) -> bool:
+        """True if nothing about the user changed after claims read at claims_at."""
+        return claims_at >= self._epochs.get(user_id, 0.0)
+
+    async def bump(self, user_id: str) -> float:
+        """Invalidate every claim of a user read before now; returns the new epoch."""
+        epoch = time.time()
+        self._epochs[user_id] = max(epoch, self._epochs.get(user_id, 0.0))
+        self.bumps += 1
+        if self.collection is not None:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.update_one(
+                    {'user_id': user_id},
+                    {
+                        '$max': {'epoch': epoch},
+                        '$set': {
+                            'updated_at': now,
+                            # BSON date - the TTL index ignores string dates
+                            'expires_at': now + timedelta(seconds=self.retention_seconds)
+                        }
+                    },
+                    upsert=True
+                )
+            except Exception as e:
+                # Other processes keep trusting the claims until the tokens expire
+                self.errors += 1
+                logger.error(f"Token epoch of user {user_id} not stored: {e}")
+        return epoch
+
+    async def load(self):
+        """Read every live epoch (startup)."""
+        self._synced_at = time.monotonic()
+        if self.collection is None:
+            return
+        try:
+            await self._pull({'expires_at': {'$gt': datetime.now(timezone.utc)}})
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Token epochs not loaded: {e}")
+            return
+        logger.info(f"Loaded {len(self._epochs)} token epochs")
+
+    async def sync(self):
+        """
+        Pull the epochs written since the last sync.
+
+        Runs at most every sync_seconds; other requests use the epochs in
+        memory without waiting.
+        """
+        if (self.collection is None or self._syncing
+                or time.monotonic() - self._synced_at < self.sync_seconds):
+            return
+        self._syncing = True
+        try:
+            self._synced_at = time.monotonic()
+            query = {}
+            if self._watermark is not None:
+                query = {'updated_at': {'$gte': self._watermark - SYNC_OVERLAP}}
+            await self._pull(query)
+            self._prune()
+            self.syncs += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Token epoch sync failed: {e}")
+        finally:
+            self._syncing = False
+
+    async def _pull(self, query: Dict[str, Any]):
+        docs = await self.collection.find(query, {'_id': 0, 'user_id': 1, 'epoch': 1, 'updated_at': 1}).to_list(None)
+        for doc in docs:
+            user_id = doc['user_id']
+            self._epochs[user_id] = max(float(doc['epoch']), self._epochs.get(user_id, 0.0))
+            updated_at = doc.get('updated_at')
+            if updated_at is not None:
+                if updated_at.tzinfo is None:
+                    updated_at = updated_at.replace(tzinfo=timezone.utc)
+                if self._watermark is None or updated_at > self._watermark:
+                    self._watermark = updated_at
+
+    def _prune(self):
+        """Drop epochs older than any access token still alive."""
+        oldest = time.time() - self.retention_seconds
+        self._epochs = {user_id: epoch for user_id, epoch in self._epochs.items() if epoch >= oldest}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "users": len(self._epochs),
+            "bumps": self.bumps,
+            "syncs": self.syncs,
+            "errors": self.errors,
+            "sync_seconds": self.sync_seconds,
+            "shared": self.collection is not None
+        }
+
+
+# Global token epoch store (initialized in server.py)
+token_epoch_store: Optional[TokenEpochStore] = None
+
+
+def get_token_epoch_store() -> Optional[TokenEpochStore]:
+    """Get the global token epoch store (None if claims are disabled or not initialized)."""
+    return token_epoch_store
+
+
+def init_token_epoch_store(db=None) -> Optional[TokenEpochStore]:
+    """
+    Initialize the global token epoch store.
+
+    Args:
+        db: MongoDB database instance (epochs shared through db.token_epochs)
+
+    Returns:
+        TokenEpochStore instance, or None if ACCESS_TOKEN_SUBSCRIPTION_CLAIMS=false
+    """
+    global token_epoch_store
+    if not SUBSCRIPTION_CLAIMS_ENABLED:
+        token_epoch_store = None
+        logger.info("Subscription claims disabled (ACCESS_TOKEN_SUBSCRIPTION_CLAIMS=false)")
+        return None
+    token_epoch_store = TokenEpochStore(db.token_epochs if db is not None else None)
+    return token_epoch_store
+
+
+async def bump_token_epoch(user_id: str) -> None:
+    """
+    After a user or subscription write: drop the user's cached resolution
+    and stop trusting the subscription claims in their current tokens.
+    """
+    invalidate_cached_user(user_id)
+    if token_epoch_store is not None:
+        await token_epoch_store.bump(user_id)
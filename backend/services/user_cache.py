@@ -0,0 +1,200 @@
+"""
+=============================================================================
+USER CACHE - Short-TTL Cache of Resolved Users for require_auth
+=============================================================================
+Every authenticated request resolves its token through
+AuthService.get_user_with_subscription (users.find_one, a sorted
+subscriptions.find_one, date parsing, a UserResponse). Formulary screens
+fire dozens of calls, so this cache keeps the resolved UserResponse for a
+few seconds instead of doing two Mongo round trips per call.
+
+KEY FEATURES:
+- Key: (user id, access token iat) - a new login or token refresh starts
+  from the database again
+- In-process LRU with TTL (per API process), most recent at the end
+- An entry never outlives the subscription it caches: a trial or paid
+  subscription ending before the TTL shortens the entry's lifetime
+- invalidate(user_id) drops every entry of a user; it is called on
+  subscription and user writes (SubscriptionService, payments, admin
+  edits, device revocation, password reset)
+- A generation counter stops a lookup that started before an
+  invalidation from caching what it read (see begin() / put())
+
+CONSISTENCY: invalidation only reaches this API process. Other processes
+serve their copy for at most AUTH_USER_CACHE_TTL_SECONDS, so keep the TTL
+short; set it to 0 to disable the cache.
+
+CONFIGURATION (environment variables):
+- AUTH_USER_CACHE_TTL_SECONDS: Entry lifetime, 0 disables (default: 30)
+- AUTH_USER_CACHE_MAX_ENTRIES: In-process LRU size (default: 10000)
+=============================================================================
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from models.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTH_USER_CACHE_TTL_SECONDS = 30
+DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES = 10000
+
+
+def _access_ends_at(user: UserResponse) -> Optional[datetime]:
+    """When the cached subscription access lapses (None: not time-limited)."""
+    if not user.has_active_subscription or user.is_admin:
+        return None
+    if user.subscription_status == 'trial':
+        return user.trial_ends_at
+    if user.subscription_status == 'active':
+        return user.subscription_renews_at
+    return None
+
+
+class UserResponseCache:
+    """
+    LRU cache of resolved UserResponse objects keyed by (user id, token iat).
+
+    Lookups and stores are synchronous and never await, so they are atomic
+    on the event loop.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_AUTH_USER_CACHE_TTL_SECONDS,
+                 max_entries: int = DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES,
+                 clock=time.monotonic):
+        """
+        Args:
+            ttl_seconds: Longest lifetime of an entry
+            max_entries: Max entries held in process memory
+            clock: Monotonic time source (seconds)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, Any], tuple]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[Tuple[str, Any]]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, user_id: str, iat: Any) -> Optional[UserResponse]:
+        """Return a copy of the cached user, or None on a miss."""
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return user.model_copy()
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def begin(self) -> int:
+        """Token to pass to put(); take it before reading the database."""
+        return self._generation
+
+    def put(self, user_id: str, iat: Any, user: UserResponse, generation: int) -> None:
+        """
+        Cache a user resolved from the database.
+
+        Skipped if anything was invalidated since ``generation`` was taken
+        (the read may predate the write), or if the user's access ends now.
+        """
+        if generation != self._generation:
+            return
+        ttl = self.ttl_seconds
+        ends_at = _access_ends_at(user)
+        if ends_at is not None:
+            ttl = min(ttl, (ends_at - datetime.now(timezone.utc)).total_seconds())
+        if ttl <= 0:
+            return
+
+        key = (user_id, iat)
+        self._entries[key] = (self._clock() + ttl, user.model_copy())
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop every cached entry of a user."""
+        self._generation += 1
+        self.invalidations += 1
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._generation += 1
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def _remove(self, key: Tuple[str, Any]) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this API process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "users": len(self._keys_by_user),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Global user cache instance (initialized in server.py)
+user_cache: Optional[UserResponseCache] = None
+
+
+def get_user_cache() -> Optional[UserResponseCache]:
+    """Get the global user cache (None if disabled or not initialized)."""
+    return user_cache
+
+
+def init_user_cache() -> Optional[UserResponseCache]:
+    """
+    Initialize the global user cache from environment configuration.
+
+    Returns:
+        UserResponseCache instance, or None if AUTH_USER_CACHE_TTL_SECONDS=0
+    """
+    global user_cache
+    ttl_seconds = float(os.environ.get('AUTH_USER_CACHE_TTL_SECONDS', DEFAULT_AUTH_USER_CACHE_TTL_SECONDS))
+    if ttl_seconds <= 0:
+        user_cache = None
+        logger.info("Auth user cache disabled (AUTH_USER_CACHE_TTL_SECONDS=0)")
+        return None
+
+    user_cache = UserResponseCache(
+        ttl_seconds=ttl_seconds,
+        max_entries=int(os.environ.get('AUTH_USER_CACHE_MAX_ENTRIES', DEFAULT_AUTH_USER_CACHE_MAX_ENTRIES))
+    )
+    return user_cache
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user's cached entries after a user or subscription write (no-op without a cache)."""
+    if user_cache is not None:
+        user_cache.invalidate(user_id)
@@ -0,0 +1,172 @@
+"""
+Reference Blood Gas Analysis
+============================
+Verbatim copy of the original scalar analyze_blood_gas route body (before
+the vectorised engine in services/blood_gas_engine.py). Used only by the
+equivalence tests and scripts/benchmark_blood_gas_engine.py.
+"""
+
+from typing import Any, Dict
+
+
+def analyze_blood_gas_reference(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze blood gas values and provide diagnosis"""
+    
+    analysis = {
+        "primary_disorder": None,
+        "compensation": None,
+        "is_compensated": False,
+        "expected_value": None,
+        "expected_label": None,
+        "lactic_acidosis": False,
+        "anion_gap": None,
+        "anion_gap_status": None,
+        "cl_na_ratio": None,
+        "electrolyte_imbalances": [],
+        "recommendations": [],
+        "hb_analysis": None
+    }
+    
+    pH = values.get("pH")
+    pCO2 = values.get("pCO2")
+    HCO3 = values.get("HCO3")
+    _BE = values.get("BE")  # Extracted but not used in current analysis
+    Na = values.get("Na")
+    K = values.get("K")
+    Cl = values.get("Cl")
+    lactate = values.get("lactate")
+    Hb = values.get("Hb")
+    
+    # Calculate Anion Gap if electrolytes available (without albumin correction)
+    if Na and Cl and HCO3:
+        anion_gap = Na - (Cl + HCO3)
+        analysis["anion_gap"] = round(anion_gap, 1)
+        
+        if anion_gap > 12:
+            analysis["anion_gap_status"] = "Elevated (High Anion Gap)"
+        elif anion_gap < 8:
+            analysis["anion_gap_status"] = "Low Anion Gap"
+        else:
+            analysis["anion_gap_status"] = "Normal"
+    
+    # Cl:Na ratio for metabolic acidosis
+    if Na and Cl:
+        cl_na_ratio = Cl / Na
+        analysis["cl_na_ratio"] = round(cl_na_ratio, 3)
+    
+    # Primary disorder analysis
+    if pH and pCO2 and HCO3:
+        # Determine primary disorder
+        if pH < 7.35:
+            # Acidemia
+            if pCO2 > 45:
+                analysis["primary_disorder"] = "Respiratory Acidosis"
+                # Check compensation - expected HCO3
+                expected_hco3 = 24 + ((pCO2 - 40) * 0.1)  # Acute
+                analysis["expected_label"] = "HCO3"
+                analysis["expected_value"] = f"{expected_hco3:.1f} mEq/L (Acute)"
+                if HCO3 > expected_hco3 + 2:
+                    analysis["compensation"] = "Metabolic compensation present"
+                    analysis["is_compensated"] = True
+            elif HCO3 < 22:
+                analysis["primary_disorder"] = "Metabolic Acidosis"
+                # Check compensation (Winter's formula) - expected pCO2
+                expected_pco2 = (1.5 * HCO3) + 8
+                analysis["expected_label"] = "pCO2"
+                analysis["expected_value"] = f"{expected_pco2:.1f} ± 2 mmHg (Winter's formula: 1.5 × HCO3 + 8)"
+                if abs(pCO2 - expected_pco2) <= 2:
+                    analysis["compensation"] = "Appropriate respiratory compensation"
+                    analysis["is_compensated"] = True
+                elif pCO2 < expected_pco2 - 2:
+                    analysis["compensation"] = "Additional respiratory alkalosis"
+                elif pCO2 > expected_pco2 + 2:
+                    analysis["compensation"] = "Additional respiratory acidosis"
+        elif pH > 7.45:
+            # Alkalemia
+            if pCO2 < 35:
+                analysis["primary_disorder"] = "Respiratory Alkalosis"
+                expected_hco3 = 24 - ((40 - pCO2) * 0.2)  # Acute
+                analysis["expected_label"] = "HCO3"
+                analysis["expected_value"] = f"{expected_hco3:.1f} mEq/L (Acute)"
+                if HCO3 < expected_hco3 - 2:
+                    analysis["compensation"] = "Metabolic compensation present"
+                    analysis["is_compensated"] = True
+            elif HCO3 > 26:
+                analysis["primary_disorder"] = "Metabolic Alkalosis"
+                expected_pco2 = 40 + (0.7 * (HCO3 - 24))
+                analysis["expected_label"] = "pCO2"
+                analysis["expected_value"] = f"{expected_pco2:.1f} mmHg (40 + 0.7 × (HCO3 - 24))"
+                if abs(pCO2 - expected_pco2) <= 2:
+                    analysis["compensation"] = "Appropriate respiratory compensation"
+                    analysis["is_compensated"] = True
+        else:
+            # Normal pH - check for mixed disorder
+            if (pCO2 > 45 and HCO3 > 26) or (pCO2 < 35 and HCO3 < 22):
+                analysis["primary_disorder"] = "Mixed Disorder (compensated or concurrent)"
+            else:
+                analysis["primary_disorder"] = "Normal acid-base status"
+    
+    # Lactic acidosis check
+    if lactate and lactate > 2:
+        analysis["lactic_acidosis"] = True
+        if lactate > 4:
+            analysis["recommendations"].append("Severe lactic acidosis - investigate cause (sepsis, hypoperfusion, etc.)")
+    
+    # Electrolyte imbalances
+    if Na:
+        if Na < 135:
+            analysis["electrolyte_imbalances"].append("Hyponatremia")
+        elif Na > 145:
+            analysis["electrolyte_imbalances"].append("Hypernatremia")
+    
+    if K:
+        if K < 3.5:
+            analysis["electrolyte_imbalances"].append("Hypokalemia")
+        elif K > 5.0:
+            analysis["electrolyte_imbalances"].append("Hyperkalemia")
+    
+    if Cl:
+        if Cl < 98:
+            analysis["electrolyte_imbalances"].append("Hypochloremia")
+        elif Cl > 106:
+            analysis["electrolyte_imbalances"].append("Hyperchloremia")
+    
+    # Hemoglobin analysis
+    if Hb:
+        if Hb < 7:
+            analysis["hb_analysis"] = {
+                "level": "Severe Anemia",
+                "color": "red",
+                "message": "Blood transfusion indicated",
+                "value": Hb
+            }
+        elif Hb < 10:
+            analysis["hb_analysis"] = {
+                "level": "Moderate Anemia", 
+                "color": "amber",
+                "message": "Consider transfusion based on symptoms",
+                "value": Hb
+            }
+        elif Hb < 12:
+            analysis["hb_analysis"] = {
+                "level": "Mild Anemia",
+                "color": "yellow", 
+                "message": "Monitor closely",
+                "value": Hb
+            }
+        elif Hb <= 17:
+            analysis["hb_analysis"] = {
+                "level": "Normal",
+                "color": "green",
+                "message": "Normal hemoglobin level",
+                "value": Hb
+            }
+        else:
+            analysis["hb_analysis"] = {
+                "level": "Elevated",
+                "color": "orange",
+                "message": "Elevated hemoglobin - investigate cause",
+                "value": Hb
+            }
+    
+    return analysis
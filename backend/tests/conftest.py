@@ -0,0 +1,228 @@
+"""
+Shared Test Helpers
+===================
+- Safe environment defaults, so ``pytest backend/tests`` runs without a .env
+- FakeCollection / FakeCursor: the Motor calls the services make, over a list of dicts
+- make_user: a resolved UserResponse with a subscription
+"""
+
+import copy
+import operator
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Before any service import: several read their configuration at import time
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-at-least-32-bytes")
+os.environ.setdefault("ADMIN_EMAIL", "admin@example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "test-admin-password")
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure  # noqa: E402
+
+from models.user import UserResponse  # noqa: E402
+
+WRITE_CALLS = ("insert_one", "insert_many", "update_one", "update_many", "find_one_and_update",
+               "delete_one", "delete_many")
+COMPARISONS = {"$lt": operator.lt, "$lte": operator.le, "$gt": operator.gt, "$gte": operator.ge}
+
+
+def make_user(user_id="u1", status="active", ends_in=timedelta(days=30), is_admin=False):
+    ends_at = datetime.now(timezone.utc) + ends_in
+    return UserResponse(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        name="Test",
+        is_admin=is_admin,
+        is_active=True,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        has_active_subscription=ends_in > timedelta(0),
+        subscription_plan="monthly",
+        subscription_status=status,
+        trial_ends_at=ends_at if status == "trial" else None,
+        subscription_renews_at=ends_at if status == "active" else None
+    )
+
+
+def matches(doc, query):
+    """Equality, $or, and $lt / $lte / $gt / $gte / $in conditions."""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, alternative) for alternative in condition):
+                return False
+            continue
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        if "$in" in condition and value not in condition["$in"]:
+            return False
+        for op, compare in COMPARISONS.items():
+            if op in condition and (value is None or not compare(value, condition[op])):
+                return False
+    return True
+
+
+def project(doc, projection):
+    doc = copy.deepcopy(doc)
+    included = [k for k, v in (projection or {}).items() if v and k != "_id"]
+    if included:
+        return {k: doc[k] for k in included if k in doc}
+    for field, keep in (projection or {}).items():
+        if not keep:
+            doc.pop(field, None)
+    return doc
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.docs if length is None else self.docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    """
+    A Motor collection over a list of dicts.
+
+    Updates apply $set, $inc and $max, with upsert. Inserts raise
+    DuplicateKeyError (BulkWriteError for insert_many) on a repeated
+    ``unique`` key. Every call's name is recorded in ``calls``.
+    """
+
+    def __init__(self, docs=(), unique=()):
+        self.docs = [copy.deepcopy(d) for d in docs]
+        self.unique = tuple(unique)
+        self.indexes = set()
+        self.calls = []
+
+    @property
+    def writes(self):
+        return [call for call in self.calls if call in WRITE_CALLS]
+
+    def _matching(self, query):
+        return [d for d in self.docs if matches(d, query)]
+
+    def _duplicate(self, doc):
+        return bool(self.unique) and any(all(d.get(k) == doc.get(k) for k in self.unique) for d in self.docs)
+
+    @staticmethod
+    def _apply(doc, update):
+        for field, value in update.get("$max", {}).items():
+            doc[field] = max(doc.get(field) or value, value)
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        doc.update(copy.deepcopy(update.get("$set", {})))
+
+    def _upsert(self, query):
+        doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+        self.docs.append(doc)
+        return doc
+
+    async def create_index(self, key, unique=False, name=None, **kwargs):
+        self.calls.append("create_index")
+        if unique and len({d.get(key) for d in self.docs}) < len(self.docs):
+            raise DuplicateKeyError(f"E11000 duplicate key error index: {name}")
+        self.indexes.add(name)
+
+    async def drop_index(self, name):
+        self.calls.append("drop_index")
+        if name not in self.indexes:
+            raise OperationFailure("index not found", 27)
+        self.indexes.remove(name)
+
+    async def count_documents(self, query):
+        self.calls.append("count_documents")
+        return len(self._matching(query))
+
+    async def find_one(self, query, projection=None, sort=None):
+        self.calls.append("find_one")
+        found = self._matching(query)
+        if sort:
+            field, direction = sort[0]
+            found.sort(key=lambda d: d.get(field) or "", reverse=direction < 0)
+        return project(found[0], projection) if found else None
+
+    def find(self, query, projection=None):
+        self.calls.append("find")
+        return FakeCursor([project(d, projection) for d in self._matching(query)])
+
+    async def insert_one(self, doc):
+        self.calls.append("insert_one")
+        if self._duplicate(doc):
+            raise DuplicateKeyError("duplicate key")
+        self.docs.append(copy.deepcopy(doc))
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append("insert_many")
+        errors = []
+        for index, doc in enumerate(docs):
+            if self._duplicate(doc):
+                errors.append({"index": index, "code": 11000, "errmsg": "duplicate key"})
+            else:
+                self.docs.append(copy.deepcopy(doc))
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def update_one(self, query, update, upsert=False):
+        self.calls.append("update_one")
+        found = self._matching(query)[:1]
+        if not found and upsert:
+            found = [self._upsert(query)]
+        for doc in found:
+            self._apply(doc, update)
+        return SimpleNamespace(matched_count=len(found), modified_count=len(found))
+
+    async def update_many(self, query, update):
+        self.calls.append("update_many")
+        found = self._matching(query)
+        for doc in found:
+            self._apply(doc, update)
+        return SimpleNamespace(matched_count=len(found), modified_count=len(found))
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=False, projection=None):
+        self.calls.append("find_one_and_update")
+        found = self._matching(query)[:1]
+        if not found and not upsert:
+            return None
+        doc = found[0] if found else self._upsert(query)
+        before = copy.deepcopy(doc)
+        self._apply(doc, update)
+        return project(doc if return_document else before, projection)
+
+    async def delete_one(self, query):
+        self.calls.append("delete_one")
+        found = self._matching(query)[:1]
+        if found:
+            self.docs.remove(found[0])
+        return SimpleNamespace(deleted_count=len(found))
+
+    async def delete_many(self, query):
+        self.calls.append("delete_many")
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if not matches(d, query)]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
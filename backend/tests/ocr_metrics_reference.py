@@ -0,0 +1,403 @@
+"""
+Reference Metric Extractor
+==========================
+Verbatim copy of the original pattern-by-pattern extract_metrics_improved
+(before the compiled rule table in services/ocr_service.py). Used only by
+the equivalence tests and scripts/benchmark_metric_extraction.py.
+"""
+
+import re
+from typing import Any, Dict
+
+
+def extract_metrics_reference(ocr_text: str) -> Dict[str, Any]:
+    """
+    Improved extraction with multiple strategies for each metric.
+    Handles common OCR errors in medical reports.
+    """
+    metrics = {}
+    text = ocr_text
+    
+    # Normalize common OCR errors
+    text_normalized = text.replace(',', '.').replace('|', '1').replace('O', '0').replace('l', '1')
+    
+    # ================== pH ==================
+    # Common OCR patterns: "pH 7.456", "pH T 456)", "pH(T) 7.318", "py 7.3196", "? pH(T ) 7.196"
+    if 'pH' not in metrics:
+        patterns = [
+            r'[?\s]*pH?\s*[\(\[]?\s*T?\s*[\)\]]?\s*[:\|]?\s*([67][\.\,]\d{2,4})',  # pH(T) 7.196
+            r'pH\s*T?\s*[\)\]]?\s*(\d{3,4})\s*[\)\]]',  # pH T 456) -> 7.456
+            r'([67][\.\,]\d{3,4})\s*[\|\]]',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                # Handle cases like "456" -> "7.456" or "7456" -> "7.456"
+                if '.' not in val_str:
+                    if len(val_str) == 3:  # 456 -> 7.456
+                        val_str = '7.' + val_str
+                    elif len(val_str) >= 4:  # 7456 -> 7.456
+                        val_str = val_str[0] + '.' + val_str[1:]
+                try:
+                    val = float(val_str)
+                    if 6.5 <= val <= 8.0:
+                        metrics['pH'] = round(val, 3)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== pCO2 ==================
+    # Common OCR patterns: "pCO2 31.6", "poo, 341.6", "pCO,(T) 25.9", "pCO{T ) 25.9)", "PCO, 7.198", "pCO,{T ) 47.5"
+    if 'pCO2' not in metrics:
+        patterns = [
+            r'pCO[2,\{]?\s*[\(\[\{]?\s*T?\s*[\)\]\}]?\s*[:\|]?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm|\))?',
+            r'p[cC][oO0][2,]?\s*\(?[T\)]?\s*[:\s]*(\d{1,3}[\.\,]?\d*)\s*(?:mmHg|mm|rorntig)?',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    # Skip if this looks like pH (7.xxx)
+                    if 7.0 <= val <= 7.8:
+                        continue
+                    # Handle OCR adding extra digit: "341.6" -> "31.6"
+                    if val > 150 and val < 1000:
+                        val = val / 10
+                    if 10 <= val <= 150:
+                        metrics['pCO2'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== pO2 ==================
+    # Common OCR patterns: "pO2 166", "? pO, 166", "pO2(T) 95.2", "OT) 95.2", "pO(T ) 110"
+    # Must distinguish from pCO2 - pO2 values are usually larger (60-500)
+    if 'pO2' not in metrics:
+        patterns = [
+            r'pO[,]?\s*(\d{2,3})\s*[=]',  # "? pO, 166 ="
+            r'[?\s]?pO[2,]?\s*[=:]\s*(\d{2,3})',  # pO2 = 166
+            r'pO\s*\(?T?\s*\)?\s*(\d{2,3}[\.\,]?\d*)\s*(?:mmHg|mm)',  # pO(T ) 110 mmHg
+            r'OT\)\s*(\d{2,3}[\.\,]\d*)',  # OCR error for pO2(T)
+            r'Poi[,\s]*T?h?\s*(\d{2,3}[\.\,]?\d*)\s*mmHg',  # "Poi, Th mmHg" OCR error
+        ]
+        for pat in patterns:
+            matches = re.findall(pat, text, re.IGNORECASE)
+            for val_str in matches:
+                val_str = val_str.replace(',', '.')
+                try:
+                    val = float(val_str)
+                    # pO2 typically > 50, unlike pCO2 which is 20-60
+                    if 50 <= val <= 700:
+                        metrics['pO2'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+            if 'pO2' in metrics:
+                break
+    
+    # ================== HCO3 ==================
+    # Common patterns: "cHCO3-(P,st) 23.5", "cH20,(P,st)o 15.4", "cHOO, (7,80. 23.6", "cHCO,(P,st)¢ 15.8"
+    if 'HCO3' not in metrics:
+        patterns = [
+            r'c?H[CO0]{1,3}[O032\-,]?\s*[\(\[]?P?,?\s*st\s*[\)\]][oc¢]?\s*[:\s]*(\d{1,2}[\.\,]\d)',
+            r'cH[2O0]{1,2}[,O0]?\s*[\(\[]?P?,?\s*st\s*[\)\]]?[oc]?\s*(\d{1,2}[\.\,]\d)',
+            r'HCO3[\-]?\s*[:\s]*(\d{1,2}[\.\,]\d)',
+            r'Bicarb[^\d]*(\d{1,2}[\.\,]\d)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 5 <= val <= 45:
+                        metrics['HCO3'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Base Excess (BE) ==================
+    # Common patterns: "cBase(Ef) -1.3", "cBase(Ecf)> -12.0", "cBase(Ecf)> "12.0" (quote = minus)
+    if 'BE' not in metrics:
+        patterns = [
+            r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*[""]?(\-?\d{1,2}[\.\,]?\d*)',
+            r'c?Base\s*[\(\[]?\s*E[cf]{1,2}f?\s*[\)\]][oc>]?\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)',
+            r'oBase[^\d]*([\-\+]?\d{1,2}[\.\,]?\d*)',
+            r'BE\s*[:\s]*([\-\+]?\d{1,2}[\.\,]?\d*)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.').replace('"', '-').replace('"', '-')
+                try:
+                    val = float(val_str)
+                    if -30 <= val <= 30:
+                        metrics['BE'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Sodium (Na) ==================
+    # Common patterns: "cNa+ 134", "cNat 134", "oNat 135"
+    if 'Na' not in metrics:
+        patterns = [
+            r'[co]?Na[t\+]?\s*[:\s]*(\d{3})[\.\,]?\s*(?:mmol)?',
+            r'Sodium[^\d]*(\d{3})',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                try:
+                    val = float(match.group(1))
+                    if 100 <= val <= 180:
+                        metrics['Na'] = round(val, 0)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Potassium (K) ==================
+    # Common patterns: "cK+ 4.9", "? cK 4.9", "ckK* 3.7", "3k+ 3.9"
+    if 'K' not in metrics:
+        patterns = [
+            r'[?3co]?\s*[ck]?K[\+\*]?\s*[:\s]*(\d[\.\,]\d)',
+            r'[?co]?\s*[ck]K[\+\*]?\s*(\d[\.\,]\d)\s*mmol',
+            r'Potassium[^\d]*(\d[\.\,]\d)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 1.5 <= val <= 10.0:
+                        metrics['K'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Calcium (Ca) ==================
+    # Common patterns: "cCa2+ 1.37", "? cCa 1.37", "cia 1.36", "Ca?" 431" (431 -> 1.31), "cCa™ 137"
+    if 'Ca' not in metrics:
+        patterns = [
+            r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*[:\s]*(\d[\.\,]\d{1,2})',  # Normal: 1.37
+            r'[?sco]?\s*c?[Cc]a2?[\+\?™""]?\s*(\d{3})\s*(?:mmol)?',  # OCR error: 137 -> 1.37 or 431 -> 1.31
+            r'cia\s*(\d[\.\,]\d{1,2})',  # OCR error
+            r'Calcium[^\d]*(\d[\.\,]\d{1,2})',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    # Handle 3-digit values: 137 -> 1.37, 431 -> 1.31
+                    if val > 10:
+                        # Insert decimal after first digit
+                        val_str_clean = str(int(val))
+                        val = float(val_str_clean[0] + '.' + val_str_clean[1:])
+                    if 0.5 <= val <= 3.0:
+                        metrics['Ca'] = round(val, 2)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Chloride (Cl) ==================
+    # Common patterns: "Cl- 107", "cCl- 107", "oc: 102", "scl 1412" (needs digit fix)
+    if 'Cl' not in metrics:
+        patterns = [
+            r'[sco]?[Cc]l[\-]?\s*[:\s]*(\d{2,4})',
+            r'oc:\s*(\d{2,3})',  # OCR error
+            r'Chloride[^\d]*(\d{2,3})',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                try:
+                    val = float(match.group(1))
+                    # Handle extra digits like 1412 -> 112
+                    if val > 200:
+                        val_str = str(int(val))
+                        if len(val_str) == 4 and val_str[0] == '1':
+                            val = float(val_str[1:])  # Remove leading 1
+                    if 70 <= val <= 130:
+                        metrics['Cl'] = round(val, 0)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Hemoglobin (Hb) ==================
+    # Common patterns: "ctHb 7.41", "» ctHb 7.41", "Cthb 12.4", "StHb", "30, 1.0 y/dl"
+    if 'Hb' not in metrics:
+        patterns = [
+            r'[»\sSs]?[cCsS]?t?[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:g/?[dD]?[lL]?|y/?[dD]?[lL]?)?',
+            r'Hemoglobin[^\d]*(\d{1,2}[\.\,]\d)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 3 <= val <= 25:
+                        metrics['Hb'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Oxygen Saturation (SO2/sO2) ==================
+    # Common patterns: "sO2 99.3%", "[ sO, 99.", "sO, O6.2", "30, 97.4"
+    if 'SO2' not in metrics:
+        patterns = [
+            r'[s3][oO0][2,]?\s*[:\s]*[O0]?(\d{2}[\.\,]?\d*)\s*%?',
+            r'met\s*(\d{2}[\.\,]\d)\s*[%Yo]',  # OCR error "met 97.4 %"
+            r'Saturation[^\d]*(\d{2,3}[\.\,]?\d*)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.').replace('O', '0')
+                try:
+                    val = float(val_str)
+                    if 0 <= val <= 100:
+                        metrics['SO2'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Lactate ==================
+    # Common patterns: "cLac 0.9", "? clec 0.", "clac", "Pitac 48" (48 -> 4.8)
+    if 'lactate' not in metrics:
+        patterns = [
+            r'[?coPp]?\s*[ciI]?[tl]?[ae]c\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?',
+            r'clec\s*(\d[\.\,]\d)',  # OCR error
+            r'Lactate[^\d]*(\d{1,2}[\.\,]\d)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    # Handle OCR without decimal: 48 -> 4.8
+                    if val >= 10 and '.' not in match.group(1):
+                        val = val / 10.0
+                    if 0 <= val <= 30:
+                        metrics['lactate'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Glucose ==================
+    # Common patterns: "cGlu 6.7", "Glu 67", "eGiu . 4" (needs decimal reconstruction), "Glu 41.3" -> 11.3
+    if 'glucose' not in metrics:
+        patterns = [
+            r'[ce]?[Gg][il]u\s*[\.\s]*(\d{1,2}[\.\,]?\d*)\s*(?:mmol)?',
+            r'Glucose[^\d]*(\d{1,3}[\.\,]\d)',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    # Handle OCR errors adding extra digits: 41.3 -> 11.3
+                    if val > 30 and val < 100:
+                        val_str = str(val)
+                        if val_str[0] == '4':
+                            val = float('1' + val_str[1:])
+                    if 0.5 <= val <= 50:
+                        metrics['glucose'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== Bilirubin ==================
+    # Common patterns: "ctBil 5", "ctB! &"
+    if 'Bilirubin' not in metrics:
+        patterns = [
+            r'ct?[Bb]il?\s*[:\s]*(\d{1,3})\s*(?:umol|µmol)?',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                try:
+                    val = float(match.group(1))
+                    if 0 <= val <= 500:
+                        metrics['Bilirubin'] = round(val, 0)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== FO2Hb ==================
+    if 'FO2Hb' not in metrics:
+        patterns = [
+            r'F[oO0][2,]?[,\s]?[Hh][bB]\s*[:\s]*(\d{2,3}[\.\,]?\d*)\s*%?',
+            r'nol\s*(\d{2}[\.\,]\d)\s*%',  # OCR error for FO2Hb
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 0 <= val <= 100:
+                        metrics['FO2Hb'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== FCOHb ==================
+    if 'FCOHb' not in metrics:
+        patterns = [
+            r'F?C[oO0][Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 0 <= val <= 100:
+                        metrics['FCOHb'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== FMetHb ==================
+    if 'FMetHb' not in metrics:
+        patterns = [
+            r'F?M[ea]t[Hh][bB]\s*[:\s]*(\d{1,2}[\.\,]?\d*)\s*%?',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 0 <= val <= 100:
+                        metrics['FMetHb'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    # ================== ctO2 (Total Oxygen Content) ==================
+    if 'ctO2' not in metrics:
+        patterns = [
+            r'[lc]?[tl]?[oO0]2?[,c]?\s*[:\s]*(\d{1,2}[\.\,]\d)\s*(?:Vol%|vol)?',
+        ]
+        for pat in patterns:
+            match = re.search(pat, text, re.IGNORECASE)
+            if match:
+                val_str = match.group(1).replace(',', '.')
+                try:
+                    val = float(val_str)
+                    if 5 <= val <= 30:
+                        metrics['ctO2'] = round(val, 1)
+                        break
+                except ValueError:
+                    continue
+    
+    return metrics
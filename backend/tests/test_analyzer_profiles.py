@@ -0,0 +1,149 @@
+"""
+Analyzer Profile Tests
+======================
+Tests for layout-aware extraction (services/analyzer_profiles.py):
+- Profile detection from the header lines
+- Label lookup, decimal repair and order-gap inference
+- Profile values merged with the generic METRIC_RULES
+- Tesseract settings of a detected profile reaching every pass
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from services import ocr_service
+from services.analyzer_profiles import (
+    ABL800_FLEX,
+    detect_profile,
+    extract_with_profile,
+    label_key,
+    with_decimals,
+)
+from services.ocr_service import _METRIC_CONVERTERS, extract_key_metrics, extract_metrics_improved, run_ocr_passes
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "ocr_corpus"
+CORPUS_SAMPLES = sorted(p.stem for p in CORPUS_DIR.glob("*.txt"))
+
+ABL_REPORT = """ABL80O FLEX PATIENT REPORT
+Syringe - S 195uL  Sample # 2824
+
+pH 7.014 [ 7.350 - 7.450 ]
+pCo2 33.8 mmHg
+p02 117  mmHg
+ctHb 8.5 g/dL
+502 86.5 %
+"""
+
+
+class TestDetection:
+    """Test profile detection and label folding"""
+
+    def test_detects_misread_header(self):
+        """OCR spellings of the analyzer name are recognised"""
+        assert detect_profile(ABL_REPORT) is ABL800_FLEX
+        assert detect_profile("\nABL 8OO FLEX\npH 7.40") is ABL800_FLEX
+
+    def test_header_only_in_first_lines(self):
+        """A model name further down the page is not a header"""
+        text = "\n".join(["Lab report"] + [f"line {i}" for i in range(10)] + ["ABL800"])
+        assert detect_profile(text) is None
+        assert detect_profile("pH 7.40\npCO2 40") is None
+
+    def test_label_key(self):
+        assert label_key("pCo2") == "pco2"
+        assert label_key("p02") == "po2"
+        assert label_key("cHCO3(P,st)") == "chco3pst"
+        assert ABL800_FLEX.field_at("502") == ABL800_FLEX.field_at("sO2")
+
+    def test_whitelist_covers_printout(self):
+        for ch in "0123456789.-%[]":
+            assert ch in ABL800_FLEX.whitelist
+        assert " " not in ABL800_FLEX.whitelist
+
+
+class TestProfileLookup:
+    """Test direct lookup by label and print position"""
+
+    def test_lookup_reads_labels_the_rules_miss(self):
+        metrics = extract_with_profile(ABL800_FLEX, ABL_REPORT, _METRIC_CONVERTERS)
+        assert metrics == {"pH": 7.014, "pCO2": 33.8, "pO2": 117.0, "Hb": 8.5, "SO2": 86.5}
+
+    def test_dropped_decimal_point_restored(self):
+        assert with_decimals("7300", 3) == "7.300"
+        assert with_decimals("19", 1) == "1.9"
+        assert with_decimals("-08", 1) == "-0.8"
+        assert with_decimals("9.4", 1) == "9.4"
+        assert with_decimals("117", 0) == "117"
+        metrics = extract_with_profile(ABL800_FLEX, "ABL800\nFCOHb 17 %\n", _METRIC_CONVERTERS)
+        assert metrics == {"FCOHb": 1.7}
+
+    def test_unreadable_label_between_neighbours(self):
+        """A data line between fields n and n + 2 is field n + 1"""
+        text = "FO2Hb 95.4 %\nF#@ 1.7 %\nFMetHb 1.3 %\n"
+        metrics = extract_with_profile(ABL800_FLEX, text, _METRIC_CONVERTERS)
+        assert metrics == {"FO2Hb": 95.4, "FCOHb": 1.7, "FMetHb": 1.3}
+
+    def test_no_inference_across_wider_gaps(self):
+        text = "FO2Hb 95.4 %\nF#@ 1.7 %\ncK+ 4.1 mmol/L\n"
+        metrics = extract_with_profile(ABL800_FLEX, text, _METRIC_CONVERTERS)
+        assert metrics == {"FO2Hb": 95.4, "K": 4.1}
+
+    def test_out_of_range_value_rejected(self):
+        metrics = extract_with_profile(ABL800_FLEX, "pH 9.99\n", _METRIC_CONVERTERS)
+        assert metrics == {}
+
+
+class TestKeyMetrics:
+    """Test profile values merged with the generic rules"""
+
+    @pytest.mark.parametrize("sample", CORPUS_SAMPLES)
+    def test_corpus_finds_at_least_as_many_metrics(self, sample):
+        text = (CORPUS_DIR / f"{sample}.txt").read_text()
+        generic = extract_metrics_improved(text)
+        metrics = extract_key_metrics(text)
+        assert set(generic) <= set(metrics)
+        assert "pO2" in metrics
+
+    def test_corpus_sample(self):
+        metrics = extract_key_metrics((CORPUS_DIR / "sample_01.txt").read_text())
+        assert metrics["pO2"] == 117.0
+        assert metrics["SO2"] == 86.5
+
+    def test_unknown_printout_uses_rules_only(self):
+        text = "pH 7.396\npCO2 41.2 mmHg\n"
+        assert extract_key_metrics(text) == extract_metrics_improved(text)
+
+    def test_profiles_disabled(self, monkeypatch):
+        monkeypatch.setattr(ocr_service, "OCR_ANALYZER_PROFILES", False)
+        assert extract_key_metrics(ABL_REPORT) == extract_metrics_improved(ABL_REPORT)
+
+
+class TestProfileTesseractSettings:
+    """Test that a detected profile's psm / whitelist reach Tesseract"""
+
+    def test_passes_use_profile_settings(self, monkeypatch):
+        calls = []
+
+        def fake_tesseract(processed, psm_mode=4, language="eng", whitelist=None):
+            calls.append((psm_mode, whitelist))
+            return ABL_REPORT, 90.0, []
+
+        monkeypatch.setattr(ocr_service, "run_tesseract", fake_tesseract)
+        monkeypatch.setattr(ocr_service, "OCR_VARIANTS", [("a", lambda img: img), ("b", lambda img: img)])
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8), early_exit=False, profile=ABL800_FLEX)
+        assert calls == [(ABL800_FLEX.psm, ABL800_FLEX.whitelist)] * 2
+        assert best.metrics["pO2"] == 117.0
+
+    def test_profile_detected_from_header_strip(self, monkeypatch):
+        shapes = []
+
+        def fake_tesseract(processed, psm_mode=4, language="eng", whitelist=None):
+            shapes.append(processed.shape)
+            return "ABL800 FLEX PATIENT REPORT\n", 90.0, []
+
+        monkeypatch.setattr(ocr_service, "run_tesseract", fake_tesseract)
+        profile = ocr_service.detect_profile_from_image(np.zeros((2000, 1000), np.uint8))
+        assert profile is ABL800_FLEX
+        assert shapes == [(240, 1000)]
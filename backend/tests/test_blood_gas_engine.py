@@ -0,0 +1,117 @@
+"""
+Blood Gas Engine Tests
+======================
+The vectorised engine (services/blood_gas_engine.py) must return exactly
+what the original scalar route returned (tests/blood_gas_reference.py):
+- Values on and around every rule threshold
+- Missing and zero values
+- Random samples, analysed one at a time and as one batch
+"""
+
+import asyncio
+import itertools
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from services import blood_gas_engine
+from services.blood_gas_engine import analyze, analyze_batch
+from tests.blood_gas_reference import analyze_blood_gas_reference
+
+# Values at, just inside and just outside each threshold (plus missing / 0)
+THRESHOLD_VALUES = {
+    "pH": (None, 0, 7.2, 7.35, 7.349, 7.4, 7.45, 7.451, 7.6),
+    "pCO2": (None, 20, 34.9, 35, 40, 45, 45.1, 70),
+    "HCO3": (None, 0, 10, 21.9, 22, 24, 26, 26.1, 40),
+    "Na": (None, 120, 135, 140, 145, 146),
+    "Cl": (None, 90, 98, 104, 106, 107),
+}
+
+
+def random_sample(rng: random.Random) -> dict:
+    ranges = {
+        "pH": (6.8, 7.8), "pCO2": (15, 90), "pO2": (30, 400), "HCO3": (5, 45), "BE": (-25, 20),
+        "Na": (115, 160), "K": (2.0, 7.5), "Cl": (80, 125), "lactate": (0.3, 12), "Hb": (4, 22),
+    }
+    sample = {}
+    for name, (low, high) in ranges.items():
+        roll = rng.random()
+        if roll < 0.1:
+            sample[name] = None
+        elif roll < 0.13:
+            sample[name] = 0.0
+        else:
+            sample[name] = round(rng.uniform(low, high), rng.choice((0, 1, 2, 3)))
+    return sample
+
+
+def threshold_samples():
+    base = {"K": 4.0, "lactate": 1.0, "Hb": 13.0}
+    for ph, pco2, hco3 in itertools.product(THRESHOLD_VALUES["pH"], THRESHOLD_VALUES["pCO2"], THRESHOLD_VALUES["HCO3"]):
+        yield {**base, "pH": ph, "pCO2": pco2, "HCO3": hco3, "Na": 140, "Cl": 104}
+    for na, cl, hco3 in itertools.product(THRESHOLD_VALUES["Na"], THRESHOLD_VALUES["Cl"], THRESHOLD_VALUES["HCO3"]):
+        yield {**base, "Na": na, "Cl": cl, "HCO3": hco3}
+    for k in (None, 0, 3.4, 3.5, 5.0, 5.1):
+        for lactate in (None, 0, 2, 2.1, 4, 4.1):
+            yield {"K": k, "lactate": lactate}
+    for hb in (None, 0, 6.9, 7, 9.9, 10, 11.9, 12, 17, 17.1):
+        yield {"Hb": hb}
+
+
+class TestEquivalence:
+    """Test that the engine matches the original scalar rules"""
+
+    def test_thresholds(self):
+        samples = list(threshold_samples())
+        for sample, result in zip(samples, analyze_batch(samples)):
+            assert result == analyze_blood_gas_reference(sample), sample
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_random_samples(self, seed):
+        rng = random.Random(seed)
+        samples = [random_sample(rng) for _ in range(500)]
+        batch = analyze_batch(samples)
+        for sample, result in zip(samples, batch):
+            expected = analyze_blood_gas_reference(sample)
+            assert result == expected, sample
+            assert analyze(sample) == expected
+
+    def test_empty_sample(self):
+        assert analyze({}) == analyze_blood_gas_reference({})
+
+    def test_plain_python_types(self):
+        """Results are JSON-ready: no numpy scalars"""
+        result = analyze({"pH": 7.2, "pCO2": 26, "HCO3": 12, "Na": 140, "Cl": 100, "Hb": 8, "lactate": 5})
+        assert type(result["is_compensated"]) is bool
+        assert type(result["anion_gap"]) is float
+        assert type(result["hb_analysis"]["value"]) is float
+        assert result["primary_disorder"] == "Metabolic Acidosis"
+        assert result["compensation"] == "Appropriate respiratory compensation"
+
+    def test_empty_batch(self):
+        assert analyze_batch([]) == []
+
+
+class TestRoutes:
+    """Test the single and batch analyze endpoints"""
+
+    def test_batch_endpoint_matches_single(self):
+        from server import (BloodGasAnalysisRequest, BloodGasBatchRequest, analyze_blood_gas,
+                            analyze_blood_gas_batch)
+
+        rng = random.Random(7)
+        samples = [random_sample(rng) for _ in range(20)]
+        response = asyncio.run(analyze_blood_gas_batch(BloodGasBatchRequest(samples=samples)))
+        assert response["count"] == 20
+        for sample, result in zip(samples, response["results"]):
+            single = asyncio.run(analyze_blood_gas(BloodGasAnalysisRequest(values=sample)))
+            assert result == single == analyze_blood_gas_reference(sample)
+
+    def test_batch_size_limits(self):
+        from server import BloodGasBatchRequest
+
+        with pytest.raises(ValidationError):
+            BloodGasBatchRequest(samples=[])
+        with pytest.raises(ValidationError):
+            BloodGasBatchRequest(samples=[{}] * (blood_gas_engine.BLOOD_GAS_BATCH_MAX + 1))
@@ -0,0 +1,165 @@
+"""
+Blood Gas Rules Tests
+=====================
+Tests for the declarative rules table (services/blood_gas_rules.py):
+- Validation of submitted tables
+- Age-specific thresholds (neonates vs the base table)
+- Edited thresholds reaching the engine's results
+- Stored versions reloaded by every API process
+"""
+
+import asyncio
+import copy
+
+import pytest
+
+from conftest import FakeCollection
+from services.blood_gas_engine import analyze, analyze_batch
+from services.blood_gas_rules import (
+    DEFAULT_COMPILED_RULES,
+    DEFAULT_RULES,
+    RULES_DOC_TYPE,
+    BloodGasRulesStore,
+    compile_rules,
+    threshold_names,
+)
+
+
+def edited(**overrides):
+    """DEFAULT_RULES with flat-named thresholds replaced."""
+    rules = copy.deepcopy(DEFAULT_RULES)
+    for name, value in overrides.items():
+        node = rules
+        *path, leaf = name.replace("__", ".").split(".")
+        for key in path:
+            if isinstance(node, list):
+                node = next((e for e in node if e.get("field") == key), None) or node[int(key)]
+            else:
+                node = node[key]
+        node[leaf] = value
+    return rules
+
+
+class TestValidation:
+    """Test that broken tables are rejected with a reason"""
+
+    def test_default_table_compiles(self):
+        assert DEFAULT_COMPILED_RULES.groups == ("neonate", "default")
+        assert "electrolytes.K.high" in threshold_names(DEFAULT_RULES)
+        assert "hb_bands.3.max" in threshold_names(DEFAULT_RULES)
+
+    @pytest.mark.parametrize("rules, message", [
+        ({k: v for k, v in DEFAULT_RULES.items() if k != "lactate"}, "missing section"),
+        ({**DEFAULT_RULES, "extra": {}}, "unknown sections"),
+        (edited(**{"acid_base.pH.low": 7.5}), "acid_base.pH.low"),
+        (edited(**{"electrolytes.K.low": "low"}), "must be a number"),
+        (edited(**{"hb_bands.1.max": 6}), "ascending"),
+        (edited(**{"age_groups.0.overrides": {"electrolytes.Mg.high": 1}}), "unknown threshold"),
+        (edited(**{"age_groups.0.overrides": {"electrolytes.K.high": 3.0}}), "age_groups.neonate"),
+    ])
+    def test_invalid_tables(self, rules, message):
+        with pytest.raises(ValueError, match=message):
+            compile_rules(rules)
+
+    def test_submitted_table_is_copied(self):
+        rules = edited()
+        compiled = compile_rules(rules)
+        rules["anion_gap"]["high"] = 99
+        assert compiled.rules["anion_gap"]["high"] == 12
+
+
+class TestAgeGroups:
+    """Test neonatal ranges against the base (child) table"""
+
+    def test_potassium_range(self):
+        assert analyze({"K": 5.5})["electrolyte_imbalances"] == ["Hyperkalemia"]
+        assert analyze({"K": 5.5, "age_days": 10})["electrolyte_imbalances"] == []
+        assert analyze({"K": 6.2, "age_days": 10})["electrolyte_imbalances"] == ["Hyperkalemia"]
+
+    def test_hb_bands(self):
+        assert analyze({"Hb": 13, "age_days": 400})["hb_analysis"]["level"] == "Normal"
+        assert analyze({"Hb": 13, "age_days": 0})["hb_analysis"]["level"] == "Mild Anemia"
+        assert analyze({"Hb": 20, "age_days": 3})["hb_analysis"]["level"] == "Normal"
+        assert analyze({"Hb": 20})["hb_analysis"]["level"] == "Elevated"
+
+    def test_group_boundary(self):
+        assert analyze({"K": 5.5, "age_days": 27.9})["electrolyte_imbalances"] == []
+        assert analyze({"K": 5.5, "age_days": 28})["electrolyte_imbalances"] == ["Hyperkalemia"]
+
+    def test_mixed_age_batch_matches_single(self):
+        samples = [
+            {"K": 5.5, "Hb": 13, "age_days": age, "pH": 7.2, "pCO2": 26, "HCO3": 12, "Na": 140, "Cl": 100}
+            for age in (None, 1, 5000, 0, 20, None)
+        ]
+        assert analyze_batch(samples) == [analyze(s) for s in samples]
+
+
+class TestEditedThresholds:
+    """Test that edited tables change the results"""
+
+    def test_threshold_edit(self):
+        rules = compile_rules(edited(**{"electrolytes.Na.low": 133}))
+        assert analyze({"Na": 134}, rules)["electrolyte_imbalances"] == []
+        assert analyze({"Na": 134})["electrolyte_imbalances"] == ["Hyponatremia"]
+
+    def test_formula_edit_updates_report_text(self):
+        rules = compile_rules(edited(**{"compensation.winters_intercept": 7}))
+        result = analyze({"pH": 7.2, "pCO2": 26, "HCO3": 12}, rules)
+        assert result["expected_value"] == "25.0 ± 2 mmHg (Winter's formula: 1.5 × HCO3 + 7)"
+        default = analyze({"pH": 7.2, "pCO2": 26, "HCO3": 12})
+        assert default["expected_value"] == "26.0 ± 2 mmHg (Winter's formula: 1.5 × HCO3 + 8)"
+
+
+class TestRulesStore:
+    """Test loading, saving and hot reload through content_metadata"""
+
+    def test_load_stored_table(self):
+        collection = FakeCollection([{"type": RULES_DOC_TYPE, "version": 3,
+                                      "rules": edited(**{"electrolytes.Na.low": 133})}])
+        store = BloodGasRulesStore(collection)
+        asyncio.run(store.load())
+        assert store.compiled.version == 3
+        assert store.stats()["source"] == "database"
+        assert analyze({"Na": 134}, store.compiled)["electrolyte_imbalances"] == []
+
+    def test_invalid_stored_table_keeps_current(self):
+        collection = FakeCollection([{"type": RULES_DOC_TYPE, "version": 4, "rules": {"anion_gap": {}}}])
+        store = BloodGasRulesStore(collection)
+        asyncio.run(store.load())
+        assert store.compiled is DEFAULT_COMPILED_RULES
+        assert store.errors == 1
+
+    def test_other_process_picks_up_new_version(self):
+        collection = FakeCollection()
+        writer = BloodGasRulesStore(collection)
+        reader = BloodGasRulesStore(collection, refresh_seconds=0)
+
+        async def scenario():
+            await reader.load()
+            assert (await reader.current()) is DEFAULT_COMPILED_RULES
+            saved = await writer.save(edited(**{"electrolytes.Na.low": 133}), updated_by="admin@example.com")
+            assert saved.version == 1
+            assert writer.compiled is saved
+            return await reader.current()
+
+        rules = asyncio.run(scenario())
+        assert rules.version == 1
+        assert collection.docs[0]["updated_by"] == "admin@example.com"
+        assert analyze({"Na": 134}, rules)["electrolyte_imbalances"] == []
+
+    def test_version_checked_only_after_interval(self):
+        collection = FakeCollection()
+        reader = BloodGasRulesStore(collection, refresh_seconds=3600)
+
+        async def scenario():
+            await BloodGasRulesStore(collection).save(edited())
+            return await reader.current()
+
+        assert asyncio.run(scenario()) is DEFAULT_COMPILED_RULES
+
+    def test_invalid_table_not_saved(self):
+        collection = FakeCollection()
+        store = BloodGasRulesStore(collection)
+        with pytest.raises(ValueError):
+            asyncio.run(store.save(edited(**{"hb_bands.0.max": 50})))
+        assert collection.docs == []
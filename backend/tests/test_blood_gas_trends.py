@@ -0,0 +1,240 @@
+"""
+Blood Gas Trend Tests
+=====================
+Tests for the opt-in serial gas store (services/blood_gas_trends.py):
+- Incremental statistics equal to recomputing over the whole history
+- Constant-size state however many readings a series holds
+- Compensation trajectory across readings
+- Store: compare-and-set, per-user isolation, history paging
+- Endpoints: disabled store, label validation, time order
+"""
+
+import asyncio
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import FakeCollection
+from services import blood_gas_trends
+from services.blood_gas_engine import analyze_with_codes
+from services.blood_gas_trends import (
+    BloodGasTrendStore,
+    TrendOrderError,
+    advance,
+    is_valid_label,
+    new_series,
+    summarize,
+)
+
+START = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def analysed(values):
+    analyses, codes = analyze_with_codes([values])
+    expected = codes["expected"][0].item()
+    return analyses[0], None if expected != expected else expected
+
+
+def run_series(readings, window=6):
+    state = new_series("user-1", "BED-4", START)
+    for hours, values in readings:
+        analysis, expected = analysed(values)
+        state = advance(state, START + timedelta(hours=hours), values, analysis, expected, window)
+    return state
+
+
+def leaf_count(node):
+    """Scalars stored in a state document."""
+    if isinstance(node, dict):
+        return sum(leaf_count(v) for v in node.values())
+    if isinstance(node, list):
+        return sum(leaf_count(v) for v in node)
+    return 1
+
+
+def make_store(window=6):
+    return BloodGasTrendStore(FakeCollection(unique=("user_id", "label")),
+                              FakeCollection(unique=("user_id", "label", "reading")), window=window)
+
+
+class TestIncrementalStatistics:
+    """Test that the running state matches a full recomputation"""
+
+    def test_matches_full_history(self):
+        rng = random.Random(3)
+        readings = [(i * 0.5, {"pH": round(rng.uniform(7.1, 7.5), 3), "K": round(rng.uniform(3, 6), 1)})
+                    for i in range(300)]
+        trend = summarize(run_series(readings))
+        ph = [v["pH"] for _, v in readings]
+        assert trend["count"] == 300
+        assert trend["metrics"]["pH"]["mean"] == round(statistics.mean(ph), 3)
+        assert trend["metrics"]["pH"]["sd"] == round(statistics.stdev(ph), 3)
+        assert trend["metrics"]["pH"]["min"] == min(ph)
+        assert trend["metrics"]["pH"]["change_from_first"] == round(ph[-1] - ph[0], 3)
+        assert trend["metrics"]["pH"]["rolling"]["mean"] == round(statistics.mean(ph[-6:]), 3)
+
+    def test_state_size_is_constant(self):
+        readings = [(i, {"pH": 7.3, "Na": 140, "Cl": 100, "HCO3": 20}) for i in range(400)]
+        size = leaf_count(run_series(readings[:10]))
+        state = run_series(readings)
+        assert all(len(m["window"]) == 6 for m in state["metrics"].values())
+        assert leaf_count(state) == size
+
+    def test_deltas_and_rolling_slope(self):
+        trend = summarize(run_series([(0, {"lactate": 6.0}), (2, {"lactate": 5.0}), (4, {"lactate": 3.0})]))
+        lactate = trend["metrics"]["lactate"]
+        assert lactate["delta"] == -2.0
+        assert lactate["hours_since_previous"] == 2.0
+        assert lactate["rate_per_hour"] == -1.0
+        assert lactate["rolling"]["slope_per_hour"] == -0.75
+
+    def test_missing_values_keep_previous(self):
+        trend = summarize(run_series([(0, {"K": 4.0}), (1, {"Na": 140}), (3, {"K": 5.0, "BE": 0})]))
+        assert trend["metrics"]["K"]["delta"] == 1.0
+        assert trend["metrics"]["K"]["hours_since_previous"] == 3.0
+        assert trend["metrics"]["BE"]["value"] == 0.0
+        assert "pH" not in trend["metrics"]
+
+    def test_readings_must_be_in_time_order(self):
+        state = run_series([(2, {"pH": 7.3})])
+        analysis, expected = analysed({"pH": 7.3})
+        with pytest.raises(TrendOrderError):
+            advance(state, START + timedelta(hours=1), {"pH": 7.3}, analysis, expected)
+
+
+class TestCompensationTrajectory:
+    """Test the actual vs expected compensation across readings"""
+
+    def test_converging_then_changed(self):
+        # Metabolic acidosis, HCO3 12 -> Winter's expected pCO2 26
+        state = run_series([(0, {"pH": 7.2, "pCO2": 34, "HCO3": 12})])
+        assert state["compensation"]["direction"] == "new"
+        assert state["compensation"]["gap"] == pytest.approx(8.0)
+
+        state = run_series([(0, {"pH": 7.2, "pCO2": 34, "HCO3": 12}), (1, {"pH": 7.25, "pCO2": 29, "HCO3": 12})])
+        compensation = summarize(state)["compensation"]
+        assert compensation["direction"] == "converging"
+        assert compensation["gap"] == 3.0 and compensation["previous_gap"] == 8.0
+        assert compensation["readings"] == 2 and compensation["since_reading"] == 1
+
+        state = run_series([(0, {"pH": 7.2, "pCO2": 34, "HCO3": 12}), (1, {"pH": 7.25, "pCO2": 29, "HCO3": 12}),
+                            (2, {"K": 4.0}), (3, {"pH": 7.4, "pCO2": 40, "HCO3": 24})])
+        compensation = state["compensation"]
+        assert compensation["direction"] == "changed"
+        assert compensation["previous_disorder"] == "Metabolic Acidosis"
+        assert compensation["disorder"] == "Normal acid-base status"
+        assert compensation["since_reading"] == 4
+
+    def test_diverging(self):
+        state = run_series([(0, {"pH": 7.2, "pCO2": 28, "HCO3": 12}), (1, {"pH": 7.15, "pCO2": 36, "HCO3": 12})])
+        assert state["compensation"]["direction"] == "diverging"
+
+
+class TestTrendStore:
+    """Test storing readings and reading the trend back"""
+
+    def test_add_and_get(self):
+        store = make_store()
+
+        async def scenario():
+            for hours, lactate in ((0, 6.0), (1, 4.0), (2, 3.0)):
+                last = await store.add_reading("user-1", "BED-4", {"lactate": lactate, "pH": 7.3},
+                                               START + timedelta(hours=hours))
+            return last, await store.get_trend("user-1", "BED-4")
+
+        last, trend = asyncio.run(scenario())
+        assert last["reading"] == 3
+        assert last["analysis"]["lactic_acidosis"] is True
+        assert last["trend"] == trend
+        assert trend["metrics"]["lactate"]["delta"] == -1.0
+
+    def test_users_are_isolated(self):
+        store = make_store()
+
+        async def scenario():
+            await store.add_reading("user-1", "BED-4", {"pH": 7.3}, START)
+            await store.add_reading("user-2", "BED-4", {"pH": 7.1}, START)
+            return (await store.get_trend("user-1", "BED-4"), await store.list_series("user-2"),
+                    await store.get_trend("user-3", "BED-4"))
+
+        own, others, missing = asyncio.run(scenario())
+        assert own["metrics"]["pH"]["value"] == 7.3
+        assert [s["label"] for s in others] == ["BED-4"] and others[0]["count"] == 1
+        assert missing is None
+
+    def test_concurrent_update_retries(self):
+        store = make_store()
+        update_one = store.series.update_one
+        calls = []
+
+        async def racing_update(query, update):
+            if not calls:
+                # Another process adds a reading between our read and write
+                calls.append(1)
+                await update_one(query, {"$set": {"count": query["count"] + 1}})
+            return await update_one(query, update)
+
+        async def scenario():
+            await store.add_reading("user-1", "BED-4", {"K": 4.0}, START)
+            store.series.update_one = racing_update
+            return await store.add_reading("user-1", "BED-4", {"K": 5.0}, START + timedelta(hours=1))
+
+        result = asyncio.run(scenario())
+        assert len(calls) == 1
+        assert result["reading"] == 3
+
+    def test_history_paging_and_delete(self):
+        store = make_store()
+
+        async def scenario():
+            for i in range(5):
+                await store.add_reading("user-1", "BED-4", {"K": 4.0 + i / 10}, START + timedelta(hours=i))
+            first = await store.get_readings("user-1", "BED-4", limit=2)
+            older = await store.get_readings("user-1", "BED-4", limit=2, before=first[-1]["reading"])
+            deleted = await store.delete_series("user-1", "BED-4")
+            return first, older, deleted, await store.get_readings("user-1", "BED-4")
+
+        first, older, deleted, after = asyncio.run(scenario())
+        assert [r["reading"] for r in first] == [5, 4]
+        assert [r["reading"] for r in older] == [3, 2]
+        assert older[0]["values"]["K"] == 4.2
+        assert deleted and after == []
+
+
+class TestTrendRoutes:
+    """Test the trend endpoints' guards"""
+
+    @pytest.fixture
+    def user(self):
+        from models.user import UserResponse
+        return UserResponse(id="user-1", email="u@example.com", name="U", is_admin=False, is_active=True,
+                            created_at=START)
+
+    def test_disabled_returns_404(self, user, monkeypatch):
+        from server import list_blood_gas_trends
+        monkeypatch.setattr(blood_gas_trends, "blood_gas_trend_store", None)
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(list_blood_gas_trends(user=user))
+        assert exc.value.status_code == 404
+
+    def test_label_and_order_checks(self, user, monkeypatch):
+        from server import BloodGasTrendReading, add_blood_gas_trend_reading
+        monkeypatch.setattr(blood_gas_trends, "blood_gas_trend_store", make_store())
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(add_blood_gas_trend_reading("../x", BloodGasTrendReading(values={"pH": 7.3}), user=user))
+        assert exc.value.status_code == 400
+
+        later = BloodGasTrendReading(values={"pH": 7.3}, taken_at=START + timedelta(hours=1))
+        assert asyncio.run(add_blood_gas_trend_reading("BED-4", later, user=user))["reading"] == 1
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(add_blood_gas_trend_reading("BED-4", BloodGasTrendReading(values={"pH": 7.2},
+                                                                                  taken_at=START), user=user))
+        assert exc.value.status_code == 409
+
+    def test_labels(self):
+        assert is_valid_label("BED-4") and is_valid_label("study 12.b")
+        assert not is_valid_label("") and not is_valid_label("-x") and not is_valid_label("a" * 41)
@@ -0,0 +1,135 @@
+"""
+Bulk Revocation Tests
+=====================
+Tests for AuthService.revoke_all_user_tokens:
+- A constant number of round trips, however many devices the user has
+- The per-user revocation epoch rejects tokens issued before it, listed or not
+- JTIs revoked before are not an error
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeCollection
+from services import revoked_tokens as revoked_tokens_module
+from services import token_epochs as token_epochs_module
+from services import user_cache as user_cache_module
+from services.auth_service import AuthService
+
+
+def make_db():
+    users = FakeCollection([{
+        "id": "u1", "email": "u1@example.com", "name": "Test", "hashed_password": "x",
+        "is_admin": False, "is_active": True,
+        "created_at": "2024-01-01T00:00:00+00:00", "updated_at": "2024-01-01T00:00:00+00:00"
+    }])
+    return SimpleNamespace(users=users, user_devices=FakeCollection(), revoked_tokens=FakeCollection(unique=("jti",)),
+                           subscriptions=FakeCollection())
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(revoked_tokens_module, "revoked_token_filter", None)
+    monkeypatch.setattr(token_epochs_module, "token_epoch_store", None)
+    monkeypatch.setattr(user_cache_module, "user_cache", None)
+    db = make_db()
+    return AuthService(db), db
+
+
+def add_devices(auth_service, db, count):
+    tokens = [auth_service.create_refresh_token("u1") for _ in range(count)]
+    db.user_devices.docs.extend({"user_id": "u1", "device_id": f"d{i}", "refresh_token": token}
+                                for i, token in enumerate(tokens))
+    return [auth_service.decode_token(token)["jti"] for token in tokens]
+
+
+def issued_earlier(auth_service, token_type="access"):
+    """A token of u1 issued a few seconds ago."""
+    import jwt
+    now = int(time.time()) - 5
+    payload = {"sub": "u1", "type": token_type, "iat": now, "exp": now + 600, "jti": f"old-{token_type}"}
+    return jwt.encode(payload, auth_service.jwt_secret, algorithm=auth_service.jwt_algorithm)
+
+
+class TestRoundTrips:
+    """Test that the work does not grow with the number of devices"""
+
+    @pytest.mark.parametrize("devices", [1, 50])
+    def test_constant_round_trips(self, service, devices):
+        auth_service, db = service
+        jtis = add_devices(auth_service, db, devices)
+        assert asyncio.run(auth_service.revoke_all_user_tokens("u1")) == devices
+        assert db.users.calls == ["update_one"]
+        assert db.user_devices.calls == ["find"]
+        assert db.revoked_tokens.calls == ["insert_many"]
+        assert sorted(d["jti"] for d in db.revoked_tokens.docs) == sorted(jtis)
+
+    def test_no_devices_skips_insert(self, service):
+        auth_service, db = service
+        assert asyncio.run(auth_service.revoke_all_user_tokens("u1")) == 0
+        assert db.revoked_tokens.calls == []
+        assert db.users.docs[0]["tokens_valid_after"]
+
+    def test_already_revoked_jtis_ignored(self, service):
+        auth_service, db = service
+        jtis = add_devices(auth_service, db, 3)
+        assert asyncio.run(auth_service.revoke_token(jtis[0], "u1"))
+        assert asyncio.run(auth_service.revoke_all_user_tokens("u1")) == 3
+        assert len(db.revoked_tokens.docs) == 3
+        assert db.revoked_tokens.calls == ["insert_one", "insert_many"]
+
+
+class TestRevocationEpoch:
+    """Test that tokens issued before the epoch are rejected without being listed"""
+
+    def test_older_access_token_rejected(self, service):
+        auth_service, _ = service
+        payload = auth_service.decode_token(issued_earlier(auth_service))
+        assert asyncio.run(auth_service.get_user_with_subscription("u1", payload["iat"])) is not None
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        assert asyncio.run(auth_service.get_user_with_subscription("u1", payload["iat"])) is None
+        assert asyncio.run(auth_service.get_user_with_subscription("u1")) is not None
+
+    def test_new_token_accepted(self, service):
+        auth_service, _ = service
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        payload = auth_service.decode_token(auth_service.create_access_token("u1"))
+        assert asyncio.run(auth_service.get_user_with_subscription("u1", payload["iat"])) is not None
+
+    def test_token_issued_earlier_in_same_second_rejected(self, service):
+        """A token issued just before revoke-all is rejected, even within the same second"""
+        auth_service, _ = service
+        payload = auth_service.decode_token(auth_service.create_access_token("u1"))
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        assert asyncio.run(auth_service.get_user_with_subscription("u1", payload["iat"])) is None
+        whole_second = int(payload["iat"])
+        assert asyncio.run(auth_service.get_user_with_subscription("u1", whole_second)) is None
+
+    def test_refresh_token_issued_before_rejected(self, service):
+        auth_service, db = service
+        payload = auth_service.decode_token(auth_service.create_refresh_token("u1"))
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        user = asyncio.run(auth_service.get_user_by_id("u1"))
+        assert auth_service.issued_before_revocation(user, payload["iat"])
+
+    def test_unlisted_refresh_token_rejected(self, service, monkeypatch):
+        from fastapi import HTTPException
+        from routes import auth
+
+        auth_service, _ = service
+        monkeypatch.setattr(auth, "auth_service", auth_service)
+        token = issued_earlier(auth_service, "refresh")
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        request = SimpleNamespace(cookies={"refresh_token": token})
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(auth.refresh_token(request, SimpleNamespace()))
+        assert exc.value.status_code == 401
+
+    def test_epoch_never_moves_back(self, service):
+        auth_service, db = service
+        db.users.docs[0]["tokens_valid_after"] = "2999-01-01T00:00:00+00:00"
+        asyncio.run(auth_service.revoke_all_user_tokens("u1"))
+        assert db.users.docs[0]["tokens_valid_after"] == "2999-01-01T00:00:00+00:00"
@@ -0,0 +1,107 @@
+"""
+Growth Chart Tests
+==================
+Tests for server-side growth chart rendering (services/growth_charts.py):
+- PNG / PDF output and layout
+- Cached static layers are reused and never drawn on
+- Measurements land at the right place on the chart
+- POST /api/growth/chart
+"""
+
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+from pydantic import ValidationError
+
+from services.growth_charts import (
+    CHART_HEIGHT,
+    CHART_WIDTH,
+    GROWTH_CHART_MAX_POINTS,
+    POINT_COLOR,
+    chart_geometry,
+    render_charts,
+    render_growth_charts,
+    static_layer,
+)
+
+POINTS = [
+    {"age_months": 36, "stature": 95.0, "weight": 14.0},
+    {"age_months": 60, "stature": 110.0, "weight": None},
+    {"age_months": 96, "stature": None, "weight": 26.0},
+]
+
+
+def pixel(image, x, y):
+    return image.convert("RGB").getpixel((int(round(x)), int(round(y))))
+
+
+class TestRendering:
+    """Test the rendered images"""
+
+    def test_png_stacks_charts(self):
+        image = Image.open(io.BytesIO(render_growth_charts("female", ["stature", "weight"], POINTS, "png")))
+        assert image.format == "PNG"
+        assert image.size == (CHART_WIDTH, 2 * CHART_HEIGHT)
+
+    def test_pdf_page_per_chart(self):
+        content = render_growth_charts("male", ["weight", "stature"], POINTS, "pdf")
+        assert content.startswith(b"%PDF")
+        assert content.count(b"/Type /Page\n") == 2
+
+    def test_points_drawn_at_their_values(self):
+        image = render_charts(["stature", "weight"], "male", POINTS)
+        stature, weight = chart_geometry("stature"), chart_geometry("weight")
+        assert pixel(image, stature.x(60), stature.y(110.0)) == POINT_COLOR["male"]
+        assert pixel(image, weight.x(96), weight.y(26.0) + CHART_HEIGHT) == POINT_COLOR["male"]
+        # Missing values are not drawn
+        assert pixel(image, stature.x(96), stature.y(126.0)) != POINT_COLOR["male"]
+
+    def test_no_measurements_is_the_static_layer(self):
+        image = render_charts(["weight"], "female", [])
+        assert image.tobytes() == static_layer(("weight",), "female").tobytes()
+
+
+class TestStaticLayerCache:
+    """Test that only the overlay is drawn per request"""
+
+    def test_layer_reused_and_untouched(self):
+        layer = static_layer(("stature",), "female")
+        before = layer.tobytes()
+        render_growth_charts("female", ["stature"], POINTS, "png")
+        assert static_layer(("stature",), "female") is layer
+        assert layer.tobytes() == before
+
+    def test_layers_differ_by_sex(self):
+        assert static_layer(("weight",), "male").tobytes() != static_layer(("weight",), "female").tobytes()
+
+
+class TestGrowthChartRoute:
+    """Test POST /api/growth/chart"""
+
+    def test_png_response(self):
+        from server import GrowthChartRequest, growth_chart
+        request = GrowthChartRequest(sex="female", charts=["weight", "weight"], measurements=POINTS)
+        response = asyncio.run(growth_chart(request))
+        assert response.media_type == "image/png"
+        assert response.headers["content-disposition"] == 'inline; filename="cdc-weight-girls.png"'
+        assert Image.open(io.BytesIO(response.body)).size == (CHART_WIDTH, CHART_HEIGHT)
+
+    def test_pdf_response(self):
+        from server import GrowthChartRequest, growth_chart
+        response = asyncio.run(growth_chart(GrowthChartRequest(sex="male", format="pdf")))
+        assert response.media_type == "application/pdf"
+        assert response.body.startswith(b"%PDF")
+
+    @pytest.mark.parametrize("body", [
+        {"sex": "male", "charts": ["bmi"]},
+        {"sex": "male", "charts": []},
+        {"sex": "male", "format": "svg"},
+        {"sex": "male", "measurements": [{"age_months": 250, "weight": 60}]},
+        {"sex": "male", "measurements": [{"age_months": 60, "weight": 18}] * (GROWTH_CHART_MAX_POINTS + 1)},
+    ])
+    def test_request_validation(self, body):
+        from server import GrowthChartRequest
+        with pytest.raises(ValidationError):
+            GrowthChartRequest(**body)
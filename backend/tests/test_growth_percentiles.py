@@ -0,0 +1,150 @@
+"""
+Growth Percentile Tests
+=======================
+Tests for the CDC LMS growth module (services/growth_percentiles.py):
+- LMS curves reproduce the CDC tables' own percentile columns
+- Interpolation between the half-month rows
+- Batch results equal single-child results
+- Endpoint validation (age range, measure, sex)
+"""
+
+import asyncio
+import csv
+import random
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from services import growth_percentiles
+from services.growth_percentiles import (
+    GROWTH_DATA_DIR,
+    MEASURES,
+    PERCENTILE_Z_SCORES,
+    SEXES,
+    GrowthReference,
+    assess,
+    get_growth_reference,
+)
+
+
+def table_rows(measure, sex):
+    with open(GROWTH_DATA_DIR / MEASURES[measure][0], newline="") as f:
+        return [row for row in csv.DictReader(f) if int(row["Sex"]) == SEXES.index(sex) + 1]
+
+
+class TestReferenceTables:
+    """Test the loaded tables against the CDC files"""
+
+    def test_table_layout(self):
+        reference = get_growth_reference()
+        assert reference.age_range == (24.0, 240.0)
+        for table in reference.tables.values():
+            assert table.shape == (2, len(reference.ages), 3)
+            assert table.flags["C_CONTIGUOUS"]
+
+    @pytest.mark.parametrize("measure", sorted(MEASURES))
+    @pytest.mark.parametrize("sex", SEXES)
+    def test_curves_match_cdc_percentiles(self, measure, sex):
+        curves = get_growth_reference().curves(measure, sex)
+        rows = table_rows(measure, sex)
+        for name in PERCENTILE_Z_SCORES:
+            expected = np.array([float(row[name]) for row in rows])
+            np.testing.assert_allclose(curves[name], expected, rtol=1e-6)
+
+    def test_cdc_percentile_values_round_trip(self):
+        reference = get_growth_reference()
+        rows = table_rows("stature", "female")
+        ages = np.array([float(row["Agemos"]) for row in rows])
+        sex = np.ones(len(rows), dtype=np.intp)
+        p90 = np.array([float(row["P90"]) for row in rows])
+        np.testing.assert_allclose(reference.percentiles("stature", sex, ages, p90), 90.0, atol=1e-4)
+        np.testing.assert_allclose(reference.z_scores("stature", sex, ages, [float(r["M"]) for r in rows]), 0.0,
+                                   atol=1e-9)
+
+
+class TestInterpolation:
+    """Test ages between and outside the table rows"""
+
+    def test_midpoint_between_rows(self):
+        reference = get_growth_reference()
+        rows = {float(row["Agemos"]): row for row in table_rows("weight", "male")}
+        L, M, S = reference.lms("weight", [0], [25.0])
+        assert M[0] == pytest.approx((float(rows[24.5]["M"]) + float(rows[25.5]["M"])) / 2)
+        assert L[0] == pytest.approx((float(rows[24.5]["L"]) + float(rows[25.5]["L"])) / 2)
+
+    def test_table_ends(self):
+        reference = get_growth_reference()
+        _, M, _ = reference.lms("stature", [1, 1, 1, 1], [24, 240, 23.9, 240.1])
+        assert M[0] == pytest.approx(float(table_rows("stature", "female")[0]["M"]))
+        assert M[1] == pytest.approx(float(table_rows("stature", "female")[-1]["M"]))
+        assert np.isnan(M[2]) and np.isnan(M[3])
+
+    def test_log_form_near_zero_l(self):
+        ages = np.array([0.0, 1.0])
+        tables = {"weight": np.array([[[0.0, 10.0, 0.1], [0.0, 10.0, 0.1]]] * 2)}
+        reference = GrowthReference(ages, tables)
+        z = reference.z_scores("weight", [0], [0.5], [10.0 * np.exp(0.1)])
+        assert z[0] == pytest.approx(1.0)
+        assert reference.values_at("weight", [0], [0.5], [1.0])[0] == pytest.approx(10.0 * np.exp(0.1))
+
+
+class TestAssess:
+    """Test the batch assessment used by the endpoint"""
+
+    def test_batch_equals_single(self):
+        rng = random.Random(5)
+        measurements = [
+            {"sex": rng.choice(SEXES), "age_months": round(rng.uniform(24, 240), 1),
+             "weight": round(rng.uniform(10, 90), 1) if rng.random() > 0.2 else None,
+             "stature": round(rng.uniform(80, 190), 1) if rng.random() > 0.2 else None}
+            for _ in range(200)
+        ]
+        assert assess(measurements) == [assess([m])[0] for m in measurements]
+
+    def test_result_shape(self):
+        result = assess([{"sex": "male", "age_months": 60, "weight": 18.5}])[0]
+        assert result["stature"] is None
+        assert result["weight"] == {"value": 18.5, "z": 0.04, "percentile": 51.8}
+        assert type(result["weight"]["z"]) is float
+
+    def test_normal_cdf(self):
+        z = np.array([-1.880793608, 0.0, 1.644853627])
+        np.testing.assert_allclose(100 * growth_percentiles.ndtr(z), [3.0, 50.0, 95.0], atol=1e-6)
+
+
+class TestGrowthRoutes:
+    """Test the growth endpoints"""
+
+    def test_percentiles_endpoint(self):
+        from server import GrowthPercentileRequest, growth_percentiles as endpoint
+        median = next(float(r["M"]) for r in table_rows("stature", "female") if r["Agemos"] == "120.5")
+        request = GrowthPercentileRequest(measurements=[
+            {"sex": "female", "age_months": 120.5, "stature": median},
+            {"sex": "male", "age_months": 30, "weight": 13.0},
+        ])
+        response = asyncio.run(endpoint(request))
+        assert response["count"] == 2
+        assert response["results"][0]["stature"]["percentile"] == 50.0
+        assert response["results"][1]["stature"] is None
+
+    def test_request_validation(self):
+        from server import GrowthPercentileRequest
+        for bad in ({"sex": "male", "age_months": 12, "weight": 9},
+                    {"sex": "boy", "age_months": 60, "weight": 18},
+                    {"sex": "male", "age_months": 60, "weight": -1}):
+            with pytest.raises(ValidationError):
+                GrowthPercentileRequest(measurements=[bad])
+
+    def test_curves_endpoint(self):
+        from server import growth_curves
+        body = asyncio.run(growth_curves("weight", sex="female"))
+        assert body["unit"] == "kg"
+        assert len(body["ages"]) == len(body["percentiles"]["P50"]) == 218
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(growth_curves("bmi"))
+        assert exc.value.status_code == 404
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(growth_curves("weight", sex="x"))
+        assert exc.value.status_code == 400
@@ -0,0 +1,101 @@
+"""
+OCR Admission Control Tests
+===========================
+Tests for OCRAdmissionMiddleware (middleware/admission.py):
+- OCR routes beyond the in-flight limit get 503 + Retry-After
+- A saturated worker pool sheds new OCR requests
+- Non-OCR routes (/health, auth, the async job API) are never shed
+- Streaming responses hold their slot until the last chunk is sent
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import pytest
+
+from middleware import admission
+from middleware.admission import OCRAdmissionController, OCRAdmissionMiddleware
+from services.ocr_executor import OCRExecutor
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    executor = OCRExecutor(max_workers=1, max_queue_depth=1, job_timeout=30)
+    executor._durations.extend([3.0])
+    ctrl = OCRAdmissionController(executor, max_in_flight=1)
+    monkeypatch.setattr(admission, "ocr_admission", ctrl)
+    return ctrl
+
+
+@pytest.fixture
+def client(controller):
+    app = FastAPI()
+    app.add_middleware(OCRAdmissionMiddleware)
+
+    @app.post("/api/ocr/upload")
+    async def ocr():
+        return {"in_flight": controller.in_flight}
+
+    @app.post("/api/ocr/batch")
+    async def batch():
+        async def lines():
+            for _ in range(3):
+                await asyncio.sleep(0)
+                yield f'{{"in_flight": {controller.in_flight}}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/api/ocr/jobs")
+    async def jobs():
+        return {"in_flight": controller.in_flight}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return TestClient(app)
+
+
+class TestOCRAdmission:
+    """Test load shedding on OCR routes"""
+
+    def test_admitted_request_is_counted_and_released(self, client, controller):
+        response = client.post("/api/ocr/upload")
+        assert response.status_code == 200
+        assert response.json()["in_flight"] == 1
+        assert controller.in_flight == 0
+
+    def test_over_limit_gets_503_with_retry_after(self, client, controller):
+        controller.in_flight = controller.max_in_flight
+        response = client.post("/api/ocr/upload")
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.json()["retry_after"] == int(response.headers["Retry-After"])
+        assert controller.rejected_total == 1
+
+    def test_saturated_pool_sheds(self, client, controller):
+        controller.executor._pending = controller.executor.capacity
+        assert client.post("/api/ocr/upload").status_code == 503
+
+    def test_streamed_batch_holds_slot(self, client, controller):
+        response = client.post("/api/ocr/batch")
+        assert response.status_code == 200
+        assert response.text.splitlines() == ['{"in_flight": 1}'] * 3
+        assert controller.in_flight == 0
+
+    def test_job_submission_not_counted(self, client, controller):
+        controller.in_flight = controller.max_in_flight
+        response = client.post("/api/ocr/jobs")
+        assert response.status_code == 200
+        assert controller.rejected_total == 0
+
+    def test_health_never_shed(self, client, controller):
+        controller.in_flight = controller.max_in_flight
+        assert client.get("/health").status_code == 200
+        assert controller.rejected_total == 0
+
+    def test_stats(self, controller):
+        assert controller.try_acquire() is None
+        assert controller.try_acquire() is not None
+        assert controller.stats() == {"in_flight_requests": 1, "max_in_flight": 1, "rejected_total": 1}
@@ -0,0 +1,125 @@
+"""
+OCR Result Cache Tests
+======================
+Tests for the content-hash OCR result cache (services/ocr_cache.py):
+- Identical images are served from the cache, OCR runs once
+- Entries expire after the TTL
+- Least recently used entries are evicted beyond max_entries
+"""
+
+import asyncio
+
+import pytest
+
+from services import ocr_cache as ocr_cache_module
+from services import ocr_service
+from services.ocr_cache import OCRResultCache
+from services.ocr_service import OCRResult, OCRBlock
+
+
+def make_result(text="pH 7.40"):
+    return OCRResult(
+        success=True,
+        ocr_text=text,
+        ocr_blocks=[OCRBlock(text="pH", confidence=0.9, bbox=[0, 0, 10, 10])],
+        avg_confidence=0.9,
+        lines=[text],
+        key_metrics={"pH": 7.4}
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOCRResultCache:
+    """Test TTL + LRU behaviour of the in-process cache"""
+
+    def test_key_depends_on_bytes_and_options(self):
+        """Same bytes + options give the same key, anything else differs"""
+        key = OCRResultCache.make_key(b"img", "eng", 4, True)
+        assert key == OCRResultCache.make_key(b"img", "eng", 4, True)
+        assert key != OCRResultCache.make_key(b"img2", "eng", 4, True)
+        assert key != OCRResultCache.make_key(b"img", "eng", 6, True)
+        assert key != OCRResultCache.make_key(b"img", "eng", 4, False)
+
+    def test_hit_returns_copy(self):
+        """A hit returns an equal result that callers may mutate freely"""
+        cache = OCRResultCache(max_entries=4, ttl_seconds=60)
+
+        async def scenario():
+            assert await cache.get("k") is None
+            await cache.set("k", make_result())
+            first = await cache.get("k")
+            first.key_metrics["pH"] = 0
+            return await cache.get("k")
+
+        assert asyncio.run(scenario()).key_metrics == {"pH": 7.4}
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        """Entries older than ttl_seconds are misses"""
+        clock = FakeClock()
+        monkeypatch.setattr(ocr_cache_module.time, "monotonic", clock)
+        cache = OCRResultCache(max_entries=4, ttl_seconds=60)
+
+        asyncio.run(cache.set("k", make_result()))
+        clock.now += 61
+        assert asyncio.run(cache.get("k")) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first"""
+        cache = OCRResultCache(max_entries=2, ttl_seconds=60)
+
+        async def scenario():
+            await cache.set("a", make_result("a"))
+            await cache.set("b", make_result("b"))
+            await cache.get("a")
+            await cache.set("c", make_result("c"))
+            return [await cache.get(k) is not None for k in ("a", "b", "c")]
+
+        assert asyncio.run(scenario()) == [True, False, True]
+        assert cache.stats()["evictions"] == 1
+
+
+class TestPerformOCRCaching:
+    """Test that perform_ocr consults the cache"""
+
+    @pytest.fixture
+    def counted_ocr(self, monkeypatch):
+        calls = []
+
+        def fake_ocr(image_bytes, language="eng", enhanced=True, psm_mode=4):
+            calls.append(image_bytes)
+            return make_result()
+
+        monkeypatch.setattr(ocr_service, "perform_ocr_bytes_sync", fake_ocr)
+        monkeypatch.setattr(ocr_service, "get_ocr_executor", lambda: None)
+        monkeypatch.setattr(ocr_cache_module, "ocr_cache", OCRResultCache(max_entries=4, ttl_seconds=60))
+        return calls
+
+    def test_identical_upload_runs_ocr_once(self, counted_ocr):
+        """Re-uploading the same image is answered from the cache"""
+        async def scenario():
+            first = await ocr_service.perform_ocr("aW1n")
+            second = await ocr_service.perform_ocr("data:image/png;base64,aW1n")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first.key_metrics == second.key_metrics
+        assert counted_ocr == [b"img"]
+
+    def test_different_options_miss(self, counted_ocr):
+        """The same image with different OCR options is processed again"""
+        async def scenario():
+            await ocr_service.perform_ocr("aW1n", enhanced=True)
+            await ocr_service.perform_ocr("aW1n", enhanced=False)
+
+        asyncio.run(scenario())
+        assert len(counted_ocr) == 2
@@ -0,0 +1,354 @@
+"""
+OCR Engine Unit Tests
+=====================
+Offline tests for the multi-pass OCR engine in services/ocr_service.py.
+Tesseract itself is replaced by a stub, so these run without the binary.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from pytesseract.pytesseract import file_to_dict
+
+from services import ocr_service
+from services.ocr_service import (
+    OCRPass,
+    run_ocr_passes,
+    is_good_enough,
+    reconstruct_text_from_data,
+    extract_metrics_improved,
+    normalize_image,
+    decode_image_bytes,
+    decode_reduction,
+    preprocess_simple,
+    preprocess_clahe,
+    preprocess_denoise,
+    ImageBufferPool,
+    merge_key_metrics,
+    perform_ocr_batch,
+    OCRResult,
+    TesseractHandlePool,
+    tesserocr_image_to_data
+)
+
+# Recorded Tesseract output (see scripts/record_ocr_corpus.py)
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "ocr_corpus"
+CORPUS_SAMPLES = sorted(p.stem for p in CORPUS_DIR.glob("*.tsv"))
+
+FULL_REPORT_TEXT = """pH 7.396
+pCO2 41.2 mmHg
+pO2 = 95
+cHCO3(P,st) 24.1
+cBase(Ecf) -0.8
+cNa+ 138
+cK+ 4.1
+cCl- 104
+cLac 1.2
+ctHb 13.5
+"""
+
+PARTIAL_REPORT_TEXT = "pH 7.396\ncK+ 4.1\n"
+
+
+@pytest.fixture
+def stub_variants(monkeypatch):
+    """Replace the variants and Tesseract with stubs that record which ran."""
+    ran = []
+    ocr_ran = []
+    lock = threading.Lock()
+
+    def make_variant(name, delay):
+        def preprocess(img):
+            time.sleep(delay)
+            with lock:
+                ran.append(name)
+            return name
+        return (name, preprocess)
+
+    texts = {}
+
+    def fake_tesseract(processed, psm_mode=4, language="eng"):
+        with lock:
+            ocr_ran.append(processed)
+        return texts[processed], 90.0, []
+
+    monkeypatch.setattr(ocr_service, "run_tesseract", fake_tesseract)
+
+    def configure(variants, variant_texts):
+        texts.update(variant_texts)
+        monkeypatch.setattr(ocr_service, "OCR_VARIANTS", [make_variant(n, d) for n, d in variants])
+        return ran
+
+    configure.ocr_ran = ocr_ran
+    return configure
+
+
+class TestMultiPassEngine:
+    """Test parallel variant fan-out with early exit"""
+
+    def test_good_enough_pass_cancels_remaining(self, stub_variants, monkeypatch):
+        """A complete, confident first pass skips variants not yet started"""
+        monkeypatch.setattr(ocr_service, "OCR_PASS_THREADS", 1)
+        ran = stub_variants(
+            [("clahe", 0), ("simple", 0), ("denoised", 0)],
+            {"clahe": FULL_REPORT_TEXT, "simple": PARTIAL_REPORT_TEXT, "denoised": PARTIAL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8))
+        assert best.name == "clahe"
+        assert ran == ["clahe"]
+
+    def test_early_exit_stops_started_passes(self, stub_variants):
+        """With the default thread count every pass starts; the slower ones skip Tesseract"""
+        assert ocr_service.OCR_PASS_THREADS >= len(ocr_service.OCR_VARIANTS)
+        ran = stub_variants(
+            [("clahe", 0.05), ("simple", 0.2), ("denoised", 0.2)],
+            {"clahe": FULL_REPORT_TEXT, "simple": PARTIAL_REPORT_TEXT, "denoised": PARTIAL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8))
+        assert best.name == "clahe"
+        time.sleep(0.4)
+        assert sorted(ran) == ["clahe", "denoised", "simple"]  # All started
+        assert stub_variants.ocr_ran == ["clahe"]
+
+    def test_best_score_wins_without_early_exit(self, stub_variants):
+        """All passes run and the highest len(metrics) * 10 + conf wins"""
+        ran = stub_variants(
+            [("clahe", 0), ("simple", 0), ("denoised", 0)],
+            {"clahe": PARTIAL_REPORT_TEXT, "simple": FULL_REPORT_TEXT, "denoised": PARTIAL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8), early_exit=False)
+        assert best.name == "simple"
+        assert sorted(ran) == ["clahe", "denoised", "simple"]
+
+    def test_tie_goes_to_higher_priority_variant(self, stub_variants):
+        """Equal scores keep the earlier variant, matching the sequential order"""
+        stub_variants(
+            [("clahe", 0.05), ("simple", 0), ("denoised", 0)],
+            {"clahe": PARTIAL_REPORT_TEXT, "simple": PARTIAL_REPORT_TEXT, "denoised": PARTIAL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8))
+        assert best.name == "clahe"
+
+    def test_selected_variant_runs_alone(self, stub_variants):
+        """A good enough pass of the selector's variant skips the others"""
+        ran = stub_variants(
+            [("clahe", 0), ("simple", 0), ("denoised", 0)],
+            {"clahe": PARTIAL_REPORT_TEXT, "simple": PARTIAL_REPORT_TEXT, "denoised": FULL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8), first="denoised")
+        assert best.name == "denoised"
+        assert ran == ["denoised"]
+
+    def test_selected_variant_falls_back(self, stub_variants):
+        """A weak pass of the selector's variant runs the remaining variants"""
+        ran = stub_variants(
+            [("clahe", 0), ("simple", 0), ("denoised", 0)],
+            {"clahe": PARTIAL_REPORT_TEXT, "simple": FULL_REPORT_TEXT, "denoised": PARTIAL_REPORT_TEXT}
+        )
+        best = run_ocr_passes(np.zeros((4, 4), np.uint8), first="denoised", early_exit=False)
+        assert best.name == "simple"
+        assert ran[0] == "denoised"
+        assert sorted(ran) == ["clahe", "denoised", "simple"]
+
+    def test_is_good_enough_requires_confidence(self):
+        """All fields found at low confidence is not good enough"""
+        metrics = ocr_service.extract_metrics_improved(FULL_REPORT_TEXT)
+        assert is_good_enough(OCRPass("clahe", 0, FULL_REPORT_TEXT, 95.0, [], metrics))
+        assert not is_good_enough(OCRPass("clahe", 0, FULL_REPORT_TEXT, 50.0, [], metrics))
+
+
+class TestTextReconstruction:
+    """Regression corpus: one image_to_data call replaces image_to_string"""
+
+    @pytest.mark.parametrize("sample", CORPUS_SAMPLES)
+    def test_reconstructed_text_matches_image_to_string(self, sample):
+        """Text rebuilt from TSV rows equals Tesseract's own text output"""
+        data = file_to_dict((CORPUS_DIR / f"{sample}.tsv").read_text(), "\t", -1)
+        expected = (CORPUS_DIR / f"{sample}.txt").read_text()
+        assert reconstruct_text_from_data(data) == expected
+
+    @pytest.mark.parametrize("sample", CORPUS_SAMPLES)
+    def test_key_metrics_unchanged(self, sample):
+        """Extracted key_metrics are identical for both text sources"""
+        data = file_to_dict((CORPUS_DIR / f"{sample}.tsv").read_text(), "\t", -1)
+        expected = extract_metrics_improved((CORPUS_DIR / f"{sample}.txt").read_text())
+        assert extract_metrics_improved(reconstruct_text_from_data(data)) == expected
+        assert len(expected) >= 10
+
+    def test_empty_page(self):
+        """A page without words reconstructs to just the page separator"""
+        data = {"level": [1], "page_num": [1], "block_num": [0], "par_num": [0],
+                "line_num": [0], "word_num": [0], "text": [""]}
+        assert reconstruct_text_from_data(data) == "\f"
+
+
+def photo_of_printout(text_scale):
+    """A dark 4000x3000 'desk' with a white printout strip of text lines."""
+    photo = np.full((4000, 3000, 3), 60, np.uint8)
+    photo[500:3500, 1000:2200] = 255
+    for i, line in enumerate(FULL_REPORT_TEXT.splitlines() * 3):
+        y = 600 + int(95 * text_scale) * i
+        if y > 3400:
+            break
+        cv2.putText(photo, line, (1050, y), cv2.FONT_HERSHEY_SIMPLEX, text_scale, (0, 0, 0), 2 * int(text_scale))
+    return photo
+
+
+class TestImageNormalization:
+    """Test ROI cropping and resolution capping before preprocessing"""
+
+    def test_crops_to_printout_and_caps_resolution(self):
+        """A large photo is cropped to the paper and bounded in size"""
+        normalized = normalize_image(photo_of_printout(text_scale=3))
+        h, w = normalized.shape[:2]
+        assert max(h, w) <= ocr_service.OCR_MAX_IMAGE_SIDE
+        # Paper strip is 3000x1200 (+ margin); aspect ratio of the crop follows it
+        assert 2.0 < h / w < 3.0
+
+    def test_small_text_is_not_downscaled(self):
+        """Images whose text is already small keep their resolution"""
+        img = np.full((400, 600, 3), 255, np.uint8)
+        for i, line in enumerate(FULL_REPORT_TEXT.splitlines()):
+            cv2.putText(img, line, (10, 30 + 35 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
+        assert normalize_image(img).shape == img.shape
+
+
+class TestGrayscalePreprocessing:
+    """Test grayscale-first decode and shared preprocessing buffers"""
+
+    def test_grayscale_decode(self):
+        _, png = cv2.imencode(".png", np.full((60, 80, 3), 200, np.uint8))
+        gray = decode_image_bytes(png.tobytes(), grayscale=True)
+        assert gray.shape == (60, 80)
+
+    def test_large_photos_decode_reduced(self):
+        """Only photos far above the working resolution are decoded smaller"""
+        _, png = cv2.imencode(".png", np.zeros((10000, 20, 1), np.uint8))
+        assert decode_reduction(png.tobytes(), min_side=4800) == 2
+        assert decode_reduction(png.tobytes(), min_side=12000) == 1
+        assert decode_reduction(b"not an image") == 1
+        assert decode_image_bytes(png.tobytes(), grayscale=True).shape[0] in (5000, 10000)
+
+    def test_variants_accept_shared_gray_buffer(self):
+        """Variants read the shared grayscale image without modifying it"""
+        gray = cv2.cvtColor(photo_of_printout(text_scale=1)[400:800, 900:1400], cv2.COLOR_BGR2GRAY)
+        original = gray.copy()
+        assert preprocess_simple(gray) is gray
+        assert preprocess_clahe(gray, scale=1.5).shape == (600, 750)
+        assert preprocess_denoise(gray).shape == gray.shape
+        assert np.array_equal(gray, original)
+
+    def test_buffer_pool_reuses_released_buffers(self):
+        pool = ImageBufferPool(max_bytes=10_000)
+        first = pool.acquire((40, 50))
+        pool.release(first)
+        second = pool.acquire((30, 60))
+        assert np.shares_memory(first, second)
+        assert not np.shares_memory(second, pool.acquire((10, 10)))
+
+    def test_buffer_pool_ignores_foreign_arrays_and_budget(self):
+        pool = ImageBufferPool(max_bytes=1_000)
+        pool.release(np.zeros((10, 10), np.uint8))
+        big = pool.acquire((100, 100))
+        pool.release(big)
+        assert not np.shares_memory(big, pool.acquire((100, 100)))
+
+
+def page_result(confidence, **metrics):
+    return OCRResult(success=True, ocr_text="", ocr_blocks=[], avg_confidence=confidence, key_metrics=metrics)
+
+
+class TestBatchOCR:
+    """Test batch scheduling and merging of multi-page reports"""
+
+    def test_results_stream_in_completion_order(self, monkeypatch):
+        """Faster images are yielded first; failures are yielded, not raised"""
+        async def fake_ocr(image_bytes, language="eng", enhanced=True, psm_mode=4):
+            await asyncio.sleep(float(image_bytes))
+            if image_bytes == b"0.02":
+                raise RuntimeError("boom")
+            return page_result(0.9)
+
+        monkeypatch.setattr(ocr_service, "perform_ocr_bytes", fake_ocr)
+        monkeypatch.setattr(ocr_service, "get_ocr_executor", lambda: None)
+        monkeypatch.setattr(ocr_service, "OCR_PASS_THREADS", 3)
+
+        async def collect():
+            return [item async for item in perform_ocr_batch([b"0.2", b"0.02", b"0.1"])]
+
+        outcomes = asyncio.run(collect())
+        assert [i for i, _ in outcomes] == [1, 2, 0]
+        assert isinstance(outcomes[0][1], RuntimeError)
+
+    def test_concurrency_bounded_by_workers(self, monkeypatch):
+        """A batch never has more jobs in flight than OCR worker processes"""
+        in_flight = []
+        peak = []
+
+        async def fake_ocr(image_bytes, language="eng", enhanced=True, psm_mode=4):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return page_result(0.9)
+
+        class FakeExecutor:
+            max_workers = 2
+
+        monkeypatch.setattr(ocr_service, "perform_ocr_bytes", fake_ocr)
+        monkeypatch.setattr(ocr_service, "get_ocr_executor", lambda: FakeExecutor())
+
+        async def collect():
+            return [item async for item in perform_ocr_batch([b"x"] * 6)]
+
+        assert len(asyncio.run(collect())) == 6
+        assert max(peak) == 2
+
+    def test_merge_prefers_most_confident_page(self):
+        """Each metric comes from the most confident page that has it"""
+        pages = [
+            page_result(0.7, pH=7.31, K=4.0),
+            page_result(0.9, pH=7.35, Na=138),
+            None,
+            OCRResult(success=False, ocr_text="", ocr_blocks=[], avg_confidence=0.99, key_metrics={"pH": 6.0}),
+        ]
+        assert merge_key_metrics(pages) == {"pH": 7.35, "Na": 138, "K": 4.0}
+
+
+@pytest.fixture
+def tesserocr_pool():
+    """Warm tesserocr handle pool, skipped where tesserocr/eng data is missing"""
+    pytest.importorskip("tesserocr")
+    pool = TesseractHandlePool(1, ocr_service.OCR_TESSDATA_PATH)
+    try:
+        pool.warm("eng")
+    except Exception as e:
+        pytest.skip(f"tesserocr eng traineddata unavailable: {e}")
+    return pool
+
+
+class TestTesseractBackends:
+    """Test OCR_ENGINE backend selection and the in-process backend"""
+
+    def test_missing_tesserocr_falls_back_to_pytesseract(self, monkeypatch):
+        """OCR_ENGINE=tesserocr without the package uses pytesseract"""
+        monkeypatch.setattr(ocr_service, "OCR_ENGINE", "tesserocr")
+        monkeypatch.setattr(ocr_service, "tesserocr", None)
+        monkeypatch.setattr(ocr_service, "_handle_pool", None)
+        monkeypatch.setattr(ocr_service, "_handle_pool_disabled", False)
+        assert ocr_service.get_tesseract_handle_pool() is None
+
+    def test_tesserocr_returns_image_to_data_dict(self, tesserocr_pool):
+        """In-process backend yields the pytesseract DICT shape and real text"""
+        img = np.full((120, 700), 255, np.uint8)
+        cv2.putText(img, "pH 7.312", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+        cv2.putText(img, "cK+ 4.2 mmol/L", (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+        data = tesserocr_image_to_data(img, pool=tesserocr_pool)
+        assert set(data) >= {"level", "block_num", "par_num", "line_num", "conf", "text"}
+        metrics = extract_metrics_improved(reconstruct_text_from_data(data))
+        assert metrics.get("pH") == 7.312
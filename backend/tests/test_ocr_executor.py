@@ -0,0 +1,101 @@
+"""
+OCR Executor Tests
+==================
+Tests for the bounded OCR process pool (services/ocr_executor.py):
+- Jobs run in worker processes and return their result
+- Queue depth limit rejects jobs beyond capacity
+- Per-job timeout raises instead of waiting forever; the job keeps its slot
+  until the worker finishes it
+- Rejections carry a Retry-After estimate from recent job durations
+"""
+
+import asyncio
+import math
+import time
+
+import pytest
+
+from services.ocr_executor import OCRExecutor, OCRQueueFullError, OCRJobTimeoutError
+
+
+@pytest.fixture
+def executor():
+    ex = OCRExecutor(max_workers=1, max_queue_depth=1, job_timeout=10)
+    ex.start()
+    yield ex
+    ex.stop()
+
+
+class TestOCRExecutor:
+    """Test the bounded OCR worker pool"""
+
+    def test_job_returns_result(self, executor):
+        """A submitted job runs in a worker and returns its value"""
+        result = asyncio.run(executor.submit(math.sqrt, 16.0))
+        assert result == 4.0
+        assert executor.pending_jobs == 0
+
+    def test_queue_full_rejects_job(self, executor):
+        """Jobs beyond workers + queue depth are rejected immediately"""
+        async def scenario():
+            running = [asyncio.create_task(executor.submit(time.sleep, 0.5)) for _ in range(executor.capacity)]
+            await asyncio.sleep(0)
+            with pytest.raises(OCRQueueFullError):
+                await executor.submit(time.sleep, 0)
+            await asyncio.gather(*running)
+
+        asyncio.run(scenario())
+        assert executor.pending_jobs == 0
+
+    def test_job_timeout(self, executor):
+        """A job exceeding the timeout raises OCRJobTimeoutError"""
+        with pytest.raises(OCRJobTimeoutError):
+            asyncio.run(executor.submit(time.sleep, 1, timeout=0.2))
+        # Still running in its worker - the slot is held until it finishes
+        assert executor.pending_jobs == 1
+        deadline = time.monotonic() + 10
+        while executor.pending_jobs and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert executor.pending_jobs == 0
+
+    def test_broken_pool_restarted_once(self, executor):
+        """Callers failing on the same broken pool restart it only once"""
+        broken = executor._pool
+        executor._restart_broken_pool(broken)
+        fresh = executor._pool
+        executor._restart_broken_pool(broken)
+        assert executor._pool is fresh is not broken
+        assert asyncio.run(executor.submit(math.sqrt, 9.0)) == 3.0
+
+    def test_rejection_carries_retry_after(self, executor):
+        """Rejected jobs carry a Retry-After estimate from recent durations"""
+        async def scenario():
+            await executor.submit(time.sleep, 0.2)
+            running = [asyncio.create_task(executor.submit(time.sleep, 0.5)) for _ in range(executor.capacity)]
+            await asyncio.sleep(0)
+            assert executor.queued_jobs == executor.capacity - executor.max_workers
+            with pytest.raises(OCRQueueFullError) as exc:
+                await executor.submit(time.sleep, 0)
+            await asyncio.gather(*running)
+            return exc.value
+
+        error = asyncio.run(scenario())
+        assert error.retry_after >= 1
+        assert executor.rejected_total == 1
+        assert executor.recent_job_seconds >= 0.2
+
+
+class TestRetryAfterEstimate:
+    """Test the Retry-After estimate"""
+
+    def test_estimate_scales_with_backlog(self):
+        ex = OCRExecutor(max_workers=2, max_queue_depth=8, job_timeout=30)
+        ex._durations.extend([4.0, 4.0])
+        assert ex.estimate_wait_seconds(backlog=2) == 2
+        assert ex.estimate_wait_seconds(backlog=9) == 16
+        assert ex.estimate_wait_seconds(backlog=100) == 30
+
+    def test_estimate_without_history(self):
+        ex = OCRExecutor(max_workers=1, max_queue_depth=0, job_timeout=30)
+        assert ex.recent_job_seconds is None
+        assert ex.estimate_wait_seconds(backlog=1) >= 1
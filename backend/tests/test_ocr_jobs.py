@@ -0,0 +1,156 @@
+"""
+OCR Job Store Tests
+===================
+Tests for asynchronous OCR jobs (services/ocr_jobs.py):
+- Submit returns at once; polling returns the finished response
+- Long polling waits for the job to finish
+- Failures keep the route's status code and message
+- Finished jobs expire after the TTL; the store is bounded
+- Jobs wait for room in the OCR worker pool instead of failing
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+import pytest
+
+from services.ocr_executor import OCRQueueFullError
+from services.ocr_jobs import OCRJobStore
+
+
+async def slow_response(seconds=0.05, body=None):
+    await asyncio.sleep(seconds)
+    return body or {"success": True, "values": {"pH": 7.4}}
+
+
+class TestOCRJobStore:
+    """Test job lifecycle in the in-process store"""
+
+    def test_submit_then_poll(self):
+        async def scenario():
+            store = OCRJobStore()
+            job = await store.submit("blood_gas", slow_response())
+            first = await store.get(job.job_id)
+            await job.task
+            return first, await store.get(job.job_id)
+
+        first, finished = asyncio.run(scenario())
+        assert first["status"] == "pending"
+        assert "result" not in first
+        assert finished["status"] == "done"
+        assert finished["result"]["values"] == {"pH": 7.4}
+        assert finished["expires_in_seconds"] > 0
+
+    def test_long_poll_waits_for_result(self):
+        async def scenario():
+            store = OCRJobStore()
+            job = await store.submit("ocr", slow_response(0.1))
+            return await store.get(job.job_id, wait=5)
+
+        assert asyncio.run(scenario())["status"] == "done"
+
+    def test_long_poll_times_out_pending(self):
+        async def scenario():
+            store = OCRJobStore(max_wait_seconds=0.05)
+            job = await store.submit("ocr", slow_response(1))
+            body = await store.get(job.job_id, wait=10)
+            store.cancel_all()
+            return body
+
+        assert asyncio.run(scenario())["status"] == "pending"
+
+    def test_failure_keeps_status_code(self):
+        async def busy():
+            raise HTTPException(status_code=503, detail="OCR service is busy. Please try again shortly.")
+
+        async def scenario():
+            store = OCRJobStore()
+            job = await store.submit("ocr", busy())
+            return await store.get(job.job_id, wait=1)
+
+        body = asyncio.run(scenario())
+        assert body["status"] == "failed"
+        assert body["error"]["status_code"] == 503
+
+    def test_finished_jobs_expire(self):
+        async def scenario():
+            store = OCRJobStore(ttl_seconds=0)
+            job = await store.submit("ocr", slow_response(0))
+            await job.task
+            return await store.get(job.job_id)
+
+        assert asyncio.run(scenario()) is None
+
+    def test_unknown_job(self):
+        assert asyncio.run(OCRJobStore().get("missing")) is None
+
+    def test_store_is_bounded(self):
+        async def scenario():
+            store = OCRJobStore(max_jobs=1)
+            await store.submit("ocr", slow_response(0.5))
+            with pytest.raises(OCRQueueFullError):
+                await store.submit("ocr", slow_response(0))
+            stats = store.stats()
+            await asyncio.sleep(0)
+            store.cancel_all()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats["pending"] == 1
+        assert stats["rejected"] == 1
+
+
+class TestWorkerPoolCapacity:
+    """Test that accepted jobs wait for the OCR worker pool"""
+
+    def test_job_waits_for_free_slot(self):
+        executor = SimpleNamespace(capacity=2, pending_jobs=2)
+
+        async def scenario():
+            store = OCRJobStore(executor=executor)
+            job = await store.submit("ocr", slow_response(0))
+            await asyncio.sleep(0.3)
+            waiting = await store.get(job.job_id)
+            executor.pending_jobs = 1
+            return waiting, await store.get(job.job_id, wait=2)
+
+        waiting, finished = asyncio.run(scenario())
+        assert waiting["status"] == "pending"
+        assert finished["status"] == "done"
+
+    def test_jobs_in_pool_bounded_by_capacity(self):
+        executor = SimpleNamespace(capacity=2, pending_jobs=0)
+        running = []
+        peak = []
+
+        async def work():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.02)
+            running.pop()
+            return {"success": True}
+
+        async def scenario():
+            store = OCRJobStore(executor=executor)
+            jobs = [await store.submit("ocr", work()) for _ in range(6)]
+            await asyncio.gather(*(job.task for job in jobs))
+            return [job.status for job in jobs]
+
+        assert asyncio.run(scenario()) == ["done"] * 6
+        assert max(peak) == 2
+
+    def test_cancel_while_waiting(self):
+        executor = SimpleNamespace(capacity=1, pending_jobs=1)
+
+        async def scenario():
+            store = OCRJobStore(executor=executor)
+            job = await store.submit("ocr", slow_response(0))
+            await asyncio.sleep(0)
+            store.cancel_all()
+            with pytest.raises(asyncio.CancelledError):
+                await job.task
+            return await store.get(job.job_id)
+
+        body = asyncio.run(scenario())
+        assert body["status"] == "failed" and body["error"]["status_code"] == 503
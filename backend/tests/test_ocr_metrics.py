@@ -0,0 +1,102 @@
+"""
+Metric Extraction Equivalence Tests
+===================================
+The compiled rule table behind extract_metrics_improved must return exactly
+what the original pattern-by-pattern extractor returned
+(tests/ocr_metrics_reference.py):
+- Recorded OCR corpus (tests/fixtures/ocr_corpus)
+- The OCR error forms documented next to each metric's patterns
+- Deterministic character-level mutations of both (OCR noise)
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from services.ocr_service import extract_metrics_improved, METRIC_RULES, _AnchorIndex
+from tests.ocr_metrics_reference import extract_metrics_reference
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "ocr_corpus"
+CORPUS_TEXTS = {p.stem: p.read_text() for p in sorted(CORPUS_DIR.glob("*.txt"))}
+
+# OCR misreads the extractor is written to tolerate (see METRIC_RULES comments)
+OCR_ERROR_TEXTS = [
+    "? pH(T ) 7.196\nPCO, 7.198\npCO,{T ) 47.5\n? pO, 166 =\n",
+    "pH T 456)\npoo, 341.6\nOT) 95.2\nPoi, Th 88 mmHg\n",
+    "cH20,(P,st)o 15.4\ncBase(Ecf)> \"12.0\nNa 134\n3k+ 3.9\n",
+    "cHOO, (7,80. 23.6\noBase -4,1\ncNat 134\nckK* 3.7\nCa?\" 431\n",
+    "cia 1.36\nscl 1412\noc: 102\n» ctHb 7.41\nsO, O6.2\nmet 97.4 %\n",
+    "Pitac 48\n? clec 0.\neGiu . 4\nGlu 41.3\nctBil 5\nnol 95.1 %\n",
+    "FCOHb 1.2 %\nFMetHb 0.8\nctO2 19.4 Vol%\nSodium: 141\nPotassium 4,2\n",
+    "Bicarb 22.0\nChloride 99\nHemoglobin 13.2\nLactate 2.2\nGlucose 5.5\nSaturation 97\n",
+    "Calcium 1.21\nHCO3- 24.1\nBE +2.5\ncCa™ 137\n30, 1.0 y/dl\n",
+    "",
+    "no blood gas values here\n",
+]
+
+NOISE_CHARS = " \n.,:;|()[]{}?\"'-+*=oO0lI1sS5cCkK7pPhH"
+
+
+def mutate(text: str, rng: random.Random, edits: int) -> str:
+    chars = list(text)
+    for _ in range(edits):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice(NOISE_CHARS)
+        elif op < 0.7:
+            chars.insert(pos, rng.choice(NOISE_CHARS))
+        elif chars:
+            del chars[min(pos, len(chars) - 1)]
+    return "".join(chars)
+
+
+def mutated_texts(count: int = 300):
+    rng = random.Random(1234)
+    sources = list(CORPUS_TEXTS.values()) + OCR_ERROR_TEXTS
+    return [mutate(rng.choice(sources), rng, rng.randint(1, 40)) for _ in range(count)]
+
+
+class TestCompiledMetricExtraction:
+    """Test equivalence of the compiled extractor with the original"""
+
+    @pytest.mark.parametrize("sample", sorted(CORPUS_TEXTS))
+    def test_corpus_equivalent(self, sample):
+        text = CORPUS_TEXTS[sample]
+        assert extract_metrics_improved(text) == extract_metrics_reference(text)
+
+    @pytest.mark.parametrize("text", OCR_ERROR_TEXTS)
+    def test_ocr_error_forms_equivalent(self, text):
+        assert extract_metrics_improved(text) == extract_metrics_reference(text)
+
+    def test_mutated_texts_equivalent(self):
+        """OCR-noise mutations exercise the anchors and fallback patterns"""
+        for text in mutated_texts():
+            assert extract_metrics_improved(text) == extract_metrics_reference(text), text
+
+    def test_search_start_never_skips_leftmost_match(self):
+        """Every anchored pattern finds the same leftmost match from its start"""
+        texts = list(CORPUS_TEXTS.values()) + OCR_ERROR_TEXTS + mutated_texts()
+        for text in texts:
+            index = _AnchorIndex(text)
+            for rule in METRIC_RULES:
+                for pattern, anchors, lead in rule.patterns:
+                    if not anchors:
+                        continue
+                    full = pattern.search(text)
+                    start = index.search_start(anchors, lead)
+                    if full is None:
+                        assert start < 0 or pattern.search(text, start) is None
+                    else:
+                        assert 0 <= start <= full.start(), (pattern.pattern, text)
+
+    def test_unicode_case_folds_do_not_skip_patterns(self):
+        """Anchors honour characters re.IGNORECASE maps to ASCII (e.g. Kelvin K)"""
+        for text in ("cK+ 4.1\n", "ſodium 140\n", "Potaſſium 3.9\n", "Bİcarb 21.0\n"):
+            assert extract_metrics_improved(text) == extract_metrics_reference(text)
+
+    def test_metric_order_matches_original(self):
+        text = CORPUS_TEXTS[sorted(CORPUS_TEXTS)[0]]
+        assert list(extract_metrics_improved(text)) == list(extract_metrics_reference(text))
+        assert len({rule.metric for rule in METRIC_RULES}) == len(METRIC_RULES)
@@ -0,0 +1,89 @@
+"""
+OCR Stage Timing Tests
+======================
+Tests for per-stage OCR timings (services/ocr_timing.py):
+- Histogram bucketing and quantiles
+- Stage keys recorded by the multi-pass engine
+- Request-level timings (pool_wait, total) and histogram recording
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from services import ocr_cache as ocr_cache_module
+from services import ocr_service
+from services.ocr_service import OCRResult, run_ocr_passes, check_ocr_quality
+from services.ocr_timing import OCRTimingStats, StageHistogram, get_ocr_timing_stats
+
+
+@pytest.fixture
+def timing_stats():
+    stats = get_ocr_timing_stats()
+    stats.reset()
+    yield stats
+    stats.reset()
+
+
+class TestStageHistogram:
+    """Test fixed-bucket histograms"""
+
+    def test_buckets_and_quantiles(self):
+        histogram = StageHistogram()
+        for ms in (0.5, 3, 3, 40, 20000, 99999):
+            histogram.observe(ms)
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 6
+        assert snapshot["buckets"]["le_1"] == 1
+        assert snapshot["buckets"]["le_5"] == 2
+        assert snapshot["buckets"]["le_50"] == 1
+        assert snapshot["buckets"]["le_inf"] == 1
+        assert snapshot["p50_ms"] == 5.0
+        assert snapshot["max_ms"] == 99999
+
+    def test_empty_histogram(self):
+        assert StageHistogram().snapshot()["p50_ms"] is None
+
+    def test_stats_group_by_stage(self):
+        stats = OCRTimingStats()
+        stats.record({"imdecode": 4.0, "total": 900.0})
+        stats.record({"total": 1200.0})
+        snapshot = stats.snapshot()
+        assert snapshot["imdecode"]["count"] == 1
+        assert snapshot["total"]["count"] == 2
+
+
+class TestPipelineTimings:
+    """Test stage timings recorded by the OCR pipeline"""
+
+    def test_passes_record_each_stage(self, monkeypatch):
+        """Every completed pass contributes preprocess/tesseract/extract timings"""
+        monkeypatch.setattr(ocr_service, "run_tesseract", lambda img, psm_mode=4, language="eng": ("", 0.0, []))
+        monkeypatch.setattr(ocr_service, "OCR_VARIANTS", [("a", lambda img: img), ("b", lambda img: img)])
+        timings = {}
+        run_ocr_passes(np.zeros((4, 4), np.uint8), early_exit=False, timings=timings)
+        assert set(timings) == {
+            "preprocess_a", "tesseract_a", "extract_a",
+            "preprocess_b", "tesseract_b", "extract_b",
+        }
+
+    def test_request_timings_recorded(self, monkeypatch, timing_stats):
+        """perform_ocr adds API-side stages and feeds the histograms"""
+        def fake_ocr(image_bytes, language="eng", enhanced=True, psm_mode=4):
+            return OCRResult(success=True, ocr_text="pH 7.40", ocr_blocks=[], avg_confidence=0.9,
+                             timings={"imdecode": 1.0, "worker_total": 5.0})
+
+        monkeypatch.setattr(ocr_service, "perform_ocr_bytes_sync", fake_ocr)
+        monkeypatch.setattr(ocr_service, "get_ocr_executor", lambda: None)
+        monkeypatch.setattr(ocr_cache_module, "ocr_cache", None)
+
+        result = asyncio.run(ocr_service.perform_ocr("aW1n"))
+        assert {"decode_base64", "imdecode", "worker_total", "pool_wait", "total"} <= set(result.timings)
+        assert result.timings["total"] >= result.timings["decode_base64"]
+
+        check_ocr_quality(result)
+        assert "quality_check" in result.timings
+        snapshot = timing_stats.snapshot()
+        assert snapshot["total"]["count"] == 1
+        assert snapshot["quality_check"]["count"] == 1
@@ -0,0 +1,137 @@
+"""
+OCR Variant Selector Tests
+==========================
+Tests for the learned variant selector (services/ocr_variant_selector.py):
+- Feature buckets
+- When a bucket's leading variant is trusted
+- Which jobs compare every variant (plan_passes)
+- Win recording, decay (also of the stored counts) and the per-request
+  round trip through perform_ocr
+"""
+
+import asyncio
+
+import numpy as np
+
+from conftest import FakeCollection
+from services import ocr_cache as ocr_cache_module
+from services import ocr_service
+from services import ocr_variant_selector
+from services.ocr_service import OCRResult
+from services.ocr_variant_selector import (
+    MAX_BUCKET_WINS,
+    VariantSelector,
+    choose_first,
+    feature_key,
+    image_features,
+    plan_passes,
+)
+
+
+class TestFeatures:
+    """Test image features and buckets"""
+
+    def test_features_of_flat_image(self):
+        features = image_features(np.full((1000, 800), 230, np.uint8))
+        assert features == {"brightness": 230.0, "contrast": 0.0, "blur": 0.0, "megapixels": 0.8}
+        assert feature_key(features) == "b2c0s0r0"
+
+    def test_sharp_checkerboard_is_contrasty(self):
+        board = np.kron(np.indices((250, 250)).sum(axis=0) % 2, np.ones((8, 8))).astype(np.uint8) * 255
+        features = image_features(board)
+        assert feature_key(features) == "b1c2s2r2"
+
+
+class TestChooseFirst:
+    """Test when the selector trusts a bucket"""
+
+    def test_needs_samples_and_share(self):
+        assert choose_first({}, "k") is None
+        assert choose_first({"k": {"clahe": 5}}, "k", min_samples=20, explore_rate=0) is None
+        assert choose_first({"k": {"clahe": 12, "simple": 8}}, "k", min_samples=20, min_share=0.7,
+                            explore_rate=0) is None
+        assert choose_first({"k": {"clahe": 18, "simple": 2}}, "k", min_samples=20, min_share=0.7,
+                            explore_rate=0) == "clahe"
+
+    def test_exploration_runs_all_variants(self):
+        assert choose_first({"k": {"clahe": 50}}, "k", min_samples=20, explore_rate=1.0) is None
+
+
+class TestPlanPasses:
+    """Test which jobs compare every variant"""
+
+    def test_selector_disabled_keeps_early_exit(self):
+        assert plan_passes(None, "k") == (None, False)
+
+    def test_new_bucket_compares(self):
+        assert plan_passes({}, "k", explore_rate=0) == (None, True)
+        assert plan_passes({"k": {"clahe": 19}}, "k", min_samples=20, explore_rate=0) == (None, True)
+
+    def test_trusted_bucket_runs_leader_alone(self):
+        assert plan_passes({"k": {"clahe": 50}}, "k", min_samples=20, explore_rate=0) == ("clahe", False)
+
+    def test_undecided_bucket_exits_early(self):
+        stats = {"k": {"clahe": 12, "simple": 10}}
+        assert plan_passes(stats, "k", min_samples=20, min_share=0.7, explore_rate=0) == (None, False)
+
+    def test_exploration_compares(self):
+        assert plan_passes({"k": {"clahe": 50}}, "k", min_samples=20, explore_rate=1.0) == (None, True)
+
+
+class FakeStatsCollection(FakeCollection):
+    """ocr_variant_stats: $inc upserts and the halving pipeline update."""
+
+    async def update_many(self, query, pipeline):
+        divisor = pipeline[0]["$set"]["wins"]["$floor"]["$divide"][1]
+        for doc in self._matching(query):
+            doc["wins"] //= divisor
+
+
+class TestVariantSelector:
+    """Test win recording"""
+
+    def test_record_and_decay(self):
+        selector = VariantSelector()
+        for _ in range(MAX_BUCKET_WINS - 1):
+            asyncio.run(selector.record("k", "clahe"))
+        asyncio.run(selector.record("k", "simple"))
+        wins = selector.snapshot()["k"]
+        assert sum(wins.values()) < MAX_BUCKET_WINS
+        assert wins["clahe"] > wins["simple"]
+
+    def test_stored_counts_decay(self):
+        """Accumulated counts are halved with the in-memory ones"""
+        collection = FakeStatsCollection()
+        selector = VariantSelector(collection)
+
+        async def scenario():
+            for _ in range(MAX_BUCKET_WINS):
+                await selector.record("k", "clahe")
+
+        asyncio.run(scenario())
+        stored = sum(d["wins"] for d in collection.docs)
+        assert stored < MAX_BUCKET_WINS
+        assert stored == sum(selector.snapshot()["k"].values())
+
+    def test_perform_ocr_records_winner(self, monkeypatch):
+        """Win counts go to the worker; a compared winner comes back and is recorded"""
+        seen = {}
+
+        def fake_ocr(image_bytes, language="eng", enhanced=True, psm_mode=4, variant_stats=None):
+            seen["stats"] = variant_stats
+            return OCRResult(success=True, ocr_text="", ocr_blocks=[], avg_confidence=0.9,
+                             variant="simple", variant_compared=image_bytes != b"alone",
+                             image_features={"key": "b2c0s2r0"})
+
+        selector = VariantSelector()
+        monkeypatch.setattr(ocr_variant_selector, "variant_selector", selector)
+        monkeypatch.setattr(ocr_service, "perform_ocr_bytes_sync", fake_ocr)
+        monkeypatch.setattr(ocr_service, "get_ocr_executor", lambda: None)
+        monkeypatch.setattr(ocr_cache_module, "ocr_cache", None)
+
+        asyncio.run(ocr_service.perform_ocr_bytes(b"img"))
+        asyncio.run(ocr_service.perform_ocr_bytes(b"img"))
+        assert seen["stats"] == {"b2c0s2r0": {"simple": 1}}
+        assert selector.snapshot() == {"b2c0s2r0": {"simple": 2}}
+        asyncio.run(ocr_service.perform_ocr_bytes(b"alone"))
+        assert selector.snapshot() == {"b2c0s2r0": {"simple": 2}}
@@ -0,0 +1,202 @@
+"""
+Revoked Token Filter Tests
+==========================
+Tests for the in-process Bloom filter of revoked refresh token JTIs
+(services/revoked_tokens.py) and its use by AuthService:
+- No false negatives; false positive rate near the target
+- Startup load, delta sync between API processes, rebuild over capacity
+- is_token_revoked skips Mongo for unrevoked JTIs
+- Refresh token rotation rejects a token revoked meanwhile
+- The unique jti index is created even over duplicate documents
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from conftest import FakeCollection, FakeCursor
+from services import revoked_tokens as revoked_tokens_module
+from services.auth_service import AuthService
+from services.revoked_tokens import BloomFilter, RevokedTokenFilter, ensure_revoked_token_indexes
+
+
+def jtis(count):
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def revoked_collection():
+    """revoked_tokens with a unique jti index."""
+    return FakeCollection(unique=("jti",))
+
+
+class IndexedCollection(FakeCollection):
+    """revoked_tokens whose indexes are created at startup."""
+
+    def __init__(self, docs=(), indexes=()):
+        super().__init__([dict(d, _id=i) for i, d in enumerate(docs)], unique=("jti",))
+        self.indexes = set(indexes)
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        # The pipeline of remove_duplicate_jtis: latest to expire first, grouped by jti
+        groups = {}
+        for doc in sorted(self.docs, key=lambda d: d["expires_at"], reverse=True):
+            groups.setdefault(doc["jti"], []).append(doc["_id"])
+        return FakeCursor([{"_id": jti, "ids": ids, "count": len(ids)}
+                           for jti, ids in groups.items() if len(ids) > 1])
+
+
+def revoke_elsewhere(collection, jti, when=None):
+    """A revocation written by another API process."""
+    when = when or datetime.now(timezone.utc)
+    collection.docs.append({"jti": jti, "user_id": "u1", "revoked_at": when.isoformat()})
+
+
+class TestBloomFilter:
+    """Test the filter's guarantees"""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(5000, 0.001)
+        members = jtis(5000)
+        for jti in members:
+            bloom.add(jti)
+        assert all(jti in bloom for jti in members)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(5000, 0.01)
+        for jti in jtis(5000):
+            bloom.add(jti)
+        false_positives = sum(jti in bloom for jti in jtis(20000))
+        assert false_positives / 20000 < 0.03
+
+    def test_sizing(self):
+        bloom = BloomFilter(100000, 0.001)
+        assert bloom.hashes == 10
+        assert len(bloom.bits) < 200 * 1024
+
+
+class TestRevokedTokenFilter:
+    """Test load, delta sync and rebuilds"""
+
+    def test_not_ready_until_loaded(self):
+        revoked_filter = RevokedTokenFilter(revoked_collection())
+        assert revoked_filter.might_be_revoked("anything")
+
+    def test_load_and_delta_sync(self):
+        collection = revoked_collection()
+        old, new = jtis(2)
+        revoke_elsewhere(collection, old)
+        revoked_filter = RevokedTokenFilter(collection, capacity=100, sync_seconds=0)
+
+        async def scenario():
+            await revoked_filter.load()
+            assert revoked_filter.might_be_revoked(old)
+            assert not revoked_filter.might_be_revoked(new)
+            revoke_elsewhere(collection, new)
+            await revoked_filter.sync()
+            return revoked_filter.might_be_revoked(new)
+
+        assert asyncio.run(scenario())
+        assert revoked_filter.stats()["jtis"] == 2  # Overlap re-reads are not counted twice
+
+    def test_sync_interval(self):
+        collection = revoked_collection()
+        revoked_filter = RevokedTokenFilter(collection, capacity=100, sync_seconds=60)
+        asyncio.run(revoked_filter.load())
+        jti = jtis(1)[0]
+        revoke_elsewhere(collection, jti)
+        asyncio.run(revoked_filter.sync())
+        assert not revoked_filter.might_be_revoked(jti)
+
+    def test_rebuild_over_capacity(self):
+        collection = revoked_collection()
+        revoked_filter = RevokedTokenFilter(collection, capacity=10, sync_seconds=0)
+        asyncio.run(revoked_filter.load())
+        for jti in jtis(11):
+            revoke_elsewhere(collection, jti)
+            revoked_filter.add(jti)
+        asyncio.run(revoked_filter.sync())
+        assert revoked_filter.stats()["rebuilds"] == 2
+        assert revoked_filter.bloom.capacity == 22
+
+
+class TestAuthServiceRevocation:
+    """Test AuthService with the filter"""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        collection = revoked_collection()
+        revoked_filter = RevokedTokenFilter(collection, capacity=1000, sync_seconds=60)
+        asyncio.run(revoked_filter.load())
+        monkeypatch.setattr(revoked_tokens_module, "revoked_token_filter", revoked_filter)
+        return AuthService(SimpleNamespace(revoked_tokens=collection)), collection
+
+    def test_unrevoked_skips_database(self, service):
+        auth_service, collection = service
+        for jti in jtis(50):
+            assert not asyncio.run(auth_service.is_token_revoked(jti))
+        assert collection.calls.count("find_one") == 0
+
+    def test_revoked_confirmed_in_database(self, service):
+        auth_service, collection = service
+        jti = jtis(1)[0]
+        assert asyncio.run(auth_service.revoke_token(jti, "u1"))
+        assert asyncio.run(auth_service.is_token_revoked(jti))
+        assert collection.calls.count("find_one") == 1
+        assert isinstance(collection.docs[0]["expires_at"], datetime)  # TTL index needs a date
+
+    def test_revoking_twice_succeeds(self, service):
+        auth_service, _ = service
+        jti = jtis(1)[0]
+        assert asyncio.run(auth_service.revoke_token(jti, "u1"))
+        assert asyncio.run(auth_service.revoke_token(jti, "u1", reason="device_revoked"))
+
+    def test_rotation_rejects_replay(self, service):
+        auth_service, collection = service
+        jti = jtis(1)[0]
+        # Passed is_token_revoked here, but another process rotated it meanwhile
+        revoke_elsewhere(collection, jti, datetime.now(timezone.utc) - timedelta(seconds=1))
+        assert not asyncio.run(auth_service.consume_refresh_token(jti, "u1"))
+        assert asyncio.run(auth_service.consume_refresh_token(jtis(1)[0], "u1"))
+
+    def test_without_filter(self, service, monkeypatch):
+        auth_service, collection = service
+        monkeypatch.setattr(revoked_tokens_module, "revoked_token_filter", None)
+        assert not asyncio.run(auth_service.is_token_revoked("x"))
+        assert collection.calls.count("find_one") == 1
+
+
+class TestRevokedTokenIndexes:
+    """Test that startup always ends with the unique jti index"""
+
+    def revocation(self, jti, days):
+        return {"jti": jti, "user_id": "u1", "expires_at": datetime(2030, 1, days, tzinfo=timezone.utc)}
+
+    def test_unique_index_created(self):
+        collection = IndexedCollection([self.revocation("a", 1), self.revocation("b", 1)])
+        asyncio.run(ensure_revoked_token_indexes(collection))
+        assert collection.indexes == {"revoked_tokens_ttl", "revoked_tokens_jti"}
+
+    def test_duplicates_removed_then_unique_index_created(self):
+        docs = [self.revocation("a", 1), self.revocation("a", 3), self.revocation("a", 2), self.revocation("b", 1)]
+        collection = IndexedCollection(docs)
+        asyncio.run(ensure_revoked_token_indexes(collection))
+        assert "revoked_tokens_jti" in collection.indexes
+        assert sorted((d["jti"], d["expires_at"].day) for d in collection.docs) == [("a", 3), ("b", 1)]
+
+    def test_legacy_non_unique_index_replaced(self):
+        collection = IndexedCollection([self.revocation("a", 1)], indexes={"revoked_tokens_jti_lookup"})
+        asyncio.run(ensure_revoked_token_indexes(collection))
+        assert collection.indexes == {"revoked_tokens_ttl", "revoked_tokens_jti"}
+
+    def test_other_failures_raised(self):
+        class Unavailable(IndexedCollection):
+            async def create_index(self, key, unique=False, name=None, **kwargs):
+                if unique:
+                    raise OperationFailure("not authorized", 13)
+
+        with pytest.raises(OperationFailure):
+            asyncio.run(ensure_revoked_token_indexes(Unavailable()))
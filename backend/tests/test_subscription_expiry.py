@@ -0,0 +1,103 @@
+"""
+Subscription Expiry Tests
+=========================
+Tests for moving expiry transitions off the read path:
+- get_user_with_subscription / check_subscription_active judge lapsed
+  dates in memory and never write
+- SubscriptionService.expire_lapsed_subscriptions (bulk update_many)
+- The scheduler's expire_subscriptions job
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from conftest import FakeCollection
+from services.auth_service import AuthService
+from services.scheduler_service import SchedulerService
+from services.subscription_service import SubscriptionService
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def iso(delta):
+    return (datetime.now(timezone.utc) + delta).isoformat()
+
+
+def make_db(subscriptions=()):
+    users = FakeCollection([{
+        "id": "u1", "email": "u1@example.com", "name": "Test", "hashed_password": "x",
+        "is_admin": False, "is_active": True,
+        "created_at": "2024-01-01T00:00:00+00:00", "updated_at": "2024-01-01T00:00:00+00:00"
+    }])
+    return SimpleNamespace(users=users, subscriptions=FakeCollection(subscriptions),
+                           scheduler_logs=FakeCollection())
+
+
+def subscription(status, **dates):
+    return {"id": "s1", "user_id": "u1", "plan_name": "monthly", "status": status,
+            "created_at": "2024-01-01T00:00:00+00:00", **dates}
+
+
+class TestReadPathHasNoWrites:
+    """Test that lapsed subscriptions read as expired without a write"""
+
+    def test_lapsed_trial_reads_expired(self):
+        db = make_db([subscription("trial", trial_ends_at=iso(timedelta(hours=-1)))])
+        user = asyncio.run(AuthService(db).get_user_with_subscription("u1"))
+        assert user.subscription_status == "expired"
+        assert not user.has_active_subscription
+        assert db.subscriptions.writes == []
+
+    def test_lapsed_paid_subscription_reads_expired(self):
+        db = make_db([subscription("active", renews_at=iso(timedelta(days=-1)))])
+        user = asyncio.run(AuthService(db).get_user_with_subscription("u1"))
+        assert user.subscription_status == "expired" and not user.has_active_subscription
+        assert db.subscriptions.writes == []
+
+    def test_current_subscription_unchanged(self):
+        db = make_db([subscription("active", renews_at=iso(timedelta(days=3)))])
+        user = asyncio.run(AuthService(db).get_user_with_subscription("u1"))
+        assert user.subscription_status == "active" and user.has_active_subscription
+
+    def test_check_subscription_active(self):
+        db = make_db([subscription("trial", trial_ends_at=iso(timedelta(hours=-1)))])
+        assert asyncio.run(SubscriptionService(db).check_subscription_active("u1")) == (False, "trial_expired")
+        assert db.subscriptions.writes == []
+
+
+class TestExpirySweep:
+    """Test the bulk expiry transition"""
+
+    def test_only_lapsed_subscriptions_expire(self):
+        past, future = (NOW - timedelta(minutes=1)).isoformat(), (NOW + timedelta(minutes=1)).isoformat()
+        db = make_db([
+            subscription("trial", id="t-lapsed", trial_ends_at=past),
+            subscription("trial", id="t-current", trial_ends_at=future),
+            subscription("trial", id="t-undated"),
+            subscription("active", id="a-lapsed", renews_at=past),
+            subscription("active", id="a-current", renews_at=future),
+            subscription("canceled", id="c-lapsed", renews_at=past),
+        ])
+        results = asyncio.run(SubscriptionService(db).expire_lapsed_subscriptions(NOW))
+        assert results == {"trials_expired": 2, "subscriptions_expired": 1}
+        status = {d["id"]: d["status"] for d in db.subscriptions.docs}
+        assert status == {"t-lapsed": "expired", "t-current": "trial", "t-undated": "expired",
+                          "a-lapsed": "expired", "a-current": "active", "c-lapsed": "canceled"}
+        assert db.subscriptions.writes == ["update_many", "update_many"]
+
+    def test_fractional_seconds_compare_in_order(self):
+        db = make_db([subscription("active", renews_at=(NOW + timedelta(microseconds=5)).isoformat())])
+        results = asyncio.run(SubscriptionService(db).expire_lapsed_subscriptions(NOW))
+        assert results["subscriptions_expired"] == 0
+
+
+class TestSchedulerJob:
+    """Test the expire_subscriptions job"""
+
+    def test_job_logs_only_changes(self):
+        db = make_db([subscription("active", renews_at=iso(timedelta(days=-1)))])
+        scheduler = SchedulerService(db)
+        assert asyncio.run(scheduler.run_job_now("expire_subscriptions"))["subscriptions_expired"] == 1
+        assert asyncio.run(scheduler.expire_subscriptions_job())["subscriptions_expired"] == 0
+        assert len(db.scheduler_logs.writes) == 1
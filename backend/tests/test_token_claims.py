@@ -0,0 +1,176 @@
+"""
+Subscription Claim Tests
+========================
+Tests for access tokens carrying subscription claims (AuthService) and the
+per-user epochs that retire them (services/token_epochs.py):
+- Claims round trip; expiry capped at the trial / renewal date
+- Epoch bumps and the delta sync between API processes
+- require_subscription authorises current claims without a database read
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from conftest import FakeCollection, make_user
+from services import token_epochs as token_epochs_module
+from services import user_cache as user_cache_module
+from services.token_epochs import TokenEpochStore, bump_token_epoch
+
+
+def decode(token):
+    from routes.auth import auth_service
+    return auth_service.decode_token(token)
+
+
+class TestClaims:
+    """Test the claims written by create_access_token"""
+
+    def test_claims_round_trip(self):
+        from routes.auth import auth_service
+        user = make_user()
+        user_back = auth_service.user_from_claims(decode(auth_service.create_access_token("u1", False, user)))
+        assert user_back.id == "u1" and user_back.email == user.email and user_back.has_active_subscription
+        assert abs(user_back.subscription_renews_at - user.subscription_renews_at) < timedelta(seconds=1)
+
+    @pytest.mark.parametrize("status", ["trial", "active"])
+    def test_expiry_capped_at_subscription_end(self, status):
+        from routes.auth import auth_service
+        user = make_user(status=status, ends_in=timedelta(minutes=5))
+        payload = decode(auth_service.create_access_token("u1", False, user))
+        assert payload["exp"] <= (datetime.now(timezone.utc) + timedelta(minutes=5)).timestamp() + 1
+        assert payload["subscription"]["until"] == pytest.approx(payload["exp"], abs=1)
+
+    def test_admin_not_capped(self):
+        from routes.auth import auth_service
+        user = make_user(is_admin=True, ends_in=timedelta(minutes=5))
+        payload = decode(auth_service.create_access_token("u1", True, user))
+        assert payload["subscription"]["until"] is None
+        assert payload["exp"] > (datetime.now(timezone.utc) + timedelta(minutes=20)).timestamp()
+
+    def test_no_user_for_missing_or_inactive_claims(self):
+        from routes.auth import auth_service
+        assert auth_service.user_from_claims(decode(auth_service.create_access_token("u1"))) is None
+        expired = make_user(status="expired", ends_in=timedelta(days=-1))
+        assert auth_service.user_from_claims(decode(auth_service.create_access_token("u1", False, expired))) is None
+
+    def test_claims_disabled(self, monkeypatch):
+        from routes.auth import auth_service
+        monkeypatch.setattr(auth_service, "subscription_claims", False)
+        assert "subscription" not in decode(auth_service.create_access_token("u1", False, make_user()))
+
+    def test_forged_claims_rejected(self):
+        from routes.auth import auth_service
+        payload = {"sub": "u1", "type": "access", "exp": time.time() + 600,
+                   "subscription": {"active": True, "at": time.time()}}
+        assert auth_service.decode_token(jwt.encode(payload, "not-the-secret", algorithm="HS256")) is None
+
+
+class TestTokenEpochStore:
+    """Test epochs within and between API processes"""
+
+    def test_bump_retires_older_claims(self):
+        store = TokenEpochStore()
+        before = time.time()
+        asyncio.run(store.bump("u1"))
+        assert not store.is_current("u1", before)
+        assert store.is_current("u1", time.time())
+        assert store.is_current("u2", before)
+
+    def test_delta_sync_between_processes(self):
+        collection = FakeCollection()
+        writer = TokenEpochStore(collection)
+        reader = TokenEpochStore(collection, sync_seconds=0)
+        claims_at = time.time()
+
+        async def scenario():
+            await reader.load()
+            await writer.bump("u1")
+            assert reader.is_current("u1", claims_at)  # Not synced yet
+            await reader.sync()
+            assert not reader.is_current("u1", claims_at)
+            await writer.bump("u2")
+            await reader.sync()
+            return reader.stats()
+
+        stats = asyncio.run(scenario())
+        assert not reader.is_current("u2", claims_at)
+        assert stats["users"] == 2 and stats["syncs"] == 2
+
+    def test_sync_interval(self):
+        collection = FakeCollection()
+        reader = TokenEpochStore(collection, sync_seconds=60)
+        asyncio.run(TokenEpochStore(collection).bump("u1"))
+        asyncio.run(reader.sync())
+        assert reader.is_current("u1", time.time() - 10)
+
+    def test_load_and_prune(self):
+        collection = FakeCollection()
+        asyncio.run(TokenEpochStore(collection).bump("u1"))
+        store = TokenEpochStore(collection, sync_seconds=0, retention_seconds=0.01)
+        asyncio.run(store.load())
+        assert not store.is_current("u1", time.time() - 10)
+        time.sleep(0.02)
+        asyncio.run(store.sync())
+        assert store.stats()["users"] == 0
+
+
+class TestRequireSubscription:
+    """Test the claims fast path of require_subscription"""
+
+    @pytest.fixture
+    def auth(self, monkeypatch):
+        from routes import auth
+
+        reads = []
+        users = {"u1": make_user()}
+
+        async def get_user_with_subscription(user_id, issued_at=None):
+            reads.append(user_id)
+            return users[user_id]
+
+        monkeypatch.setattr(auth.auth_service, "get_user_with_subscription", get_user_with_subscription)
+        monkeypatch.setattr(user_cache_module, "user_cache", None)
+        monkeypatch.setattr(token_epochs_module, "token_epoch_store", TokenEpochStore())
+        return SimpleNamespace(module=auth, reads=reads, users=users)
+
+    def call(self, auth, token):
+        request = SimpleNamespace(cookies={"access_token": token})
+        return asyncio.run(auth.module.require_subscription(request, None))
+
+    def test_current_claims_skip_database(self, auth):
+        token, _ = asyncio.run(auth.module.auth_service.issue_access_token("u1"))
+        assert auth.reads == ["u1"]
+        for _ in range(3):
+            assert self.call(auth, token).id == "u1"
+        assert auth.reads == ["u1"]
+
+    def test_bumped_epoch_falls_back_to_database(self, auth):
+        token, _ = asyncio.run(auth.module.auth_service.issue_access_token("u1"))
+        auth.users["u1"] = make_user(status="canceled", ends_in=timedelta(days=-1))
+        asyncio.run(bump_token_epoch("u1"))
+        with pytest.raises(HTTPException) as exc:
+            self.call(auth, token)
+        assert exc.value.status_code == 403
+        assert auth.reads == ["u1", "u1"]
+
+    def test_token_without_claims_reads_database(self, auth):
+        token = auth.module.auth_service.create_access_token("u1")
+        assert self.call(auth, token).id == "u1"
+        assert auth.reads == ["u1"]
+
+    def test_without_epoch_store_reads_database(self, auth, monkeypatch):
+        token, _ = asyncio.run(auth.module.auth_service.issue_access_token("u1"))
+        monkeypatch.setattr(token_epochs_module, "token_epoch_store", None)
+        self.call(auth, token)
+        assert auth.reads == ["u1", "u1"]
+
+    def test_missing_token(self, auth):
+        with pytest.raises(HTTPException) as exc:
+            self.call(auth, None)
+        assert exc.value.status_code == 401
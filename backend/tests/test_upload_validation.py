@@ -0,0 +1,201 @@
+"""
+Binary Upload Validation Tests
+==============================
+Tests that InputValidationMiddleware lets binary OCR uploads through
+untouched (no buffering, no threat scan) while still scanning JSON, and
+that read_image_upload enforces MAX_BODY_SIZE while streaming.
+"""
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+import pytest
+
+from middleware import validation
+from middleware.validation import InputValidationMiddleware, is_binary_content_type
+
+# Bytes that would match the injection patterns if decoded and scanned
+SUSPICIOUS_BYTES = b'\x89PNG{"$where": "1"}<script>'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(validation, "STRICT_INPUT_VALIDATION", True)
+    app = FastAPI()
+    app.add_middleware(InputValidationMiddleware)
+
+    @app.post("/api/echo")
+    async def echo(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        return {"size": size}
+
+    return TestClient(app)
+
+
+class TestBinaryUploadValidation:
+    """Test binary body handling in InputValidationMiddleware"""
+
+    def test_binary_content_types(self):
+        assert is_binary_content_type("image/jpeg")
+        assert is_binary_content_type("application/octet-stream")
+        assert not is_binary_content_type("application/json")
+        assert not is_binary_content_type("multipart/form-data; boundary=x")
+
+    def test_binary_body_is_streamed_to_endpoint(self, client):
+        """Raw image bodies reach the endpoint stream without being scanned"""
+        response = client.post("/api/echo", content=SUSPICIOUS_BYTES, headers={"content-type": "image/png"})
+        assert response.status_code == 200
+        assert response.json() == {"size": len(SUSPICIOUS_BYTES)}
+
+    def test_json_body_is_still_scanned(self, client):
+        """JSON bodies keep the threat scan (blocked in strict mode)"""
+        response = client.post("/api/echo", json={"q": {"$where": "1"}})
+        assert response.status_code == 400
+
+    def test_oversized_binary_body_rejected(self, client, monkeypatch):
+        """The Content-Length limit applies to binary uploads too"""
+        monkeypatch.setattr(validation, "MAX_BODY_SIZE", 4)
+        response = client.post("/api/echo", content=SUSPICIOUS_BYTES, headers={"content-type": "image/png"})
+        assert response.status_code == 413
+
+
+def multipart_body(field, data, boundary="xyz"):
+    return (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"a.png\"\r\n"
+            f"Content-Type: image/png\r\n\r\n").encode() + data + f"\r\n--{boundary}--\r\n".encode()
+
+
+def chunked(body, size=1024):
+    """A generator body: sent with chunked transfer encoding, no Content-Length."""
+    def generate():
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+    return generate()
+
+
+def streamed_request(body, content_type, size=1024):
+    """A Request whose body arrives in chunks; returns it and the chunks read so far."""
+    chunks = [body[start:start + size] for start in range(0, len(body), size)]
+    received = []
+
+    async def receive():
+        chunk = chunks.pop(0)
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {"type": "http", "method": "POST", "path": "/upload", "query_string": b"",
+             "headers": [(b"content-type", content_type.encode())]}
+    return Request(scope, receive), received
+
+
+@pytest.fixture
+def upload_client(monkeypatch):
+    import server
+    from starlette.datastructures import FormData
+
+    closed = []
+    original_close = FormData.close
+
+    async def close(self):
+        closed.append(True)
+        await original_close(self)
+
+    monkeypatch.setattr(FormData, "close", close)
+    monkeypatch.setattr(server, "MAX_BODY_SIZE", 4096)
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await server.read_image_upload(request))}
+
+    client = TestClient(app)
+    client.closed_forms = closed
+    return client
+
+
+class TestReadImageUpload:
+    """Test the size limit and cleanup of read_image_upload"""
+
+    MULTIPART = {"content-type": "multipart/form-data; boundary=xyz"}
+
+    def test_multipart_image(self, upload_client):
+        response = upload_client.post("/upload", content=multipart_body("image", b"x" * 100), headers=self.MULTIPART)
+        assert response.json() == {"size": 100}
+        assert upload_client.closed_forms == [True]
+
+    def test_chunked_multipart_over_limit(self, upload_client):
+        """Without Content-Length the limit is enforced while parsing"""
+        body = chunked(multipart_body("image", b"x" * 10000))
+        response = upload_client.post("/upload", content=body, headers=self.MULTIPART)
+        assert response.status_code == 413
+
+    def test_multipart_rejected_at_limit(self, upload_client):
+        """Parsing stops at MAX_BODY_SIZE instead of spooling the whole body"""
+        import asyncio
+        import server
+
+        request, received = streamed_request(multipart_body("image", b"x" * 100000), self.MULTIPART["content-type"])
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.read_image_upload(request))
+        assert exc.value.status_code == 413
+        assert sum(len(chunk) for chunk in received) <= server.MAX_BODY_SIZE + 1024
+
+    def test_chunked_binary_over_limit(self, upload_client):
+        response = upload_client.post("/upload", content=chunked(b"x" * 10000), headers={"content-type": "image/png"})
+        assert response.status_code == 413
+
+    def test_missing_field_closes_form(self, upload_client):
+        response = upload_client.post("/upload", content=multipart_body("other", b"x"), headers=self.MULTIPART)
+        assert response.status_code == 400
+        assert upload_client.closed_forms == [True]
+
+
+class TestBatchUpload:
+    """Test the size limit and cleanup of the batch endpoint"""
+
+    MULTIPART = "multipart/form-data; boundary=xyz"
+
+    def test_chunked_batch_over_limit(self, upload_client):
+        """Parsing stops at MAX_BODY_SIZE instead of spooling the whole body"""
+        import asyncio
+        import server
+
+        request, received = streamed_request(multipart_body("images", b"x" * 100000), self.MULTIPART)
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.perform_ocr_batch_endpoint(request))
+        assert exc.value.status_code == 413
+        assert sum(len(chunk) for chunk in received) <= server.MAX_BODY_SIZE + 1024
+
+    def test_missing_images_closes_form(self, upload_client):
+        import asyncio
+        import server
+
+        request, _ = streamed_request(multipart_body("other", b"x"), self.MULTIPART)
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.perform_ocr_batch_endpoint(request))
+        assert exc.value.status_code == 400
+        assert upload_client.closed_forms == [True]
+
+
+class TestJobSubmissionBody:
+    """Test the size limit on JSON job submissions"""
+
+    def test_chunked_json_over_limit(self, upload_client):
+        import asyncio
+        import server
+
+        body = b'{"image_base64": "' + b"x" * 100000 + b'"}'
+        request, received = streamed_request(body, "application/json")
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.submit_ocr_job(request))
+        assert exc.value.status_code == 413
+        assert sum(len(chunk) for chunk in received) <= server.MAX_BODY_SIZE + 1024
+
+    def test_invalid_json(self, upload_client):
+        import asyncio
+        import server
+
+        request, _ = streamed_request(b"{not json", "application/json")
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.submit_ocr_job(request))
+        assert exc.value.status_code == 400
@@ -0,0 +1,192 @@
+"""
+User Cache Tests
+================
+Tests for the resolved-user cache behind require_auth (services/user_cache.py):
+- Hits, TTL expiry and LRU eviction
+- Entries never outlive the cached subscription
+- invalidate() and lookups racing an invalidation
+- get_current_user resolves a token from the database once
+- Subscription writes invalidate the user
+"""
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeCollection, make_user
+from services import user_cache as user_cache_module
+from services.user_cache import UserResponseCache, invalidate_cached_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def cache_with(user, clock=None, **kwargs):
+    cache = UserResponseCache(clock=clock or FakeClock(), **kwargs)
+    cache.put(user.id, 1, user, cache.begin())
+    return cache
+
+
+class TestUserResponseCache:
+    """Test TTL + LRU behaviour"""
+
+    def test_hit_returns_copy(self):
+        cache = cache_with(make_user())
+        first = cache.get("u1", 1)
+        first.name = "changed"
+        assert cache.get("u1", 1).name == "Test"
+        assert cache.stats()["hits"] == 2
+
+    def test_keyed_by_token_iat(self):
+        cache = cache_with(make_user())
+        assert cache.get("u1", 2) is None
+        assert cache.get("u2", 1) is None
+
+    def test_expires_after_ttl(self):
+        clock = FakeClock()
+        cache = cache_with(make_user(), clock=clock, ttl_seconds=30)
+        clock.now += 29
+        assert cache.get("u1", 1) is not None
+        clock.now += 2
+        assert cache.get("u1", 1) is None
+        assert cache.stats()["entries"] == 0 and cache.stats()["users"] == 0
+
+    def test_least_recently_used_evicted(self):
+        cache = UserResponseCache(max_entries=2, clock=FakeClock())
+        for user_id in ("a", "b"):
+            cache.put(user_id, 1, make_user(user_id), cache.begin())
+        cache.get("a", 1)
+        cache.put("c", 1, make_user("c"), cache.begin())
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+        assert cache.stats()["evictions"] == 1
+
+
+class TestSubscriptionDeadline:
+    """Test that cached access never outlasts the subscription"""
+
+    @pytest.mark.parametrize("status", ["trial", "active"])
+    def test_entry_ends_with_subscription(self, status):
+        clock = FakeClock()
+        cache = cache_with(make_user(status=status, ends_in=timedelta(seconds=5)), clock=clock, ttl_seconds=30)
+        clock.now += 4
+        assert cache.get("u1", 1) is not None
+        clock.now += 2
+        assert cache.get("u1", 1) is None
+
+    def test_ended_subscription_not_cached(self):
+        """Resolved as active just before the renewal date passed"""
+        user = make_user(ends_in=timedelta(seconds=-1)).model_copy(update={"has_active_subscription": True})
+        assert cache_with(user).get("u1", 1) is None
+
+    def test_inactive_user_uses_full_ttl(self):
+        clock = FakeClock()
+        cache = cache_with(make_user(status="expired", ends_in=timedelta(days=-1)), clock=clock, ttl_seconds=30)
+        clock.now += 20
+        assert cache.get("u1", 1).has_active_subscription is False
+
+    def test_admin_uses_full_ttl(self):
+        clock = FakeClock()
+        cache = cache_with(make_user(is_admin=True, ends_in=timedelta(seconds=5)), clock=clock, ttl_seconds=30)
+        clock.now += 20
+        assert cache.get("u1", 1) is not None
+
+
+class TestInvalidation:
+    """Test invalidate() and the read / invalidate race"""
+
+    def test_invalidate_drops_all_tokens_of_user(self):
+        cache = UserResponseCache(clock=FakeClock())
+        for iat in (1, 2):
+            cache.put("u1", iat, make_user(), cache.begin())
+        cache.put("u2", 1, make_user("u2"), cache.begin())
+        cache.invalidate("u1")
+        assert cache.get("u1", 1) is None and cache.get("u1", 2) is None
+        assert cache.get("u2", 1) is not None
+
+    def test_read_started_before_invalidation_not_cached(self):
+        cache = UserResponseCache(clock=FakeClock())
+        generation = cache.begin()
+        stale = make_user()
+        cache.invalidate("u1")  # A write lands while the read is in flight
+        cache.put("u1", 1, stale, generation)
+        assert cache.get("u1", 1) is None
+
+    def test_module_helper_without_cache(self, monkeypatch):
+        monkeypatch.setattr(user_cache_module, "user_cache", None)
+        invalidate_cached_user("u1")  # No-op
+
+    def test_init_disabled_by_zero_ttl(self, monkeypatch):
+        monkeypatch.setattr(user_cache_module, "user_cache", None)
+        monkeypatch.setenv("AUTH_USER_CACHE_TTL_SECONDS", "0")
+        assert user_cache_module.init_user_cache() is None
+        monkeypatch.setenv("AUTH_USER_CACHE_TTL_SECONDS", "15")
+        assert user_cache_module.init_user_cache().ttl_seconds == 15
+
+
+class TestGetCurrentUser:
+    """Test routes/auth.get_current_user with the cache"""
+
+    @pytest.fixture
+    def resolver(self, monkeypatch):
+        from routes import auth
+
+        calls = []
+
+        async def get_user_with_subscription(user_id, issued_at=None):
+            calls.append(user_id)
+            return make_user(user_id)
+
+        monkeypatch.setattr(auth.auth_service, "decode_token",
+                            lambda token: {"sub": "u1", "type": "access", "iat": int(token)})
+        monkeypatch.setattr(auth.auth_service, "get_user_with_subscription", get_user_with_subscription)
+        monkeypatch.setattr(user_cache_module, "user_cache", UserResponseCache(clock=FakeClock()))
+        return auth, calls
+
+    def resolve(self, auth, token):
+        request = SimpleNamespace(cookies={"access_token": token})
+        return asyncio.run(auth.get_current_user(request, None))
+
+    def test_database_read_once_per_token(self, resolver):
+        auth, calls = resolver
+        assert self.resolve(auth, "1").id == "u1"
+        assert self.resolve(auth, "1").id == "u1"
+        assert calls == ["u1"]
+        self.resolve(auth, "2")  # Refreshed token
+        assert calls == ["u1", "u1"]
+
+    def test_invalidation_forces_reread(self, resolver):
+        auth, calls = resolver
+        self.resolve(auth, "1")
+        invalidate_cached_user("u1")
+        self.resolve(auth, "1")
+        assert calls == ["u1", "u1"]
+
+    def test_without_cache_always_reads(self, resolver, monkeypatch):
+        auth, calls = resolver
+        monkeypatch.setattr(user_cache_module, "user_cache", None)
+        self.resolve(auth, "1")
+        self.resolve(auth, "1")
+        assert calls == ["u1", "u1"]
+
+
+class TestSubscriptionWrites:
+    """Test that SubscriptionService writes invalidate the user"""
+
+    def test_webhook_failed_invalidates(self, monkeypatch):
+        from services.subscription_service import SubscriptionService
+
+        cache = cache_with(make_user("u1"))
+        monkeypatch.setattr(user_cache_module, "user_cache", cache)
+        db = SimpleNamespace(subscriptions=FakeCollection([
+            {"id": "s1", "user_id": "u1", "status": "active", "gateway_order_id": "ORDER-1"}
+        ]))
+        assert asyncio.run(SubscriptionService(db).handle_webhook_failed("ORDER-1"))
+        assert cache.get("u1", 1) is None
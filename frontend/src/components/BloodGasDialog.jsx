@@ -112,75 +112,71 @@ const BloodGasDialog = ({ open, onOpenChange }) => {
     }, 500);
     
     try {
-      const reader = new FileReader();
-      reader.onloadend = async () => {
-        const base64 = reader.result;
-        setOcrProgress(25);
+      // Send the file as multipart - no base64 inflation or JSON parsing
+      const formData = new FormData();
+      formData.append("image", file);
+      setOcrProgress(25);
+      
+      try {
+        // 100% local OCR (no external API)
+        const response = await axios.post(`${getAPI()}/blood-gas/analyze-image-offline/upload`, formData, {
+          signal: abortControllerRef.current?.signal,
+          timeout: 90000 // 90 second timeout
+        });
         
-        try {
-          // 100% local OCR (no external API)
-          const response = await axios.post(`${getAPI()}/blood-gas/analyze-image-offline`, {
-            image_base64: base64
-          }, {
-            signal: abortControllerRef.current?.signal,
-            timeout: 90000 // 90 second timeout
-          });
-          
-          clearInterval(progressInterval);
-          setOcrProgress(95);
+        clearInterval(progressInterval);
+        setOcrProgress(95);
+        
+        if (response.data.success && response.data.values) {
+          const parsedValues = response.data.values;
           
-          if (response.data.success && response.data.values) {
-            const parsedValues = response.data.values;
+          if (Object.keys(parsedValues).length > 0) {
+            setExtractedValues(parsedValues);
+            setManualValues(prev => ({
+              ...prev,
+              pH: parsedValues.pH?.toString() || prev.pH,
+              pCO2: parsedValues.pCO2?.toString() || prev.pCO2,
+              pO2: parsedValues.pO2?.toString() || prev.pO2,
+              HCO3: parsedValues.HCO3?.toString() || prev.HCO3,
+              BE: parsedValues.BE?.toString() || prev.BE,
+              Na: parsedValues.Na?.toString() || prev.Na,
+              K: parsedValues.K?.toString() || prev.K,
+              Cl: parsedValues.Cl?.toString() || prev.Cl,
+              lactate: parsedValues.lactate?.toString() || prev.lactate,
+              Hb: parsedValues.Hb?.toString() || prev.Hb
+            }));
             
-            if (Object.keys(parsedValues).length > 0) {
-              setExtractedValues(parsedValues);
-              setManualValues(prev => ({
-                ...prev,
-                pH: parsedValues.pH?.toString() || prev.pH,
-                pCO2: parsedValues.pCO2?.toString() || prev.pCO2,
-                pO2: parsedValues.pO2?.toString() || prev.pO2,
-                HCO3: parsedValues.HCO3?.toString() || prev.HCO3,
-                BE: parsedValues.BE?.toString() || prev.BE,
-                Na: parsedValues.Na?.toString() || prev.Na,
-                K: parsedValues.K?.toString() || prev.K,
-                Cl: parsedValues.Cl?.toString() || prev.Cl,
-                lactate: parsedValues.lactate?.toString() || prev.lactate,
-                Hb: parsedValues.Hb?.toString() || prev.Hb
-              }));
-              
-              // Show confidence info
-              const confidence = response.data.avg_confidence || response.data.confidence_avg || 0;
-              const confidencePercent = Math.round(confidence * 100);
-              
-              if (response.data.low_confidence_warning) {
-                toast.warning(response.data.low_confidence_warning);
-              } else {
-                toast.success(`Extracted ${Object.keys(parsedValues).length} values (${confidencePercent}% confidence). Please verify.`);
-              }
+            // Show confidence info
+            const confidence = response.data.avg_confidence || response.data.confidence_avg || 0;
+            const confidencePercent = Math.round(confidence * 100);
+            
+            if (response.data.low_confidence_warning) {
+              toast.warning(response.data.low_confidence_warning);
             } else {
-              const errorMsg = response.data.error_message || "Could not extract values. Try brighter lighting, steady hand, full text visible.";
-              toast.error(errorMsg);
+              toast.success(`Extracted ${Object.keys(parsedValues).length} values (${confidencePercent}% confidence). Please verify.`);
             }
           } else {
-            const errorMsg = response.data.error_message || "Could not read image. Try brighter lighting, steady hand, full text visible.";
+            const errorMsg = response.data.error_message || "Could not extract values. Try brighter lighting, steady hand, full text visible.";
             toast.error(errorMsg);
           }
-        } catch (err) {
-          clearInterval(progressInterval);
-          if (axios.isCancel(err) || err.name === 'AbortError' || err.code === 'ERR_CANCELED') {
-            // Request was cancelled, don't show error
-            return;
-          }
-          console.error("OCR Error:", err);
-          toast.error("OCR failed: " + (err.response?.data?.detail || err.message));
+        } else {
+          const errorMsg = response.data.error_message || "Could not read image. Try brighter lighting, steady hand, full text visible.";
+          toast.error(errorMsg);
         }
-        
+      } catch (err) {
         clearInterval(progressInterval);
-        setIsLoading(false);
-        setOcrProgress(0);
-        abortControllerRef.current = null;
-      };
-      reader.readAsDataURL(file);
+        if (axios.isCancel(err) || err.name === 'AbortError' || err.code === 'ERR_CANCELED') {
+          // Request was cancelled, don't show error
+          return;
+        }
+        console.error("OCR Error:", err);
+        toast.error("OCR failed: " + (err.response?.data?.detail || err.message));
+      }
+      
+      clearInterval(progressInterval);
+      setIsLoading(false);
+      setOcrProgress(0);
+      abortControllerRef.current = null;
     } catch (error) {
       if (error.name === 'AbortError' || error.code === 'ERR_CANCELED') {
         return;
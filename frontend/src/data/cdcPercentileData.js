@@ -1,970 +0,0 @@
-// CDC Growth Chart Data (2-20 years)
-// Source: https://www.cdc.gov/growthcharts/cdc-data-files.htm
-// Age is in months (24 = 2 years, 240 = 20 years)
-// L, M, S parameters for calculating z-scores
-// Percentile values are in cm (stature) or kg (weight)
-
-// Key percentile z-scores for reference:
-// P3=-1.881, P5=-1.645, P10=-1.282, P25=-0.674, P50=0, P75=0.674, P90=1.282, P95=1.645, P97=1.881
-
-export const PERCENTILE_Z_SCORES = {
-  P3: -1.881,
-  P5: -1.645,
-  P10: -1.282,
-  P25: -0.674,
-  P50: 0,
-  P75: 0.674,
-  P90: 1.282,
-  P95: 1.645,
-  P97: 1.881
-};
-
-// Calculate z-score from value using LMS method
-// Z = ((X/M)**L - 1) / (L*S) when L ≠ 0
-// Z = ln(X/M) / S when L = 0
-export function calculateZScore(value, L, M, S) {
-  if (Math.abs(L) < 0.0001) {
-    // L ≈ 0, use logarithmic formula
-    return Math.log(value / M) / S;
-  }
-  return (Math.pow(value / M, L) - 1) / (L * S);
-}
-
-// Find the closest age data point (ages are at 0.5 month intervals starting at 24)
-export function findClosestAgeData(ageMonths, data) {
-  const ages = Object.keys(data).map(Number).sort((a, b) => a - b);
-  
-  // Find closest age
-  let closest = ages[0];
-  let minDiff = Math.abs(ageMonths - closest);
-  
-  for (const age of ages) {
-    const diff = Math.abs(ageMonths - age);
-    if (diff < minDiff) {
-      minDiff = diff;
-      closest = age;
-    }
-  }
-  
-  return data[closest];
-}
-
-// Interpolate between two age points for more accuracy
-export function interpolateAgeData(ageMonths, data) {
-  const ages = Object.keys(data).map(Number).sort((a, b) => a - b);
-  
-  // Find surrounding ages
-  let lowerAge = ages[0];
-  let upperAge = ages[ages.length - 1];
-  
-  for (let i = 0; i < ages.length - 1; i++) {
-    if (ages[i] <= ageMonths && ages[i + 1] >= ageMonths) {
-      lowerAge = ages[i];
-      upperAge = ages[i + 1];
-      break;
-    }
-  }
-  
-  // Edge cases
-  if (ageMonths <= ages[0]) return data[ages[0]];
-  if (ageMonths >= ages[ages.length - 1]) return data[ages[ages.length - 1]];
-  
-  // Interpolate
-  const ratio = (ageMonths - lowerAge) / (upperAge - lowerAge);
-  const lowerData = data[lowerAge];
-  const upperData = data[upperAge];
-  
-  return {
-    L: lowerData.L + ratio * (upperData.L - lowerData.L),
-    M: lowerData.M + ratio * (upperData.M - lowerData.M),
-    S: lowerData.S + ratio * (upperData.S - lowerData.S)
-  };
-}
-
-// Boys stature data (age in months -> LMS parameters)
-export const BOYS_STATURE = {
-  24: { L: 0.941523967, M: 86.45220101, S: 0.040321528 },
-  24.5: { L: 1.00720807, M: 86.86160934, S: 0.040395626 },
-  25.5: { L: 0.837251351, M: 87.65247282, S: 0.040577525 },
-  26.5: { L: 0.681492975, M: 88.42326434, S: 0.040723122 },
-  27.5: { L: 0.538779654, M: 89.17549228, S: 0.040833194 },
-  28.5: { L: 0.407697153, M: 89.91040853, S: 0.040909059 },
-  29.5: { L: 0.286762453, M: 90.62907762, S: 0.040952433 },
-  30.5: { L: 0.174489485, M: 91.33242379, S: 0.04096533 },
-  31.5: { L: 0.069444521, M: 92.02127167, S: 0.040949976 },
-  32.5: { L: -0.029720564, M: 92.69637946, S: 0.040908737 },
-  33.5: { L: -0.124251789, M: 93.35846546, S: 0.040844062 },
-  34.5: { L: -0.215288396, M: 94.00822923, S: 0.040758431 },
-  35.5: { L: -0.30385434, M: 94.64636981, S: 0.040654312 },
-  36.5: { L: -0.390918369, M: 95.27359106, S: 0.04053412 },
-  37.5: { L: -0.254801167, M: 95.91474929, S: 0.040572876 },
-  38.5: { L: -0.125654535, M: 96.54734328, S: 0.04061691 },
-  39.5: { L: -0.00316735, M: 97.17191309, S: 0.040666414 },
-  40.5: { L: 0.11291221, M: 97.78897727, S: 0.040721467 },
-  41.5: { L: 0.222754969, M: 98.3990283, S: 0.040782045 },
-  42.5: { L: 0.326530126, M: 99.00254338, S: 0.040848042 },
-  43.5: { L: 0.42436156, M: 99.599977, S: 0.040919281 },
-  44.5: { L: 0.516353108, M: 100.191764, S: 0.040995524 },
-  45.5: { L: 0.602595306, M: 100.7783198, S: 0.041076485 },
-  46.5: { L: 0.683170764, M: 101.3600411, S: 0.041161838 },
-  47.5: { L: 0.758158406, M: 101.9373058, S: 0.041251224 },
-  48.5: { L: 0.827636736, M: 102.5104735, S: 0.041344257 },
-  49.5: { L: 0.891686306, M: 103.0798852, S: 0.041440534 },
-  50.5: { L: 0.95039153, M: 103.645864, S: 0.041539635 },
-  51.5: { L: 1.003830006, M: 104.208713, S: 0.041641136 },
-  52.5: { L: 1.05207437, M: 104.7687442, S: 0.041744598 },
-  53.5: { L: 1.09519372, M: 105.3261618, S: 0.041849595 },
-  54.5: { L: 1.133253889, M: 105.8811561, S: 0.041955718 },
-  55.5: { L: 1.166316999, M: 106.4339094, S: 0.042062578 },
-  56.5: { L: 1.194441865, M: 106.9845978, S: 0.042169807 },
-  57.5: { L: 1.217684406, M: 107.5333907, S: 0.042277065 },
-  58.5: { L: 1.236098032, M: 108.0804521, S: 0.042384031 },
-  59.5: { L: 1.249734042, M: 108.6259403, S: 0.042490413 },
-  60.5: { L: 1.258641957, M: 109.1700094, S: 0.042595949 },
-  61.5: { L: 1.262869836, M: 109.7128095, S: 0.042700404 },
-  62.5: { L: 1.262464558, M: 110.254487, S: 0.042803573 },
-  63.5: { L: 1.257471971, M: 110.7951857, S: 0.042905285 },
-  64.5: { L: 1.247937047, M: 111.3350468, S: 0.043005402 },
-  65.5: { L: 1.233903982, M: 111.8742099, S: 0.043103821 },
-  66.5: { L: 1.215416441, M: 112.4128133, S: 0.043200471 },
-  67.5: { L: 1.192517706, M: 112.9509945, S: 0.043295316 },
-  68.5: { L: 1.165250918, M: 113.4888901, S: 0.043388348 },
-  69.5: { L: 1.133658303, M: 114.0266366, S: 0.04347959 },
-  70.5: { L: 1.097782293, M: 114.5643701, S: 0.043569089 },
-  71.5: { L: 1.057665632, M: 115.1022266, S: 0.043656919 },
-  72.5: { L: 1.013350457, M: 115.640342, S: 0.04374318 },
-  73.5: { L: 0.964878457, M: 116.1788514, S: 0.043827998 },
-  74.5: { L: 0.912290922, M: 116.7178897, S: 0.04391152 },
-  75.5: { L: 0.855628803, M: 117.2575909, S: 0.043993912 },
-  76.5: { L: 0.794932771, M: 117.7980874, S: 0.044075361 },
-  77.5: { L: 0.730243285, M: 118.3395099, S: 0.044156072 },
-  78.5: { L: 0.661600652, M: 118.8819871, S: 0.044236264 },
-  79.5: { L: 0.589045095, M: 119.4256451, S: 0.044316172 },
-  80.5: { L: 0.51261684, M: 119.9706068, S: 0.044396039 },
-  81.5: { L: 0.432356206, M: 120.5169915, S: 0.044476121 },
-  82.5: { L: 0.348303679, M: 121.0649146, S: 0.044556679 },
-  83.5: { L: 0.260499988, M: 121.6144867, S: 0.044637986 },
-  84.5: { L: 0.168986196, M: 122.1658134, S: 0.044720313 },
-  85.5: { L: 0.073803774, M: 122.7189945, S: 0.044803944 },
-  86.5: { L: -0.025006126, M: 123.2741239, S: 0.044889157 },
-  87.5: { L: -0.127402568, M: 123.8312893, S: 0.044976235 },
-  88.5: { L: -0.233345104, M: 124.3905714, S: 0.045065459 },
-  89.5: { L: -0.342793897, M: 124.9520437, S: 0.045157108 },
-  90.5: { L: -0.455709839, M: 125.5157722, S: 0.045251455 },
-  91.5: { L: -0.572054653, M: 126.0818157, S: 0.045348768 },
-  92.5: { L: -0.691791023, M: 126.6502249, S: 0.0454493 },
-  93.5: { L: -0.814882645, M: 127.2210431, S: 0.045553296 },
-  94.5: { L: -0.941294382, M: 127.7943053, S: 0.04566098 },
-  95.5: { L: -1.070991419, M: 128.3700389, S: 0.04577256 },
-  96.5: { L: -1.203939431, M: 128.9482629, S: 0.045888219 },
-  97.5: { L: -1.340104818, M: 129.5289882, S: 0.046008114 },
-  98.5: { L: -1.479454907, M: 130.1122182, S: 0.046132373 },
-  99.5: { L: -1.62195808, M: 130.6979479, S: 0.046261096 },
-  100.5: { L: -1.767583876, M: 131.2861649, S: 0.046394347 },
-  101.5: { L: -1.916303103, M: 131.8768491, S: 0.046532157 },
-  102.5: { L: -2.068087953, M: 132.4699728, S: 0.046674517 },
-  103.5: { L: -2.222912139, M: 133.0655007, S: 0.046821382 },
-  104.5: { L: -2.380750936, M: 133.6633902, S: 0.046972672 },
-  105.5: { L: -2.541581334, M: 134.2635914, S: 0.047128274 },
-  106.5: { L: -2.705382096, M: 134.866047, S: 0.047288043 },
-  107.5: { L: -2.872133822, M: 135.4706929, S: 0.047451802 },
-  108.5: { L: -3.041819033, M: 136.0774581, S: 0.047619344 },
-  109.5: { L: -3.214422246, M: 136.6862652, S: 0.047790436 },
-  110.5: { L: -3.389930045, M: 137.2970302, S: 0.047964816 },
-  111.5: { L: -3.568331125, M: 137.9096631, S: 0.048142202 },
-  112.5: { L: -3.749616321, M: 138.5240679, S: 0.048322287 },
-  113.5: { L: -3.933778642, M: 139.1401434, S: 0.048504752 },
-  114.5: { L: -4.12081328, M: 139.7577832, S: 0.048689262 },
-  115.5: { L: -4.310717624, M: 140.376877, S: 0.048875469 },
-  116.5: { L: -4.503491266, M: 140.9973097, S: 0.049063015 },
-  117.5: { L: -4.699136013, M: 141.6189621, S: 0.049251538 },
-  118.5: { L: -4.897655875, M: 142.2417116, S: 0.049440669 },
-  119.5: { L: -5.099057076, M: 142.8654317, S: 0.049630037 },
-  120.5: { L: 0.505564115, M: 138.8234114, S: 0.047610108 },
-  121.5: { L: 0.458949227, M: 139.4640668, S: 0.047747426 },
-  122.5: { L: 0.409686463, M: 140.1045419, S: 0.047886107 },
-  123.5: { L: 0.357742666, M: 140.7446866, S: 0.04802618 },
-  124.5: { L: 0.303084326, M: 141.3843453, S: 0.048167666 },
-  125.5: { L: 0.245677631, M: 142.0233572, S: 0.048310582 },
-  126.5: { L: 0.185488532, M: 142.6615563, S: 0.048454937 },
-  127.5: { L: 0.122482802, M: 143.2987717, S: 0.04860074 },
-  128.5: { L: 0.056626102, M: 143.9348279, S: 0.048747992 },
-  129.5: { L: -0.012116024, M: 144.5695447, S: 0.048896692 },
-  130.5: { L: -0.083778206, M: 145.2027378, S: 0.049046834 },
-  131.5: { L: -0.158395184, M: 145.8342185, S: 0.049198409 },
-  132.5: { L: -0.236002051, M: 146.4637937, S: 0.049351402 },
-  133.5: { L: -0.316634381, M: 147.0912658, S: 0.049505797 },
-  134.5: { L: -0.40032846, M: 147.7164327, S: 0.049661572 },
-  135.5: { L: -0.487121515, M: 148.3390873, S: 0.049818701 },
-  136.5: { L: -0.577051938, M: 148.9590175, S: 0.049977158 },
-  137.5: { L: -0.670159527, M: 149.5760059, S: 0.050136911 },
-  138.5: { L: -0.766485687, M: 150.1898291, S: 0.050297926 },
-  139.5: { L: -0.86607276, M: 150.8002581, S: 0.050460168 },
-  140.5: { L: -0.968964276, M: 151.4070572, S: 0.050623598 },
-  141.5: { L: -1.075204227, M: 152.0099841, S: 0.050788172 },
-  142.5: { L: -1.184837348, M: 152.6087896, S: 0.050953844 },
-  143.5: { L: -1.297908384, M: 153.2032164, S: 0.051120564 },
-  144.5: { L: -1.414461356, M: 153.7929985, S: 0.051288278 },
-  145.5: { L: -1.534539778, M: 154.3778602, S: 0.051456928 },
-  146.5: { L: -1.658186848, M: 154.9575158, S: 0.051626455 },
-  147.5: { L: -1.785444616, M: 155.5316684, S: 0.051796794 },
-  148.5: { L: -1.916354147, M: 156.1000089, S: 0.051967878 },
-  149.5: { L: -2.05095566, M: 156.6622154, S: 0.052139637 },
-  150.5: { L: -2.189288664, M: 157.2179522, S: 0.052311996 },
-  151.5: { L: -2.331391112, M: 157.7668688, S: 0.05248488 },
-  152.5: { L: -2.477299545, M: 158.3085997, S: 0.052658208 },
-  153.5: { L: -2.627049232, M: 158.8427634, S: 0.052831902 },
-  154.5: { L: -2.780674213, M: 159.3689618, S: 0.053005881 },
-  155.5: { L: -2.938207358, M: 159.8867801, S: 0.053180065 },
-  156.5: { L: -3.09968043, M: 160.3957862, S: 0.053354377 },
-  157.5: { L: -3.265124171, M: 160.8955302, S: 0.053528738 },
-  158.5: { L: -3.434568269, M: 161.385544, S: 0.053703074 },
-  159.5: { L: -3.608041443, M: 161.8653413, S: 0.053877311 },
-  160.5: { L: -3.785571402, M: 162.3344171, S: 0.054051379 },
-  161.5: { L: -3.967185818, M: 162.7922476, S: 0.054225208 },
-  162.5: { L: -4.152912294, M: 163.2382899, S: 0.054398732 },
-  163.5: { L: -4.342778342, M: 163.6719823, S: 0.054571888 },
-  164.5: { L: -4.536811383, M: 164.0927441, S: 0.054744615 },
-  165.5: { L: -4.735038731, M: 164.4999761, S: 0.054916856 },
-  166.5: { L: -4.937487589, M: 164.8930603, S: 0.055088556 },
-  167.5: { L: -5.144185049, M: 165.2713604, S: 0.055259662 },
-  168.5: { L: -5.35515808, M: 165.6342223, S: 0.055430126 },
-  169.5: { L: -5.570433521, M: 165.9809745, S: 0.0555999 },
-  170.5: { L: -5.790038077, M: 166.3109292, S: 0.055768942 },
-  171.5: { L: -6.013998312, M: 166.6233831, S: 0.055937207 },
-  172.5: { L: -6.242340638, M: 166.9176186, S: 0.056104657 },
-  173.5: { L: -6.475091319, M: 167.1929051, S: 0.05627125 },
-  174.5: { L: -6.712276462, M: 167.4485001, S: 0.056436952 },
-  175.5: { L: -6.95392201, M: 167.6836508, S: 0.056601724 },
-  176.5: { L: -7.200053737, M: 167.8975948, S: 0.056765531 },
-  177.5: { L: -7.450697246, M: 168.0895617, S: 0.056928339 },
-  178.5: { L: -7.705877957, M: 168.2587746, S: 0.057090116 },
-  179.5: { L: -7.965621101, M: 168.4044515, S: 0.057250829 },
-  180.5: { L: -8.229951712, M: 168.5258066, S: 0.057410447 },
-  181.5: { L: -8.498894617, M: 168.6220527, S: 0.05756894 },
-  182.5: { L: -8.772474427, M: 168.6924022, S: 0.057726278 },
-  183.5: { L: -9.050715534, M: 168.7360689, S: 0.057882433 },
-  184.5: { L: -9.333642096, M: 168.7522699, S: 0.058037377 },
-  185.5: { L: -9.621278025, M: 168.7402272, S: 0.058191084 },
-  186.5: { L: -9.913647079, M: 168.6991703, S: 0.058343529 },
-  187.5: { L: -10.21077285, M: 168.6283383, S: 0.058494687 },
-  188.5: { L: -10.51267878, M: 168.5269816, S: 0.058644537 },
-  189.5: { L: -10.81938817, M: 168.3943649, S: 0.058793058 },
-  190.5: { L: -11.13092417, M: 168.2297686, S: 0.058940231 },
-  191.5: { L: -11.44731, M: 168.0324917, S: 0.059086037 },
-  192.5: { L: -11.7685689, M: 167.8018537, S: 0.059230461 },
-  193.5: { L: -12.09472409, M: 167.5371966, S: 0.059373486 },
-  194.5: { L: -12.42579879, M: 167.2378873, S: 0.059515099 },
-  195.5: { L: -12.76181618, M: 166.9033203, S: 0.05965529 },
-  196.5: { L: -13.10279936, M: 166.5329207, S: 0.059794049 },
-  197.5: { L: -13.4487714, M: 166.1261464, S: 0.059931368 },
-  198.5: { L: -13.79975529, M: 165.6824912, S: 0.06006724 },
-  199.5: { L: -14.15577389, M: 165.2014871, S: 0.060201662 },
-  200.5: { L: -14.51684997, M: 164.6827077, S: 0.060334629 },
-  201.5: { L: -14.88300614, M: 164.1257711, S: 0.060466141 },
-  202.5: { L: -15.25426482, M: 163.5303432, S: 0.060596197 },
-  203.5: { L: -15.63064817, M: 162.8961413, S: 0.060724799 },
-  204.5: { L: -16.0121781, M: 162.2229377, S: 0.060851951 },
-  205.5: { L: -16.39887614, M: 161.5105651, S: 0.060977658 },
-  206.5: { L: -16.79076344, M: 160.7589201, S: 0.061101925 },
-  207.5: { L: -17.18786071, M: 159.9679683, S: 0.061224762 },
-  208.5: { L: -17.59018815, M: 159.137748, S: 0.061346176 },
-  209.5: { L: -17.99776551, M: 158.2682729, S: 0.061466178 },
-  210.5: { L: -18.41061199, M: 157.3596364, S: 0.06158478 },
-  211.5: { L: -18.8287462, M: 156.4119141, S: 0.061701994 },
-  212.5: { L: -19.25218619, M: 155.4252665, S: 0.061817837 },
-  213.5: { L: -19.68094932, M: 154.3998421, S: 0.061932322 },
-  214.5: { L: -20.11505237, M: 153.3357793, S: 0.062045468 },
-  215.5: { L: -20.55451145, M: 152.2332092, S: 0.062157292 },
-  216.5: { L: -20.99934211, M: 151.0922576, S: 0.062267813 },
-  217.5: { L: -21.44955924, M: 149.9130464, S: 0.06237705 },
-  218.5: { L: -21.90517718, M: 148.6956959, S: 0.062485026 },
-  219.5: { L: -22.36620959, M: 147.4403256, S: 0.062591761 },
-  220.5: { L: -22.83266953, M: 146.1470562, S: 0.062697279 },
-  221.5: { L: -23.30456942, M: 144.816011, S: 0.062801604 },
-  222.5: { L: -23.78192107, M: 143.4473171, S: 0.062904761 },
-  223.5: { L: -24.26473567, M: 142.0411064, S: 0.063006777 },
-  224.5: { L: -24.75302379, M: 140.5975174, S: 0.063107679 },
-  225.5: { L: -25.24679539, M: 139.1166961, S: 0.063207495 },
-  226.5: { L: -25.74605981, M: 137.5987968, S: 0.063306253 },
-  227.5: { L: -26.25082579, M: 136.0439827, S: 0.063403983 },
-  228.5: { L: -26.76110146, M: 134.4524261, S: 0.063500715 },
-  229.5: { L: -27.27689435, M: 132.8243091, S: 0.06359648 },
-  230.5: { L: -27.79821144, M: 131.1598237, S: 0.063691309 },
-  231.5: { L: -28.32505908, M: 129.459172, S: 0.063785234 },
-  232.5: { L: -28.85744304, M: 127.7225665, S: 0.063878287 },
-  233.5: { L: -29.39536855, M: 125.9502301, S: 0.063970501 },
-  234.5: { L: -29.93884023, M: 124.1423958, S: 0.064061909 },
-  235.5: { L: -30.48786215, M: 122.2993074, S: 0.064152547 },
-  236.5: { L: -31.04243779, M: 120.4212188, S: 0.064242447 },
-  237.5: { L: -31.60257004, M: 118.5083943, S: 0.064331644 },
-  238.5: { L: -32.16826119, M: 116.561108, S: 0.064420173 },
-  239.5: { L: -32.73951294, M: 114.5796439, S: 0.064508071 },
-  240: { L: 1.167279219, M: 176.8492322, S: 0.040369574 }
-};
-
-// Boys weight data (age in months -> LMS parameters)
-export const BOYS_WEIGHT = {
-  24: { L: -0.20615245, M: 12.6707633, S: 0.108125811 },
-  24.5: { L: -0.216501213, M: 12.74154396, S: 0.108166006 },
-  25.5: { L: -0.239790488, M: 12.88102276, S: 0.108274706 },
-  26.5: { L: -0.266315853, M: 13.01842382, S: 0.108421025 },
-  27.5: { L: -0.295754969, M: 13.1544966, S: 0.10860477 },
-  28.5: { L: -0.327729368, M: 13.28989667, S: 0.108825681 },
-  29.5: { L: -0.361817468, M: 13.42519408, S: 0.109083424 },
-  30.5: { L: -0.397568087, M: 13.56088113, S: 0.109377581 },
-  31.5: { L: -0.434520252, M: 13.69737858, S: 0.109707646 },
-  32.5: { L: -0.472188756, M: 13.83504622, S: 0.110073084 },
-  33.5: { L: -0.510116627, M: 13.97418299, S: 0.110473254 },
-  34.5: { L: -0.547885579, M: 14.1150324, S: 0.1109074 },
-  35.5: { L: -0.58507011, M: 14.25779618, S: 0.111374787 },
-  36.5: { L: -0.621319726, M: 14.40262749, S: 0.111874514 },
-  37.5: { L: -0.656295986, M: 14.54964614, S: 0.112405687 },
-  38.5: { L: -0.689735029, M: 14.69893326, S: 0.112967254 },
-  39.5: { L: -0.721410388, M: 14.85054151, S: 0.11355811 },
-  40.5: { L: -0.751175223, M: 15.00449143, S: 0.114176956 },
-  41.5: { L: -0.778904279, M: 15.16078454, S: 0.114822482 },
-  42.5: { L: -0.804515498, M: 15.31940246, S: 0.115493292 },
-  43.5: { L: -0.828003255, M: 15.48030313, S: 0.116187777 },
-  44.5: { L: -0.849380372, M: 15.64343309, S: 0.116904306 },
-  45.5: { L: -0.86869965, M: 15.80872535, S: 0.117641148 },
-  46.5: { L: -0.886033992, M: 15.97610456, S: 0.118396541 },
-  47.5: { L: -0.901507878, M: 16.14548194, S: 0.119168555 },
-  48.5: { L: -0.915241589, M: 16.31676727, S: 0.11995532 },
-  49.5: { L: -0.927377772, M: 16.4898646, S: 0.120754916 },
-  50.5: { L: -0.938069819, M: 16.66467529, S: 0.121565421 },
-  51.5: { L: -0.94747794, M: 16.84109948, S: 0.122384927 },
-  52.5: { L: -0.955766417, M: 17.01904109, S: 0.123211566 },
-  53.5: { L: -0.96310124, M: 17.19840504, S: 0.124043532 },
-  54.5: { L: -0.969649011, M: 17.37909876, S: 0.124879084 },
-  55.5: { L: -0.975576163, M: 17.56103187, S: 0.125716556 },
-  56.5: { L: -0.981048176, M: 17.74411618, S: 0.126554364 },
-  57.5: { L: -0.986228952, M: 17.92826545, S: 0.127391007 },
-  58.5: { L: -0.991280191, M: 18.11339547, S: 0.128225067 },
-  59.5: { L: -0.996362008, M: 18.29942389, S: 0.12905521 },
-  60.5: { L: -1.001633442, M: 18.48627027, S: 0.129880189 },
-  61.5: { L: -1.007253105, M: 18.67385597, S: 0.130698842 },
-  62.5: { L: -1.013379624, M: 18.86210422, S: 0.131510091 },
-  63.5: { L: -1.020172118, M: 19.05093998, S: 0.132312949 },
-  64.5: { L: -1.027790709, M: 19.24028998, S: 0.13310651 },
-  65.5: { L: -1.036396929, M: 19.43008263, S: 0.133889959 },
-  66.5: { L: -1.046153937, M: 19.6202481, S: 0.134662558 },
-  67.5: { L: -1.057226805, M: 19.81071822, S: 0.135423656 },
-  68.5: { L: -1.069781698, M: 20.00142651, S: 0.136172677 },
-  69.5: { L: -1.083986044, M: 20.19230818, S: 0.136909131 },
-  70.5: { L: -1.100008626, M: 20.38329998, S: 0.137632602 },
-  71.5: { L: -1.118019684, M: 20.57434042, S: 0.138342752 },
-  72.5: { L: -1.138190004, M: 20.76536949, S: 0.139039316 },
-  73.5: { L: -1.160691007, M: 20.95632877, S: 0.139722102 },
-  74.5: { L: -1.185694839, M: 21.14716141, S: 0.140390986 },
-  75.5: { L: -1.213374431, M: 21.33781215, S: 0.141045913 },
-  76.5: { L: -1.243903568, M: 21.5282275, S: 0.141686891 },
-  77.5: { L: -1.277456943, M: 21.71835563, S: 0.142313989 },
-  78.5: { L: -1.314210213, M: 21.90814654, S: 0.142927334 },
-  79.5: { L: -1.354340052, M: 22.09755211, S: 0.143527105 },
-  80.5: { L: -1.39802415, M: 22.28652607, S: 0.144113536 },
-  81.5: { L: -1.4454413, M: 22.47502404, S: 0.144686908 },
-  82.5: { L: -1.496771498, M: 22.66300349, S: 0.145247548 },
-  83.5: { L: -1.552195928, M: 22.85042379, S: 0.145795825 },
-  84.5: { L: -1.611897053, M: 23.03724618, S: 0.146332148 },
-  85.5: { L: -1.676058703, M: 23.22343375, S: 0.146856967 },
-  86.5: { L: -1.744866153, M: 23.40895143, S: 0.147370762 },
-  87.5: { L: -1.818505189, M: 23.59376598, S: 0.147874046 },
-  88.5: { L: -1.897163185, M: 23.77784598, S: 0.148367362 },
-  89.5: { L: -1.981028161, M: 23.96116181, S: 0.148851279 },
-  90.5: { L: -2.070288891, M: 24.14368564, S: 0.149326394 },
-  91.5: { L: -2.165134959, M: 24.3253904, S: 0.14979333 },
-  92.5: { L: -2.265756859, M: 24.50625083, S: 0.150252732 },
-  93.5: { L: -2.372346059, M: 24.68624239, S: 0.15070527 },
-  94.5: { L: -2.485095066, M: 24.8653423, S: 0.151151634 },
-  95.5: { L: -2.604197496, M: 25.04352945, S: 0.151592535 },
-  96.5: { L: -2.729848114, M: 25.22078441, S: 0.152028709 },
-  97.5: { L: -2.862242908, M: 25.3970894, S: 0.152460913 },
-  98.5: { L: -3.001579135, M: 25.5724283, S: 0.152889927 },
-  99.5: { L: -3.148055382, M: 25.74678664, S: 0.153316553 },
-  100.5: { L: -3.301871625, M: 25.92015163, S: 0.153741617 },
-  101.5: { L: -3.463229287, M: 26.0925121, S: 0.154165968 },
-  102.5: { L: -3.632331318, M: 26.26385857, S: 0.154590479 },
-  103.5: { L: -3.809382267, M: 26.43418316, S: 0.155016045 },
-  104.5: { L: -3.99458837, M: 26.60347968, S: 0.155443587 },
-  105.5: { L: -4.188157632, M: 26.77174351, S: 0.155874048 },
-  106.5: { L: -4.390299921, M: 26.93897165, S: 0.156308398 },
-  107.5: { L: -4.601227049, M: 27.10516264, S: 0.156747631 },
-  108.5: { L: -4.821152857, M: 27.27031651, S: 0.157192769 },
-  109.5: { L: -5.050293298, M: 27.43443478, S: 0.157644858 },
-  110.5: { L: -5.288866521, M: 27.59752038, S: 0.158104973 },
-  111.5: { L: -5.537093046, M: 27.75957762, S: 0.158574215 },
-  112.5: { L: -5.795196853, M: 27.92061222, S: 0.159053713 },
-  113.5: { L: -6.063404563, M: 28.08063119, S: 0.159544621 },
-  114.5: { L: -6.341945643, M: 28.23964293, S: 0.160048121 },
-  115.5: { L: -6.631052618, M: 28.39765712, S: 0.160565425 },
-  116.5: { L: -6.930961296, M: 28.55468476, S: 0.161097773 },
-  117.5: { L: -7.24191091, M: 28.71073809, S: 0.161646434 },
-  118.5: { L: -7.564144265, M: 28.86583067, S: 0.162212707 },
-  119.5: { L: -7.897907967, M: 29.01997728, S: 0.16279792 },
-  120.5: { L: -1.206688407, M: 32.08799062, S: 0.17892874 },
-  121.5: { L: -1.227549389, M: 32.35652078, S: 0.179871298 },
-  122.5: { L: -1.248764917, M: 32.62888614, S: 0.180814251 },
-  123.5: { L: -1.270351988, M: 32.90520306, S: 0.181757553 },
-  124.5: { L: -1.292328137, M: 33.18559286, S: 0.182701158 },
-  125.5: { L: -1.314711437, M: 33.47018201, S: 0.18364502 },
-  126.5: { L: -1.337520502, M: 33.75910223, S: 0.184589091 },
-  127.5: { L: -1.360774496, M: 34.0524905, S: 0.185533322 },
-  128.5: { L: -1.384493135, M: 34.35048918, S: 0.186477661 },
-  129.5: { L: -1.408696698, M: 34.65324607, S: 0.187422054 },
-  130.5: { L: -1.433406037, M: 34.96091449, S: 0.188366445 },
-  131.5: { L: -1.45864258, M: 35.27365333, S: 0.189310775 },
-  132.5: { L: -1.484428339, M: 35.59162715, S: 0.190254983 },
-  133.5: { L: -1.510785916, M: 35.91500624, S: 0.191199007 },
-  134.5: { L: -1.537738511, M: 36.24396669, S: 0.192142779 },
-  135.5: { L: -1.565309933, M: 36.57869052, S: 0.193086234 },
-  136.5: { L: -1.593524612, M: 36.91936578, S: 0.194029301 },
-  137.5: { L: -1.622407612, M: 37.26618668, S: 0.194971909 },
-  138.5: { L: -1.651984643, M: 37.61935362, S: 0.195913985 },
-  139.5: { L: -1.682282077, M: 37.97907329, S: 0.196855453 },
-  140.5: { L: -1.713326962, M: 38.3455588, S: 0.197796236 },
-  141.5: { L: -1.745147041, M: 38.71902971, S: 0.198736254 },
-  142.5: { L: -1.777770768, M: 39.09971211, S: 0.199675425 },
-  143.5: { L: -1.811227323, M: 39.48783867, S: 0.200613664 },
-  144.5: { L: -1.845546629, M: 39.88364875, S: 0.201550884 },
-  145.5: { L: -1.880759373, M: 40.28738845, S: 0.202486994 },
-  146.5: { L: -1.916897019, M: 40.69931075, S: 0.203421905 },
-  147.5: { L: -1.95399182, M: 41.11967549, S: 0.204355522 },
-  148.5: { L: -1.992076836, M: 41.54874942, S: 0.20528775 },
-  149.5: { L: -2.031185945, M: 41.98680627, S: 0.206218488 },
-  150.5: { L: -2.071353864, M: 42.4341268, S: 0.207147636 },
-  151.5: { L: -2.112616154, M: 42.89099876, S: 0.208075089 },
-  152.5: { L: -2.155009241, M: 43.35771698, S: 0.20900074 },
-  153.5: { L: -2.198570432, M: 43.83458334, S: 0.209924479 },
-  154.5: { L: -2.243337929, M: 44.32190685, S: 0.210846193 },
-  155.5: { L: -2.289350841, M: 44.82000365, S: 0.211765766 },
-  156.5: { L: -2.336649195, M: 45.32919698, S: 0.21268308 },
-  157.5: { L: -2.385273935, M: 45.84981722, S: 0.213598015 },
-  158.5: { L: -2.435266935, M: 46.38220178, S: 0.214510446 },
-  159.5: { L: -2.486671003, M: 46.92669513, S: 0.215420247 },
-  160.5: { L: -2.539529892, M: 47.48364872, S: 0.216327289 },
-  161.5: { L: -2.593888306, M: 48.05342091, S: 0.217231439 },
-  162.5: { L: -2.649791905, M: 48.63637686, S: 0.218132562 },
-  163.5: { L: -2.70728731, M: 49.23288843, S: 0.219030519 },
-  164.5: { L: -2.766422106, M: 49.84333407, S: 0.219925168 },
-  165.5: { L: -2.827244835, M: 50.46809874, S: 0.220816367 },
-  166.5: { L: -2.889805003, M: 51.10757384, S: 0.221703967 },
-  167.5: { L: -2.954153071, M: 51.76215714, S: 0.222587819 },
-  168.5: { L: -3.020340461, M: 52.43225274, S: 0.223467769 },
-  169.5: { L: -3.088419548, M: 53.11827102, S: 0.22434366 },
-  170.5: { L: -3.158443652, M: 53.82062861, S: 0.22521533 },
-  171.5: { L: -3.230467029, M: 54.53974835, S: 0.226082616 },
-  172.5: { L: -3.304544849, M: 55.27605923, S: 0.226945348 },
-  173.5: { L: -3.38073318, M: 56.02999634, S: 0.227803355 },
-  174.5: { L: -3.459088966, M: 56.80200076, S: 0.228656462 },
-  175.5: { L: -3.539670004, M: 57.59251961, S: 0.229504488 },
-  176.5: { L: -3.622534914, M: 58.40200593, S: 0.230347252 },
-  177.5: { L: -3.707743106, M: 59.23091873, S: 0.231184568 },
-  178.5: { L: -3.795354735, M: 60.07972295, S: 0.232016246 },
-  179.5: { L: -3.885430653, M: 60.94888941, S: 0.232842094 },
-  180.5: { L: -3.978032345, M: 61.83889481, S: 0.233661917 },
-  181.5: { L: -4.073221874, M: 62.75022176, S: 0.234475517 },
-  182.5: { L: -4.171061814, M: 63.68335873, S: 0.235282694 },
-  183.5: { L: -4.271615197, M: 64.63880001, S: 0.236083244 },
-  184.5: { L: -4.374945443, M: 65.61704567, S: 0.236876963 },
-  185.5: { L: -4.481116308, M: 66.61860151, S: 0.237663643 },
-  186.5: { L: -4.590191839, M: 67.64397901, S: 0.238443076 },
-  187.5: { L: -4.702236329, M: 68.69369524, S: 0.239215051 },
-  188.5: { L: -4.817314266, M: 69.76827285, S: 0.239979355 },
-  189.5: { L: -4.935490296, M: 70.86824001, S: 0.240735775 },
-  190.5: { L: -5.056829167, M: 71.99413038, S: 0.241484093 },
-  191.5: { L: -5.181395699, M: 73.14648306, S: 0.242224094 },
-  192.5: { L: -5.309254743, M: 74.32584257, S: 0.242955559 },
-  193.5: { L: -5.440471135, M: 75.53275874, S: 0.243678271 },
-  194.5: { L: -5.575109651, M: 76.76778672, S: 0.244392012 },
-  195.5: { L: -5.71323495, M: 78.03148688, S: 0.24509656 },
-  196.5: { L: -5.854911531, M: 79.3244248, S: 0.245791697 },
-  197.5: { L: -6.000203674, M: 80.64717114, S: 0.246477201 },
-  198.5: { L: -6.149175387, M: 82.00030147, S: 0.24715285 },
-  199.5: { L: -6.30189039, M: 83.3843962, S: 0.247818425 },
-  200.5: { L: -6.458412079, M: 84.80004041, S: 0.248473704 },
-  201.5: { L: -6.618803504, M: 86.24782369, S: 0.249118468 },
-  202.5: { L: -6.783127343, M: 87.72833999, S: 0.249752498 },
-  203.5: { L: -6.951445881, M: 89.24218746, S: 0.250375575 },
-  204.5: { L: -7.123820989, M: 90.78996825, S: 0.250987482 },
-  205.5: { L: -7.300314106, M: 92.37228826, S: 0.251588003 },
-  206.5: { L: -7.480986215, M: 93.98975693, S: 0.252176924 },
-  207.5: { L: -7.665897827, M: 95.64298703, S: 0.252754031 },
-  208.5: { L: -7.855108967, M: 97.33259443, S: 0.253319114 },
-  209.5: { L: -8.048679167, M: 99.05919789, S: 0.253871962 },
-  210.5: { L: -8.246667442, M: 100.8234188, S: 0.254412368 },
-  211.5: { L: -8.449132279, M: 102.6258808, S: 0.254940126 },
-  212.5: { L: -8.65613163, M: 104.4672091, S: 0.255455032 },
-  213.5: { L: -8.867722893, M: 106.3480301, S: 0.255956886 },
-  214.5: { L: -9.083962906, M: 108.2689714, S: 0.256445489 },
-  215.5: { L: -9.304907928, M: 110.2306614, S: 0.256920646 },
-  216.5: { L: -9.530613631, M: 112.2337289, S: 0.257382162 },
-  217.5: { L: -9.761135078, M: 114.2788028, S: 0.257829847 },
-  218.5: { L: -9.99652669, M: 116.3665116, S: 0.258263512 },
-  219.5: { L: -10.23684223, M: 118.4974832, S: 0.258682971 },
-  220.5: { L: -10.48213489, M: 120.6723442, S: 0.259088041 },
-  221.5: { L: -10.73245727, M: 122.8917195, S: 0.259478541 },
-  222.5: { L: -10.98786137, M: 125.1562316, S: 0.259854294 },
-  223.5: { L: -11.24839858, M: 127.4665001, S: 0.260215124 },
-  224.5: { L: -11.51411967, M: 129.8231405, S: 0.260560859 },
-  225.5: { L: -11.78507481, M: 132.2267638, S: 0.260891329 },
-  226.5: { L: -12.06131353, M: 134.6779756, S: 0.261206367 },
-  227.5: { L: -12.34288476, M: 137.1773753, S: 0.261505811 },
-  228.5: { L: -12.62983679, M: 139.7255554, S: 0.261789499 },
-  229.5: { L: -12.92221725, M: 142.3231011, S: 0.262057275 },
-  230.5: { L: -13.22007317, M: 144.9705889, S: 0.26230898 },
-  231.5: { L: -13.52345092, M: 147.6685867, S: 0.262544462 },
-  232.5: { L: -13.83239627, M: 150.4176525, S: 0.262763569 },
-  233.5: { L: -14.14695441, M: 153.218334, S: 0.262966152 },
-  234.5: { L: -14.46716994, M: 156.0711672, S: 0.263152063 },
-  235.5: { L: -14.79308694, M: 158.9766756, S: 0.263321158 },
-  236.5: { L: -15.12474893, M: 161.9353694, S: 0.263473295 },
-  237.5: { L: -15.46219893, M: 164.9477445, S: 0.263608333 },
-  238.5: { L: -15.80547947, M: 168.0142816, S: 0.263726137 },
-  239.5: { L: -16.15463262, M: 171.1354456, S: 0.263826572 },
-  240: { L: -0.91648762, M: 70.59761453, S: 0.161476792 }
-};
-
-// Girls stature data (age in months -> LMS parameters)
-export const GIRLS_STATURE = {
-  24: { L: 0.388712327, M: 85.18676119, S: 0.040875455 },
-  24.5: { L: 0.385451746, M: 85.60440979, S: 0.040900855 },
-  25.5: { L: 0.377858063, M: 86.42268887, S: 0.040955883 },
-  26.5: { L: 0.368958766, M: 87.22193932, S: 0.04101395 },
-  27.5: { L: 0.358830316, M: 88.00248152, S: 0.041074637 },
-  28.5: { L: 0.347547831, M: 88.76471605, S: 0.041137509 },
-  29.5: { L: 0.335185063, M: 89.50911447, S: 0.041202115 },
-  30.5: { L: 0.321814386, M: 90.23621047, S: 0.04126799 },
-  31.5: { L: 0.30750678, M: 90.94659141, S: 0.041334654 },
-  32.5: { L: 0.292331814, M: 91.64089984, S: 0.041401618 },
-  33.5: { L: 0.276357641, M: 92.31982578, S: 0.041468386 },
-  34.5: { L: 0.259650988, M: 92.98409815, S: 0.041534461 },
-  35.5: { L: 0.242277147, M: 93.63448605, S: 0.041599348 },
-  36.5: { L: 0.224299972, M: 94.27179001, S: 0.041662554 },
-  37.5: { L: 0.346691748, M: 94.91276884, S: 0.041660823 },
-  38.5: { L: 0.464085737, M: 95.54636606, S: 0.04166241 },
-  39.5: { L: 0.576597116, M: 96.17236927, S: 0.041667349 },
-  40.5: { L: 0.684333696, M: 96.7906015, S: 0.041675643 },
-  41.5: { L: 0.787396038, M: 97.40092123, S: 0.041687268 },
-  42.5: { L: 0.88588754, M: 98.00322222, S: 0.041702177 },
-  43.5: { L: 0.979914423, M: 98.5974232, S: 0.041720305 },
-  44.5: { L: 1.069585802, M: 99.18346718, S: 0.041741567 },
-  45.5: { L: 1.155013727, M: 99.76132059, S: 0.041765869 },
-  46.5: { L: 1.236312196, M: 100.3309725, S: 0.041793102 },
-  47.5: { L: 1.313597178, M: 100.8924339, S: 0.04182315 },
-  48.5: { L: 1.386986628, M: 101.4457269, S: 0.041855889 },
-  49.5: { L: 1.456600488, M: 101.9908838, S: 0.041891189 },
-  50.5: { L: 1.522560693, M: 102.5279464, S: 0.041928917 },
-  51.5: { L: 1.584990166, M: 103.0569643, S: 0.041968935 },
-  52.5: { L: 1.644012808, M: 103.5779937, S: 0.042011103 },
-  53.5: { L: 1.699753478, M: 104.0910956, S: 0.042055278 },
-  54.5: { L: 1.752337976, M: 104.5963352, S: 0.042101315 },
-  55.5: { L: 1.801893018, M: 105.0937794, S: 0.042149069 },
-  56.5: { L: 1.84854621, M: 105.5834969, S: 0.042198393 },
-  57.5: { L: 1.892426024, M: 106.0655575, S: 0.042249142 },
-  58.5: { L: 1.933661774, M: 106.5400313, S: 0.042301167 },
-  59.5: { L: 1.972383591, M: 107.0069886, S: 0.042354323 },
-  60.5: { L: 2.008722396, M: 107.4664991, S: 0.042408462 },
-  61.5: { L: 2.042809876, M: 107.9186316, S: 0.042463439 },
-  62.5: { L: 2.074778462, M: 108.3634539, S: 0.042519107 },
-  63.5: { L: 2.104761303, M: 108.8010323, S: 0.042575323 },
-  64.5: { L: 2.132892245, M: 109.2314317, S: 0.042631943 },
-  65.5: { L: 2.159305804, M: 109.654716, S: 0.042688825 },
-  66.5: { L: 2.184137142, M: 110.0709476, S: 0.042745828 },
-  67.5: { L: 2.207522054, M: 110.4801878, S: 0.042802816 },
-  68.5: { L: 2.229597938, M: 110.8824972, S: 0.042859651 },
-  69.5: { L: 2.250502754, M: 111.2779357, S: 0.042916203 },
-  70.5: { L: 2.270375998, M: 111.6665628, S: 0.042972341 },
-  71.5: { L: 2.289357664, M: 112.0484377, S: 0.043027941 },
-  72.5: { L: 2.307588199, M: 112.4236197, S: 0.043082882 },
-  73.5: { L: 2.325208462, M: 112.7921681, S: 0.043137046 },
-  74.5: { L: 2.342359679, M: 113.1541426, S: 0.043190321 },
-  75.5: { L: 2.359183392, M: 113.5096033, S: 0.043242602 },
-  76.5: { L: 2.375821415, M: 113.85861, S: 0.043293786 },
-  77.5: { L: 2.392415775, M: 114.2012229, S: 0.043343779 },
-  78.5: { L: 2.409108646, M: 114.5375024, S: 0.043392492 },
-  79.5: { L: 2.426042292, M: 114.8675088, S: 0.043439845 },
-  80.5: { L: 2.443359002, M: 115.191303, S: 0.043485764 },
-  81.5: { L: 2.461201019, M: 115.5089458, S: 0.043530185 },
-  82.5: { L: 2.479710476, M: 115.8204982, S: 0.043573048 },
-  83.5: { L: 2.499029342, M: 116.1260216, S: 0.043614302 },
-  84.5: { L: 2.519299368, M: 116.4255773, S: 0.043653906 },
-  85.5: { L: 2.540662032, M: 116.7192267, S: 0.043691824 },
-  86.5: { L: 2.563258476, M: 117.0070317, S: 0.04372803 },
-  87.5: { L: 2.587229548, M: 117.2890539, S: 0.043762507 },
-  88.5: { L: 2.612715752, M: 117.565355, S: 0.043795247 },
-  89.5: { L: 2.639857193, M: 117.8359972, S: 0.043826252 },
-  90.5: { L: 2.66879362, M: 118.1010422, S: 0.043855532 },
-  91.5: { L: 2.699664377, M: 118.3605522, S: 0.043883108 },
-  92.5: { L: 2.732608434, M: 118.6145896, S: 0.043909013 },
-  93.5: { L: 2.767764438, M: 118.8632166, S: 0.043933291 },
-  94.5: { L: 2.805270671, M: 119.1064959, S: 0.043955996 },
-  95.5: { L: 2.845265108, M: 119.3444902, S: 0.043977191 },
-  96.5: { L: 2.88788537, M: 119.5772621, S: 0.043996951 },
-  97.5: { L: 2.933268773, M: 119.8048743, S: 0.044015359 },
-  98.5: { L: 2.98155231, M: 120.0273898, S: 0.04403251 },
-  99.5: { L: 3.032872653, M: 120.2448711, S: 0.044048509 },
-  100.5: { L: 3.087366157, M: 120.457381, S: 0.044063468 },
-  101.5: { L: 3.145168873, M: 120.6649825, S: 0.044077511 },
-  102.5: { L: 3.206416547, M: 120.8677386, S: 0.044090772 },
-  103.5: { L: 3.271244629, M: 121.0657123, S: 0.044103393 },
-  104.5: { L: 3.339788267, M: 121.2589668, S: 0.044115527 },
-  105.5: { L: 3.412182303, M: 121.4475653, S: 0.044127333 },
-  106.5: { L: 3.488561284, M: 121.631571, S: 0.044138985 },
-  107.5: { L: 3.569059462, M: 121.8110475, S: 0.044150663 },
-  108.5: { L: 3.653810798, M: 121.9860582, S: 0.044162559 },
-  109.5: { L: 3.742948953, M: 122.1566668, S: 0.044174878 },
-  110.5: { L: 3.836607299, M: 122.3229372, S: 0.044187833 },
-  111.5: { L: 3.934918915, M: 122.4849333, S: 0.044201651 },
-  112.5: { L: 4.038016595, M: 122.6427195, S: 0.044216569 },
-  113.5: { L: 4.146032845, M: 122.7963599, S: 0.044232837 },
-  114.5: { L: 4.259099893, M: 122.9459193, S: 0.044250718 },
-  115.5: { L: 4.377349697, M: 123.0914624, S: 0.044270488 },
-  116.5: { L: 4.500913968, M: 123.2330542, S: 0.044292439 },
-  117.5: { L: 4.629924181, M: 123.3707599, S: 0.044316878 },
-  118.5: { L: 4.764511575, M: 123.5046449, S: 0.044344131 },
-  119.5: { L: 4.90480716, M: 123.6347746, S: 0.044374537 },
-  120.5: { L: 0.862626951, M: 138.1957728, S: 0.047200879 },
-  121.5: { L: 0.807893893, M: 138.9034155, S: 0.047373252 },
-  122.5: { L: 0.749835046, M: 139.6076818, S: 0.047548131 },
-  123.5: { L: 0.68841168, M: 140.3080709, S: 0.047725601 },
-  124.5: { L: 0.623584628, M: 141.0040773, S: 0.047905728 },
-  125.5: { L: 0.555313255, M: 141.6951905, S: 0.048088565 },
-  126.5: { L: 0.483556413, M: 142.3808956, S: 0.048274148 },
-  127.5: { L: 0.408272411, M: 143.0606732, S: 0.048462502 },
-  128.5: { L: 0.329418969, M: 143.7340001, S: 0.048653636 },
-  129.5: { L: 0.246953165, M: 144.400349, S: 0.048847548 },
-  130.5: { L: 0.160831389, M: 145.0591886, S: 0.049044222 },
-  131.5: { L: 0.071009292, M: 145.7099844, S: 0.049243631 },
-  132.5: { L: -0.022557594, M: 146.3521983, S: 0.049445734 },
-  133.5: { L: -0.119913215, M: 146.985289, S: 0.049650478 },
-  134.5: { L: -0.221101007, M: 147.6087116, S: 0.049857796 },
-  135.5: { L: -0.326164022, M: 148.2219185, S: 0.050067609 },
-  136.5: { L: -0.435145025, M: 148.8243585, S: 0.050279825 },
-  137.5: { L: -0.548086598, M: 149.4154781, S: 0.050494342 },
-  138.5: { L: -0.665030248, M: 149.9947211, S: 0.050711047 },
-  139.5: { L: -0.786016523, M: 150.5615289, S: 0.050929818 },
-  140.5: { L: -0.911085144, M: 151.1153408, S: 0.051150524 },
-  141.5: { L: -1.040275137, M: 151.6555941, S: 0.051373025 },
-  142.5: { L: -1.173624964, M: 152.1817243, S: 0.051597177 },
-  143.5: { L: -1.311172668, M: 152.6931647, S: 0.051822825 },
-  144.5: { L: -1.452955904, M: 153.1893474, S: 0.052049811 },
-  145.5: { L: -1.599012091, M: 153.6697022, S: 0.052277971 },
-  146.5: { L: -1.749378462, M: 154.1336572, S: 0.052507133 },
-  147.5: { L: -1.904092133, M: 154.5806381, S: 0.052737125 },
-  148.5: { L: -2.063190184, M: 155.0100678, S: 0.052967768 },
-  149.5: { L: -2.226709728, M: 155.4213669, S: 0.053198878 },
-  150.5: { L: -2.394687004, M: 155.8139527, S: 0.053430271 },
-  151.5: { L: -2.567158449, M: 156.1872389, S: 0.053661759 },
-  152.5: { L: -2.744160778, M: 156.5406352, S: 0.053893151 },
-  153.5: { L: -2.925731072, M: 156.8735467, S: 0.054124256 },
-  154.5: { L: -3.111906867, M: 157.1853737, S: 0.054354881 },
-  155.5: { L: -3.302726241, M: 157.4755108, S: 0.054584832 },
-  156.5: { L: -3.498227894, M: 157.7433467, S: 0.05481391 },
-  157.5: { L: -3.698451239, M: 157.9882635, S: 0.05504192 },
-  158.5: { L: -3.903436488, M: 158.2096363, S: 0.055268663 },
-  159.5: { L: -4.113224715, M: 158.4068327, S: 0.055493939 },
-  160.5: { L: -4.327857934, M: 158.5792128, S: 0.055717552 },
-  161.5: { L: -4.547379178, M: 158.7261287, S: 0.055939301 },
-  162.5: { L: -4.771832571, M: 158.8469249, S: 0.056158988 },
-  163.5: { L: -5.001263403, M: 158.940937, S: 0.056376414 },
-  164.5: { L: -5.235718215, M: 159.0074925, S: 0.056591381 },
-  165.5: { L: -5.475244886, M: 159.0459099, S: 0.056803694 },
-  166.5: { L: -5.719892707, M: 159.0554989, S: 0.057013156 },
-  167.5: { L: -5.969712463, M: 159.0355601, S: 0.057219575 },
-  168.5: { L: -6.224756504, M: 158.9853849, S: 0.057422759 },
-  169.5: { L: -6.485078823, M: 158.9042554, S: 0.057622519 },
-  170.5: { L: -6.750734138, M: 158.7914439, S: 0.057818668 },
-  171.5: { L: -7.021778966, M: 158.6462135, S: 0.058011022 },
-  172.5: { L: -7.298270689, M: 158.4678173, S: 0.058199401 },
-  173.5: { L: -7.580267609, M: 158.2554985, S: 0.058383628 },
-  174.5: { L: -7.867828993, M: 158.0084902, S: 0.058563528 },
-  175.5: { L: -8.161015132, M: 157.7260153, S: 0.058738932 },
-  176.5: { L: -8.459887396, M: 157.4072863, S: 0.058909674 },
-  177.5: { L: -8.764508291, M: 157.0515053, S: 0.059075594 },
-  178.5: { L: -9.074941519, M: 156.657864, S: 0.059236536 },
-  179.5: { L: -9.391251031, M: 156.2255433, S: 0.059392347 },
-  180.5: { L: -9.713502091, M: 155.7537136, S: 0.059542882 },
-  181.5: { L: -10.04176032, M: 155.2415346, S: 0.059687997 },
-  182.5: { L: -10.37609181, M: 154.6881551, S: 0.059827555 },
-  183.5: { L: -10.71656322, M: 154.0927133, S: 0.059961421 },
-  184.5: { L: -11.0632418, M: 153.4543362, S: 0.060089468 },
-  185.5: { L: -11.41619529, M: 152.7721399, S: 0.060211569 },
-  186.5: { L: -11.77549191, M: 152.0452294, S: 0.0603276 },
-  187.5: { L: -12.14120031, M: 151.2726984, S: 0.060437446 },
-  188.5: { L: -12.51338956, M: 150.4536294, S: 0.060540992 },
-  189.5: { L: -12.89212908, M: 149.5870937, S: 0.060638127 },
-  190.5: { L: -13.27748867, M: 148.6721511, S: 0.060728743 },
-  191.5: { L: -13.66953836, M: 147.7078501, S: 0.060812738 },
-  192.5: { L: -14.06834843, M: 146.693228, S: 0.060890012 },
-  193.5: { L: -14.47398935, M: 145.6273105, S: 0.060960466 },
-  194.5: { L: -14.88653166, M: 144.5091116, S: 0.061024007 },
-  195.5: { L: -15.30604598, M: 143.3376341, S: 0.061080544 },
-  196.5: { L: -15.73260286, M: 142.1118687, S: 0.061129989 },
-  197.5: { L: -16.16627279, M: 140.8307943, S: 0.061172255 },
-  198.5: { L: -16.60712614, M: 139.493378, S: 0.061207262 },
-  199.5: { L: -17.05523306, M: 138.0985748, S: 0.061234929 },
-  200.5: { L: -17.51066344, M: 136.6453274, S: 0.061255179 },
-  201.5: { L: -17.9734869, M: 135.1325661, S: 0.061267939 },
-  202.5: { L: -18.4437727, M: 133.5592085, S: 0.061273137 },
-  203.5: { L: -18.92158972, M: 131.924159, S: 0.061270704 },
-  204.5: { L: -19.40700643, M: 130.2263091, S: 0.061260574 },
-  205.5: { L: -19.90009079, M: 128.4645366, S: 0.061242684 },
-  206.5: { L: -20.40091028, M: 126.6377061, S: 0.061216974 },
-  207.5: { L: -20.90953181, M: 124.7446686, S: 0.061183384 },
-  208.5: { L: -21.42602169, M: 122.7842615, S: 0.06114186 },
-  209.5: { L: -21.95044564, M: 120.755308, S: 0.061092349 },
-  210.5: { L: -22.48286873, M: 118.6566173, S: 0.0610348 },
-  211.5: { L: -23.02335539, M: 116.4869845, S: 0.060969164 },
-  212.5: { L: -23.57196934, M: 114.2451897, S: 0.060895395 },
-  213.5: { L: -24.12877357, M: 111.9299984, S: 0.060813451 },
-  214.5: { L: -24.69383035, M: 109.5401614, S: 0.060723289 },
-  215.5: { L: -25.26720112, M: 107.0744144, S: 0.060624871 },
-  216.5: { L: -25.84894651, M: 104.531478, S: 0.060518162 },
-  217.5: { L: -26.43912627, M: 101.9100577, S: 0.060403128 },
-  218.5: { L: -27.03779925, M: 99.20884383, S: 0.060279738 },
-  219.5: { L: -27.64502338, M: 96.42651115, S: 0.060147965 },
-  220.5: { L: -28.26085562, M: 93.56170977, S: 0.060007783 },
-  221.5: { L: 1.063862715, M: 163.1914194, S: 0.039673596 },
-  222.5: { L: 1.066872639, M: 163.202203, S: 0.039671082 },
-  223.5: { L: 1.069803036, M: 163.2125835, S: 0.039668635 },
-  224.5: { L: 1.072655401, M: 163.2225779, S: 0.039666254 },
-  225.5: { L: 1.075431258, M: 163.2322024, S: 0.039663936 },
-  226.5: { L: 1.078132156, M: 163.2414722, S: 0.039661679 },
-  227.5: { L: 1.080759655, M: 163.2504019, S: 0.039659481 },
-  228.5: { L: 1.083315329, M: 163.2590052, S: 0.039657339 },
-  229.5: { L: 1.085800751, M: 163.2672954, S: 0.039655252 },
-  230.5: { L: 1.088217496, M: 163.2752848, S: 0.039653218 },
-  231.5: { L: 1.090567133, M: 163.2829854, S: 0.039651237 },
-  232.5: { L: 1.092851222, M: 163.2904086, S: 0.039649306 },
-  233.5: { L: 1.095071313, M: 163.297565, S: 0.039647424 },
-  234.5: { L: 1.097228939, M: 163.304465, S: 0.039645591 },
-  235.5: { L: 1.099325619, M: 163.3111185, S: 0.039643804 },
-  236.5: { L: 1.101362852, M: 163.3175349, S: 0.039642063 },
-  237.5: { L: 1.103342119, M: 163.3237231, S: 0.039640367 },
-  238.5: { L: 1.105264876, M: 163.3296918, S: 0.039638715 },
-  239.5: { L: 1.107132561, M: 163.3354491, S: 0.039637105 },
-  240: { L: 1.108046193, M: 163.338251, S: 0.039636316 }
-};
-
-// Girls weight data (age in months -> LMS parameters)
-export const GIRLS_WEIGHT = {
-  24: { L: -0.73533951, M: 12.05503983, S: 0.107399495 },
-  24.5: { L: -0.75220657, M: 12.13455523, S: 0.107740345 },
-  25.5: { L: -0.78423366, M: 12.2910249, S: 0.10847701 },
-  26.5: { L: -0.81409582, M: 12.44469258, S: 0.109280828 },
-  27.5: { L: -0.841935504, M: 12.59622335, S: 0.110144488 },
-  28.5: { L: -0.867894714, M: 12.74621068, S: 0.111061024 },
-  29.5: { L: -0.892117619, M: 12.89518497, S: 0.112023741 },
-  30.5: { L: -0.914735823, M: 13.04362234, S: 0.113026241 },
-  31.5: { L: -0.935870411, M: 13.19195124, S: 0.11406246 },
-  32.5: { L: -0.955631749, M: 13.34055909, S: 0.115126622 },
-  33.5: { L: -0.974119296, M: 13.48979821, S: 0.116213223 },
-  34.5: { L: -0.991422494, M: 13.63999169, S: 0.11731701 },
-  35.5: { L: -1.007620782, M: 13.79143882, S: 0.118432967 },
-  36.5: { L: -1.022783542, M: 13.94442003, S: 0.119556315 },
-  37.5: { L: -1.036970093, M: 14.09920179, S: 0.120682517 },
-  38.5: { L: -1.050229647, M: 14.25604119, S: 0.121807309 },
-  39.5: { L: -1.062601321, M: 14.41518908, S: 0.122926759 },
-  40.5: { L: -1.074115139, M: 14.5768936, S: 0.124037284 },
-  41.5: { L: -1.08479208, M: 14.74140284, S: 0.12513559 },
-  42.5: { L: -1.094644146, M: 14.90896646, S: 0.126218718 },
-  43.5: { L: -1.103674432, M: 15.0798363, S: 0.127283982 },
-  44.5: { L: -1.11187721, M: 15.25426701, S: 0.128329013 },
-  45.5: { L: -1.119238074, M: 15.43251666, S: 0.12935175 },
-  46.5: { L: -1.125734058, M: 15.61484741, S: 0.130350408 },
-  47.5: { L: -1.131333782, M: 15.80152599, S: 0.131323466 },
-  48.5: { L: -1.135997655, M: 15.99282411, S: 0.132269639 },
-  49.5: { L: -1.139678102, M: 16.1890191, S: 0.133187853 },
-  50.5: { L: -1.142319879, M: 16.39039444, S: 0.134077229 },
-  51.5: { L: -1.143860394, M: 16.59723989, S: 0.134937056 },
-  52.5: { L: -1.144230053, M: 16.80985162, S: 0.135766772 },
-  53.5: { L: -1.143352575, M: 17.02853228, S: 0.136565947 },
-  54.5: { L: -1.141145343, M: 17.25359125, S: 0.137334273 },
-  55.5: { L: -1.137519721, M: 17.48534477, S: 0.138071553 },
-  56.5: { L: -1.132382354, M: 17.72411617, S: 0.138777685 },
-  57.5: { L: -1.125635477, M: 17.97023593, S: 0.139452647 },
-  58.5: { L: -1.117177254, M: 18.22404182, S: 0.1400965 },
-  59.5: { L: -1.106902089, M: 18.48587883, S: 0.140709366 },
-  60.5: { L: -1.09470091, M: 18.75610013, S: 0.141291427 },
-  61.5: { L: -1.080461508, M: 19.03506614, S: 0.141842921 },
-  62.5: { L: -1.064068825, M: 19.32314481, S: 0.142364138 },
-  63.5: { L: -1.04540529, M: 19.62071076, S: 0.142855414 },
-  64.5: { L: -1.024351088, M: 19.92814552, S: 0.143317131 },
-  65.5: { L: -1.000784537, M: 20.24583769, S: 0.143749713 },
-  66.5: { L: -0.974582693, M: 20.57418305, S: 0.144153626 },
-  67.5: { L: -0.945621775, M: 20.91358468, S: 0.144529378 },
-  68.5: { L: -0.913777533, M: 21.26445304, S: 0.144877519 },
-  69.5: { L: -0.878925682, M: 21.6272063, S: 0.145198641 },
-  70.5: { L: -0.840942256, M: 22.00227044, S: 0.145493378 },
-  71.5: { L: -0.799703992, M: 22.39007946, S: 0.145762406 },
-  72.5: { L: -0.755088703, M: 22.79107543, S: 0.146006445 },
-  73.5: { L: -0.706975655, M: 23.20570864, S: 0.146226258 },
-  74.5: { L: -0.655246008, M: 23.63443769, S: 0.146422653 },
-  75.5: { L: -0.599783211, M: 24.07772966, S: 0.146596481 },
-  76.5: { L: -0.54047343, M: 24.53606023, S: 0.146748642 },
-  77.5: { L: -0.477206044, M: 25.00991377, S: 0.14688008 },
-  78.5: { L: -0.409874072, M: 25.49978342, S: 0.146991785 },
-  79.5: { L: -0.338374714, M: 26.00617106, S: 0.147084793 },
-  80.5: { L: -0.262610016, M: 26.52958727, S: 0.147160182 },
-  81.5: { L: -0.182487563, M: 27.07055124, S: 0.147219076 },
-  82.5: { L: -0.097921195, M: 27.62959065, S: 0.147262638 },
-  83.5: { L: -0.00883183, M: 28.20724149, S: 0.147292072 },
-  84.5: { L: 0.084853756, M: 28.8040479, S: 0.147308622 },
-  85.5: { L: 0.183201887, M: 29.42056194, S: 0.147313566 },
-  86.5: { L: 0.286266954, M: 30.05733325, S: 0.147308221 },
-  87.5: { L: 0.394087455, M: 30.71491879, S: 0.147293939 },
-  88.5: { L: 0.506683119, M: 31.39388253, S: 0.147272106 },
-  89.5: { L: 0.624052996, M: 32.09479512, S: 0.147244141 },
-  90.5: { L: 0.746173459, M: 32.81823358, S: 0.147211496 },
-  91.5: { L: 0.872995184, M: 33.56478088, S: 0.147175661 },
-  92.5: { L: 1.004440086, M: 34.33502552, S: 0.147138159 },
-  93.5: { L: 1.140397189, M: 35.12956111, S: 0.147100556 },
-  94.5: { L: 1.280719398, M: 35.94898586, S: 0.147064463 },
-  95.5: { L: 1.425219992, M: 36.79390221, S: 0.147031537 },
-  96.5: { L: 1.573669318, M: 37.66491551, S: 0.147003489 },
-  97.5: { L: 1.725791681, M: 38.56263378, S: 0.146982089 },
-  98.5: { L: 1.881262436, M: 39.48766733, S: 0.14696917 },
-  99.5: { L: 2.039706179, M: 40.44062848, S: 0.146966637 },
-  100.5: { L: 2.200695046, M: 41.42213131, S: 0.146976468 },
-  101.5: { L: 2.363747152, M: 42.43279155, S: 0.147000723 },
-  102.5: { L: 2.528326229, M: 43.47322636, S: 0.147041549 },
-  103.5: { L: 2.693839487, M: 44.54405406, S: 0.14710118 },
-  104.5: { L: 2.859636696, M: 45.64589393, S: 0.147181945 },
-  105.5: { L: 3.025009463, M: 46.77936608, S: 0.147286276 },
-  106.5: { L: 3.189193433, M: 47.94509116, S: 0.147416706 },
-  107.5: { L: 3.351370602, M: 49.14369012, S: 0.147575882 },
-  108.5: { L: 3.510672606, M: 50.37578386, S: 0.147766569 },
-  109.5: { L: 3.666184015, M: 51.64199302, S: 0.147991657 },
-  110.5: { L: 3.816945526, M: 52.94293789, S: 0.148254172 },
-  111.5: { L: 3.961957262, M: 54.27923813, S: 0.148557279 },
-  112.5: { L: 4.100183147, M: 55.65151268, S: 0.148904296 },
-  113.5: { L: 4.230555493, M: 57.06038066, S: 0.149298699 },
-  114.5: { L: 4.351981523, M: 58.50646035, S: 0.149744133 },
-  115.5: { L: 4.463349894, M: 59.99036917, S: 0.150244416 },
-  116.5: { L: 4.563537272, M: 61.51272371, S: 0.150803546 },
-  117.5: { L: 4.651416107, M: 63.0741396, S: 0.15142571 },
-  118.5: { L: 4.725862519, M: 64.67523148, S: 0.15211529 },
-  119.5: { L: 4.785765312, M: 66.31661293, S: 0.15287686 },
-  120.5: { L: -1.201282618, M: 32.06277866, S: 0.183933527 },
-  121.5: { L: -1.22076682, M: 32.37170339, S: 0.185044076 },
-  122.5: { L: -1.240590823, M: 32.68635063, S: 0.186161163 },
-  123.5: { L: -1.260773206, M: 33.00695066, S: 0.187284672 },
-  124.5: { L: -1.281333113, M: 33.33373832, S: 0.188414486 },
-  125.5: { L: -1.302290263, M: 33.66695321, S: 0.189550486 },
-  126.5: { L: -1.323664954, M: 34.00683979, S: 0.190692548 },
-  127.5: { L: -1.345478074, M: 34.3536474, S: 0.191840543 },
-  128.5: { L: -1.367751105, M: 34.70763034, S: 0.192994337 },
-  129.5: { L: -1.390506128, M: 35.06904787, S: 0.194153791 },
-  130.5: { L: -1.413765832, M: 35.4381643, S: 0.195318759 },
-  131.5: { L: -1.437553512, M: 35.81524902, S: 0.196489091 },
-  132.5: { L: -1.46189307, M: 36.20057659, S: 0.197664628 },
-  133.5: { L: -1.486809014, M: 36.59442669, S: 0.198845206 },
-  134.5: { L: -1.512326456, M: 36.99708424, S: 0.20003065 },
-  135.5: { L: -1.538471108, M: 37.40883949, S: 0.20122078 },
-  136.5: { L: -1.565269278, M: 37.82998808, S: 0.202415409 },
-  137.5: { L: -1.59274787, M: 38.2608302, S: 0.203614343 },
-  138.5: { L: -1.620934384, M: 38.70167053, S: 0.204817383 },
-  139.5: { L: -1.64985692, M: 39.15281836, S: 0.206024325 },
-  140.5: { L: -1.679544185, M: 39.6145876, S: 0.207234963 },
-  141.5: { L: -1.710025497, M: 40.08729686, S: 0.208449086 },
-  142.5: { L: -1.741330792, M: 40.57126938, S: 0.209666479 },
-  143.5: { L: -1.773490636, M: 41.06683309, S: 0.210886927 },
-  144.5: { L: -1.806536232, M: 41.57432058, S: 0.212110212 },
-  145.5: { L: -1.840499434, M: 42.09406914, S: 0.213336119 },
-  146.5: { L: -1.875412757, M: 42.62642068, S: 0.214564432 },
-  147.5: { L: -1.911309393, M: 43.17172181, S: 0.215794936 },
-  148.5: { L: -1.948223228, M: 43.73032382, S: 0.217027419 },
-  149.5: { L: -1.986188851, M: 44.30258264, S: 0.218261673 },
-  150.5: { L: -2.025241571, M: 44.88885884, S: 0.219497489 },
-  151.5: { L: -2.065417432, M: 45.48951753, S: 0.220734665 },
-  152.5: { L: -2.106753225, M: 46.10492835, S: 0.221973 },
-  153.5: { L: -2.149286506, M: 46.73546541, S: 0.223212299 },
-  154.5: { L: -2.193055606, M: 47.38150723, S: 0.224452369 },
-  155.5: { L: -2.238099643, M: 48.04343667, S: 0.225693024 },
-  156.5: { L: -2.284458533, M: 48.72164086, S: 0.226934082 },
-  157.5: { L: -2.332172992, M: 49.41651108, S: 0.228175367 },
-  158.5: { L: -2.381284544, M: 50.12844266, S: 0.22941671 },
-  159.5: { L: -2.431835525, M: 50.85783486, S: 0.23065795 },
-  160.5: { L: -2.483869081, M: 51.60509074, S: 0.231898932 },
-  161.5: { L: -2.537429173, M: 52.37061697, S: 0.233139509 },
-  162.5: { L: -2.592560572, M: 53.15482365, S: 0.23437954 },
-  163.5: { L: -2.64930887, M: 53.95812407, S: 0.235618896 },
-  164.5: { L: -2.707720471, M: 54.78093454, S: 0.236857452 },
-  165.5: { L: -2.767842607, M: 55.62367405, S: 0.23809509 },
-  166.5: { L: -2.829723334, M: 56.48676398, S: 0.239331702 },
-  167.5: { L: -2.893411555, M: 57.37062773, S: 0.240567187 },
-  168.5: { L: -2.958957013, M: 58.27569039, S: 0.241801448 },
-  169.5: { L: -3.026410295, M: 59.20237834, S: 0.243034402 },
-  170.5: { L: -3.095822818, M: 60.1511188, S: 0.24426597 },
-  171.5: { L: -3.167246829, M: 61.12233937, S: 0.245496084 },
-  172.5: { L: -3.2407354, M: 62.11646742, S: 0.24672468 },
-  173.5: { L: -3.316342426, M: 63.13392953, S: 0.247951704 },
-  174.5: { L: -3.394122623, M: 64.17515089, S: 0.249177106 },
-  175.5: { L: -3.474131532, M: 65.24055474, S: 0.250400844 },
-  176.5: { L: -3.556425531, M: 66.33056177, S: 0.251622882 },
-  177.5: { L: -3.641061829, M: 67.44558946, S: 0.252843188 },
-  178.5: { L: -3.728098478, M: 68.58605143, S: 0.254061739 },
-  179.5: { L: -3.817594379, M: 69.75235685, S: 0.255278515 },
-  180.5: { L: -3.909609297, M: 70.94490985, S: 0.256493503 },
-  181.5: { L: -4.004203867, M: 72.16410898, S: 0.257706697 },
-  182.5: { L: -4.101439608, M: 73.41034668, S: 0.258918094 },
-  183.5: { L: -4.201378928, M: 74.68400867, S: 0.2601277 },
-  184.5: { L: -4.304085152, M: 75.9854735, S: 0.261335525 },
-  185.5: { L: -4.409622516, M: 77.31511194, S: 0.262541584 },
-  186.5: { L: -4.51805621, M: 78.67328644, S: 0.263745901 },
-  187.5: { L: -4.629451394, M: 80.06035056, S: 0.264948502 },
-  188.5: { L: -4.743874227, M: 81.47664826, S: 0.26614942 },
-  189.5: { L: -4.861390877, M: 82.92251327, S: 0.267348695 },
-  190.5: { L: -4.982068551, M: 84.39826839, S: 0.268546369 },
-  191.5: { L: -5.10597451, M: 85.90422472, S: 0.269742491 },
-  192.5: { L: -5.233176087, M: 87.44068104, S: 0.270937115 },
-  193.5: { L: -5.363740702, M: 89.00792306, S: 0.272130301 },
-  194.5: { L: -5.497735882, M: 90.60622259, S: 0.273322117 },
-  195.5: { L: -5.635229267, M: 92.23583684, S: 0.27451263 },
-  196.5: { L: -5.776288614, M: 93.89700761, S: 0.275701915 },
-  197.5: { L: -5.920981813, M: 95.58996059, S: 0.276890049 },
-  198.5: { L: -6.069376891, M: 97.31490464, S: 0.278077112 },
-  199.5: { L: -6.221542015, M: 99.0720311, S: 0.279263186 },
-  200.5: { L: -6.377545505, M: 100.8615134, S: 0.280448358 },
-  201.5: { L: -6.537455838, M: 102.6835066, S: 0.281632715 },
-  202.5: { L: -6.701341661, M: 104.5381456, S: 0.282816347 },
-  203.5: { L: -6.869271802, M: 106.4255438, S: 0.283999344 },
-  204.5: { L: -7.041315276, M: 108.345793, S: 0.285181799 },
-  205.5: { L: -7.217541301, M: 110.2989633, S: 0.286363804 },
-  206.5: { L: -7.398019305, M: 112.2851026, S: 0.287545453 },
-  207.5: { L: -7.582818937, M: 114.3042368, S: 0.288726839 },
-  208.5: { L: -7.772010082, M: 116.3563697, S: 0.289908056 },
-  209.5: { L: -7.96566287, M: 118.4414827, S: 0.291089198 },
-  210.5: { L: -8.163847686, M: 120.5595353, S: 0.29227036 },
-  211.5: { L: -8.36663518, M: 122.7104651, S: 0.293451638 },
-  212.5: { L: -8.574096276, M: 124.8941879, S: 0.294633125 },
-  213.5: { L: -8.786302181, M: 127.1105982, S: 0.29581492 },
-  214.5: { L: -9.003324386, M: 129.3595693, S: 0.296997116 },
-  215.5: { L: -9.225234679, M: 131.6409537, S: 0.298179807 },
-  216.5: { L: -9.452105154, M: 133.9545835, S: 0.299363088 },
-  217.5: { L: -9.684008209, M: 136.3002708, S: 0.300547052 },
-  218.5: { L: -9.921016571, M: 138.6778083, S: 0.301731794 },
-  219.5: { L: -10.16320329, M: 141.0869703, S: 0.302917406 },
-  220.5: { L: -10.41064175, M: 143.5275136, S: 0.304103982 },
-  221.5: { L: -10.66340574, M: 145.9991787, S: 0.305291614 },
-  222.5: { L: -10.92157949, M: 148.5016916, S: 0.306480394 },
-  223.5: { L: -11.18524774, M: 151.0347653, S: 0.307670414 },
-  224.5: { L: -11.45449574, M: 153.5981008, S: 0.308861764 },
-  225.5: { L: -11.72940927, M: 156.1913896, S: 0.310054533 },
-  226.5: { L: -12.01007469, M: 158.8143147, S: 0.31124881 },
-  227.5: { L: -12.29657895, M: 161.4665523, S: 0.312444682 },
-  228.5: { L: -12.58900959, M: 164.1477734, S: 0.313642238 },
-  229.5: { L: -12.88745479, M: 166.8576451, S: 0.314841562 },
-  230.5: { L: -13.19200332, M: 169.5958325, S: 0.316042742 },
-  231.5: { L: -13.50274463, M: 172.3619999, S: 0.317245862 },
-  232.5: { L: -13.81976883, M: 175.155812, S: 0.318451006 },
-  233.5: { L: -14.14316673, M: 177.9769348, S: 0.319658258 },
-  234.5: { L: -14.4730299, M: 180.8250369, S: 0.320867702 },
-  235.5: { L: -14.80945064, M: 183.6997901, S: 0.32207942 },
-  236.5: { L: -15.15252203, M: 186.6008705, S: 0.323293494 },
-  237.5: { L: -15.50233794, M: 189.5279596, S: 0.324510006 },
-  238.5: { L: -15.85899306, M: 192.4807448, S: 0.325729038 },
-  239.5: { L: -16.22258289, M: 195.4589203, S: 0.326950671 },
-  240: { L: -1.51336185, M: 58.21897289, S: 0.166644749 }
-};